@@ -66,7 +66,7 @@ export default function Chatbot({ onTasksChanged }: ChatbotProps) {
 
       // Add assistant message
       const assistantMsg: Message = {
-        id: response.message_id,
+        id: response.message_id ?? Date.now(),
         role: "assistant",
         content: response.content,
         tool_calls: response.tool_calls,
@@ -19,7 +19,7 @@ export interface ToolCallInfo {
 
 export interface ChatResponse {
   conversation_id: number
-  message_id: number
+  message_id: number | null
   content: string
   tool_calls?: ToolCallInfo[]
 }
@@ -52,6 +52,21 @@ export interface ConversationMessagesResponse {
   total: number
 }
 
+export interface MessagePageResponse {
+  conversation_id: number
+  messages: Message[]  // newest first
+  has_more: boolean
+  next_before: number | null
+}
+
+export interface MessagePageOptions {
+  before?: number
+  limit?: number
+  includeToolCalls?: boolean
+  /** false returns large tool results as digests (success/error/count only) */
+  expandToolResults?: boolean
+}
+
 export const chatService = {
   /**
    * Send a message to the AI assistant
@@ -77,6 +92,22 @@ export const chatService = {
     return apiRequest<ConversationMessagesResponse>(`/api/conversations/${conversationId}`)
   },
 
+  /**
+   * Get one page of messages, newest first.
+   * Pass next_before from the previous page as `before` to scroll back.
+   */
+  async getMessagePage(conversationId: number, options: MessagePageOptions = {}): Promise<MessagePageResponse> {
+    const params = new URLSearchParams()
+    if (options.before !== undefined) params.set("before", String(options.before))
+    if (options.limit !== undefined) params.set("limit", String(options.limit))
+    if (options.includeToolCalls === false) params.set("include_tool_calls", "false")
+    if (options.expandToolResults === false) params.set("expand_tool_results", "false")
+    const query = params.toString()
+    return apiRequest<MessagePageResponse>(
+      `/api/conversations/${conversationId}/messages${query ? `?${query}` : ""}`
+    )
+  },
+
   /**
    * Delete a conversation
    */
@@ -86,6 +117,17 @@ export const chatService = {
     })
   },
 
+  /**
+   * Delete all conversations of the current user.
+   * With background, the server purges them after responding (202).
+   */
+  async deleteAllConversations(background = false): Promise<{ deleted?: number; scheduled?: number }> {
+    return apiRequest<{ deleted?: number; scheduled?: number }>(
+      `/api/conversations${background ? "?background=true" : ""}`,
+      { method: "DELETE" }
+    )
+  },
+
   /**
    * Check if chat service is healthy
    */
@@ -17,6 +17,8 @@ from sqlmodel import SQLModel
 from app.models.user import User
 from app.models.better_auth_user import BetterAuthUser
 from app.models.task import Task
+from app.models.message_archive import MessageArchive
+from app.models.tool_result import ToolResult, ToolResultRef
 
 # this is the Alembic Config object, which provides
 # access to the values within the .ini file in use.
@@ -0,0 +1,40 @@
+"""Add message_archives table for message retention
+
+Revision ID: c4d81f2a9b37
+Revises: 7e18eb43eb3f
+Create Date: 2026-10-18 21:40:12.512734
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'c4d81f2a9b37'
+down_revision: Union[str, Sequence[str], None] = '7e18eb43eb3f'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Add message_archives table."""
+    op.create_table(
+        'message_archives',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('conversation_id', sa.Integer(), nullable=False),
+        sa.Column('codec', sa.String(length=10), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('message_count', sa.Integer(), nullable=False, server_default='0'),
+        sa.Column('last_message_at', sa.DateTime(), nullable=False),
+        sa.Column('archived_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('id'),
+        sa.UniqueConstraint('conversation_id')
+    )
+
+
+def downgrade() -> None:
+    """Downgrade schema - Remove message_archives table."""
+    op.drop_table('message_archives')
@@ -0,0 +1,38 @@
+"""Add tool_results table for compact tool_calls storage
+
+Revision ID: e9a3b7c1d542
+Revises: c4d81f2a9b37
+Create Date: 2026-10-18 23:05:41.207318
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'e9a3b7c1d542'
+down_revision: Union[str, Sequence[str], None] = 'c4d81f2a9b37'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def upgrade() -> None:
+    """Upgrade schema - Add tool_results table."""
+    op.create_table(
+        'tool_results',
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.Column('codec', sa.String(length=10), nullable=False),
+        sa.Column('data', sa.LargeBinary(), nullable=False),
+        sa.Column('size', sa.Integer(), nullable=False),
+        sa.Column('created_at', sa.DateTime(), nullable=False, server_default=sa.func.now()),
+        sa.PrimaryKeyConstraint('hash')
+    )
+    op.create_index('ix_tool_results_created_at', 'tool_results', ['created_at'])
+
+
+def downgrade() -> None:
+    """Downgrade schema - Remove tool_results table."""
+    op.drop_index('ix_tool_results_created_at', table_name='tool_results')
+    op.drop_table('tool_results')
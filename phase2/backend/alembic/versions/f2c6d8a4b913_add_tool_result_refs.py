@@ -0,0 +1,84 @@
+"""Track tool result references in tool_result_refs
+
+Revision ID: f2c6d8a4b913
+Revises: e9a3b7c1d542
+Create Date: 2026-10-19 10:12:37.480163
+
+"""
+from typing import Sequence, Union
+
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision: str = 'f2c6d8a4b913'
+down_revision: Union[str, Sequence[str], None] = 'e9a3b7c1d542'
+branch_labels: Union[str, Sequence[str], None] = None
+depends_on: Union[str, Sequence[str], None] = None
+
+
+def _references(tool_calls):
+    for call in tool_calls or []:
+        result = call.get("result") if isinstance(call, dict) else None
+        if isinstance(result, dict) and "_ref" in result:
+            yield result["_ref"]
+
+
+def upgrade() -> None:
+    """Upgrade schema - Add tool_result_refs and tool_results.last_referenced_at."""
+    from app.services.message_archive import decode_messages
+
+    op.add_column('tool_results', sa.Column('last_referenced_at', sa.DateTime(), nullable=True))
+    op.execute("UPDATE tool_results SET last_referenced_at = created_at")
+    with op.batch_alter_table('tool_results') as batch_op:
+        batch_op.alter_column('last_referenced_at', existing_type=sa.DateTime(), nullable=False,
+                              server_default=sa.func.now())
+        batch_op.drop_index('ix_tool_results_created_at')
+        batch_op.create_index('ix_tool_results_last_referenced_at', ['last_referenced_at'])
+    op.create_table(
+        'tool_result_refs',
+        sa.Column('hash', sa.String(length=64), nullable=False),
+        sa.Column('message_id', sa.Integer(), nullable=False),
+        sa.Column('conversation_id', sa.Integer(), nullable=False),
+        sa.ForeignKeyConstraint(['hash'], ['tool_results.hash']),
+        sa.ForeignKeyConstraint(['conversation_id'], ['conversations.id'], ondelete='CASCADE'),
+        sa.PrimaryKeyConstraint('hash', 'message_id')
+    )
+    op.create_index('ix_tool_result_refs_conversation_id', 'tool_result_refs', ['conversation_id'])
+
+    # Backfill the references held by existing hot and archived messages
+    bind = op.get_bind()
+    stored = {row[0] for row in bind.execute(sa.text("SELECT hash FROM tool_results"))}
+    refs = set()
+    messages = sa.table(
+        'messages',
+        sa.column('id', sa.Integer), sa.column('conversation_id', sa.Integer),
+        sa.column('role', sa.String), sa.column('tool_calls', sa.JSON),
+    )
+    for message_id, conversation_id, tool_calls in bind.execute(
+        sa.select(messages.c.id, messages.c.conversation_id, messages.c.tool_calls)
+        .where(messages.c.role == 'assistant', messages.c.tool_calls.is_not(None))
+    ):
+        refs.update((ref, message_id, conversation_id) for ref in _references(tool_calls))
+    for conversation_id, codec, data in bind.execute(sa.text(
+        "SELECT conversation_id, codec, data FROM message_archives"
+    )):
+        for row in decode_messages(codec, data):
+            refs.update((ref, row["id"], conversation_id) for ref in _references(row.get("tool_calls")))
+    rows = [{"hash": h, "message_id": m, "conversation_id": c} for h, m, c in refs if h in stored]
+    if rows:
+        op.bulk_insert(sa.table(
+            'tool_result_refs',
+            sa.column('hash', sa.String), sa.column('message_id', sa.Integer), sa.column('conversation_id', sa.Integer),
+        ), rows)
+
+
+def downgrade() -> None:
+    """Downgrade schema - Remove tool_result_refs and tool_results.last_referenced_at."""
+    op.drop_index('ix_tool_result_refs_conversation_id', table_name='tool_result_refs')
+    op.drop_table('tool_result_refs')
+    with op.batch_alter_table('tool_results') as batch_op:
+        batch_op.drop_index('ix_tool_results_last_referenced_at')
+        batch_op.create_index('ix_tool_results_created_at', ['created_at'])
+        batch_op.drop_column('last_referenced_at')
@@ -3,9 +3,15 @@ Demo authentication endpoints for development
 This provides basic login functionality for testing
 """
 
-from fastapi import APIRouter, HTTPException
+from datetime import datetime
+from fastapi import APIRouter, Depends, HTTPException, status
 from pydantic import BaseModel
+from sqlalchemy.exc import IntegrityError
+from sqlmodel import Session, select
+from app.core.database import get_session
+from app.core.password_hasher import password_hasher, PasswordHasherBusy
 from app.core.security import create_access_token
+from app.models.better_auth_user import BetterAuthUser
 
 router = APIRouter(prefix="/auth", tags=["authentication"])
 
@@ -23,17 +29,62 @@ class LoginResponse(BaseModel):
     user_id: str
 
 
+def _hasher_busy() -> HTTPException:
+    """503 returned when the password hashing queue is full."""
+    return HTTPException(
+        status_code=status.HTTP_503_SERVICE_UNAVAILABLE,
+        detail="Too many authentication requests in progress. Please try again.",
+        headers={"Retry-After": "1"},
+    )
+
+
 @router.post("/login", response_model=LoginResponse)
-async def demo_login(request: LoginRequest):
+async def demo_login(request: LoginRequest, session: Session = Depends(get_session)):
     """
     Demo login endpoint for development.
-    Accepts any email/password and returns a valid JWT token.
+
+    Registered users must present the correct password; their stored hash
+    is transparently re-hashed when it uses outdated parameters.
+    Unregistered emails are still accepted for demo purposes, unless their
+    user ID (the part before "@") belongs to a registered account.
 
     In production, this would validate credentials against Better Auth.
     """
-    # For demo: accept any credentials and create user_id from email
+    # For demo: create user_id from email
     user_id = request.email.split("@")[0]
 
+    account = session.exec(
+        select(BetterAuthUser).where(BetterAuthUser.email == request.email)
+    ).first()
+
+    if account:
+        try:
+            valid, new_hash = await password_hasher.verify_and_update(
+                request.password, account.hashed_password
+            )
+        except PasswordHasherBusy:
+            raise _hasher_busy()
+
+        if not valid:
+            raise HTTPException(
+                status_code=status.HTTP_401_UNAUTHORIZED,
+                detail="Invalid email or password",
+            )
+
+        if new_hash:
+            account.hashed_password = new_hash
+            account.updated_at = datetime.utcnow()
+            session.add(account)
+            session.commit()
+
+        user_id = account.id
+    elif session.get(BetterAuthUser, user_id) is not None:
+        # Same user ID under another domain: never issue a token for a registered account
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail="Invalid email or password",
+        )
+
     # Generate JWT token
     access_token = create_access_token(data={"sub": user_id})
 
@@ -44,16 +95,51 @@ async def demo_login(request: LoginRequest):
 
 
 @router.post("/register", response_model=LoginResponse)
-async def demo_register(request: LoginRequest):
+async def demo_register(request: LoginRequest, session: Session = Depends(get_session)):
     """
     Demo register endpoint for development.
-    Accepts any email/password and returns a valid JWT token.
+    Stores the account with a hashed password and returns a valid JWT token.
 
     In production, this would create a user via Better Auth.
     """
-    # For demo: accept any credentials and create user_id from email
+    # For demo: create user_id from email
     user_id = request.email.split("@")[0]
 
+    existing = session.exec(
+        select(BetterAuthUser).where(BetterAuthUser.email == request.email)
+    ).first()
+    if existing:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email already registered",
+        )
+    if session.get(BetterAuthUser, user_id) is not None:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="User name already taken",
+        )
+
+    try:
+        hashed_password = await password_hasher.hash(request.password)
+    except PasswordHasherBusy:
+        raise _hasher_busy()
+
+    session.add(BetterAuthUser(
+        id=user_id,
+        email=request.email,
+        name=user_id,
+        hashed_password=hashed_password,
+    ))
+    try:
+        session.commit()
+    except IntegrityError:
+        # Lost a race with a concurrent registration of the same email or user ID
+        session.rollback()
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail="Email or user name already registered",
+        )
+
     # Generate JWT token
     access_token = create_access_token(data={"sub": user_id})
 
@@ -5,16 +5,18 @@ Task: T-022, T-024 - Implement chat API endpoint with error handling
 Handles chat messages between users and the AI assistant.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, status
 from pydantic import BaseModel, Field
 from typing import Optional, List, Any, Dict
 from sqlmodel import Session
+from app.core.config import settings
 from app.core.database import get_session
+from app.core.tracing import tracer
 from app.core.auth import get_current_user_id
-from app.services.conversation_service import ConversationService
-from app.services.message_service import MessageService
-from app.services.agent_service import process_chat_message
+from app.core.profiler import profiled, request_profile
+from app.services.chat_unit_of_work import ChatUnitOfWork, complete_in_background
 import logging
+import sys
 
 # Set up logging
 logger = logging.getLogger(__name__)
@@ -22,6 +24,27 @@ logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/api/chat", tags=["chat"])
 
 
+async def process_chat_message(
+    user_id: str,
+    message_content: str,
+    conversation_history: Optional[List[Dict[str, Any]]] = None
+) -> Dict[str, Any]:
+    """
+    Process a message through the AI agent.
+
+    The agent stack (openai, MCP tools) is imported on the first chat
+    request instead of at app startup, keeping cold starts fast for
+    deployments that mostly serve task requests.
+    """
+    from app.services.agent_service import process_chat_message as process_with_agent
+
+    return await process_with_agent(
+        user_id=user_id,
+        message_content=message_content,
+        conversation_history=conversation_history
+    )
+
+
 class ChatRequest(BaseModel):
     """Request body for chat endpoint."""
     message: str = Field(..., min_length=1, max_length=4000, description="User's message")
@@ -38,7 +61,7 @@ class ToolCallInfo(BaseModel):
 class ChatResponse(BaseModel):
     """Response body for chat endpoint."""
     conversation_id: int
-    message_id: int
+    message_id: Optional[int] = Field(None, description="Assistant message ID (None when persistence is deferred)")
     content: str
     tool_calls: Optional[List[ToolCallInfo]] = None
 
@@ -58,10 +81,13 @@ class ErrorResponse(BaseModel):
         401: {"model": ErrorResponse, "description": "Unauthorized"},
         500: {"model": ErrorResponse, "description": "Server error"},
         503: {"model": ErrorResponse, "description": "AI service unavailable"},
-    }
+    },
+    dependencies=[Depends(request_profile)],
 )
+@profiled
 async def chat(
     request: ChatRequest,
+    background_tasks: BackgroundTasks,
     user_id: str = Depends(get_current_user_id),
     session: Session = Depends(get_session)
 ):
@@ -77,6 +103,7 @@ async def chat(
 
     Args:
         request: Chat request with message and optional conversation ID
+        background_tasks: Runs deferred persistence after the response
         user_id: Authenticated user's ID (from JWT)
         session: Database session
 
@@ -87,34 +114,20 @@ async def chat(
         HTTPException: If message processing fails
     """
     try:
-        # Initialize services
-        conv_service = ConversationService(session, user_id)
-        msg_service = MessageService(session)
-
-        # Get or create conversation
-        conversation = conv_service.get_or_create_conversation(request.conversation_id)
-
-        # Auto-generate title from first message if new conversation
-        if conversation.title == "New Conversation" and not request.conversation_id:
-            # Use first 50 chars of message as title
-            title = request.message[:50].strip()
-            if len(request.message) > 50:
-                title += "..."
-            conv_service.update_conversation_title(conversation.id, title)
+        uow = ChatUnitOfWork(session, user_id)
 
-        # Load conversation history for context
-        history = msg_service.get_conversation_history(conversation.id)
-
-        # Save user message
-        user_message = msg_service.create_user_message(conversation.id, request.message)
+        # Transaction 1: conversation, title, user message (and history for context)
+        with tracer.span("chat.begin"):
+            history = uow.begin(request.message, request.conversation_id)
 
         # Process through AI agent
         try:
-            agent_response = await process_chat_message(
-                user_id=user_id,
-                message_content=request.message,
-                conversation_history=history
-            )
+            with tracer.span("chat.agent"):
+                agent_response = await process_chat_message(
+                    user_id=user_id,
+                    message_content=request.message,
+                    conversation_history=history
+                )
         except Exception as agent_error:
             logger.error(f"Agent error: {agent_error}")
             # Provide fallback response
@@ -123,15 +136,20 @@ async def chat(
                 "tool_calls": None
             }
 
-        # Save assistant message
-        assistant_message = msg_service.create_assistant_message(
-            conversation_id=conversation.id,
-            content=agent_response["content"] or "I apologize, I couldn't generate a response.",
-            tool_calls=agent_response.get("tool_calls")
-        )
-
-        # Update conversation timestamp
-        conv_service.update_conversation_timestamp(conversation.id)
+        # Transaction 2: assistant message and conversation timestamp
+        assistant_content = agent_response["content"] or "I apologize, I couldn't generate a response."
+        message_id = None
+        if settings.CHAT_DEFER_PERSISTENCE:
+            background_tasks.add_task(
+                complete_in_background,
+                user_id,
+                uow.conversation_id,
+                assistant_content,
+                agent_response.get("tool_calls")
+            )
+        else:
+            with tracer.span("chat.complete"):
+                message_id = uow.complete(assistant_content, agent_response.get("tool_calls"))
 
         # Format tool calls for response
         tool_calls_info = None
@@ -146,8 +164,8 @@ async def chat(
             ]
 
         return ChatResponse(
-            conversation_id=conversation.id,
-            message_id=assistant_message.id,
+            conversation_id=uow.conversation_id,
+            message_id=message_id,
             content=agent_response["content"] or "",
             tool_calls=tool_calls_info
         )
@@ -165,14 +183,20 @@ async def chat(
 @router.get("/health")
 async def chat_health():
     """Check if chat service is available."""
-    from app.core.config import settings
-
     has_gemini_key = bool(settings.GEMINI_API_KEY)
     has_openai_key = bool(settings.OPENAI_API_KEY)
 
-    return {
+    health = {
         "status": "ok" if (has_gemini_key or has_openai_key) else "degraded",
         "gemini_configured": has_gemini_key,
         "openai_configured": has_openai_key,
         "model": settings.GEMINI_MODEL if has_gemini_key else settings.OPENAI_AGENT_MODEL
     }
+
+    # Provider latency/error stats once the agent has been created; the
+    # agent stack is not imported just to answer this
+    agent_module = sys.modules.get("app.services.agent_service")
+    agent = getattr(agent_module, "agent_service", None)
+    if agent is not None:
+        health["providers"] = agent.llm.stats()
+    return health
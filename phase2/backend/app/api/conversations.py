@@ -5,18 +5,23 @@ Task: T-023 - Add conversation history loading
 Handles conversation listing and message history retrieval.
 """
 
-from fastapi import APIRouter, Depends, HTTPException, status
+from fastapi import APIRouter, BackgroundTasks, Depends, HTTPException, Query, status
 from pydantic import BaseModel
 from typing import List, Optional, Any
 from datetime import datetime
 from sqlmodel import Session
-from app.core.database import get_session
+from app.core.database import get_session, get_read_session
 from app.core.auth import get_current_user_id
-from app.services.conversation_service import ConversationService
+from app.core.responses import FastJSONResponse
+from app.services.conversation_service import ConversationService, purge_conversations
 from app.services.message_service import MessageService
 
 router = APIRouter(prefix="/api/conversations", tags=["conversations"])
 
+# Message history page size (GET /{conversation_id}/messages)
+DEFAULT_PAGE_SIZE = 50
+MAX_PAGE_SIZE = 200
+
 
 class ConversationResponse(BaseModel):
     """Response body for a conversation."""
@@ -50,10 +55,18 @@ class ConversationMessagesResponse(BaseModel):
     total: int
 
 
+class MessagePageResponse(BaseModel):
+    """Response body for one page of conversation messages (newest first)."""
+    conversation_id: int
+    messages: List[MessageResponse]
+    has_more: bool
+    next_before: Optional[int] = None
+
+
 @router.get("", response_model=ConversationsListResponse)
 async def list_conversations(
     user_id: str = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_read_session)
 ):
     """
     List all conversations for the current user.
@@ -62,7 +75,7 @@ async def list_conversations(
 
     Args:
         user_id: Authenticated user's ID (from JWT)
-        session: Database session
+        session: Database session (read replica when configured)
 
     Returns:
         ConversationsListResponse with list of conversations
@@ -92,16 +105,18 @@ async def list_conversations(
 @router.get("/{conversation_id}", response_model=ConversationMessagesResponse)
 async def get_conversation_messages(
     conversation_id: int,
+    expand_tool_results: bool = Query(True, description="Return full tool results instead of digests"),
     user_id: str = Depends(get_current_user_id),
-    session: Session = Depends(get_session)
+    session: Session = Depends(get_read_session)
 ):
     """
     Get all messages for a specific conversation.
 
     Args:
         conversation_id: ID of the conversation
+        expand_tool_results: Whether to replace tool result digests with the full results
         user_id: Authenticated user's ID (from JWT)
-        session: Database session
+        session: Database session (read replica when configured)
 
     Returns:
         ConversationMessagesResponse with conversation details and messages
@@ -120,37 +135,121 @@ async def get_conversation_messages(
             detail=f"Conversation {conversation_id} not found"
         )
 
-    # Get messages
-    messages = msg_service.get_conversation_messages(conversation_id)
+    # Get messages as row dicts and serialize them directly
+    messages = msg_service.get_conversation_message_rows(conversation_id, expand_tool_results)
 
-    return ConversationMessagesResponse(
-        conversation_id=conversation.id,
-        title=conversation.title,
-        messages=[
-            MessageResponse(
-                id=msg.id,
-                role=msg.role,
-                content=msg.content,
-                tool_calls=msg.tool_calls,
-                created_at=msg.created_at
-            )
-            for msg in messages
-        ],
-        total=len(messages)
+    return FastJSONResponse(content={
+        "conversation_id": conversation.id,
+        "title": conversation.title,
+        "messages": messages,
+        "total": len(messages)
+    })
+
+
+@router.get("/{conversation_id}/messages", response_model=MessagePageResponse)
+async def get_message_page(
+    conversation_id: int,
+    before: Optional[int] = Query(None, description="Return messages older than this message ID"),
+    limit: int = Query(DEFAULT_PAGE_SIZE, ge=1, le=MAX_PAGE_SIZE),
+    include_tool_calls: bool = Query(True, description="Include tool_calls payloads"),
+    expand_tool_results: bool = Query(True, description="Return full tool results instead of digests"),
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_read_session)
+):
+    """
+    Get one page of messages, newest first.
+
+    Call without `before` for the latest page, then pass `next_before`
+    from each response to load older messages until `has_more` is false.
+
+    Args:
+        conversation_id: ID of the conversation
+        before: Cursor (ID of the oldest message already loaded)
+        limit: Page size
+        include_tool_calls: Whether to include tool_calls payloads
+        expand_tool_results: Whether to replace tool result digests with the full results
+        user_id: Authenticated user's ID (from JWT)
+        session: Database session (read replica when configured)
+
+    Returns:
+        MessagePageResponse with messages and the cursor for the next page
+
+    Raises:
+        HTTPException 404: If conversation not found or not owned by user
+    """
+    conv_service = ConversationService(session, user_id)
+    if not conv_service.get_conversation_by_id(conversation_id):
+        raise HTTPException(
+            status_code=status.HTTP_404_NOT_FOUND,
+            detail=f"Conversation {conversation_id} not found"
+        )
+
+    messages, has_more = MessageService(session).get_message_page(
+        conversation_id,
+        limit=limit,
+        before=before,
+        include_tool_calls=include_tool_calls,
+        expand_tool_results=expand_tool_results
     )
 
+    return FastJSONResponse(content={
+        "conversation_id": conversation_id,
+        "messages": messages,
+        "has_more": has_more,
+        "next_before": messages[-1]["id"] if has_more else None
+    })
+
+
+@router.delete("")
+async def delete_all_conversations(
+    background_tasks: BackgroundTasks,
+    background: bool = Query(False, description="Purge in the background and return 202"),
+    user_id: str = Depends(get_current_user_id),
+    session: Session = Depends(get_session)
+):
+    """
+    Delete all conversations of the current user and their messages.
+
+    Args:
+        background: Hide the conversations now and delete them in chunks after responding
+        user_id: Authenticated user's ID (from JWT)
+        session: Database session
+
+    Returns:
+        Number of conversations deleted (or scheduled for deletion)
+    """
+    conv_service = ConversationService(session, user_id)
+
+    if background:
+        conversation_ids = conv_service.hide_for_purge()
+        if conversation_ids:
+            background_tasks.add_task(purge_conversations, conversation_ids)
+        return FastJSONResponse(
+            content={"scheduled": len(conversation_ids)},
+            status_code=status.HTTP_202_ACCEPTED
+        )
+
+    return {"deleted": conv_service.delete_all_conversations()}
+
 
 @router.delete("/{conversation_id}")
 async def delete_conversation(
     conversation_id: int,
+    background_tasks: BackgroundTasks,
+    background: bool = Query(False, description="Purge in the background and return 202"),
     user_id: str = Depends(get_current_user_id),
     session: Session = Depends(get_session)
 ):
     """
     Delete a conversation and all its messages.
 
+    With background=true the conversation disappears for the user at once
+    and its messages are deleted in chunks after the response is sent,
+    for conversations too large to delete within a request.
+
     Args:
         conversation_id: ID of the conversation to delete
+        background: Purge in the background and return 202
         user_id: Authenticated user's ID (from JWT)
         session: Database session
 
@@ -162,6 +261,19 @@ async def delete_conversation(
     """
     conv_service = ConversationService(session, user_id)
 
+    if background:
+        conversation_ids = conv_service.hide_for_purge(conversation_id)
+        if not conversation_ids:
+            raise HTTPException(
+                status_code=status.HTTP_404_NOT_FOUND,
+                detail=f"Conversation {conversation_id} not found"
+            )
+        background_tasks.add_task(purge_conversations, conversation_ids)
+        return FastJSONResponse(
+            content={"message": f"Conversation {conversation_id} scheduled for deletion"},
+            status_code=status.HTTP_202_ACCEPTED
+        )
+
     deleted = conv_service.delete_conversation(conversation_id)
     if not deleted:
         raise HTTPException(
@@ -0,0 +1,111 @@
+"""
+Diagnostics endpoints
+Phase V: Monitoring - metrics and runtime diagnostics
+
+Exposes Prometheus metrics and, for admins, a connection pool snapshot
+for sizing pools against the HPA replica range (it includes pool
+settings), the event loop monitor's blocking report (it includes source
+paths and stacks) and the sampling profiler.
+"""
+
+from fastapi import APIRouter, Depends, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+from app.core.auth import require_admin
+from app.core.config import settings
+from app.core.database import get_pool_status
+from app.core.loop_monitor import loop_monitor
+from app.core.metrics import metrics
+from app.core.profiler import ProfileBusy, profile_worker, request_profiles
+
+router = APIRouter(tags=["system"])
+
+
+@router.get("/metrics", response_class=PlainTextResponse)
+async def prometheus_metrics():
+    """Prometheus text exposition of all in-process metrics."""
+    return PlainTextResponse(metrics.render(), media_type="text/plain; version=0.0.4")
+
+
+@router.get("/diagnostics/db-pool")
+async def db_pool_diagnostics(user_id: str = Depends(require_admin)):
+    """
+    Connection pool configuration, usage and checkout telemetry (admins only).
+
+    The counters alone are public on /metrics.
+
+    Args:
+        user_id: Admin user (from JWT)
+
+    Returns:
+        dict: Pool snapshot for this worker process
+    """
+    return get_pool_status()
+
+
+@router.get("/diagnostics/event-loop")
+async def event_loop_diagnostics(user_id: str = Depends(require_admin)):
+    """
+    Event loop lag and the calls that blocked the loop (admins only).
+
+    Returns:
+        dict: Recent lag percentiles and, with LOOP_BLOCKING_DEBUG, the
+        deduplicated blocking call sites of this worker process
+    """
+    return loop_monitor.snapshot()
+
+
+@router.get("/diagnostics/profile", response_class=PlainTextResponse)
+async def sampling_profile(
+    seconds: float = Query(10.0, gt=0, le=settings.PROFILER_MAX_SECONDS),
+    hz: float = Query(100.0, gt=0, le=1000),
+    idle: bool = Query(False, description="Include threads waiting for work"),
+    user_id: str = Depends(require_admin),
+):
+    """
+    Sample the stacks of this worker's threads for a while.
+
+    Args:
+        seconds: Sampling duration
+        hz: Samples per second
+        idle: Include threads waiting for work
+        user_id: Admin user (from JWT)
+
+    Returns:
+        Collapsed stacks ("frame;frame;frame count" per line), for
+        flamegraph.pl, speedscope or inferno
+
+    Raises:
+        HTTPException: 409 if a profile is already running on this worker
+    """
+    try:
+        sampler = await profile_worker(seconds, hz, include_idle=idle)
+    except ProfileBusy as e:
+        raise HTTPException(status_code=status.HTTP_409_CONFLICT, detail=str(e))
+    return PlainTextResponse(
+        sampler.collapsed(),
+        headers={"X-Profile-Samples": str(sampler.samples), "X-Profile-Seconds": f"{sampler.elapsed:.3f}"},
+    )
+
+
+@router.get("/diagnostics/profile/requests/{profile_id}", response_class=PlainTextResponse)
+async def request_profile_result(profile_id: str, user_id: str = Depends(require_admin)):
+    """
+    Profile of a request sent with the X-Profile header.
+
+    Args:
+        profile_id: X-Profile-Id of the response
+        user_id: Admin user (from JWT)
+
+    Returns:
+        Collapsed stacks of the request's endpoint
+
+    Raises:
+        HTTPException: 404 if the profile is unknown or was evicted
+    """
+    profile = request_profiles.get(profile_id)
+    if profile is None:
+        raise HTTPException(status_code=status.HTTP_404_NOT_FOUND, detail="Profile not found")
+    return PlainTextResponse(
+        profile["collapsed"],
+        headers={"X-Profile-Samples": str(profile["samples"]), "X-Profile-Seconds": f"{profile['seconds']:.3f}"},
+    )
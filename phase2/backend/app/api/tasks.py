@@ -5,8 +5,10 @@ Task: T-013 - Create Task API Endpoints
 
 from fastapi import APIRouter, Depends, HTTPException, status
 from sqlmodel import Session
-from app.core.database import get_session
+from app.core.database import get_session, get_read_session
 from app.core.auth import get_current_user_id
+from app.core.profiler import profiled, request_profile
+from app.core.responses import FastJSONResponse
 from app.services.task_service import TaskService
 from app.models.task import Task
 from pydantic import BaseModel
@@ -53,9 +55,10 @@ async def create_task(
         )
 
 
-@router.get("/", response_model=list[Task])
+@router.get("/", response_model=list[Task], dependencies=[Depends(request_profile)])
+@profiled
 async def get_all_tasks(
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     user_id: str = Depends(get_current_user_id)
 ):
     """
@@ -64,13 +67,14 @@ async def get_all_tasks(
     Returns empty list if user has no tasks.
     """
     service = TaskService(session, user_id)
-    return service.get_all_tasks()
+    # Serialize rows directly; response_model still documents the schema
+    return FastJSONResponse(content=service.get_all_task_rows())
 
 
 @router.get("/{task_id}", response_model=Task)
 async def get_task(
     task_id: int,
-    session: Session = Depends(get_session),
+    session: Session = Depends(get_read_session),
     user_id: str = Depends(get_current_user_id)
 ):
     """
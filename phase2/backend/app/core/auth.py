@@ -5,6 +5,7 @@ Task: T-011 - Create Authentication Middleware
 
 from fastapi import Depends, HTTPException, status
 from fastapi.security import HTTPBearer, HTTPAuthorizationCredentials
+from app.core.config import settings
 from app.core.security import verify_token
 
 
@@ -33,7 +34,7 @@ async def get_current_user_id(
     token = credentials.credentials
 
     # Verify and decode token
-    payload = verify_token(token)
+    payload = await verify_token(token)
 
     if payload is None:
         raise HTTPException(
@@ -53,3 +54,24 @@ async def get_current_user_id(
         )
 
     return user_id
+
+
+async def require_admin(user_id: str = Depends(get_current_user_id)) -> str:
+    """
+    Dependency for operator endpoints: the user must be in ADMIN_USER_IDS.
+
+    Args:
+        user_id: Authenticated user's ID
+
+    Returns:
+        str: The user ID
+
+    Raises:
+        HTTPException: 403 if the user is not an admin
+    """
+    if user_id not in settings.ADMIN_USER_IDS:
+        raise HTTPException(
+            status_code=status.HTTP_403_FORBIDDEN,
+            detail="Admin access required",
+        )
+    return user_id
@@ -0,0 +1,165 @@
+"""
+Circuit breaker
+Phase III: fail fast while a dependency is degraded
+
+After failure_threshold consecutive failures the breaker opens and calls
+are refused without touching the dependency. After reset_seconds one
+probe call is let through (half-open): success closes the breaker, a
+failure opens it again for another reset_seconds.
+"""
+
+import threading
+import time
+from typing import Dict
+
+from app.core.metrics import metrics
+
+STATE_CLOSED = "closed"
+STATE_HALF_OPEN = "half_open"
+STATE_OPEN = "open"
+
+BREAKER_STATE = metrics.gauge(
+    "circuit_breaker_state", "Circuit breaker state: 0 closed, 1 half-open, 2 open", ("dependency",)
+)
+BREAKER_TRIPS = metrics.counter(
+    "circuit_breaker_trips_total", "Times a circuit breaker opened", ("dependency",)
+)
+BREAKER_REJECTED = metrics.counter(
+    "circuit_breaker_rejected_total", "Calls refused by an open circuit breaker", ("dependency",)
+)
+
+_STATE_VALUES = {STATE_CLOSED: 0, STATE_HALF_OPEN: 1, STATE_OPEN: 2}
+
+
+class CircuitBreaker:
+    """
+    Consecutive-failure circuit breaker for one dependency.
+    """
+
+    def __init__(self, name: str, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        """
+        Initialize the breaker (closed).
+
+        Args:
+            name: Dependency name, used as the metrics label
+            failure_threshold: Consecutive failures that open the breaker
+            reset_seconds: Time the breaker stays open before a probe call
+        """
+        self.name = name
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._state = STATE_CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        BREAKER_STATE.set(0, dependency=name)
+
+    @property
+    def state(self) -> str:
+        """closed, half_open or open."""
+        with self._lock:
+            if self._state == STATE_OPEN and self._reset_due():
+                return STATE_HALF_OPEN
+            return self._state
+
+    def _reset_due(self) -> bool:
+        return time.monotonic() - self._opened_at >= self.reset_seconds
+
+    def _set_state(self, state: str) -> None:
+        self._state = state
+        BREAKER_STATE.set(_STATE_VALUES[state], dependency=self.name)
+
+    def allow(self) -> bool:
+        """
+        Whether a call may go to the dependency.
+
+        Returns:
+            bool: True when closed, or for the single probe call of a
+            half-open breaker; False while open
+        """
+        with self._lock:
+            if self._state == STATE_CLOSED:
+                return True
+            if self._state == STATE_OPEN and self._reset_due():
+                self._set_state(STATE_HALF_OPEN)
+            if self._state == STATE_HALF_OPEN and not self._probe_in_flight:
+                self._probe_in_flight = True
+                return True
+        BREAKER_REJECTED.inc(dependency=self.name)
+        return False
+
+    def retry_after(self) -> float:
+        """Seconds until an open breaker lets a probe through."""
+        with self._lock:
+            if self._state != STATE_OPEN:
+                return 0.0
+            return max(0.0, self.reset_seconds - (time.monotonic() - self._opened_at))
+
+    def record_success(self) -> None:
+        """Record a successful call; closes a half-open breaker."""
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            if self._state != STATE_CLOSED:
+                self._set_state(STATE_CLOSED)
+
+    def record_failure(self) -> None:
+        """Record a failed call; may open the breaker."""
+        with self._lock:
+            self._failures += 1
+            self._probe_in_flight = False
+            if self._state == STATE_HALF_OPEN or (
+                self._state == STATE_CLOSED and self._failures >= self.failure_threshold
+            ):
+                self._opened_at = time.monotonic()
+                self._set_state(STATE_OPEN)
+                BREAKER_TRIPS.inc(dependency=self.name)
+
+    def release(self) -> None:
+        """Give back a probe slot without an outcome (e.g. the call was cancelled)."""
+        with self._lock:
+            self._probe_in_flight = False
+
+    def reset(self) -> None:
+        """Close the breaker and forget past failures."""
+        with self._lock:
+            self._failures = 0
+            self._probe_in_flight = False
+            self._set_state(STATE_CLOSED)
+
+
+class CircuitBreakerRegistry:
+    """
+    One breaker per dependency name, created on first use.
+    """
+
+    def __init__(self, failure_threshold: int = 5, reset_seconds: float = 30.0):
+        """
+        Initialize the registry.
+
+        Args:
+            failure_threshold: Threshold of the breakers it creates
+            reset_seconds: Open time of the breakers it creates
+        """
+        self.failure_threshold = failure_threshold
+        self.reset_seconds = reset_seconds
+        self._breakers: Dict[str, CircuitBreaker] = {}
+        self._lock = threading.Lock()
+
+    def get(self, name: str) -> CircuitBreaker:
+        """Breaker of a dependency."""
+        with self._lock:
+            breaker = self._breakers.get(name)
+            if breaker is None:
+                breaker = self._breakers[name] = CircuitBreaker(
+                    name, self.failure_threshold, self.reset_seconds
+                )
+            return breaker
+
+    def reset(self) -> None:
+        """Close every breaker."""
+        with self._lock:
+            breakers = list(self._breakers.values())
+        for breaker in breakers:
+            breaker.reset()
@@ -0,0 +1,379 @@
+"""
+Response compression middleware
+Performance: bytes on the wire for large JSON responses
+
+Pure ASGI middleware that compresses responses with zstd, brotli or gzip,
+negotiated from Accept-Encoding. Bodies are compressed only above a
+minimum size: pieces of a streamed body are held back until minimum_size
+bytes have arrived or the body ends, which also covers bodies that an
+inner middleware (e.g. BaseHTTPMiddleware) re-sends in pieces. Past the
+threshold, the rest is compressed chunk by chunk with a flush after each
+chunk, so nothing else is held back until the end.
+brotli and zstd are used when the brotli / zstandard packages are
+installed; gzip is always available.
+
+PrecompressedResponse serves bodies that never change (e.g. the OpenAPI
+schema) from encodings computed once instead of per request.
+"""
+
+import zlib
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+from starlette.datastructures import Headers, MutableHeaders
+from starlette.responses import Response
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import metrics
+
+try:
+    import brotli
+except ImportError:  # pragma: no cover - optional dependency
+    brotli = None
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+
+COMPRESSED_RESPONSES = metrics.counter(
+    "http_compressed_responses_total",
+    "Responses compressed by the compression middleware",
+    ("encoding",),
+)
+COMPRESSION_BYTES = metrics.counter(
+    "http_compression_bytes_total",
+    "Response bytes before (in) and after (out) compression",
+    ("encoding", "direction"),
+)
+
+# Content types that are already compressed or must reach the client unbuffered
+EXCLUDED_CONTENT_TYPES = ("text/event-stream", "image/", "video/", "audio/", "application/zip", "application/gzip")
+
+
+class _StreamCompressor:
+    """Incremental compressor: compress() then flush() per chunk, finish() at the end."""
+
+    def __init__(self, compress: Callable[[bytes], bytes], flush: Callable[[], bytes], finish: Callable[[], bytes]):
+        self.compress = compress
+        self.flush = flush
+        self.finish = finish
+
+
+class Encoder:
+    """A content-coding with one-shot and streaming compression."""
+
+    def __init__(self, name: str, level: int):
+        self.name = name
+        self.level = level
+
+    def compress(self, data: bytes) -> bytes:
+        raise NotImplementedError
+
+    def stream(self) -> _StreamCompressor:
+        raise NotImplementedError
+
+
+class GzipEncoder(Encoder):
+    def compress(self, data: bytes) -> bytes:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return compressor.compress(data) + compressor.flush()
+
+    def stream(self) -> _StreamCompressor:
+        compressor = zlib.compressobj(self.level, zlib.DEFLATED, 31)
+        return _StreamCompressor(
+            compressor.compress,
+            lambda: compressor.flush(zlib.Z_SYNC_FLUSH),
+            compressor.flush,
+        )
+
+
+class BrotliEncoder(Encoder):
+    def compress(self, data: bytes) -> bytes:
+        return brotli.compress(data, quality=self.level)
+
+    def stream(self) -> _StreamCompressor:
+        compressor = brotli.Compressor(quality=self.level)
+        return _StreamCompressor(compressor.process, compressor.flush, compressor.finish)
+
+
+class ZstdEncoder(Encoder):
+    def __init__(self, name: str, level: int):
+        super().__init__(name, level)
+        self._compressor = zstandard.ZstdCompressor(level=level)
+
+    def compress(self, data: bytes) -> bytes:
+        return self._compressor.compress(data)
+
+    def stream(self) -> _StreamCompressor:
+        compressor = zstandard.ZstdCompressor(level=self.level).compressobj()
+        return _StreamCompressor(
+            compressor.compress,
+            lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_BLOCK),
+            lambda: compressor.flush(zstandard.COMPRESSOBJ_FLUSH_FINISH),
+        )
+
+
+def available_encoders(levels: Optional[Dict[str, int]] = None) -> Dict[str, Encoder]:
+    """
+    Build the encoders supported by the installed packages.
+
+    Args:
+        levels: Optional compression level per encoding name
+
+    Returns:
+        dict: Encoding name ("zstd", "br", "gzip") -> Encoder
+    """
+    levels = levels or {}
+    encoders: Dict[str, Encoder] = {"gzip": GzipEncoder("gzip", levels.get("gzip", 6))}
+    if brotli is not None:
+        encoders["br"] = BrotliEncoder("br", levels.get("br", 4))
+    if zstandard is not None:
+        encoders["zstd"] = ZstdEncoder("zstd", levels.get("zstd", 3))
+    return encoders
+
+
+def negotiate(accept_encoding: str, preference: Iterable[str]) -> Optional[str]:
+    """
+    Pick a content-coding from an Accept-Encoding header.
+
+    The highest q-value wins; ties go to the earlier entry in preference.
+    Codings with q=0 are refused, and "*" covers codings not listed.
+
+    Args:
+        accept_encoding: Accept-Encoding request header value
+        preference: Supported encodings in server preference order
+
+    Returns:
+        Optional[str]: Chosen encoding, or None to send the body as is
+    """
+    if not accept_encoding:
+        return None
+
+    weights: Dict[str, float] = {}
+    for part in accept_encoding.split(","):
+        token, _, params = part.strip().partition(";")
+        token = token.strip().lower()
+        if not token:
+            continue
+        q = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                q = float(params[2:])
+            except ValueError:
+                q = 0.0
+        weights[token] = q
+
+    best: Optional[str] = None
+    best_q = 0.0
+    for encoding in preference:
+        q = weights.get(encoding, weights.get("*", 0.0))
+        if q > best_q:
+            best, best_q = encoding, q
+    return best
+
+
+def _compressible(headers: Headers) -> bool:
+    if "content-encoding" in headers:
+        return False
+    content_type = headers.get("content-type", "")
+    return not content_type.startswith(EXCLUDED_CONTENT_TYPES)
+
+
+class CompressionMiddleware:
+    """
+    Compress HTTP responses for clients that accept it.
+
+    Bodies smaller than minimum_size are sent unchanged, whether they
+    arrive in one message or several. Larger streamed bodies are
+    compressed incrementally and flushed per chunk.
+    Responses that already carry a Content-Encoding (including
+    PrecompressedResponse) and event streams pass through untouched.
+    """
+
+    def __init__(
+        self,
+        app: ASGIApp,
+        minimum_size: int = 1024,
+        encodings: Iterable[str] = ("zstd", "br", "gzip"),
+        levels: Optional[Dict[str, int]] = None,
+    ):
+        self.app = app
+        self.minimum_size = minimum_size
+        self.encoders = available_encoders(levels)
+        self.preference: List[str] = [name for name in encodings if name in self.encoders]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self.preference)
+        if encoding is None:
+            await self.app(scope, receive, send)
+            return
+
+        await _CompressedSend(self.encoders[encoding], self.minimum_size, send).run(self.app, scope, receive)
+
+
+class _CompressedSend:
+    """Per-request send wrapper for CompressionMiddleware."""
+
+    def __init__(self, encoder: Encoder, minimum_size: int, send: Send):
+        self.encoder = encoder
+        self.minimum_size = minimum_size
+        self.send = send
+        self.start: Optional[Message] = None
+        self.passthrough = False
+        self.stream: Optional[_StreamCompressor] = None
+        # Body pieces held back until the compression decision
+        self.pending: List[bytes] = []
+        self.pending_size = 0
+
+    async def run(self, app: ASGIApp, scope: Scope, receive: Receive) -> None:
+        await app(scope, receive, self.wrapped_send)
+
+    def _mark_encoded(self, headers: MutableHeaders) -> None:
+        headers["Content-Encoding"] = self.encoder.name
+        headers.add_vary_header("Accept-Encoding")
+        COMPRESSED_RESPONSES.inc(encoding=self.encoder.name)
+
+    def _count(self, size_in: int, size_out: int) -> None:
+        COMPRESSION_BYTES.inc(size_in, encoding=self.encoder.name, direction="in")
+        COMPRESSION_BYTES.inc(size_out, encoding=self.encoder.name, direction="out")
+
+    async def wrapped_send(self, message: Message) -> None:
+        message_type = message["type"]
+
+        if message_type == "http.response.start":
+            self.start = message
+            if not _compressible(Headers(raw=message["headers"])):
+                self.passthrough = True
+                await self.send(message)
+            return
+
+        if message_type != "http.response.body" or self.passthrough:
+            await self.send(message)
+            return
+
+        body = message.get("body", b"")
+        more_body = message.get("more_body", False)
+
+        if self.stream is None and self.start is not None:
+            if more_body and self.pending_size + len(body) < self.minimum_size:
+                # Too little to decide yet: hold the piece back
+                if body:
+                    self.pending.append(body)
+                    self.pending_size += len(body)
+                return
+
+            body = b"".join(self.pending) + body
+            self.pending, self.pending_size = [], 0
+            start, self.start = self.start, None
+            headers = MutableHeaders(raw=start["headers"])
+
+            if not more_body:
+                # Whole body known: compress above the threshold only
+                if len(body) >= self.minimum_size:
+                    compressed = self.encoder.compress(body)
+                    self._count(len(body), len(compressed))
+                    self._mark_encoded(headers)
+                    headers["Content-Length"] = str(len(compressed))
+                    body = compressed
+                await self.send(start)
+                await self.send({"type": "http.response.body", "body": body, "more_body": False})
+                return
+
+            # Past the threshold with more to come: compress incrementally
+            self.stream = self.encoder.stream()
+            self._mark_encoded(headers)
+            del headers["Content-Length"]
+            await self.send(start)
+
+        if self.stream is None:
+            await self.send(message)
+            return
+
+        chunk = self.stream.compress(body)
+        chunk += self.stream.flush() if more_body else self.stream.finish()
+        self._count(len(body), len(chunk))
+        await self.send({"type": "http.response.body", "body": chunk, "more_body": more_body})
+
+
+class PrecompressedResponse(Response):
+    """
+    Response for a fixed body whose encodings are computed once.
+
+    The same instance can be returned for every request: the encoding is
+    picked per request from Accept-Encoding, and each compressed variant
+    is built on first use and reused afterwards.
+    """
+
+    def __init__(
+        self,
+        content: bytes,
+        media_type: Optional[str] = None,
+        encodings: Iterable[str] = ("zstd", "br", "gzip"),
+        levels: Optional[Dict[str, int]] = None,
+    ):
+        super().__init__(content=content, media_type=media_type)
+        self._encoders = available_encoders(levels)
+        self._preference = [name for name in encodings if name in self._encoders]
+        self._variants: Dict[str, bytes] = {}
+
+    def variant(self, encoding: Optional[str]) -> bytes:
+        """
+        Return the body in the given encoding (None for the raw body).
+
+        Args:
+            encoding: Content-coding name or None
+
+        Returns:
+            bytes: Encoded body
+        """
+        if encoding is None:
+            return self.body
+        if encoding not in self._variants:
+            self._variants[encoding] = self._encoders[encoding].compress(self.body)
+        return self._variants[encoding]
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        encoding = negotiate(Headers(scope=scope).get("accept-encoding", ""), self._preference)
+        body = self.variant(encoding)
+
+        headers: List[Tuple[bytes, bytes]] = [
+            (name, value) for name, value in self.raw_headers if name != b"content-length"
+        ]
+        headers.append((b"content-length", str(len(body)).encode("latin-1")))
+        headers.append((b"vary", b"Accept-Encoding"))
+        if encoding is not None:
+            headers.append((b"content-encoding", encoding.encode("latin-1")))
+
+        await send({"type": "http.response.start", "status": self.status_code, "headers": headers})
+        await send({"type": "http.response.body", "body": body})
+
+
+def install_precompressed_openapi(app) -> None:
+    """
+    Serve app.openapi_url from a PrecompressedResponse built on first request.
+
+    Replaces FastAPI's default route, which re-encodes the schema per request.
+
+    Args:
+        app: FastAPI application
+    """
+    from app.core.responses import dumps
+
+    path = app.openapi_url
+    if not path:
+        return
+    app.router.routes[:] = [route for route in app.router.routes if getattr(route, "path", None) != path]
+    cached: Dict[str, PrecompressedResponse] = {}
+
+    async def openapi(request):
+        if "response" not in cached:
+            cached["response"] = PrecompressedResponse(dumps(app.openapi()), media_type="application/json")
+        return cached["response"]
+
+    app.add_route(path, openapi, include_in_schema=False)
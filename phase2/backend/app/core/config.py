@@ -4,24 +4,141 @@ Task: T-003 - Create Backend Environment Configuration
 """
 
 from pydantic_settings import BaseSettings
-from typing import List
+from typing import Dict, List
 
 
 class Settings(BaseSettings):
     """Application settings loaded from environment variables"""
 
     PROJECT_NAME: str = "Todo API"
+    # Components loaded by app.main: full, tasks, chat or analytics
+    APP_PROFILE: str = "full"
     DATABASE_URL: str
+    DATABASE_READ_URL: str = ""  # Optional read replica for read-only endpoints
+    READ_YOUR_WRITES_SECONDS: float = 5.0  # Pin a user to the primary after a write
+
+    # Database connection pool (per process). Size it so that
+    # HPA maxReplicas * (DB_POOL_SIZE + DB_MAX_OVERFLOW) stays below
+    # the Postgres max_connections (10 * 8 = 80 with the defaults).
+    DB_POOL_SIZE: int = 5
+    DB_MAX_OVERFLOW: int = 3
+    DB_POOL_TIMEOUT: float = 10.0  # Seconds to wait for a free connection
+    DB_POOL_RECYCLE: int = 1800  # Seconds before a connection is replaced
+    DB_POOL_PRE_PING: bool = True  # Test connections on checkout (one extra round trip)
+    DB_ECHO: bool = False  # Log every SQL statement
+    # Run create_all at startup. Off by default: the schema is managed by
+    # Alembic (alembic upgrade head) or `python -m app.core.database`.
+    DB_CREATE_TABLES_ON_STARTUP: bool = False
     JWT_SECRET: str
     JWT_ALGORITHM: str = "HS256"
+    # Asymmetric algorithms (RS*/ES*/PS*): verify with a PEM public key or a JWKS URL
+    JWT_PUBLIC_KEY: str = ""
+    JWT_PRIVATE_KEY: str = ""  # Only needed to issue tokens locally
+    JWT_JWKS_URL: str = ""
+    JWT_JWKS_CACHE_SECONDS: int = 300
+    JWT_CACHE_SIZE: int = 10000  # Verified tokens kept in memory (0 disables)
     ACCESS_TOKEN_EXPIRE_MINUTES: int = 30
     CORS_ORIGINS: List[str] = ["http://localhost:3000"]
 
+    # Password hashing. The first scheme hashes new passwords; hashes in the
+    # other schemes (or with fewer bcrypt rounds) are upgraded on login.
+    # "argon2" requires the argon2-cffi package.
+    PASSWORD_SCHEMES: List[str] = ["bcrypt"]
+    BCRYPT_ROUNDS: int = 12
+    PASSWORD_HASH_WORKERS: int = 2  # Threads running hash/verify off the event loop
+    PASSWORD_HASH_QUEUE_LIMIT: int = 32  # Waiting requests before new ones are rejected
+
     # Phase III: AI Configuration
     OPENAI_API_KEY: str = ""  # Get from https://platform.openai.com/api-keys
     OPENAI_AGENT_MODEL: str = "gpt-4o"  # GPT-4 Optimized
     GEMINI_API_KEY: str = ""  # Get from https://aistudio.google.com/app/apikey
     GEMINI_MODEL: str = "gemini-2.5-flash"  # Gemini model
+    GEMINI_BASE_URL: str = "https://generativelanguage.googleapis.com/v1beta/openai/"
+    OPENAI_CHAT_MODEL: str = "gpt-4o-mini"  # Model of the chat agent
+    # Chat agent providers in order of preference; those without an API key
+    # are skipped, and a failing provider hands the request to the next one
+    LLM_PROVIDERS: List[str] = ["openai", "gemini"]
+    LLM_TIMEOUT_SECONDS: float = 60.0
+    LLM_MAX_CONNECTIONS: int = 20  # Per provider, kept alive between requests
+    # Hedging: when a provider hasn't started answering within its recent
+    # LLM_HEDGE_PERCENTILE first-chunk latency, also ask the next provider
+    LLM_HEDGING_ENABLED: bool = False
+    LLM_HEDGE_PERCENTILE: float = 0.95
+    LLM_HEDGE_DELAY_SECONDS: float = 2.0  # Used until LLM_HEDGE_MIN_SAMPLES are known
+    LLM_HEDGE_MIN_SAMPLES: int = 20
+    # Consecutive failures that take a provider out of rotation, and for how long
+    LLM_BREAKER_FAILURE_THRESHOLD: int = 3
+    LLM_BREAKER_RESET_SECONDS: float = 30.0
+    # Scripted "fake" provider for load tests (LLM_PROVIDERS=["fake"])
+    LLM_FAKE_SCRIPT: str = ""  # JSON rules file; empty uses the built-in script
+    LLM_FAKE_FIRST_CHUNK_MS: float = 300.0
+    LLM_FAKE_TOKENS_PER_SECOND: float = 50.0  # 0 streams the rest at once
+    # Cache answers to repeated read-only questions until the user's tasks change
+    AGENT_CACHE_ENABLED: bool = True
+    AGENT_CACHE_TTL_SECONDS: int = 600
+    AGENT_CACHE_MAX_ENTRIES: int = 10000
+    # Answer simple commands ("add buy milk", "complete task 3") without the LLM
+    INTENT_ROUTER_ENABLED: bool = True
+    INTENT_ROUTER_MIN_CONFIDENCE: float = 0.9  # Lower matches go to the LLM
+
+    # Persist the assistant reply after the chat response is sent
+    CHAT_DEFER_PERSISTENCE: bool = False
+    # Messages deleted per statement by background conversation purges
+    CONVERSATION_PURGE_CHUNK_SIZE: int = 1000
+    # Retention job (python -m app.services.retention_service); 0 disables a step
+    MESSAGE_ARCHIVE_AFTER_DAYS: int = 30  # Idle conversations move to the archive tier
+    MESSAGE_RETENTION_DAYS: int = 0  # Idle conversations are deleted; 0 keeps them forever
+    RETENTION_BATCH_SIZE: int = 100  # Conversations handled per query
+    # Tool results larger than this (JSON bytes) are stored once in tool_results
+    # and replaced by a digest in messages.tool_calls; 0 keeps every result inline
+    TOOL_RESULT_INLINE_MAX_BYTES: int = 1024
+    TOOL_RESULT_PREVIEW_CHARS: int = 120  # Longest string kept in a digest
+    # Tool execution policy (MCPServer.execute_tool). Handlers run on
+    # MCP_TOOL_WORKERS threads; keep it <= DB_POOL_SIZE + DB_MAX_OVERFLOW
+    MCP_TOOL_WORKERS: int = 4
+    MCP_TOOL_TIMEOUT_SECONDS: float = 10.0  # Deadline per call, waiting for a slot included
+    MCP_TOOL_TIMEOUTS: Dict[str, float] = {}  # Per-tool deadlines, e.g. {"search_tasks": 5}
+    MCP_TOOL_MAX_CONCURRENCY: int = 8  # Concurrent calls per tool; more wait for a slot
+    MCP_TOOL_CONCURRENCY_LIMITS: Dict[str, int] = {}  # Per-tool caps
+    # Consecutive timeouts/DB errors that open the database circuit breaker,
+    # and how long it fails calls fast before letting a probe through
+    MCP_BREAKER_FAILURE_THRESHOLD: int = 5
+    MCP_BREAKER_RESET_SECONDS: float = 30.0
+    # MCP protocol server (python -m app.mcp_protocol)
+    MCP_SERVER_MAX_PENDING: int = 64  # Calls in progress before new ones are rejected
+    MCP_USER_ID: str = ""  # User of the stdio transport (HTTP uses the bearer token)
+
+    # Response compression (br/zstd need the brotli/zstandard packages)
+    COMPRESSION_ENABLED: bool = True
+    COMPRESSION_MIN_SIZE: int = 1024  # Smaller bodies are sent uncompressed
+    COMPRESSION_ENCODINGS: List[str] = ["zstd", "br", "gzip"]  # Preference order
+    COMPRESSION_GZIP_LEVEL: int = 6
+    COMPRESSION_BROTLI_QUALITY: int = 4
+    COMPRESSION_ZSTD_LEVEL: int = 3
+
+    # Readiness probe: dependency checks run in the background and are cached
+    HEALTH_REFRESH_SECONDS: float = 5.0  # Background refresh interval
+    HEALTH_MAX_AGE_SECONDS: float = 15.0  # Older snapshots are refreshed on read
+    HEALTH_CHECK_TIMEOUT_SECONDS: float = 2.0  # Per-dependency timeout
+    HEALTH_OPENAI_INTERVAL_SECONDS: float = 60.0  # OpenAI is polled less often
+
+    # Event loop monitor (lag metric; stack capture of blocking calls in debug mode)
+    LOOP_MONITOR_ENABLED: bool = True
+    LOOP_MONITOR_INTERVAL_SECONDS: float = 0.1
+    LOOP_BLOCKING_THRESHOLD_MS: float = 100.0  # Lag counted as a blocked loop
+    LOOP_BLOCKING_DEBUG: bool = False  # Capture and report the stacks of blocking calls
+
+    # Sampling profiler (GET /diagnostics/profile, X-Profile request header)
+    ADMIN_USER_IDS: List[str] = []  # Users allowed to profile; empty disables profiling
+    PROFILER_MAX_SECONDS: float = 60.0
+    PROFILER_REQUEST_HZ: float = 1000.0  # Sampling rate of per-request profiles
+    PROFILER_KEEP_REQUESTS: int = 20  # Per-request profiles kept for retrieval
+
+    # Request tracing (sampled responses carry a Server-Timing header)
+    TRACING_SAMPLE_RATE: float = 0.0  # Fraction of requests traced; 0 disables tracing
+    TRACING_HONOR_TRACEPARENT: bool = False  # Also trace requests whose traceparent is sampled
+    TRACING_SERVER_TIMING: bool = True
+    TRACING_OTLP_ENDPOINT: str = ""  # OTLP/HTTP collector, e.g. http://otel-collector:4318
 
     class Config:
         env_file = ".env"
@@ -3,22 +3,230 @@ Database connection and session management
 Task: T-004 - Initialize Database Connection
 """
 
+import threading
+import time
+from fastapi import Depends
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import TimeoutError as PoolTimeoutError
+from sqlalchemy.orm import Session as OrmSession
+from sqlalchemy.pool import QueuePool
 from sqlmodel import create_engine, Session, SQLModel
-from typing import Generator
+from typing import Any, Dict, Generator, Optional
+from app.core.auth import get_current_user_id
 from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.tracing import instrument_sqlalchemy
 from app.models.task import Task  # Import to register with SQLModel metadata
 
 
+# Pool telemetry
+POOL_CHECKOUTS = metrics.counter(
+    "db_pool_checkouts_total", "Connections checked out from the pool"
+)
+POOL_TIMEOUTS = metrics.counter(
+    "db_pool_checkout_timeouts_total", "Checkouts that gave up after DB_POOL_TIMEOUT"
+)
+POOL_WAIT_SECONDS = metrics.histogram(
+    "db_pool_checkout_wait_seconds",
+    "Time spent waiting for a pooled connection (includes opening new ones)",
+    buckets=(0.0005, 0.001, 0.005, 0.01, 0.05, 0.1, 0.5, 1.0, 5.0, 10.0),
+)
+
+
+class InstrumentedQueuePool(QueuePool):
+    """QueuePool that records how long each checkout waited for a connection."""
+
+    def _do_get(self):
+        start = time.perf_counter()
+        try:
+            return super()._do_get()
+        except PoolTimeoutError:
+            POOL_TIMEOUTS.inc()
+            raise
+        finally:
+            POOL_WAIT_SECONDS.observe(time.perf_counter() - start)
+
+
+def engine_options(database_url: str) -> Dict[str, Any]:
+    """
+    Build create_engine() keyword arguments from settings.
+
+    SQLite keeps SQLAlchemy's default pool, which does not accept the
+    Postgres sizing options.
+
+    Args:
+        database_url: Database connection URL
+
+    Returns:
+        dict: Keyword arguments for create_engine()
+    """
+    options: Dict[str, Any] = {
+        "echo": settings.DB_ECHO,
+        "pool_pre_ping": settings.DB_POOL_PRE_PING,
+    }
+    if database_url.startswith("sqlite"):
+        return options
+
+    options.update(
+        poolclass=InstrumentedQueuePool,
+        pool_size=settings.DB_POOL_SIZE,
+        max_overflow=settings.DB_MAX_OVERFLOW,
+        pool_timeout=settings.DB_POOL_TIMEOUT,
+        pool_recycle=settings.DB_POOL_RECYCLE,
+    )
+    return options
+
+
 # Create database engine
-engine = create_engine(
-    settings.DATABASE_URL,
-    echo=True,  # Log SQL statements (set to False in production)
-    pool_pre_ping=True,  # Verify connections before using
+engine = create_engine(settings.DATABASE_URL, **engine_options(settings.DATABASE_URL))
+
+
+# Optional read replica engine (None when DATABASE_READ_URL is not set)
+read_engine: Optional[Engine] = (
+    create_engine(settings.DATABASE_READ_URL, **engine_options(settings.DATABASE_READ_URL))
+    if settings.DATABASE_READ_URL else None
+)
+
+
+# db.query spans for traced requests, on every engine
+instrument_sqlalchemy()
+
+
+@event.listens_for(engine, "checkout")
+def _on_checkout(dbapi_connection, connection_record, connection_proxy):
+    POOL_CHECKOUTS.inc()
+
+
+READ_ROUTING = metrics.counter(
+    "db_read_routing_total", "Read-only sessions by target database", ["target"]
+)
+
+
+class ReadYourWritesTracker:
+    """
+    Remembers which users wrote recently so their reads stay on the primary
+    until the replica has caught up.
+
+    State is per process: a user whose next request lands on another pod
+    may still see replica lag within the window.
+    """
+
+    def __init__(self, window_seconds: float, max_users: int = 10000):
+        self.window_seconds = window_seconds
+        self.max_users = max_users
+        self._last_write: Dict[str, float] = {}
+        self._lock = threading.Lock()
+
+    def record_write(self, user_id: str) -> None:
+        now = time.monotonic()
+        with self._lock:
+            self._last_write[user_id] = now
+            if len(self._last_write) > self.max_users:
+                cutoff = now - self.window_seconds
+                self._last_write = {
+                    uid: ts for uid, ts in self._last_write.items() if ts > cutoff
+                }
+
+    def recently_wrote(self, user_id: str) -> bool:
+        last = self._last_write.get(user_id)
+        return last is not None and time.monotonic() - last < self.window_seconds
+
+
+read_your_writes = ReadYourWritesTracker(settings.READ_YOUR_WRITES_SECONDS)
+
+
+def bind_user(session: Session, user_id: str) -> None:
+    """
+    Tag a session with the user whose data it modifies, so commits that
+    wrote anything pin that user's reads to the primary.
+
+    Args:
+        session: Database session
+        user_id: Current user's ID
+    """
+    session.info["user_id"] = user_id
+
+
+@event.listens_for(OrmSession, "after_flush")
+def _mark_session_wrote(session, flush_context):
+    session.info["wrote"] = True
+
+
+@event.listens_for(OrmSession, "after_commit")
+def _record_user_write(session):
+    if session.info.pop("wrote", False) and "user_id" in session.info:
+        read_your_writes.record_write(session.info["user_id"])
+
+
+@event.listens_for(OrmSession, "after_rollback")
+def _discard_session_write(session):
+    session.info.pop("wrote", None)
+
+
+def read_bind(user_id: str, primary: Optional[Engine] = None) -> Engine:
+    """
+    Choose the engine for a read-only query.
+
+    Args:
+        user_id: User the read is performed for
+        primary: Primary engine to fall back to (default: engine)
+
+    Returns:
+        Engine: The replica, unless none is configured or the user
+        wrote within READ_YOUR_WRITES_SECONDS
+    """
+    if read_engine is None or read_your_writes.recently_wrote(user_id):
+        READ_ROUTING.inc(target="primary")
+        return primary if primary is not None else engine
+    READ_ROUTING.inc(target="replica")
+    return read_engine
+
+
+def get_pool_status() -> Dict[str, Any]:
+    """
+    Snapshot of the connection pool for diagnostics.
+
+    Returns:
+        dict: Pool configuration, current usage and checkout telemetry
+    """
+    pool = engine.pool
+    is_queue_pool = isinstance(pool, QueuePool)
+    wait_count = POOL_WAIT_SECONDS.count()
+
+    return {
+        "pool_class": type(pool).__name__,
+        "pool_size": pool.size() if is_queue_pool else None,
+        "max_overflow": settings.DB_MAX_OVERFLOW if is_queue_pool else None,
+        "timeout_seconds": settings.DB_POOL_TIMEOUT if is_queue_pool else None,
+        "recycle_seconds": settings.DB_POOL_RECYCLE if is_queue_pool else None,
+        "pre_ping": settings.DB_POOL_PRE_PING,
+        "checked_out": pool.checkedout() if is_queue_pool else None,
+        "checked_in": pool.checkedin() if is_queue_pool else None,
+        "overflow_in_use": max(0, pool.overflow()) if is_queue_pool else None,
+        "checkouts_total": int(POOL_CHECKOUTS.value()),
+        "checkout_timeouts_total": int(POOL_TIMEOUTS.value()),
+        "checkout_wait_avg_ms": (
+            round(POOL_WAIT_SECONDS.sum() / wait_count * 1000, 3) if wait_count else 0.0
+        ),
+    }
+
+
+metrics.gauge(
+    "db_pool_connections_in_use", "Connections currently checked out",
+    callback=lambda: get_pool_status()["checked_out"] or 0,
+)
+metrics.gauge(
+    "db_pool_overflow_in_use", "Connections open beyond DB_POOL_SIZE",
+    callback=lambda: get_pool_status()["overflow_in_use"] or 0,
 )
 
 
 def create_db_and_tables():
     """Create all database tables based on SQLModel metadata"""
+    # Import every model so that create_all sees all tables
+    from app.models import better_auth_user, conversation, message, message_archive, tool_result, user  # noqa: F401
+
     SQLModel.metadata.create_all(engine)
 
 
@@ -32,3 +240,25 @@ def get_session() -> Generator[Session, None, None]:
     """
     with Session(engine) as session:
         yield session
+
+
+def get_read_session(
+    user_id: str = Depends(get_current_user_id)
+) -> Generator[Session, None, None]:
+    """
+    Dependency for read-only endpoints: a session on the read replica
+    (or the primary, see read_bind).
+
+    Args:
+        user_id: Authenticated user's ID (from JWT)
+
+    Yields:
+        Session: SQLModel database session
+    """
+    with Session(read_bind(user_id)) as session:
+        yield session
+
+
+if __name__ == "__main__":
+    # Create tables without starting the app: python -m app.core.database
+    create_db_and_tables()
@@ -0,0 +1,302 @@
+"""
+Dependency health monitor
+Phase IV: Kubernetes liveness and readiness probes
+
+Dependency checks (database, Kafka producer, OpenAI) run in a background
+loop and their results are cached, so readiness probes read an in-memory
+snapshot instead of opening a DB connection per probe. A slow database
+then costs one connection per refresh per process, not one per probe.
+
+A sync check that times out keeps running in its thread (threads cannot
+be cancelled) and holds its connection. It is not started again until
+that thread returns; meanwhile the check is reported as failing, so a
+hung database cannot exhaust the pool through repeated health checks.
+"""
+
+import asyncio
+import inspect
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Any, Awaitable, Callable, Dict, Optional, Union
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+CheckFunction = Callable[[], Union[None, str, Awaitable[Optional[str]]]]
+
+# Status reported for a check that has not run or is turned off
+STATUS_PENDING = "pending"
+STATUS_DISABLED = "disabled"
+
+DEPENDENCY_UP = metrics.gauge(
+    "health_dependency_up",
+    "1 if the last check of a dependency succeeded, else 0",
+    ("dependency",),
+)
+CHECK_SECONDS = metrics.histogram(
+    "health_check_seconds",
+    "Duration of dependency health checks",
+    ("dependency",),
+)
+
+
+class SkipCheck(Exception):
+    """Raised by a check whose dependency is not configured."""
+
+
+class _Check:
+    """A registered dependency check and its last result."""
+
+    def __init__(self, name: str, func: CheckFunction, critical: bool, interval: Optional[float]):
+        self.name = name
+        self.func = func
+        self.critical = critical
+        self.interval = interval
+        self.last_run: Optional[float] = None
+        self.result: Dict[str, Any] = {"status": STATUS_PENDING, "critical": critical}
+        # Thread of a sync check that is still running, and when it started
+        self.in_flight: Optional[asyncio.Future] = None
+        self.in_flight_since: float = 0.0
+
+    def still_running(self) -> bool:
+        """Whether a previous run of this sync check has not returned yet."""
+        return (
+            self.in_flight is not None
+            and not self.in_flight.done()
+            and self.in_flight.get_loop() is asyncio.get_running_loop()
+        )
+
+    def start_thread(self) -> asyncio.Future:
+        """Run the sync check in a worker thread, remembering it until it returns."""
+        future = asyncio.ensure_future(asyncio.to_thread(self.func))
+        # Its outcome is not awaited after a timeout
+        future.add_done_callback(lambda f: f.cancelled() or f.exception())
+        self.in_flight = future
+        self.in_flight_since = time.monotonic()
+        return future
+
+
+class HealthMonitor:
+    """
+    Caches dependency health for readiness probes.
+
+    Checks are refreshed every refresh_seconds by start()'s background loop.
+    get_status() returns the cached snapshot while it is younger than
+    max_age_seconds; otherwise (no background loop, e.g. serverless) it runs
+    a single refresh that concurrent callers share.
+    """
+
+    def __init__(
+        self,
+        refresh_seconds: float = 5.0,
+        max_age_seconds: float = 15.0,
+        timeout_seconds: float = 2.0,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            refresh_seconds: Interval of the background refresh loop
+            max_age_seconds: Age after which the snapshot is refreshed on read
+            timeout_seconds: Per-check timeout
+        """
+        self.refresh_seconds = refresh_seconds
+        self.max_age_seconds = max_age_seconds
+        self.timeout_seconds = timeout_seconds
+        self._checks: Dict[str, _Check] = {}
+        self._checked_at: Optional[float] = None
+        self._checked_at_wall: Optional[datetime] = None
+        self._refreshing: Optional[asyncio.Task] = None
+        self._loop_task: Optional[asyncio.Task] = None
+
+    def register(
+        self,
+        name: str,
+        func: CheckFunction,
+        critical: bool = True,
+        interval: Optional[float] = None,
+    ) -> None:
+        """
+        Register a dependency check.
+
+        The check passes if it returns without raising. Sync checks run in a
+        worker thread. A check may raise SkipCheck when its dependency is not
+        configured, and may return a string to report as its detail.
+
+        Args:
+            name: Dependency name (e.g. "database")
+            func: Sync or async check callable
+            critical: Whether a failure makes the service not ready
+            interval: Minimum seconds between runs (defaults to every refresh)
+        """
+        self._checks[name] = _Check(name, func, critical, interval)
+
+    async def _run_check(self, check: _Check, now: float) -> None:
+        if check.interval is not None and check.last_run is not None and now - check.last_run < check.interval:
+            return
+        check.last_run = now
+
+        start = time.perf_counter()
+        result: Dict[str, Any] = {"critical": check.critical}
+        try:
+            if inspect.iscoroutinefunction(check.func):
+                detail = await asyncio.wait_for(check.func(), self.timeout_seconds)
+            elif check.still_running():
+                raise RuntimeError(
+                    f"previous check still running after {time.monotonic() - check.in_flight_since:.0f}s"
+                )
+            else:
+                # shield: a timeout stops the wait, the thread keeps running
+                detail = await asyncio.wait_for(asyncio.shield(check.start_thread()), self.timeout_seconds)
+            result["status"] = "ok"
+            if detail:
+                result["detail"] = detail
+        except SkipCheck as e:
+            result["status"] = STATUS_DISABLED
+            if str(e):
+                result["detail"] = str(e)
+        except asyncio.TimeoutError:
+            result["status"] = "failed"
+            result["error"] = f"timed out after {self.timeout_seconds:g}s"
+        except Exception as e:
+            result["status"] = "failed"
+            result["error"] = str(e) or type(e).__name__
+
+        elapsed = time.perf_counter() - start
+        result["latency_ms"] = round(elapsed * 1000, 2)
+        check.result = result
+
+        if result["status"] != STATUS_DISABLED:
+            CHECK_SECONDS.observe(elapsed, dependency=check.name)
+            DEPENDENCY_UP.set(1 if result["status"] == "ok" else 0, dependency=check.name)
+            if result["status"] == "failed":
+                logger.warning(f"Health check {check.name} failed: {result['error']}")
+
+    async def refresh(self) -> None:
+        """Run all due checks concurrently and update the snapshot."""
+        now = time.monotonic()
+        await asyncio.gather(*(self._run_check(check, now) for check in self._checks.values()))
+        self._checked_at = time.monotonic()
+        self._checked_at_wall = datetime.utcnow()
+
+    async def _refresh_once(self) -> None:
+        # Share one in-flight refresh between concurrent callers
+        if (
+            self._refreshing is None
+            or self._refreshing.done()
+            or self._refreshing.get_loop() is not asyncio.get_running_loop()
+        ):
+            self._refreshing = asyncio.ensure_future(self.refresh())
+        await asyncio.shield(self._refreshing)
+
+    def is_fresh(self) -> bool:
+        """Whether the cached snapshot is younger than max_age_seconds."""
+        return self._checked_at is not None and time.monotonic() - self._checked_at < self.max_age_seconds
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Return the cached status without running any checks.
+
+        Returns:
+            dict: ready flag, snapshot age and per-dependency results
+        """
+        checks = {name: dict(check.result) for name, check in self._checks.items()}
+        ready = self._checked_at is not None and all(
+            result["status"] in ("ok", STATUS_DISABLED)
+            for result in checks.values()
+            if result["critical"]
+        )
+        return {
+            "ready": ready,
+            "checked_at": self._checked_at_wall.isoformat() + "Z" if self._checked_at_wall else None,
+            "age_seconds": round(time.monotonic() - self._checked_at, 3) if self._checked_at is not None else None,
+            "checks": checks,
+        }
+
+    async def get_status(self) -> Dict[str, Any]:
+        """
+        Return the cached status, refreshing it first if it is stale.
+
+        Returns:
+            dict: Same as snapshot()
+        """
+        if not self.is_fresh():
+            await self._refresh_once()
+        return self.snapshot()
+
+    async def _loop(self) -> None:
+        while True:
+            try:
+                await self._refresh_once()
+            except Exception as e:
+                logger.exception(f"Health refresh failed: {e}")
+            await asyncio.sleep(self.refresh_seconds)
+
+    async def start(self) -> None:
+        """Start the background refresh loop (idempotent)."""
+        if self._loop_task is None or self._loop_task.done():
+            self._loop_task = asyncio.create_task(self._loop())
+
+    async def stop(self) -> None:
+        """Stop the background refresh loop."""
+        if self._loop_task is not None:
+            self._loop_task.cancel()
+            try:
+                await self._loop_task
+            except asyncio.CancelledError:
+                pass
+            self._loop_task = None
+
+
+def check_database() -> None:
+    """Run SELECT 1 on a pooled primary connection."""
+    from sqlalchemy import text
+    from app.core.database import engine
+
+    with engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+def check_read_replica() -> None:
+    """Run SELECT 1 on the read replica, if one is configured."""
+    from sqlalchemy import text
+    from app.core.database import read_engine
+
+    if read_engine is None:
+        raise SkipCheck("no read replica configured")
+    with read_engine.connect() as connection:
+        connection.execute(text("SELECT 1"))
+
+
+async def check_kafka_producer() -> None:
+    """Check the Kafka producer is connected (no broker round trip)."""
+    from app.services.event_service import EventService
+
+    if os.getenv('KAFKA_ENABLED', 'false').lower() != 'true':
+        raise SkipCheck("KAFKA_ENABLED is false")
+    service = EventService._instance
+    if service is None:
+        raise SkipCheck("producer not started yet")
+    if not service.enabled or not service._initialized:
+        raise RuntimeError("producer is not connected")
+
+
+async def check_openai() -> str:
+    """Check the OpenAI API answers (any HTTP response below 500)."""
+    import httpx
+    from app.core.config import settings
+
+    if not settings.OPENAI_API_KEY:
+        raise SkipCheck("OPENAI_API_KEY is not set")
+    base_url = os.getenv("OPENAI_BASE_URL", "https://api.openai.com/v1").rstrip("/")
+    async with httpx.AsyncClient(timeout=settings.HEALTH_CHECK_TIMEOUT_SECONDS) as client:
+        response = await client.get(
+            f"{base_url}/models",
+            headers={"Authorization": f"Bearer {settings.OPENAI_API_KEY}"},
+        )
+    if response.status_code >= 500:
+        raise RuntimeError(f"HTTP {response.status_code}")
+    return f"HTTP {response.status_code}"
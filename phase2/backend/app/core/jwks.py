@@ -0,0 +1,105 @@
+"""
+JWKS key cache
+Phase II: Authentication with asymmetric keys
+
+Fetches and caches a JSON Web Key Set for verifying RS*/ES*/PS* tokens
+issued by an external identity provider (e.g. Better Auth).
+
+Fetches run on the event loop with httpx.AsyncClient, so a slow provider
+only delays the requests that need the keys. Only one fetch runs at a
+time: requests arriving while the keys are loaded wait for that fetch
+instead of starting their own.
+"""
+
+import asyncio
+import logging
+import time
+from typing import Any, Dict, Optional
+import httpx
+
+logger = logging.getLogger(__name__)
+
+
+class JWKSCache:
+    """
+    JWKS fetched from a URL and reused for ttl_seconds.
+    A forced refresh (for rotated keys) is limited to one per
+    min_refresh_seconds so bad tokens cannot hammer the provider.
+    """
+
+    def __init__(
+        self,
+        url: str,
+        ttl_seconds: float = 300,
+        min_refresh_seconds: float = 30,
+        transport: Optional[httpx.AsyncBaseTransport] = None,
+    ):
+        self.url = url
+        self.ttl_seconds = ttl_seconds
+        self.min_refresh_seconds = min_refresh_seconds
+        self.transport = transport
+        self._jwks: Optional[Dict[str, Any]] = None
+        self._fetched_at = 0.0
+        self._loading: Optional[asyncio.Future] = None
+
+    async def _fetch(self) -> Dict[str, Any]:
+        async with httpx.AsyncClient(timeout=5.0, transport=self.transport) as client:
+            response = await client.get(self.url)
+        response.raise_for_status()
+        # Raises ValueError for a body that isn't JSON, e.g. a proxy's error page
+        jwks = response.json()
+        if not isinstance(jwks, dict) or not isinstance(jwks.get("keys"), list):
+            raise ValueError("response is not a JWKS document")
+        self._jwks = jwks
+        self._fetched_at = time.monotonic()
+        logger.info(f"Loaded {len(self._jwks.get('keys', []))} keys from {self.url}")
+        return self._jwks
+
+    def _loading_here(self) -> bool:
+        """Whether a fetch is in flight on the running loop."""
+        return (
+            self._loading is not None
+            and not self._loading.done()
+            and self._loading.get_loop() is asyncio.get_running_loop()
+        )
+
+    async def _load(self) -> Dict[str, Any]:
+        """Fetch the key set, or join the fetch already in flight."""
+        if not self._loading_here():
+            self._loading = asyncio.ensure_future(self._fetch())
+            # Retrieved here too, so a failure nobody awaited isn't logged as unhandled
+            self._loading.add_done_callback(lambda f: f.cancelled() or f.exception())
+        # A cancelled request must not cancel the fetch others are waiting on
+        return await asyncio.shield(self._loading)
+
+    async def get(self) -> Dict[str, Any]:
+        """
+        Return the cached key set, fetching it when missing or stale.
+
+        Returns:
+            dict: JWKS document ({"keys": [...]})
+
+        Raises:
+            httpx.HTTPError: If the key set could not be fetched
+            ValueError: If the response is not a JWKS document
+        """
+        if self._jwks is None or time.monotonic() - self._fetched_at > self.ttl_seconds:
+            return await self._load()
+        return self._jwks
+
+    async def refresh(self) -> bool:
+        """
+        Re-fetch the key set after a verification failure.
+
+        Returns:
+            bool: True if the key set was re-fetched
+        """
+        recent = self._jwks is not None and time.monotonic() - self._fetched_at < self.min_refresh_seconds
+        if recent and not self._loading_here():
+            return False
+        try:
+            await self._load()
+        except (httpx.HTTPError, ValueError) as e:
+            logger.error(f"Failed to refresh JWKS from {self.url}: {e}")
+            return False
+        return True
@@ -0,0 +1,291 @@
+"""
+Event loop monitor
+Phase V: Monitoring - event loop lag and blocking calls
+
+Routes are async but much of their work (SQLModel sessions, bcrypt) is
+synchronous, so a slow call stalls every request on the worker. The
+monitor measures this continuously: a ticker sleeps
+LOOP_MONITOR_INTERVAL_SECONDS and records how late it wakes up as
+event_loop_lag_seconds.
+
+With LOOP_BLOCKING_DEBUG, a watchdog thread also captures the stack of
+the event loop thread whenever the ticker is overdue by
+LOOP_BLOCKING_THRESHOLD_MS. Stacks are deduplicated by the call site
+that blocked (the innermost frame of our own code, not the stdlib or an
+installed package): each new offender is logged once with its stack,
+and GET /diagnostics/event-loop lists all of them with counts and times.
+"""
+
+import asyncio
+import logging
+import os
+import sys
+import sysconfig
+import threading
+import time
+import traceback
+from collections import deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+LOOP_LAG_SECONDS = metrics.histogram(
+    "event_loop_lag_seconds", "How late the loop monitor's timer fired",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+LOOP_BLOCKED = metrics.counter(
+    "event_loop_blocked_total", "Times the event loop was blocked for longer than LOOP_BLOCKING_THRESHOLD_MS"
+)
+
+# Frames kept per captured stack
+MAX_STACK_FRAMES = 30
+
+# Frames from these directories are library code, not call sites of ours
+_LIBRARY_PATHS = tuple(
+    os.path.normcase(os.path.realpath(path)) + os.sep
+    for path in {sysconfig.get_path(name) for name in ("stdlib", "platstdlib", "purelib", "platlib")}
+    if path
+)
+
+
+def _is_own_frame(frame: traceback.FrameSummary) -> bool:
+    if frame.filename.startswith("<"):
+        # Frozen stdlib modules and generated code (e.g. SQLAlchemy's decorators)
+        return False
+    filename = os.path.normcase(os.path.realpath(frame.filename))
+    return not filename.startswith(_LIBRARY_PATHS) and filename != os.path.normcase(os.path.realpath(__file__))
+
+
+def _location(frame: traceback.FrameSummary) -> str:
+    return f"{frame.filename}:{frame.lineno} in {frame.name}"
+
+
+def offender_key(stack: List[traceback.FrameSummary]) -> Tuple[str, str]:
+    """
+    Identify a blocking stack by where it blocked.
+
+    Args:
+        stack: Frames, outermost first
+
+    Returns:
+        Tuple of the innermost frame of our own code (the call site to fix)
+        and the innermost frame overall (what it was waiting on)
+    """
+    own = next((frame for frame in reversed(stack) if _is_own_frame(frame)), None)
+    innermost = _location(stack[-1]) if stack else "<unknown>"
+    return (_location(own) if own else "<library code>", innermost)
+
+
+class BlockingReport:
+    """
+    Deduplicated stacks of callbacks that blocked the event loop.
+    """
+
+    def __init__(self, max_offenders: int = 100):
+        """
+        Initialize the report.
+
+        Args:
+            max_offenders: Distinct call sites kept; later new ones are
+                counted but not stored
+        """
+        self.max_offenders = max_offenders
+        self._offenders: Dict[Tuple[str, str], Dict[str, Any]] = {}
+        self.dropped = 0
+        self._lock = threading.Lock()
+
+    def record(self, stack: List[traceback.FrameSummary], blocked_seconds: float) -> bool:
+        """
+        Add one blocking episode.
+
+        Args:
+            stack: Stack of the loop thread while it was blocked
+            blocked_seconds: How long the loop was blocked
+
+        Returns:
+            bool: True if the call site was not in the report yet
+        """
+        key = offender_key(stack)
+        now = time.time()
+        with self._lock:
+            entry = self._offenders.get(key)
+            if entry is None:
+                if len(self._offenders) >= self.max_offenders:
+                    self.dropped += 1
+                    return False
+                self._offenders[key] = {
+                    "call_site": key[0],
+                    "blocked_in": key[1],
+                    "count": 1,
+                    "total_seconds": blocked_seconds,
+                    "max_seconds": blocked_seconds,
+                    "first_seen": now,
+                    "last_seen": now,
+                    "stack": traceback.format_list(stack[-MAX_STACK_FRAMES:]),
+                }
+                return True
+            entry["count"] += 1
+            entry["total_seconds"] += blocked_seconds
+            entry["max_seconds"] = max(entry["max_seconds"], blocked_seconds)
+            entry["last_seen"] = now
+            return False
+
+    def offenders(self) -> List[Dict[str, Any]]:
+        """Offenders, the most total blocking time first."""
+        with self._lock:
+            entries = [dict(entry) for entry in self._offenders.values()]
+        return sorted(entries, key=lambda entry: entry["total_seconds"], reverse=True)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._offenders.clear()
+            self.dropped = 0
+
+
+class LoopMonitor:
+    """
+    Measures event loop lag and, in debug mode, finds what blocks the loop.
+    """
+
+    def __init__(
+        self,
+        interval_seconds: float = 0.1,
+        threshold_seconds: float = 0.1,
+        capture_stacks: bool = False,
+        window: int = 600,
+    ):
+        """
+        Initialize the monitor.
+
+        Args:
+            interval_seconds: Ticker sleep; lag is how late it wakes up
+            threshold_seconds: Lag counted as blocking (and captured)
+            capture_stacks: Run the watchdog thread that captures stacks
+            window: Recent lag samples kept for snapshot()
+        """
+        self.interval = interval_seconds
+        self.threshold = threshold_seconds
+        self.capture_stacks = capture_stacks
+        self.report = BlockingReport()
+        self._lags: Deque[float] = deque(maxlen=window)
+        self._task: Optional[asyncio.Task] = None
+        self._watchdog: Optional[threading.Thread] = None
+        self._stopping = threading.Event()
+        self._loop_thread: Optional[int] = None
+        # Start of the current ticker sleep; read by the watchdog
+        self._tick_started: Optional[float] = None
+        # (tick start, stack) captured by the watchdog during that tick
+        self._captured: Optional[Tuple[float, List[traceback.FrameSummary]]] = None
+
+    async def _tick(self) -> None:
+        while True:
+            started = time.monotonic()
+            self._tick_started = started
+            await asyncio.sleep(self.interval)
+            lag = max(0.0, time.monotonic() - started - self.interval)
+            self._lags.append(lag)
+            LOOP_LAG_SECONDS.observe(lag)
+            if lag >= self.threshold:
+                LOOP_BLOCKED.inc()
+                captured = self._captured
+                if captured is not None and captured[0] == started:
+                    self._report(captured[1], lag)
+            self._captured = None
+
+    def _report(self, stack: List[traceback.FrameSummary], lag: float) -> None:
+        if self.report.record(stack, lag):
+            call_site, blocked_in = offender_key(stack)
+            logger.warning(
+                f"Event loop blocked for {lag * 1000:.0f} ms at {call_site} (in {blocked_in})\n"
+                + "".join(traceback.format_list(stack[-MAX_STACK_FRAMES:]))
+            )
+
+    def _watch(self) -> None:
+        # Poll a few times per threshold so short blocks are caught mid-call
+        poll = max(self.threshold / 4, 0.005)
+        captured_for = None
+        while not self._stopping.wait(poll):
+            started = self._tick_started
+            if started is None or started == captured_for:
+                continue
+            if time.monotonic() - started - self.interval < self.threshold:
+                continue
+            frame = sys._current_frames().get(self._loop_thread)
+            if frame is None:
+                continue
+            self._captured = (started, traceback.extract_stack(frame))
+            captured_for = started
+
+    async def start(self) -> None:
+        """Start the ticker (and the watchdog in debug mode) on the running loop."""
+        if self._task is not None and not self._task.done() and self._task.get_loop() is asyncio.get_running_loop():
+            return
+        self._loop_thread = threading.get_ident()
+        self._tick_started = None
+        self._captured = None
+        self._task = asyncio.create_task(self._tick())
+        if self.capture_stacks and (self._watchdog is None or not self._watchdog.is_alive()):
+            self._stopping.clear()
+            self._watchdog = threading.Thread(target=self._watch, name="loop-watchdog", daemon=True)
+            self._watchdog.start()
+
+    async def stop(self) -> None:
+        """Stop monitoring and log the blocking report, if any."""
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
+        if self._watchdog is not None:
+            self._stopping.set()
+            self._watchdog.join(timeout=1.0)
+            self._watchdog = None
+        offenders = self.report.offenders()
+        if offenders:
+            logger.warning("Event loop blocking report:\n" + "\n".join(
+                f"  {o['count']:5d}x  total {o['total_seconds'] * 1000:8.0f} ms  max {o['max_seconds'] * 1000:6.0f} ms  "
+                f"{o['call_site']} (in {o['blocked_in']})"
+                for o in offenders
+            ))
+
+    def snapshot(self) -> Dict[str, Any]:
+        """
+        Recent lag and the blocking report.
+
+        Returns:
+            dict: Settings, lag p50/p99/max in ms over the recent window,
+            and the offenders (debug mode only)
+        """
+        lags = sorted(self._lags)
+
+        def percentile(q: float) -> Optional[float]:
+            if not lags:
+                return None
+            return round(lags[min(len(lags) - 1, int(len(lags) * q))] * 1000, 3)
+
+        return {
+            "running": self._task is not None and not self._task.done(),
+            "interval_ms": self.interval * 1000,
+            "threshold_ms": self.threshold * 1000,
+            "capture_stacks": self.capture_stacks,
+            "samples": len(lags),
+            "lag_p50_ms": percentile(0.50),
+            "lag_p99_ms": percentile(0.99),
+            "lag_max_ms": round(lags[-1] * 1000, 3) if lags else None,
+            "blocked_total": int(LOOP_BLOCKED.value()),
+            "offenders": self.report.offenders(),
+            "offenders_dropped": self.report.dropped,
+        }
+
+
+# Global loop monitor (one per worker process)
+loop_monitor = LoopMonitor(
+    interval_seconds=settings.LOOP_MONITOR_INTERVAL_SECONDS,
+    threshold_seconds=settings.LOOP_BLOCKING_THRESHOLD_MS / 1000,
+    capture_stacks=settings.LOOP_BLOCKING_DEBUG,
+)
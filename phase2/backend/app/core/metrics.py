@@ -0,0 +1,220 @@
+"""
+In-process metrics registry
+Phase V: Monitoring - Prometheus metrics exposition
+
+Minimal counters, gauges and histograms rendered in the Prometheus text
+format at GET /metrics. Kept dependency-free so every pod can export
+metrics without pulling in a client library.
+"""
+
+import threading
+from typing import Callable, Dict, Iterable, List, Optional, Tuple
+
+
+# Default latency buckets in seconds
+DEFAULT_BUCKETS = (0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+LabelValues = Tuple[str, ...]
+
+
+def _format_labels(names: Iterable[str], values: Iterable[str], extra: str = "") -> str:
+    """Render a Prometheus label set, e.g. {tool="list_tasks",le="0.1"}."""
+    parts = [f'{name}="{value}"' for name, value in zip(names, values)]
+    if extra:
+        parts.append(extra)
+    return "{" + ",".join(parts) + "}" if parts else ""
+
+
+class _Metric:
+    """Base class for a metric family with optional labels."""
+
+    kind = "untyped"
+
+    def __init__(self, name: str, description: str, labelnames: Iterable[str] = ()):
+        self.name = name
+        self.description = description
+        self.labelnames: Tuple[str, ...] = tuple(labelnames)
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, str]) -> LabelValues:
+        if set(labels) != set(self.labelnames):
+            raise ValueError(f"{self.name} expects labels {self.labelnames}, got {tuple(labels)}")
+        return tuple(str(labels[name]) for name in self.labelnames)
+
+    def samples(self) -> List[Tuple[str, str, float]]:
+        """Return (suffix, label string, value) tuples for exposition."""
+        raise NotImplementedError
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.description}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, labels, value in self.samples():
+            lines.append(f"{self.name}{suffix}{labels} {value:g}")
+        return "\n".join(lines)
+
+
+class Counter(_Metric):
+    """Monotonically increasing counter."""
+
+    kind = "counter"
+
+    def __init__(self, name: str, description: str, labelnames: Iterable[str] = ()):
+        super().__init__(name, description, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def value(self, **labels: str) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        return [("", _format_labels(self.labelnames, key), value) for key, value in sorted(self._values.items())]
+
+
+class Gauge(_Metric):
+    """
+    Gauge that is either set explicitly or read from a callback at
+    scrape time (for values owned by another object, e.g. pool status).
+    """
+
+    kind = "gauge"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Iterable[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ):
+        super().__init__(name, description, labelnames)
+        self._values: Dict[LabelValues, float] = {}
+        self._callback = callback
+
+    def set(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels: str) -> None:
+        self.inc(-amount, **labels)
+
+    def value(self, **labels: str) -> float:
+        if self._callback is not None:
+            return float(self._callback())
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self):
+        if self._callback is not None:
+            return [("", "", float(self._callback()))]
+        return [("", _format_labels(self.labelnames, key), value) for key, value in sorted(self._values.items())]
+
+
+class Histogram(_Metric):
+    """Cumulative histogram with fixed upper bounds."""
+
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        description: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, description, labelnames)
+        self.buckets: Tuple[float, ...] = tuple(sorted(buckets))
+        # label values -> [per-bucket counts..., +Inf count, sum]
+        self._values: Dict[LabelValues, List[float]] = {}
+
+    def observe(self, value: float, **labels: str) -> None:
+        key = self._key(labels)
+        with self._lock:
+            data = self._values.get(key)
+            if data is None:
+                data = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            for i, bound in enumerate(self.buckets):
+                if value <= bound:
+                    data[i] += 1
+            data[-2] += 1
+            data[-1] += value
+
+    def count(self, **labels: str) -> int:
+        data = self._values.get(self._key(labels))
+        return int(data[-2]) if data else 0
+
+    def sum(self, **labels: str) -> float:
+        data = self._values.get(self._key(labels))
+        return data[-1] if data else 0.0
+
+    def samples(self):
+        out = []
+        for key, data in sorted(self._values.items()):
+            for bound, bucket_count in zip(self.buckets, data):
+                out.append(("_bucket", _format_labels(self.labelnames, key, f'le="{bound:g}"'), bucket_count))
+            out.append(("_bucket", _format_labels(self.labelnames, key, 'le="+Inf"'), data[-2]))
+            out.append(("_count", _format_labels(self.labelnames, key), data[-2]))
+            out.append(("_sum", _format_labels(self.labelnames, key), data[-1]))
+        return out
+
+
+class MetricsRegistry:
+    """
+    Registry of named metrics.
+    Registering an existing name returns the existing metric, so modules
+    can declare their metrics at import time without coordination.
+    """
+
+    def __init__(self):
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def _register(self, cls, name: str, *args, **kwargs):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, *args, **kwargs)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric {name} already registered as {metric.kind}")
+            return metric
+
+    def counter(self, name: str, description: str, labelnames: Iterable[str] = ()) -> Counter:
+        return self._register(Counter, name, description, labelnames)
+
+    def gauge(
+        self,
+        name: str,
+        description: str,
+        labelnames: Iterable[str] = (),
+        callback: Optional[Callable[[], float]] = None,
+    ) -> Gauge:
+        gauge = self._register(Gauge, name, description, labelnames)
+        if callback is not None:
+            gauge._callback = callback
+        return gauge
+
+    def histogram(
+        self,
+        name: str,
+        description: str,
+        labelnames: Iterable[str] = (),
+        buckets: Iterable[float] = DEFAULT_BUCKETS,
+    ) -> Histogram:
+        return self._register(Histogram, name, description, labelnames, buckets)
+
+    def get(self, name: str) -> Optional[_Metric]:
+        return self._metrics.get(name)
+
+    def render(self) -> str:
+        """Render all metrics in the Prometheus text exposition format."""
+        return "\n".join(metric.render() for metric in self._metrics.values()) + "\n"
+
+
+# Global metrics registry
+metrics = MetricsRegistry()
@@ -0,0 +1,143 @@
+"""
+Async password hashing service
+Phase II: Authentication performance
+
+Runs passlib hash/verify calls in a bounded thread pool so bcrypt's
+100-300 ms of CPU per call never blocks the event loop. bcrypt and
+argon2-cffi release the GIL, so threads give real parallelism here.
+When more than PASSWORD_HASH_QUEUE_LIMIT calls are waiting, new calls
+are rejected with PasswordHasherBusy instead of queueing without bound.
+"""
+
+import asyncio
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional, Tuple
+from passlib.context import CryptContext
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.security import pwd_context
+
+
+HASH_SECONDS = metrics.histogram(
+    "password_hash_seconds", "Password hash/verify time including queueing", ["op"],
+    buckets=(0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+HASH_REJECTED = metrics.counter(
+    "password_hash_rejected_total", "Hash/verify calls rejected because the queue was full", ["op"]
+)
+HASH_UPGRADES = metrics.counter(
+    "password_hash_upgrades_total", "Stored hashes re-hashed with current parameters on login"
+)
+
+
+class PasswordHasherBusy(Exception):
+    """Raised when the hashing queue is full."""
+
+
+class PasswordHasher:
+    """
+    Bounded worker pool for password hashing and verification.
+    """
+
+    def __init__(self, context: CryptContext, max_workers: int = 2, queue_limit: int = 32):
+        """
+        Initialize the hasher.
+
+        Args:
+            context: passlib context defining schemes and parameters
+            max_workers: Threads hashing concurrently
+            queue_limit: Calls allowed to wait for a free thread
+        """
+        self.context = context
+        self.max_workers = max_workers
+        self.max_pending = max_workers + queue_limit
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="password-hash")
+        self._pending = 0
+        self._lock = threading.Lock()
+
+    @property
+    def pending(self) -> int:
+        """Calls running or waiting in the pool."""
+        return self._pending
+
+    async def _run(self, op: str, fn, *args):
+        with self._lock:
+            if self._pending >= self.max_pending:
+                HASH_REJECTED.inc(op=op)
+                raise PasswordHasherBusy(f"Password {op} queue is full")
+            self._pending += 1
+
+        start = time.perf_counter()
+        try:
+            future = self._executor.submit(fn, *args)
+        except BaseException:
+            self._done()
+            raise
+        # Counted down when the call finishes in its thread, not when the
+        # caller stops waiting: a cancelled request leaves bcrypt running
+        future.add_done_callback(self._done)
+        try:
+            return await asyncio.wrap_future(future)
+        finally:
+            HASH_SECONDS.observe(time.perf_counter() - start, op=op)
+
+    def _done(self, future=None) -> None:
+        with self._lock:
+            self._pending -= 1
+
+    async def hash(self, password: str) -> str:
+        """
+        Hash a password with the default scheme.
+
+        Args:
+            password: Plain text password
+
+        Returns:
+            str: Hashed password
+
+        Raises:
+            PasswordHasherBusy: If the queue is full
+        """
+        return await self._run("hash", self.context.hash, password)
+
+    async def verify(self, password: str, hashed_password: str) -> bool:
+        """
+        Verify a password against a stored hash.
+
+        Raises:
+            PasswordHasherBusy: If the queue is full
+        """
+        return await self._run("verify", self.context.verify, password, hashed_password)
+
+    async def verify_and_update(self, password: str, hashed_password: str) -> Tuple[bool, Optional[str]]:
+        """
+        Verify a password and re-hash it if the stored hash uses a
+        deprecated scheme or weaker parameters than currently configured.
+
+        Args:
+            password: Plain text password
+            hashed_password: Stored hash
+
+        Returns:
+            (valid, new_hash): new_hash is None unless the hash should be replaced
+
+        Raises:
+            PasswordHasherBusy: If the queue is full
+        """
+        valid, new_hash = await self._run(
+            "verify", self.context.verify_and_update, password, hashed_password
+        )
+        if valid and new_hash:
+            HASH_UPGRADES.inc()
+        return valid, new_hash
+
+
+# Global password hasher instance
+password_hasher = PasswordHasher(
+    pwd_context,
+    max_workers=settings.PASSWORD_HASH_WORKERS,
+    queue_limit=settings.PASSWORD_HASH_QUEUE_LIMIT,
+)
+metrics.gauge("password_hash_pending", "Hash/verify calls running or queued", callback=lambda: password_hasher.pending)
@@ -0,0 +1,330 @@
+"""
+Sampling profiler
+Phase V: Monitoring - on-demand CPU profiles of a running worker
+
+A background thread reads the stacks of every thread with
+sys._current_frames() at a fixed rate and counts them in the collapsed
+format used by flamegraph.pl, speedscope and inferno
+("thread;outer (file:line);inner (file:line) count"). Nothing runs
+until a profile is requested, so it can stay enabled in production.
+
+Two ways to profile, both restricted to ADMIN_USER_IDS:
+
+- GET /diagnostics/profile?seconds=N samples the whole worker for N
+  seconds. Threads waiting for work (an idle event loop, idle pool
+  threads) are left out unless idle=true.
+- An X-Profile: 1 header on POST /api/chat or GET /tasks/ profiles that
+  request alone. Only event loop samples taken while the request's
+  endpoint is running are kept, so concurrent requests do not show up;
+  work the endpoint hands to other threads (tool calls) appears as
+  waiting. The response carries X-Profile-Id, and the profile is read
+  from GET /diagnostics/profile/requests/{id}.
+"""
+
+import asyncio
+import os
+import sys
+import threading
+import time
+import uuid
+from collections import Counter, OrderedDict
+from contextvars import ContextVar
+from functools import wraps
+from types import CodeType, FrameType
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from fastapi import Depends, Request, Response
+
+from app.core.auth import get_current_user_id
+from app.core.config import settings
+from app.core.metrics import metrics
+
+PROFILE_HEADER = "X-Profile"
+PROFILE_ID_HEADER = "X-Profile-Id"
+
+PROFILES_TAKEN = metrics.counter(
+    "profiler_profiles_total", "Profiles taken (mode: worker, request)", ["mode"]
+)
+
+# Innermost frames of threads that are waiting for work: (file name, function)
+IDLE_FRAMES = frozenset({
+    ("selectors.py", "select"),
+    ("threading.py", "wait"),
+    ("threading.py", "_wait_for_tstate_lock"),
+    ("queue.py", "get"),
+    ("thread.py", "_worker"),
+    ("socket.py", "accept"),
+})
+
+# Longest prefixes first, so frames are labelled relative to the innermost sys.path entry
+_PATH_PREFIXES = sorted(
+    {os.path.join(os.path.abspath(path), "") for path in sys.path if path},
+    key=len, reverse=True,
+)
+_labels: Dict[CodeType, str] = {}
+
+
+def frame_label(code: CodeType) -> str:
+    """
+    Collapsed-stack label of a function,
+    e.g. "TaskService.get_tasks (app/services/task_service.py:40)".
+
+    Args:
+        code: Code object of the frame
+
+    Returns:
+        str: Qualified name and definition site, without ";" (the frame separator)
+    """
+    label = _labels.get(code)
+    if label is None:
+        filename = code.co_filename
+        for prefix in _PATH_PREFIXES:
+            if filename.startswith(prefix):
+                filename = filename[len(prefix):]
+                break
+        name = getattr(code, "co_qualname", code.co_name)
+        label = _labels[code] = f"{name} ({filename}:{code.co_firstlineno})".replace(";", ":")
+    return label
+
+
+def is_idle(frame: FrameType) -> bool:
+    """Whether a thread's innermost frame is waiting for work."""
+    code = frame.f_code
+    return (os.path.basename(code.co_filename), code.co_name) in IDLE_FRAMES
+
+
+def collapse(frame: FrameType, root: str, within: Optional[FrameType] = None) -> Optional[str]:
+    """
+    Collapsed stack of a frame.
+
+    Args:
+        frame: Innermost frame
+        root: First element of the stack (thread or request name)
+        within: Keep only this frame and the frames it called; the stack
+            is dropped if it does not contain it
+
+    Returns:
+        str | None: "root;outermost;...;innermost", or None if within
+        is not on the stack
+    """
+    labels: List[str] = []
+    while frame is not None:
+        labels.append(frame_label(frame.f_code))
+        if frame is within:
+            break
+        frame = frame.f_back
+    else:
+        if within is not None:
+            return None
+    labels.append(root)
+    labels.reverse()
+    return ";".join(labels)
+
+
+class StackSampler:
+    """
+    Counts the collapsed stacks of the process's threads at a fixed rate.
+    """
+
+    def __init__(
+        self,
+        hz: float = 100.0,
+        include_idle: bool = False,
+        thread_id: Optional[int] = None,
+        within: Optional[FrameType] = None,
+        root: Optional[str] = None,
+    ):
+        """
+        Initialize the sampler.
+
+        Args:
+            hz: Samples per second
+            include_idle: Also count threads that are waiting for work
+            thread_id: Sample only this thread (default: all but the sampler)
+            within: See collapse(); requires thread_id
+            root: Root label instead of the thread name
+        """
+        self.interval = 1.0 / hz
+        self.include_idle = include_idle
+        self.thread_id = thread_id
+        self.within = within
+        self.root = root
+        self.stacks: Counter = Counter()
+        self.samples = 0
+        self.elapsed = 0.0
+        self._stopping = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    def _sample(self, own_id: int, names: Dict[int, str]) -> None:
+        frames = sys._current_frames()
+        if self.thread_id is not None:
+            frames = {self.thread_id: frames[self.thread_id]} if self.thread_id in frames else {}
+        self.samples += 1
+        for ident, frame in frames.items():
+            if ident == own_id or (not self.include_idle and is_idle(frame)):
+                continue
+            if self.root is not None:
+                root = self.root
+            else:
+                if ident not in names:
+                    names.update((t.ident, t.name) for t in threading.enumerate())
+                root = names.get(ident, f"thread-{ident}").replace(";", ":")
+            stack = collapse(frame, root, self.within)
+            if stack is not None:
+                self.stacks[stack] += 1
+
+    def run(self, seconds: Optional[float] = None) -> "StackSampler":
+        """
+        Sample on the calling thread for seconds, or until stop().
+
+        Returns:
+            StackSampler: self, with stacks filled in
+        """
+        own_id = threading.get_ident()
+        names: Dict[int, str] = {}
+        started = time.monotonic()
+        deadline = started + seconds if seconds is not None else None
+        next_sample = started
+        while not self._stopping.is_set():
+            now = time.monotonic()
+            if deadline is not None and now >= deadline:
+                break
+            self._sample(own_id, names)
+            next_sample += self.interval
+            self._stopping.wait(max(0.0, next_sample - time.monotonic()))
+        self.elapsed = time.monotonic() - started
+        return self
+
+    def start(self) -> None:
+        """Sample on a background thread until stop()."""
+        self._thread = threading.Thread(target=self.run, name="stack-sampler", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stopping.set()
+        if self._thread is not None:
+            self._thread.join()
+            self._thread = None
+
+    def collapsed(self) -> str:
+        """The counted stacks in collapsed format, most frequent first."""
+        return "".join(f"{stack} {count}\n" for stack, count in self.stacks.most_common())
+
+
+def is_admin(user_id: str) -> bool:
+    return user_id in settings.ADMIN_USER_IDS
+
+
+class ProfileBusy(Exception):
+    """Raised when a worker profile is requested while one is running."""
+    pass
+
+
+_worker_profile_lock = threading.Lock()
+
+
+async def profile_worker(seconds: float, hz: float = 100.0, include_idle: bool = False) -> StackSampler:
+    """
+    Sample every thread of this worker for a while.
+
+    Args:
+        seconds: Sampling duration
+        hz: Samples per second
+        include_idle: Also count threads waiting for work
+
+    Returns:
+        StackSampler: The finished sampler
+
+    Raises:
+        ProfileBusy: If another worker profile is running
+    """
+    if not _worker_profile_lock.acquire(blocking=False):
+        raise ProfileBusy("A profile is already running on this worker")
+    try:
+        PROFILES_TAKEN.inc(mode="worker")
+        sampler = StackSampler(hz=hz, include_idle=include_idle)
+        return await asyncio.to_thread(sampler.run, seconds)
+    finally:
+        _worker_profile_lock.release()
+
+
+class RequestProfiles:
+    """The most recent per-request profiles, by ID."""
+
+    def __init__(self, max_profiles: int = 20):
+        self.max_profiles = max_profiles
+        self._profiles: "OrderedDict[str, Dict[str, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def add(self, name: str, user_id: str, sampler: StackSampler) -> str:
+        profile_id = uuid.uuid4().hex[:16]
+        with self._lock:
+            self._profiles[profile_id] = {
+                "id": profile_id,
+                "request": name,
+                "user_id": user_id,
+                "created_at": time.time(),
+                "seconds": round(sampler.elapsed, 4),
+                "samples": sampler.samples,
+                "collapsed": sampler.collapsed(),
+            }
+            while len(self._profiles) > self.max_profiles:
+                self._profiles.popitem(last=False)
+        return profile_id
+
+    def get(self, profile_id: str) -> Optional[Dict[str, Any]]:
+        return self._profiles.get(profile_id)
+
+
+request_profiles = RequestProfiles(settings.PROFILER_KEEP_REQUESTS)
+
+# Set by request_profile for requests that asked to be profiled: (name, user ID, response)
+_profile_requested: ContextVar[Optional[Tuple[str, str, Response]]] = ContextVar("profile_requested", default=None)
+
+
+async def request_profile(
+    request: Request,
+    response: Response,
+    user_id: str = Depends(get_current_user_id),
+) -> None:
+    """
+    Route dependency: mark the request for profiling if it carries the
+    X-Profile header and comes from an admin. Used with @profiled.
+    """
+    if PROFILE_HEADER in request.headers and is_admin(user_id):
+        _profile_requested.set((f"{request.method} {request.url.path}", user_id, response))
+
+
+def profiled(endpoint: Callable) -> Callable:
+    """
+    Decorator for async endpoints that declare Depends(request_profile):
+    profile the endpoint when the request asked for it.
+    """
+    @wraps(endpoint)
+    async def wrapper(*args, **kwargs):
+        requested = _profile_requested.get()
+        if requested is None:
+            return await endpoint(*args, **kwargs)
+
+        name, user_id, response = requested
+        PROFILES_TAKEN.inc(mode="request")
+        coroutine = endpoint(*args, **kwargs)
+        sampler = StackSampler(
+            hz=settings.PROFILER_REQUEST_HZ,
+            include_idle=True,
+            thread_id=threading.get_ident(),
+            within=coroutine.cr_frame,
+            root=name,
+        )
+        sampler.start()
+        result = None
+        try:
+            result = await coroutine
+            return result
+        finally:
+            sampler.stop()
+            # Headers of the injected Response are not applied to a Response the endpoint returns itself
+            target = result if isinstance(result, Response) else response
+            target.headers[PROFILE_ID_HEADER] = request_profiles.add(name, user_id, sampler)
+
+    return wrapper
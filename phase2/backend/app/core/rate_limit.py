@@ -34,8 +34,8 @@ class RateLimitMiddleware(BaseHTTPMiddleware):
         self.requests[key] = [t for t in self.requests[key] if t > cutoff]
 
     async def dispatch(self, request: Request, call_next) -> Response:
-        # Skip rate limiting for health checks
-        if request.url.path in ("/health", "/"):
+        # Skip rate limiting for health checks and metrics scrapes
+        if request.url.path in ("/health", "/health/live", "/health/ready", "/", "/metrics"):
             return await call_next(request)
 
         client_ip = self._get_client_ip(request)
@@ -0,0 +1,80 @@
+"""
+Fast JSON serialization
+Performance: JSON responses and tool results
+
+JSON encoding through orjson when it is installed (see requirements.txt),
+with a stdlib json fallback producing the same output. FastJSONResponse is
+the app's default response class; large list endpoints pass plain row
+dicts to it directly, which skips pydantic model construction and
+FastAPI's jsonable_encoder pass.
+"""
+
+import json
+from datetime import date, datetime
+from decimal import Decimal
+from typing import Any
+from uuid import UUID
+
+from fastapi.responses import JSONResponse
+
+try:
+    import orjson
+except ImportError:  # pragma: no cover - exercised only without orjson
+    orjson = None
+
+
+def _default(obj: Any) -> Any:
+    """Encode types stdlib json (and orjson, for Decimal) can't handle."""
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (UUID, Decimal)):
+        return str(obj)
+    if hasattr(obj, "model_dump"):
+        return obj.model_dump()
+    raise TypeError(f"Object of type {type(obj).__name__} is not JSON serializable")
+
+
+if orjson is not None:
+    _ORJSON_OPTIONS = orjson.OPT_NON_STR_KEYS
+
+    def dumps(obj: Any) -> bytes:
+        """
+        Serialize obj to compact UTF-8 JSON.
+
+        Args:
+            obj: Value made of dicts, lists, scalars, datetimes or models
+
+        Returns:
+            bytes: JSON document
+        """
+        return orjson.dumps(obj, default=_default, option=_ORJSON_OPTIONS)
+
+    loads = orjson.loads
+else:
+    def dumps(obj: Any) -> bytes:
+        """
+        Serialize obj to compact UTF-8 JSON.
+
+        Args:
+            obj: Value made of dicts, lists, scalars, datetimes or models
+
+        Returns:
+            bytes: JSON document
+        """
+        return json.dumps(
+            obj, default=_default, ensure_ascii=False, separators=(",", ":")
+        ).encode("utf-8")
+
+    loads = json.loads
+
+
+def dumps_str(obj: Any) -> str:
+    """Serialize obj to a JSON string (e.g. tool results sent to the LLM)."""
+    return dumps(obj).decode("utf-8")
+
+
+class FastJSONResponse(JSONResponse):
+    """JSONResponse rendered with dumps()."""
+
+    def render(self, content: Any) -> bytes:
+        return dumps(content)
@@ -4,13 +4,78 @@ Task: T-010 - Create JWT Authentication Utilities
 """
 
 from datetime import datetime, timedelta
-from jose import JWTError, jwt
+from typing import Any
+import httpx
+from jose import ExpiredSignatureError, JWTError, jwt
+from jose.exceptions import JWTClaimsError
 from passlib.context import CryptContext
 from app.core.config import settings
+from app.core.jwks import JWKSCache
+from app.core.metrics import metrics
+from app.core.token_cache import TokenCache
 
 
-# Password hashing context using bcrypt
-pwd_context = CryptContext(schemes=["bcrypt"], deprecated="auto")
+def _build_pwd_context() -> CryptContext:
+    """Password hashing context from settings (bcrypt by default)."""
+    options = {}
+    if "bcrypt" in settings.PASSWORD_SCHEMES:
+        options["bcrypt__rounds"] = settings.BCRYPT_ROUNDS
+        options["bcrypt__min_rounds"] = settings.BCRYPT_ROUNDS
+    return CryptContext(schemes=settings.PASSWORD_SCHEMES, deprecated="auto", **options)
+
+
+# Password hashing context; hash_password/verify_password block, so async
+# code should go through app.core.password_hasher instead
+pwd_context = _build_pwd_context()
+
+# Verified-token cache shared by all requests in this process
+token_cache = TokenCache(max_size=settings.JWT_CACHE_SIZE)
+metrics.gauge("jwt_cache_entries", "Tokens in the verified-token cache", callback=lambda: len(token_cache))
+
+# JWKS for asymmetric verification (None unless JWT_JWKS_URL is set)
+jwks_cache = (
+    JWKSCache(settings.JWT_JWKS_URL, ttl_seconds=settings.JWT_JWKS_CACHE_SECONDS)
+    if settings.JWT_JWKS_URL else None
+)
+
+
+def _is_symmetric(algorithm: str) -> bool:
+    return algorithm.startswith("HS")
+
+
+def _signing_key() -> str:
+    """Key used by create_access_token for the configured algorithm."""
+    if _is_symmetric(settings.JWT_ALGORITHM):
+        return settings.JWT_SECRET
+    return settings.JWT_PRIVATE_KEY
+
+
+async def _verification_key() -> Any:
+    """Key (or JWKS) used by verify_token for the configured algorithm."""
+    if _is_symmetric(settings.JWT_ALGORITHM):
+        return settings.JWT_SECRET
+    if settings.JWT_PUBLIC_KEY:
+        return settings.JWT_PUBLIC_KEY
+    if jwks_cache is not None:
+        try:
+            return await jwks_cache.get()
+        except (httpx.HTTPError, ValueError) as e:
+            raise JWTError(f"JWKS unavailable: {e}")
+    raise JWTError(f"No public key or JWKS URL configured for {settings.JWT_ALGORITHM}")
+
+
+async def _decode(token: str) -> dict:
+    """Verify the signature and standard claims of a token."""
+    try:
+        return jwt.decode(token, await _verification_key(), algorithms=[settings.JWT_ALGORITHM])
+    except (ExpiredSignatureError, JWTClaimsError):
+        raise
+    except JWTError:
+        # Keys may have been rotated since the JWKS was cached
+        uses_jwks = jwks_cache is not None and not settings.JWT_PUBLIC_KEY
+        if uses_jwks and not _is_symmetric(settings.JWT_ALGORITHM) and await jwks_cache.refresh():
+            return jwt.decode(token, await jwks_cache.get(), algorithms=[settings.JWT_ALGORITHM])
+        raise
 
 
 def create_access_token(data: dict) -> str:
@@ -29,31 +94,37 @@ def create_access_token(data: dict) -> str:
 
     return jwt.encode(
         to_encode,
-        settings.JWT_SECRET,
+        _signing_key(),
         algorithm=settings.JWT_ALGORITHM
     )
 
 
-def verify_token(token: str) -> dict | None:
+async def verify_token(token: str) -> dict | None:
     """
     Verify and decode a JWT token.
 
+    Verified claims are cached until the token's exp, so a token seen
+    before skips signature verification. With a JWKS URL the key set is
+    fetched without blocking the event loop.
+
     Args:
         token: JWT token string
 
     Returns:
         dict | None: Decoded payload if valid, None if invalid/expired
     """
-    try:
-        payload = jwt.decode(
-            token,
-            settings.JWT_SECRET,
-            algorithms=[settings.JWT_ALGORITHM]
-        )
+    payload = token_cache.get(token)
+    if payload is not None:
         return payload
+
+    try:
+        payload = await _decode(token)
     except JWTError:
         return None
 
+    token_cache.put(token, payload)
+    return payload
+
 
 def hash_password(password: str) -> str:
     """
@@ -0,0 +1,95 @@
+"""
+Verified JWT cache
+Phase II: Authentication performance
+
+Maps a SHA-256 digest of a bearer token to its verified claims until the
+token's own expiry, so repeated requests with the same token skip
+signature verification and claim parsing.
+"""
+
+import hashlib
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, Optional, Tuple
+from app.core.metrics import metrics
+
+
+TOKEN_CACHE_REQUESTS = metrics.counter(
+    "jwt_cache_requests_total", "Verified-token cache lookups", ["result"]
+)
+
+
+class TokenCache:
+    """
+    Bounded LRU cache of verified token claims.
+    Only successfully verified tokens that carry an exp claim are cached.
+    """
+
+    def __init__(self, max_size: int = 10000):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached tokens (0 disables caching)
+        """
+        self.max_size = max_size
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _digest(token: str) -> bytes:
+        return hashlib.sha256(token.encode()).digest()
+
+    def get(self, token: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up the claims of a previously verified token.
+
+        Args:
+            token: Raw JWT string
+
+        Returns:
+            dict | None: Claims if cached and not yet expired
+        """
+        if not self.max_size:
+            return None
+
+        key = self._digest(token)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                payload, expires_at = entry
+                if time.time() < expires_at:
+                    self._entries.move_to_end(key)
+                    TOKEN_CACHE_REQUESTS.inc(result="hit")
+                    return dict(payload)
+                del self._entries[key]
+
+        TOKEN_CACHE_REQUESTS.inc(result="miss")
+        return None
+
+    def put(self, token: str, payload: Dict[str, Any]) -> None:
+        """
+        Cache verified claims until the token's exp.
+
+        Args:
+            token: Raw JWT string
+            payload: Verified claims
+        """
+        exp = payload.get("exp")
+        if not self.max_size or not isinstance(exp, (int, float)):
+            return
+
+        key = self._digest(token)
+        with self._lock:
+            self._entries[key] = (dict(payload), float(exp))
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
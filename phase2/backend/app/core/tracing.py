@@ -0,0 +1,523 @@
+"""
+Request tracing
+Phase V: Monitoring - per-request latency breakdown
+
+Lightweight spans for finding where a slow request spent its time
+(history loading, model calls, tool execution, persistence, SQL).
+Spans follow the OpenTelemetry data model: W3C trace context
+(traceparent) is continued from incoming requests, and finished traces
+are exported as OTLP/JSON to TRACING_OTLP_ENDPOINT, or kept in memory by
+InMemorySpanExporter (tests, debugging).
+
+Sampling is decided once per request by TracingMiddleware. Code that
+runs outside a sampled request pays one ContextVar lookup per span and
+records nothing. Sampled responses carry a Server-Timing header that
+sums span durations by name.
+"""
+
+import inspect
+import logging
+import os
+import queue
+import random
+import threading
+import time
+from collections import deque
+from contextvars import ContextVar
+from functools import wraps
+from typing import Any, Callable, Deque, Dict, List, Optional, Tuple
+
+from sqlalchemy import event
+from sqlalchemy.engine import Engine
+from starlette.datastructures import MutableHeaders
+from starlette.types import ASGIApp, Message, Receive, Scope, Send
+
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+SAMPLED_REQUESTS = metrics.counter("traces_sampled_total", "Requests recorded as traces")
+TRACES_DROPPED = metrics.counter("traces_dropped_total", "Traces dropped because the export queue was full")
+
+# Longest SQL statement kept in a db.query span
+STATEMENT_MAX_CHARS = 300
+
+# OTLP span kinds
+KIND_INTERNAL, KIND_SERVER, KIND_CLIENT = 1, 2, 3
+
+
+def _new_id(nbytes: int) -> str:
+    return os.urandom(nbytes).hex()
+
+
+class Trace:
+    """Spans of one sampled request."""
+
+    __slots__ = ("trace_id", "spans")
+
+    def __init__(self, trace_id: str):
+        self.trace_id = trace_id
+        self.spans: List["Span"] = []
+
+
+class Span:
+    """A timed operation within a trace."""
+
+    __slots__ = ("name", "kind", "span_id", "parent_id", "trace", "start_ns", "end_ns", "attributes", "error")
+
+    def __init__(
+        self,
+        name: str,
+        trace: Trace,
+        parent_id: Optional[str] = None,
+        attributes: Optional[Dict[str, Any]] = None,
+        kind: int = KIND_INTERNAL,
+    ):
+        self.name = name
+        self.kind = kind
+        self.span_id = _new_id(8)
+        self.parent_id = parent_id
+        self.trace = trace
+        self.start_ns = time.time_ns()
+        self.end_ns: Optional[int] = None
+        self.attributes: Dict[str, Any] = dict(attributes) if attributes else {}
+        self.error: Optional[str] = None
+        trace.spans.append(self)
+
+    @property
+    def trace_id(self) -> str:
+        return self.trace.trace_id
+
+    @property
+    def duration_ms(self) -> float:
+        end = self.end_ns if self.end_ns is not None else time.time_ns()
+        return (end - self.start_ns) / 1e6
+
+    def set_attribute(self, key: str, value: Any) -> None:
+        self.attributes[key] = value
+
+    def end(self, error: Optional[str] = None) -> None:
+        if self.end_ns is None:
+            self.end_ns = time.time_ns()
+            self.error = error
+
+    def to_otlp(self) -> Dict[str, Any]:
+        """The span as an OTLP/JSON span object."""
+        data: Dict[str, Any] = {
+            "traceId": self.trace_id,
+            "spanId": self.span_id,
+            "name": self.name,
+            "kind": self.kind,
+            "startTimeUnixNano": str(self.start_ns),
+            "endTimeUnixNano": str(self.end_ns if self.end_ns is not None else self.start_ns),
+            "attributes": [_otlp_attribute(k, v) for k, v in self.attributes.items()],
+            "status": {"code": 2, "message": self.error} if self.error else {"code": 0},
+        }
+        if self.parent_id:
+            data["parentSpanId"] = self.parent_id
+        return data
+
+
+def _otlp_attribute(key: str, value: Any) -> Dict[str, Any]:
+    if isinstance(value, bool):
+        return {"key": key, "value": {"boolValue": value}}
+    if isinstance(value, int):
+        return {"key": key, "value": {"intValue": str(value)}}
+    if isinstance(value, float):
+        return {"key": key, "value": {"doubleValue": value}}
+    return {"key": key, "value": {"stringValue": str(value)}}
+
+
+# Innermost active span of the current request; None outside sampled requests
+_current_span: ContextVar[Optional[Span]] = ContextVar("current_span", default=None)
+
+
+class _NoopScope:
+    """Returned by Tracer.span outside sampled requests."""
+
+    __slots__ = ()
+
+    def __enter__(self) -> None:
+        return None
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        return None
+
+
+_NOOP = _NoopScope()
+
+
+class _SpanScope:
+    """Makes a span current for the duration of a with block."""
+
+    __slots__ = ("span", "_token")
+
+    def __init__(self, span: Span):
+        self.span = span
+        self._token = None
+
+    def __enter__(self) -> Span:
+        self._token = _current_span.set(self.span)
+        return self.span
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        _current_span.reset(self._token)
+        self.span.end(error=f"{exc_type.__name__}: {exc}" if exc_type else None)
+
+
+class SpanExporter:
+    """Receives the spans of each finished trace."""
+
+    def export(self, spans: List[Span]) -> None:
+        raise NotImplementedError
+
+    def shutdown(self) -> None:
+        pass
+
+
+class InMemorySpanExporter(SpanExporter):
+    """Keeps the most recent spans in memory."""
+
+    def __init__(self, max_spans: int = 10000):
+        self._spans: Deque[Span] = deque(maxlen=max_spans)
+
+    def export(self, spans: List[Span]) -> None:
+        self._spans.extend(spans)
+
+    def get_finished_spans(self) -> List[Span]:
+        return list(self._spans)
+
+    def clear(self) -> None:
+        self._spans.clear()
+
+
+class OTLPJSONExporter(SpanExporter):
+    """
+    Sends traces to an OTLP/HTTP collector (POST {endpoint}/v1/traces,
+    JSON encoding) from a background thread, up to batch_size traces per
+    request.
+    Traces are dropped when the queue is full rather than slowing requests.
+    """
+
+    def __init__(self, endpoint: str, service_name: str, max_queue: int = 2048, batch_size: int = 64, timeout: float = 5.0):
+        self.url = endpoint.rstrip("/") + "/v1/traces"
+        self.service_name = service_name
+        self.batch_size = batch_size
+        self.timeout = timeout
+        self._queue: "queue.Queue[Optional[List[Span]]]" = queue.Queue(maxsize=max_queue)
+        self._thread = threading.Thread(target=self._run, name="otlp-exporter", daemon=True)
+        self._thread.start()
+
+    def export(self, spans: List[Span]) -> None:
+        try:
+            self._queue.put_nowait(spans)
+        except queue.Full:
+            TRACES_DROPPED.inc()
+
+    def payload(self, spans: List[Span]) -> Dict[str, Any]:
+        return {
+            "resourceSpans": [{
+                "resource": {"attributes": [_otlp_attribute("service.name", self.service_name)]},
+                "scopeSpans": [{"scope": {"name": __name__}, "spans": [span.to_otlp() for span in spans]}],
+            }]
+        }
+
+    def _run(self) -> None:
+        import httpx
+
+        with httpx.Client(timeout=self.timeout) as client:
+            while True:
+                trace = self._queue.get()
+                if trace is None:
+                    return
+                spans = list(trace)
+                # Send the traces queued meanwhile in the same request
+                for _ in range(self.batch_size - 1):
+                    try:
+                        trace = self._queue.get_nowait()
+                    except queue.Empty:
+                        break
+                    if trace is None:
+                        self._send(client, spans)
+                        return
+                    spans.extend(trace)
+                self._send(client, spans)
+
+    def _send(self, client, spans: List[Span]) -> None:
+        try:
+            client.post(self.url, json=self.payload(spans)).raise_for_status()
+        except Exception as e:
+            logger.warning(f"Trace export to {self.url} failed: {e}")
+
+    def shutdown(self) -> None:
+        self._queue.put(None)
+        self._thread.join(timeout=self.timeout)
+
+
+def parse_traceparent(header: Optional[str]) -> Optional[Tuple[str, str, bool]]:
+    """
+    Parse a W3C traceparent header.
+
+    Args:
+        header: e.g. "00-<32 hex trace id>-<16 hex parent id>-01"
+
+    Returns:
+        Tuple of trace ID, parent span ID and sampled flag, or None if
+        the header is missing or malformed
+    """
+    if not header:
+        return None
+    parts = header.strip().split("-")
+    if len(parts) < 4 or len(parts[1]) != 32 or len(parts[2]) != 16 or len(parts[3]) != 2:
+        return None
+    try:
+        int(parts[1], 16), int(parts[2], 16)
+        flags = int(parts[3], 16)
+    except ValueError:
+        return None
+    if parts[1] == "0" * 32 or parts[2] == "0" * 16:
+        return None
+    return parts[1], parts[2], bool(flags & 1)
+
+
+class Tracer:
+    """
+    Creates spans for the current request and exports finished traces.
+    """
+
+    def __init__(self, sample_rate: float = 0.0, honor_traceparent: bool = False, exporters: Optional[List[SpanExporter]] = None):
+        """
+        Initialize the tracer.
+
+        Args:
+            sample_rate: Fraction of requests recorded (0 disables tracing)
+            honor_traceparent: Also record requests whose traceparent
+                header has the sampled flag set
+            exporters: Receivers of finished traces
+        """
+        self.sample_rate = sample_rate
+        self.honor_traceparent = honor_traceparent
+        self.exporters: List[SpanExporter] = list(exporters or [])
+
+    @property
+    def enabled(self) -> bool:
+        return self.sample_rate > 0 or self.honor_traceparent
+
+    def should_sample(self, parent: Optional[Tuple[str, str, bool]]) -> bool:
+        if parent is not None and parent[2] and self.honor_traceparent:
+            return True
+        return self.sample_rate > 0 and random.random() < self.sample_rate
+
+    def start_trace(self, name: str, parent: Optional[Tuple[str, str, bool]] = None, attributes: Optional[Dict[str, Any]] = None) -> _SpanScope:
+        """
+        Start the root span of a sampled request.
+
+        Args:
+            name: Span name
+            parent: Parsed traceparent of the caller, if any
+            attributes: Span attributes
+
+        Returns:
+            Scope to enter for the duration of the request
+        """
+        trace = Trace(parent[0] if parent else _new_id(16))
+        SAMPLED_REQUESTS.inc()
+        return _SpanScope(Span(name, trace, parent[1] if parent else None, attributes, KIND_SERVER))
+
+    def span(self, name: str, attributes: Optional[Dict[str, Any]] = None):
+        """
+        Child span of the current span, for use in a with block.
+
+        Args:
+            name: Span name; Server-Timing sums durations by name
+            attributes: Span attributes
+
+        Returns:
+            A scope whose with block yields the Span, or None (and records
+            nothing) outside a sampled request
+        """
+        parent = _current_span.get()
+        if parent is None:
+            return _NOOP
+        return _SpanScope(Span(name, parent.trace, parent.span_id, attributes))
+
+    def export(self, root: Span) -> None:
+        """Hand a finished trace to the exporters."""
+        for exporter in self.exporters:
+            try:
+                exporter.export(root.trace.spans)
+            except Exception as e:
+                logger.warning(f"Span exporter {type(exporter).__name__} failed: {e}")
+
+    def shutdown(self) -> None:
+        for exporter in self.exporters:
+            exporter.shutdown()
+
+
+def current_span() -> Optional[Span]:
+    """The innermost active span, or None outside a sampled request."""
+    return _current_span.get()
+
+
+def traced(name: Optional[str] = None) -> Callable:
+    """
+    Decorator recording each call of a function (sync or async) as a span.
+
+    Args:
+        name: Span name (default: the function's qualified name)
+    """
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+
+        if inspect.iscoroutinefunction(func):
+            @wraps(func)
+            async def async_wrapper(*args, **kwargs):
+                if _current_span.get() is None:
+                    return await func(*args, **kwargs)
+                with tracer.span(span_name):
+                    return await func(*args, **kwargs)
+            return async_wrapper
+
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            if _current_span.get() is None:
+                return func(*args, **kwargs)
+            with tracer.span(span_name):
+                return func(*args, **kwargs)
+        return wrapper
+
+    return decorator
+
+
+def server_timing(root: Span) -> str:
+    """
+    Server-Timing header value for a trace: total time, then the summed
+    duration of each span name in order of first appearance.
+
+    Nested spans are counted in their own entry as well as their
+    parent's, so entries do not add up to the total.
+
+    Args:
+        root: Root span of the request (may still be running)
+
+    Returns:
+        str: e.g. 'total;dur=812.4, chat.begin;dur=3.1, db.query;dur=4.0;desc="9 calls"'
+    """
+    totals: Dict[str, List[float]] = {}
+    for span in root.trace.spans:
+        if span is root:
+            continue
+        entry = totals.setdefault(span.name, [0.0, 0])
+        entry[0] += span.duration_ms
+        entry[1] += 1
+    parts = [f"total;dur={root.duration_ms:.1f}"]
+    for span_name, (duration, count) in totals.items():
+        part = f"{span_name};dur={duration:.1f}"
+        if count > 1:
+            part += f';desc="{count} calls"'
+        parts.append(part)
+    return ", ".join(parts)
+
+
+class TracingMiddleware:
+    """
+    Records sampled requests as traces and adds a Server-Timing header
+    to their responses. Unsampled requests pass straight through.
+    """
+
+    def __init__(self, app: ASGIApp, tracer: Optional["Tracer"] = None, server_timing: bool = True):
+        self.app = app
+        self.tracer = tracer
+        self.server_timing = server_timing
+
+    async def __call__(self, scope: Scope, receive: Receive, send: Send) -> None:
+        active = self.tracer or tracer
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        parent = None
+        if active.honor_traceparent:
+            for key, value in scope["headers"]:
+                if key == b"traceparent":
+                    parent = parse_traceparent(value.decode("latin-1"))
+                    break
+        if not active.should_sample(parent):
+            await self.app(scope, receive, send)
+            return
+
+        scope_ = active.start_trace("http.request", parent, {
+            "http.method": scope["method"],
+            "http.target": scope["path"],
+        })
+        root = scope_.span
+
+        async def send_with_timing(message: Message) -> None:
+            if message["type"] == "http.response.start":
+                root.set_attribute("http.status_code", message["status"])
+                if self.server_timing:
+                    headers = MutableHeaders(scope=message)
+                    headers.append("Server-Timing", server_timing(root))
+                    headers.append("traceresponse", f"00-{root.trace_id}-{root.span_id}-01")
+            await send(message)
+
+        with scope_:
+            await self.app(scope, receive, send_with_timing)
+        route = scope.get("route")
+        if route is not None and getattr(route, "path", None):
+            root.set_attribute("http.route", route.path)
+        active.export(root)
+
+
+def _before_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    parent = _current_span.get()
+    if parent is None or context is None:
+        return
+    context._trace_span = Span("db.query", parent.trace, parent.span_id, {
+        "db.system": conn.dialect.name,
+        "db.statement": statement[:STATEMENT_MAX_CHARS],
+    }, KIND_CLIENT)
+
+
+def _after_cursor_execute(conn, cursor, statement, parameters, context, executemany):
+    span = getattr(context, "_trace_span", None)
+    if span is not None:
+        span.end()
+
+
+def _handle_error(exception_context):
+    span = getattr(exception_context.execution_context, "_trace_span", None)
+    if span is not None:
+        span.end(error=str(exception_context.original_exception))
+
+
+def instrument_sqlalchemy() -> None:
+    """Record SQL statements run during sampled requests as db.query spans (all engines)."""
+    if not event.contains(Engine, "before_cursor_execute", _before_cursor_execute):
+        event.listen(Engine, "before_cursor_execute", _before_cursor_execute)
+        event.listen(Engine, "after_cursor_execute", _after_cursor_execute)
+        event.listen(Engine, "handle_error", _handle_error)
+
+
+def build_tracer() -> Tracer:
+    """
+    Tracer from settings.
+
+    Returns:
+        Tracer: Sampling TRACING_SAMPLE_RATE of requests, exporting to
+        TRACING_OTLP_ENDPOINT when set
+    """
+    from app.core.config import settings
+
+    exporters: List[SpanExporter] = []
+    if settings.TRACING_OTLP_ENDPOINT:
+        exporters.append(OTLPJSONExporter(settings.TRACING_OTLP_ENDPOINT, settings.PROJECT_NAME))
+    return Tracer(
+        sample_rate=settings.TRACING_SAMPLE_RATE,
+        honor_traceparent=settings.TRACING_HONOR_TRACEPARENT,
+        exporters=exporters,
+    )
+
+
+# Global tracer
+tracer = build_tracer()
@@ -1,99 +1,120 @@
 """
 FastAPI application entry point
 Task: T-014 - Create FastAPI Application Entry Point
+
+The app is assembled by create_app(profile) so each deployment only loads
+the components it serves (see PROFILES). uvicorn app.main:app uses the
+profile from the APP_PROFILE setting.
 """
 
-from fastapi import FastAPI, Depends
+from fastapi import APIRouter, FastAPI, Depends, Request
 from fastapi.middleware.cors import CORSMiddleware
-from sqlmodel import Session
+from typing import Dict, FrozenSet
 from app.core.config import settings
-from app.api.tasks import router as tasks_router
-from app.api.auth import router as auth_router
-from app.api.chat import router as chat_router
-from app.api.conversations import router as conversations_router
-from app.core.database import create_db_and_tables, get_session
+from app.core.compression import CompressionMiddleware, install_precompressed_openapi
+from app.core.database import create_db_and_tables
+from app.core.health import (
+    HealthMonitor,
+    check_database,
+    check_kafka_producer,
+    check_openai,
+    check_read_replica,
+)
 from app.core.auth import get_current_user_id
+from app.core.loop_monitor import loop_monitor
 from app.core.rate_limit import RateLimitMiddleware
+from app.core.responses import FastJSONResponse
+from app.core.tracing import TracingMiddleware, tracer
 
 
-# Create FastAPI application instance
-app = FastAPI(
-    title=settings.PROJECT_NAME,
-    description="Todo API with multi-user support and JWT authentication",
-    version="2.0.0",
-)
+# Components assembled for each deployment profile
+PROFILES: Dict[str, FrozenSet[str]] = {
+    # Everything in one process (local dev, Vercel, single-image deployments)
+    "full": frozenset({"auth", "tasks", "chat", "analytics", "diagnostics", "debug", "rate_limit"}),
+    # Task CRUD API pods: no OpenAI/agent stack
+    "tasks": frozenset({"auth", "tasks", "diagnostics", "rate_limit"}),
+    # Chat API pods: chat and conversation history
+    "chat": frozenset({"auth", "chat", "diagnostics", "rate_limit"}),
+    # Analytics/consumer node: Kafka consumer plus its read endpoint, no API routers
+    "analytics": frozenset({"analytics", "consumer", "diagnostics"}),
+}
 
 
-# Initialize database tables on startup
-@app.on_event("startup")
-def on_startup():
-    create_db_and_tables()
+# System endpoints present in every profile
+system_router = APIRouter(tags=["system"])
 
+# Debug endpoints (full profile only)
+debug_router = APIRouter(tags=["system"])
 
-# Configure CORS middleware
-app.add_middleware(
-    CORSMiddleware,
-    allow_origins=settings.CORS_ORIGINS,
-    allow_credentials=True,
-    allow_methods=["*"],  # Allow all HTTP methods
-    allow_headers=["*"],  # Allow all headers
-)
+# Analytics endpoints (Phase V: Event Consumer)
+analytics_router = APIRouter(tags=["system"])
+
+
+def _health_response(status: dict) -> dict:
+    return {
+        "service": settings.PROJECT_NAME,
+        "version": "2.0.0",
+        "timestamp": status["checked_at"],
+        "age_seconds": status["age_seconds"],
+        "checks": status["checks"],
+    }
+
+
+@system_router.get("/health/live")
+async def liveness():
+    """
+    Liveness probe: the process is up and serving requests. No I/O.
+
+    Returns:
+        dict: Liveness status
+    """
+    return {"status": "alive"}
+
+
+@system_router.get("/health/ready")
+async def readiness(request: Request):
+    """
+    Readiness probe backed by the cached dependency snapshot.
 
-# Rate limiting middleware
-app.add_middleware(RateLimitMiddleware, default_limit=100, auth_limit=20, window_seconds=60)
+    Critical dependencies (the database) must be ok; Kafka, OpenAI and the
+    read replica are reported but do not take the pod out of rotation.
 
+    Returns:
+        dict: Readiness status with per-dependency status and latency
+        (503 if not ready)
+    """
+    status = await request.app.state.health.get_status()
+    response = {"status": "ready" if status["ready"] else "not_ready", **_health_response(status)}
 
-# Include routers
-app.include_router(auth_router)
-app.include_router(tasks_router)
-app.include_router(chat_router)
-app.include_router(conversations_router)
+    if not status["ready"]:
+        return FastJSONResponse(content=response, status_code=503)
+    return response
 
 
-# Health check endpoint for Kubernetes probes
+# Health check endpoint (kept for existing clients; same cached snapshot as /health/ready)
 # [Task]: T-007
 # [From]: specs/phase4-kubernetes/spec.md FR-4, specs/phase4-kubernetes/plan.md Section 6.1
-@app.get("/health", tags=["system"])
-async def health_check(session: Session = Depends(get_session)):
+@system_router.get("/health")
+async def health_check(request: Request):
     """
-    Health check endpoint for Kubernetes liveness/readiness probes.
+    Health check endpoint.
 
     Checks:
-    - Database connectivity
+    - Database connectivity (cached, see /health/ready)
 
     Returns:
         dict: Health status with component checks
     """
-    from datetime import datetime
-    from fastapi.responses import JSONResponse
-    from sqlmodel import text
-
-    checks = {}
-    status = "healthy"
-
-    # Check database connection
-    try:
-        session.exec(text("SELECT 1"))
-        checks["database"] = "ok"
-    except Exception as e:
-        checks["database"] = f"failed: {str(e)}"
-        status = "unhealthy"
-
-    response = {
-        "status": status,
-        "service": settings.PROJECT_NAME,
-        "version": "2.0.0",
-        "timestamp": datetime.utcnow().isoformat() + "Z",
-        "checks": checks
-    }
+    status = await request.app.state.health.get_status()
+    response = {"status": "healthy" if status["ready"] else "unhealthy", **_health_response(status)}
 
-    if status == "unhealthy":
-        return JSONResponse(content=response, status_code=503)
+    if not status["ready"]:
+        return FastJSONResponse(content=response, status_code=503)
     return response
 
 
 # Debug endpoint to test authentication
-@app.get("/debug/auth", tags=["system"])
+@debug_router.get("/debug/auth")
 async def debug_auth(user_id: str = Depends(get_current_user_id)):
     """Debug endpoint to test authentication"""
     return {
@@ -103,7 +124,7 @@ async def debug_auth(user_id: str = Depends(get_current_user_id)):
 
 
 # Analytics endpoint (Phase V: Event Consumer)
-@app.get("/analytics", tags=["system"])
+@analytics_router.get("/analytics")
 async def analytics():
     """Get task event analytics from Kafka consumer."""
     from app.services.event_consumer import EventConsumer
@@ -112,7 +133,7 @@ async def analytics():
 
 
 # Root endpoint
-@app.get("/", tags=["system"])
+@system_router.get("/")
 async def root():
     """
     Root endpoint with API information.
@@ -123,5 +144,153 @@ async def root():
     return {
         "message": "Todo API - Phase II Full-Stack Application",
         "docs": "/docs",
-        "health": "/health"
+        "health": "/health/ready"
     }
+
+
+# Initialize database tables on startup (opt-in; see DB_CREATE_TABLES_ON_STARTUP)
+def on_startup():
+    if settings.DB_CREATE_TABLES_ON_STARTUP:
+        create_db_and_tables()
+
+
+async def start_event_consumer():
+    """Start consuming task events (analytics profile)."""
+    from app.services.event_consumer import EventConsumer
+    consumer = await EventConsumer.get_instance()
+    await consumer.start()
+
+
+async def stop_event_consumer():
+    """Stop the event consumer on shutdown."""
+    from app.services.event_consumer import EventConsumer
+    consumer = await EventConsumer.get_instance()
+    await consumer.stop()
+
+
+def create_health_monitor(components: FrozenSet[str]) -> HealthMonitor:
+    """
+    Build the dependency health monitor for a profile's components.
+
+    Args:
+        components: Components from PROFILES
+
+    Returns:
+        HealthMonitor: Monitor with the relevant checks registered
+    """
+    monitor = HealthMonitor(
+        refresh_seconds=settings.HEALTH_REFRESH_SECONDS,
+        max_age_seconds=settings.HEALTH_MAX_AGE_SECONDS,
+        timeout_seconds=settings.HEALTH_CHECK_TIMEOUT_SECONDS,
+    )
+    monitor.register("database", check_database)
+    monitor.register("read_replica", check_read_replica, critical=False)
+    if "tasks" in components or "chat" in components:
+        monitor.register("kafka", check_kafka_producer, critical=False)
+    if "chat" in components:
+        monitor.register(
+            "openai", check_openai, critical=False,
+            interval=settings.HEALTH_OPENAI_INTERVAL_SECONDS,
+        )
+    return monitor
+
+
+def create_app(profile: str = "full") -> FastAPI:
+    """
+    Build the FastAPI application for a deployment profile.
+
+    Routers are imported only for the components the profile includes, so
+    e.g. task-serving pods never import the chat modules.
+
+    Args:
+        profile: One of PROFILES ("full", "tasks", "chat", "analytics")
+
+    Returns:
+        FastAPI: Configured application
+
+    Raises:
+        ValueError: If the profile is unknown
+    """
+    if profile not in PROFILES:
+        raise ValueError(f"Unknown app profile: {profile}. Available profiles: {sorted(PROFILES)}")
+    components = PROFILES[profile]
+
+    # Create FastAPI application instance
+    app = FastAPI(
+        title=settings.PROJECT_NAME,
+        description="Todo API with multi-user support and JWT authentication",
+        version="2.0.0",
+        default_response_class=FastJSONResponse,
+    )
+    app.state.profile = profile
+    app.state.health = create_health_monitor(components)
+
+    app.add_event_handler("startup", on_startup)
+    app.add_event_handler("startup", app.state.health.start)
+    app.add_event_handler("shutdown", app.state.health.stop)
+    if settings.LOOP_MONITOR_ENABLED:
+        app.add_event_handler("startup", loop_monitor.start)
+        app.add_event_handler("shutdown", loop_monitor.stop)
+    if "consumer" in components:
+        app.add_event_handler("startup", start_event_consumer)
+        app.add_event_handler("shutdown", stop_event_consumer)
+
+    # Configure CORS middleware
+    app.add_middleware(
+        CORSMiddleware,
+        allow_origins=settings.CORS_ORIGINS,
+        allow_credentials=True,
+        allow_methods=["*"],  # Allow all HTTP methods
+        allow_headers=["*"],  # Allow all headers
+    )
+
+    # Rate limiting middleware
+    if "rate_limit" in components:
+        app.add_middleware(RateLimitMiddleware, default_limit=100, auth_limit=20, window_seconds=60)
+
+    # Response compression
+    if settings.COMPRESSION_ENABLED:
+        app.add_middleware(
+            CompressionMiddleware,
+            minimum_size=settings.COMPRESSION_MIN_SIZE,
+            encodings=settings.COMPRESSION_ENCODINGS,
+            levels={
+                "gzip": settings.COMPRESSION_GZIP_LEVEL,
+                "br": settings.COMPRESSION_BROTLI_QUALITY,
+                "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+            },
+        )
+        install_precompressed_openapi(app)
+
+    # Request tracing; added last so the breakdown covers every middleware
+    if tracer.enabled:
+        app.add_middleware(TracingMiddleware, server_timing=settings.TRACING_SERVER_TIMING)
+        app.add_event_handler("shutdown", tracer.shutdown)
+
+    # Include routers
+    if "auth" in components:
+        from app.api.auth import router as auth_router
+        app.include_router(auth_router)
+    if "tasks" in components:
+        from app.api.tasks import router as tasks_router
+        app.include_router(tasks_router)
+    if "chat" in components:
+        from app.api.chat import router as chat_router
+        from app.api.conversations import router as conversations_router
+        app.include_router(chat_router)
+        app.include_router(conversations_router)
+    if "diagnostics" in components:
+        from app.api.diagnostics import router as diagnostics_router
+        app.include_router(diagnostics_router)
+
+    app.include_router(system_router)
+    if "debug" in components:
+        app.include_router(debug_router)
+    if "analytics" in components:
+        app.include_router(analytics_router)
+
+    return app
+
+
+# Application instance for uvicorn app.main:app and api/index.py
+app = create_app(settings.APP_PROFILE)
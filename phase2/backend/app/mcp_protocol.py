@@ -0,0 +1,275 @@
+"""
+MCP Protocol Server - Task tools for external MCP clients
+Phase III: serve TOOL_HANDLERS over the Model Context Protocol
+
+app.mcp_server.MCPServer dispatches tool calls inside the chat process.
+This module exposes the same tools to external agents over the MCP stdio
+and streamable-HTTP transports:
+
+    python -m app.mcp_protocol --transport stdio --user-id <user id>
+    python -m app.mcp_protocol --transport http --port 8001
+
+The user is never a tool argument: stdio serves the one user given on
+the command line (MCP_USER_ID), HTTP takes it from the same bearer JWT
+as the REST API. Any user_id sent by the client is overwritten.
+
+Calls go through MCPServer.execute_tool, so they run on the tool worker
+threads under the same deadlines, concurrency caps and circuit breakers
+as the agent's calls (see mcp_tools.policy). Each call is committed on
+its own, and only if it was not cancelled and did not time out, so a
+client that gave up on a write never sees it applied later. Beyond
+MCP_SERVER_MAX_PENDING calls in progress, new calls are rejected.
+"""
+
+import argparse
+import asyncio
+import copy
+import time
+from contextlib import asynccontextmanager
+from typing import Any, Dict, List, Optional
+
+import mcp.types as types
+from jsonschema.validators import validator_for
+from mcp.server.lowlevel import Server
+from starlette.applications import Starlette
+from starlette.responses import JSONResponse
+from starlette.routing import Route
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.responses import dumps_str
+from app.core.security import verify_token
+from app.mcp_server import mcp_server
+from app.mcp_tools import ALL_TOOLS
+
+SERVER_NAME = "todo-tasks"
+
+MCP_CALLS = metrics.counter(
+    "mcp_server_calls_total",
+    "MCP protocol tool calls (result: ok, failed, error, cancelled, rejected)",
+    ["tool", "result"],
+)
+MCP_CALL_SECONDS = metrics.histogram(
+    "mcp_server_call_seconds", "MCP protocol tool call time", ["tool"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+
+
+class ToolServerBusy(Exception):
+    """Raised when too many tool calls are in progress."""
+
+
+class ToolCallLimiter:
+    """
+    Admission control for MCP tool calls.
+    Rejects calls once max_pending are in progress instead of queueing
+    them without bound.
+    """
+
+    def __init__(self, max_pending: int = 64):
+        """
+        Initialize the limiter.
+
+        Args:
+            max_pending: Calls allowed in progress (running or waiting)
+        """
+        self.max_pending = max_pending
+        self._pending = 0
+
+    @property
+    def pending(self) -> int:
+        """Calls in progress."""
+        return self._pending
+
+    async def call(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+        """
+        Execute a tool call through MCPServer.
+
+        Args:
+            tool_name: Name of the tool
+            arguments: Tool arguments, user_id included
+
+        Returns:
+            Dictionary with the tool result
+
+        Raises:
+            ToolServerBusy: If max_pending calls are in progress
+        """
+        if self._pending >= self.max_pending:
+            MCP_CALLS.inc(tool=tool_name, result="rejected")
+            raise ToolServerBusy("Too many tool calls in progress, please retry")
+
+        self._pending += 1
+        outcome = "error"
+        start = time.perf_counter()
+        try:
+            result = await mcp_server.execute_tool(tool_name, arguments)
+            outcome = "ok" if result.get("success") else "failed"
+            return result
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            raise
+        finally:
+            self._pending -= 1
+            MCP_CALLS.inc(tool=tool_name, result=outcome)
+            MCP_CALL_SECONDS.observe(time.perf_counter() - start, tool=tool_name)
+
+
+def protocol_tools() -> List[types.Tool]:
+    """
+    MCP tool definitions from the OpenAI tool definitions, without user_id.
+
+    Returns:
+        List of MCP tools
+    """
+    tools = []
+    for tool in ALL_TOOLS:
+        function = tool["function"]
+        schema = copy.deepcopy(function["parameters"])
+        schema.get("properties", {}).pop("user_id", None)
+        schema["required"] = [name for name in schema.get("required", []) if name != "user_id"]
+        tools.append(types.Tool(
+            name=function["name"],
+            description=function["description"],
+            inputSchema=schema,
+        ))
+    return tools
+
+
+def build_server(limiter: ToolCallLimiter, user_id: Optional[str] = None) -> Server:
+    """
+    Create the MCP server.
+
+    Args:
+        limiter: Admission control for the tool calls
+        user_id: User for transports without authentication (stdio)
+
+    Returns:
+        Low-level MCP server; requests are handled concurrently
+    """
+    server = Server(SERVER_NAME)
+    tools = protocol_tools()
+    # Compiled once: the SDK's per-call jsonschema.validate re-checks the
+    # schema every time (about 0.7 ms per call)
+    validators = {tool.name: validator_for(tool.inputSchema)(tool.inputSchema) for tool in tools}
+
+    @server.list_tools()
+    async def list_tools() -> List[types.Tool]:
+        return tools
+
+    @server.call_tool(validate_input=False)
+    async def call_tool(name: str, arguments: Dict[str, Any]) -> List[types.TextContent]:
+        # Errors raised here are returned to the client as isError results
+        request = server.request_context.request
+        caller = request.scope.get("state", {}).get("user_id") if request is not None else user_id
+        if not caller:
+            raise PermissionError("Not authenticated")
+        validator = validators.get(name)
+        if validator is not None:
+            error = next(validator.iter_errors(arguments), None)
+            if error is not None:
+                raise ValueError(f"Input validation error: {error.message}")
+
+        result = await limiter.call(name, {**arguments, "user_id": caller})
+        # Compact JSON text only: serializing the same dict again as
+        # structuredContent through pydantic costs several ms for a long task list
+        return [types.TextContent(type="text", text=dumps_str(result))]
+
+    return server
+
+
+async def _bearer_user_id(scope) -> Optional[str]:
+    """User ID from the request's bearer token, or None."""
+    for name, value in scope.get("headers", []):
+        if name == b"authorization":
+            scheme, _, token = value.decode("latin-1").partition(" ")
+            if scheme.lower() != "bearer":
+                return None
+            payload = await verify_token(token.strip())
+            return payload.get("sub") if payload else None
+    return None
+
+
+class _StreamableHTTPEndpoint:
+    """ASGI endpoint that authenticates the caller and hands the request to MCP."""
+
+    def __init__(self, session_manager):
+        self.session_manager = session_manager
+
+    async def __call__(self, scope, receive, send):
+        user_id = await _bearer_user_id(scope)
+        if user_id is None:
+            response = JSONResponse(
+                {"detail": "Invalid authentication credentials"},
+                status_code=401,
+                headers={"WWW-Authenticate": "Bearer"},
+            )
+            await response(scope, receive, send)
+            return
+        scope.setdefault("state", {})["user_id"] = user_id
+        await self.session_manager.handle_request(scope, receive, send)
+
+
+def create_http_app(limiter: Optional[ToolCallLimiter] = None) -> Starlette:
+    """
+    Streamable-HTTP app serving MCP at /mcp.
+
+    Sessions are stateless, so any replica can serve any request.
+
+    Args:
+        limiter: Admission control (default: MCP_SERVER_MAX_PENDING)
+
+    Returns:
+        Starlette ASGI application
+    """
+    from mcp.server.streamable_http_manager import StreamableHTTPSessionManager
+
+    limiter = limiter or ToolCallLimiter(settings.MCP_SERVER_MAX_PENDING)
+    session_manager = StreamableHTTPSessionManager(app=build_server(limiter), stateless=True)
+
+    @asynccontextmanager
+    async def lifespan(app):
+        async with session_manager.run():
+            yield
+
+    return Starlette(
+        routes=[Route("/mcp", endpoint=_StreamableHTTPEndpoint(session_manager))],
+        lifespan=lifespan,
+    )
+
+
+async def run_stdio(user_id: str, limiter: Optional[ToolCallLimiter] = None) -> None:
+    """
+    Serve MCP over stdin/stdout for one user.
+
+    Args:
+        user_id: User whose tasks the client manages
+        limiter: Admission control (default: MCP_SERVER_MAX_PENDING)
+    """
+    from mcp.server.stdio import stdio_server
+
+    server = build_server(limiter or ToolCallLimiter(settings.MCP_SERVER_MAX_PENDING), user_id=user_id)
+    async with stdio_server() as (read_stream, write_stream):
+        await server.run(read_stream, write_stream, server.create_initialization_options())
+
+
+def main(argv: Optional[List[str]] = None) -> None:
+    parser = argparse.ArgumentParser(description="Serve the task tools over MCP")
+    parser.add_argument("--transport", choices=["stdio", "http"], default="stdio")
+    parser.add_argument("--user-id", default=settings.MCP_USER_ID, help="User served over stdio")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    args = parser.parse_args(argv)
+
+    if args.transport == "stdio":
+        if not args.user_id:
+            parser.error("stdio needs --user-id or MCP_USER_ID")
+        asyncio.run(run_stdio(args.user_id))
+    else:
+        import uvicorn
+
+        uvicorn.run(create_http_app(), host=args.host, port=args.port)
+
+
+if __name__ == "__main__":
+    main()
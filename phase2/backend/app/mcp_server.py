@@ -9,6 +9,9 @@ methods to provide a natural language interface for task operations.
 
 import json
 from typing import Any, Dict, List, Optional
+from app.core.tracing import tracer
+from app.mcp_tools.context import ToolContext
+from app.mcp_tools.policy import ToolExecutor, tool_executor
 from app.mcp_tools import (
     ALL_TOOLS,
     TOOL_HANDLERS,
@@ -28,10 +31,17 @@ class MCPServer:
     Provides tools for AI agents to interact with the task system.
     """
 
-    def __init__(self):
-        """Initialize the MCP server with available tools."""
+    def __init__(self, executor: Optional[ToolExecutor] = None):
+        """
+        Initialize the MCP server with available tools.
+
+        Args:
+            executor: Runs handlers under their deadlines, concurrency caps
+                and circuit breakers (default: the process-wide executor)
+        """
         self.tools = ALL_TOOLS
         self.handlers = TOOL_HANDLERS
+        self.executor = executor or tool_executor
 
     def get_tools(self) -> List[Dict[str, Any]]:
         """
@@ -51,16 +61,24 @@ class MCPServer:
         """
         return list(self.handlers.keys())
 
-    async def execute_tool(self, tool_name: str, arguments: Dict[str, Any]) -> Dict[str, Any]:
+    async def execute_tool(
+        self,
+        tool_name: str,
+        arguments: Dict[str, Any],
+        context: Optional[ToolContext] = None
+    ) -> Dict[str, Any]:
         """
         Execute a tool by name with given arguments.
 
         Args:
             tool_name: Name of the tool to execute
             arguments: Dictionary of arguments to pass to the tool
+            context: Shared session of the agent turn; the caller commits
+                it (default: the call is committed on its own)
 
         Returns:
-            Dictionary with tool execution result
+            Dictionary with tool execution result; a call stopped by the
+            execution policy returns success False with an error_code
 
         Raises:
             ValueError: If tool_name is not found
@@ -69,7 +87,8 @@ class MCPServer:
             raise ValueError(f"Unknown tool: {tool_name}. Available tools: {self.get_tool_names()}")
 
         handler = self.handlers[tool_name]
-        return await handler(arguments)
+        with tracer.span(f"tool.{tool_name}"):
+            return await self.executor.run(tool_name, handler, arguments, context)
 
     async def execute_tool_call(self, tool_call: Dict[str, Any]) -> Dict[str, Any]:
         """
@@ -3,13 +3,13 @@ MCP Tools Package - Task Management Tools for AI Chatbot
 Phase III: T-006 to T-013
 """
 
-from app.mcp_tools.create_task import create_task_tool, handle_create_task
-from app.mcp_tools.list_tasks import list_tasks_tool, handle_list_tasks
-from app.mcp_tools.get_task import get_task_tool, handle_get_task
-from app.mcp_tools.update_task import update_task_tool, handle_update_task
-from app.mcp_tools.complete_task import complete_task_tool, handle_complete_task
-from app.mcp_tools.delete_task import delete_task_tool, handle_delete_task
-from app.mcp_tools.search_tasks import search_tasks_tool, handle_search_tasks
+from app.mcp_tools.create_task import create_task_spec, create_task_tool, handle_create_task
+from app.mcp_tools.list_tasks import list_tasks_spec, list_tasks_tool, handle_list_tasks
+from app.mcp_tools.get_task import get_task_spec, get_task_tool, handle_get_task
+from app.mcp_tools.update_task import update_task_spec, update_task_tool, handle_update_task
+from app.mcp_tools.complete_task import complete_task_spec, complete_task_tool, handle_complete_task
+from app.mcp_tools.delete_task import delete_task_spec, delete_task_tool, handle_delete_task
+from app.mcp_tools.search_tasks import search_tasks_spec, search_tasks_tool, handle_search_tasks
 
 # Export all tools and handlers
 __all__ = [
@@ -29,19 +29,24 @@ __all__ = [
     "handle_complete_task",
     "handle_delete_task",
     "handle_search_tasks",
+    "TOOL_SPECS",
+    "READ_ONLY_TOOLS",
 ]
 
-# List of all tools for registration
-ALL_TOOLS = [
-    create_task_tool,
-    list_tasks_tool,
-    get_task_tool,
-    update_task_tool,
-    complete_task_tool,
-    delete_task_tool,
-    search_tasks_tool,
+# Tool specs: input models and generated definitions
+TOOL_SPECS = [
+    create_task_spec,
+    list_tasks_spec,
+    get_task_spec,
+    update_task_spec,
+    complete_task_spec,
+    delete_task_spec,
+    search_tasks_spec,
 ]
 
+# List of all tools for registration
+ALL_TOOLS = [spec.definition for spec in TOOL_SPECS]
+
 # Map tool names to handlers
 TOOL_HANDLERS = {
     "create_task": handle_create_task,
@@ -52,3 +57,6 @@ TOOL_HANDLERS = {
     "delete_task": handle_delete_task,
     "search_tasks": handle_search_tasks,
 }
+
+# Tools that never modify tasks
+READ_ONLY_TOOLS = frozenset({"list_tasks", "get_task", "search_tasks"})
@@ -5,83 +5,59 @@ Task: T-011 - Toggle task completion status
 
 from pydantic import BaseModel, Field
 from typing import Optional
-from sqlmodel import Session
 from app.services.task_service import TaskService
 from app.core.database import engine
+from app.mcp_tools.context import ToolContext, tool_session
+from app.mcp_tools.registry import ToolSpec
 
 
 class CompleteTaskInput(BaseModel):
     """Input schema for complete_task tool"""
-    user_id: str = Field(..., description="The user's ID")
-    task_id: int = Field(..., description="The task ID to toggle completion")
+    user_id: str = Field(..., description="The user's ID (automatically provided)")
+    task_id: int = Field(..., description="The ID of the task to mark as complete/incomplete")
 
 
-class CompleteTaskOutput(BaseModel):
-    """Output schema for complete_task tool"""
-    success: bool
-    id: Optional[int] = None
-    title: Optional[str] = None
-    completed: Optional[bool] = None
-    message: Optional[str] = None
-    error: Optional[str] = None
+complete_task_spec = ToolSpec(
+    "complete_task",
+    "Toggle a task's completion status. Use this when the user wants to mark a task as done/complete or undo a completion.",
+    CompleteTaskInput,
+)
 
 
-async def handle_complete_task(input_data: dict) -> dict:
+async def handle_complete_task(input_data: dict, context: Optional[ToolContext] = None) -> dict:
     """
     Handler for complete_task tool.
     Toggles a task's completion status.
 
     Args:
         input_data: Dictionary with user_id and task_id
+        context: Shared session of the agent turn (optional)
 
     Returns:
         Dictionary with updated task status or error message
     """
     try:
-        validated = CompleteTaskInput(**input_data)
+        validated = complete_task_spec.validate(input_data)
 
-        with Session(engine) as session:
-            service = TaskService(session, validated.user_id)
+        with tool_session(context, engine) as session:
+            service = TaskService(session, validated.user_id, autocommit=context is None)
             task = service.toggle_completion(validated.task_id)
 
             if not task:
-                return CompleteTaskOutput(
-                    success=False,
-                    error=f"Task with ID {validated.task_id} not found"
-                ).model_dump()
+                return {"success": False, "error": f"Task with ID {validated.task_id} not found"}
 
             status = "completed" if task.completed else "incomplete"
-            return CompleteTaskOutput(
-                success=True,
-                id=task.id,
-                title=task.title,
-                completed=task.completed,
-                message=f"Task '{task.title}' marked as {status}"
-            ).model_dump()
+            return {
+                "success": True,
+                "id": task.id,
+                "title": task.title,
+                "completed": task.completed,
+                "message": f"Task '{task.title}' marked as {status}"
+            }
 
     except Exception as e:
-        return CompleteTaskOutput(success=False, error=f"Failed to update task: {str(e)}").model_dump()
+        return {"success": False, "error": f"Failed to update task: {str(e)}"}
 
 
 # Tool definition for OpenAI function calling
-complete_task_tool = {
-    "type": "function",
-    "function": {
-        "name": "complete_task",
-        "description": "Toggle a task's completion status. Use this when the user wants to mark a task as done/complete or undo a completion.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "user_id": {
-                    "type": "string",
-                    "description": "The user's ID (automatically provided)"
-                },
-                "task_id": {
-                    "type": "integer",
-                    "description": "The ID of the task to mark as complete/incomplete"
-                }
-            },
-            "required": ["user_id", "task_id"]
-        }
-    }
-}
+complete_task_tool = complete_task_spec.definition
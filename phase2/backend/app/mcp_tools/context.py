@@ -0,0 +1,146 @@
+"""
+MCP Tool Execution Context
+Phase III: one database session per agent turn
+
+A ToolContext is created for the tool calls of one agent turn and passed
+through MCPServer.execute_tool to the handlers. All calls share its
+session: one connection checkout, reads served from the identity map
+where possible, and the turn's writes flushed as they happen but
+committed together by ToolContext.commit().
+
+Handlers called without a context open and commit their own session,
+as before.
+"""
+
+import logging
+from contextlib import contextmanager
+from typing import Iterator, Optional
+
+from sqlalchemy.engine import Engine
+from sqlalchemy.exc import SQLAlchemyError
+from sqlmodel import Session
+
+from app.core.database import engine, read_bind
+from app.core.metrics import metrics
+
+logger = logging.getLogger(__name__)
+
+TOOL_CONTEXT_COMMITS = metrics.counter(
+    "mcp_tool_context_commits_total",
+    "Agent turns whose tool calls were committed together (result: committed, rolled_back)",
+    ["result"],
+)
+
+# Reported for a turn's write calls when its batch was rolled back
+TURN_ROLLED_BACK = "The change could not be saved; no changes were made. Please try again."
+
+
+class ToolContext:
+    """
+    Unit of work shared by the tool calls of one agent turn.
+    The session is opened on first use, so turns without database work
+    never check out a connection.
+    """
+
+    def __init__(self, bind: Optional[Engine] = None):
+        """
+        Initialize the context.
+
+        Args:
+            bind: Engine for the shared session (default: the primary engine)
+        """
+        self._bind = bind
+        self._session: Optional[Session] = None
+        self.failed = False
+
+    @property
+    def session(self) -> Session:
+        """The turn's shared session, opened on first use."""
+        if self._session is None:
+            self._session = Session(self._bind if self._bind is not None else engine)
+        return self._session
+
+    def commit(self) -> bool:
+        """
+        Commit the turn's writes together.
+
+        Returns:
+            bool: False if a tool call hit a database error or the commit
+            failed, in which case every write of the turn was rolled back
+        """
+        if self._session is None:
+            return not self.failed
+        if not self.failed:
+            try:
+                self._session.commit()
+                TOOL_CONTEXT_COMMITS.inc(result="committed")
+                return True
+            except SQLAlchemyError as e:
+                logger.error(f"Tool call commit failed: {e}")
+                self.failed = True
+        self._session.rollback()
+        TOOL_CONTEXT_COMMITS.inc(result="rolled_back")
+        return False
+
+    def abandon(self) -> Optional[Session]:
+        """
+        Detach the session from a call that is still running.
+
+        The context is marked failed, so the turn is rolled back; later
+        calls of the turn get a new session.
+
+        Returns:
+            Session | None: The detached session, for the caller to close
+            once the running call is done
+        """
+        self.failed = True
+        session, self._session = self._session, None
+        return session
+
+    def close(self) -> None:
+        """Release the connection; uncommitted writes are discarded."""
+        if self._session is not None:
+            self._session.close()
+            self._session = None
+
+    def __enter__(self) -> "ToolContext":
+        return self
+
+    def __exit__(self, exc_type, exc, tb) -> None:
+        self.close()
+
+
+@contextmanager
+def tool_session(
+    context: Optional[ToolContext],
+    bind: Engine,
+    read_user_id: Optional[str] = None
+) -> Iterator[Session]:
+    """
+    Session for one tool call: the turn's shared session, or a new one.
+
+    A database error inside a shared session rolls it back and marks the
+    context failed, so the turn's writes are never partially committed.
+
+    Args:
+        context: The turn's ToolContext, or None for a standalone call
+        bind: Primary engine for a standalone session
+        read_user_id: For read-only calls, route a standalone session with
+            read_bind (the shared session always uses the primary)
+
+    Yields:
+        Session: Database session for the handler
+    """
+    if context is None:
+        if read_user_id is not None:
+            bind = read_bind(read_user_id, bind)
+        with Session(bind) as session:
+            yield session
+        return
+
+    try:
+        yield context.session
+    except SQLAlchemyError:
+        context.session.rollback()
+        context.failed = True
+        raise
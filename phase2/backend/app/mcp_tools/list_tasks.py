@@ -4,90 +4,65 @@ Task: T-008 - List all tasks for user
 """
 
 from pydantic import BaseModel, Field
-from typing import Optional, List
-from sqlmodel import Session
+from typing import Optional
 from app.services.task_service import TaskService
 from app.core.database import engine
+from app.mcp_tools.context import ToolContext, tool_session
+from app.mcp_tools.registry import ToolSpec
 
 
 class ListTasksInput(BaseModel):
     """Input schema for list_tasks tool"""
-    user_id: str = Field(..., description="The user's ID")
+    user_id: str = Field(..., description="The user's ID (automatically provided)")
 
 
-class TaskItem(BaseModel):
-    """Individual task in list"""
-    id: int
-    title: str
-    description: str
-    completed: bool
-    created_at: str
-    updated_at: str
+list_tasks_spec = ToolSpec(
+    "list_tasks",
+    "Get all tasks for the user. Use this to show the user their todo list or when they ask what tasks they have.",
+    ListTasksInput,
+)
 
 
-class ListTasksOutput(BaseModel):
-    """Output schema for list_tasks tool"""
-    success: bool
-    tasks: Optional[List[TaskItem]] = None
-    count: Optional[int] = None
-    error: Optional[str] = None
-
-
-async def handle_list_tasks(input_data: dict) -> dict:
+async def handle_list_tasks(input_data: dict, context: Optional[ToolContext] = None) -> dict:
     """
     Handler for list_tasks tool.
     Retrieves all tasks for the specified user.
 
     Args:
         input_data: Dictionary with user_id
+        context: Shared session of the agent turn (optional)
 
     Returns:
         Dictionary with list of tasks or error message
     """
     try:
-        validated = ListTasksInput(**input_data)
+        validated = list_tasks_spec.validate(input_data)
 
-        with Session(engine) as session:
-            service = TaskService(session, validated.user_id)
+        with tool_session(context, engine, read_user_id=validated.user_id) as session:
+            service = TaskService(session, validated.user_id, autocommit=context is None)
             tasks = service.get_all_tasks()
 
             task_items = [
-                TaskItem(
-                    id=task.id,
-                    title=task.title,
-                    description=task.description,
-                    completed=task.completed,
-                    created_at=task.created_at.isoformat(),
-                    updated_at=task.updated_at.isoformat()
-                )
+                {
+                    "id": task.id,
+                    "title": task.title,
+                    "description": task.description,
+                    "completed": task.completed,
+                    "created_at": task.created_at.isoformat(),
+                    "updated_at": task.updated_at.isoformat()
+                }
                 for task in tasks
             ]
 
-            return ListTasksOutput(
-                success=True,
-                tasks=task_items,
-                count=len(task_items)
-            ).model_dump()
+            return {
+                "success": True,
+                "tasks": task_items,
+                "count": len(task_items)
+            }
 
     except Exception as e:
-        return ListTasksOutput(success=False, error=f"Failed to list tasks: {str(e)}").model_dump()
+        return {"success": False, "error": f"Failed to list tasks: {str(e)}"}
 
 
 # Tool definition for OpenAI function calling
-list_tasks_tool = {
-    "type": "function",
-    "function": {
-        "name": "list_tasks",
-        "description": "Get all tasks for the user. Use this to show the user their todo list or when they ask what tasks they have.",
-        "parameters": {
-            "type": "object",
-            "properties": {
-                "user_id": {
-                    "type": "string",
-                    "description": "The user's ID (automatically provided)"
-                }
-            },
-            "required": ["user_id"]
-        }
-    }
-}
+list_tasks_tool = list_tasks_spec.definition
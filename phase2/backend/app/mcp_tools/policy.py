@@ -0,0 +1,278 @@
+"""
+MCP Tool Execution Policy
+Phase III: deadlines, concurrency caps and circuit breakers for tool calls
+
+MCPServer.execute_tool runs every handler through a ToolExecutor:
+
+- The handler runs on a worker thread (MCP_TOOL_WORKERS), so blocking
+  database code never stalls the event loop and a deadline can be enforced.
+- Each tool has a deadline (MCP_TOOL_TIMEOUT_SECONDS, overridden per tool
+  by MCP_TOOL_TIMEOUTS) covering the wait for a slot and the call itself.
+- Each tool has a concurrency cap (MCP_TOOL_MAX_CONCURRENCY, overridden by
+  MCP_TOOL_CONCURRENCY_LIMITS); further calls wait for a slot.
+- Each dependency has a circuit breaker. Timeouts and database errors
+  count as failures; while the breaker is open, calls fail immediately.
+
+Timeouts and open breakers come back as structured results
+({"success": False, "error": ..., "error_code": ...}) that the model can
+relay to the user. A call that misses its deadline keeps running on its
+thread until its query returns, and its writes (and those of the rest of
+its ToolContext) are rolled back.
+"""
+
+import asyncio
+import contextvars
+import logging
+import threading
+import time
+import weakref
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Any, Awaitable, Callable, Dict, Optional
+
+from app.core.circuit_breaker import CircuitBreakerRegistry
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.mcp_tools import READ_ONLY_TOOLS
+from app.mcp_tools.context import TURN_ROLLED_BACK, ToolContext
+
+logger = logging.getLogger(__name__)
+
+ToolHandler = Callable[[Dict[str, Any], Optional[ToolContext]], Awaitable[Dict[str, Any]]]
+
+# Dependency of the task tools
+DATABASE = "database"
+
+# error_code values of policy failures
+ERROR_TIMEOUT = "timeout"
+ERROR_UNAVAILABLE = "dependency_unavailable"
+ERROR_TOOL = "tool_error"
+
+TOOL_CALLS = metrics.counter(
+    "mcp_tool_calls_total",
+    "Tool calls by outcome (ok, failed, timeout, rejected, cancelled)",
+    ["tool", "result"],
+)
+TOOL_SECONDS = metrics.histogram(
+    "mcp_tool_seconds", "Tool call time including the wait for a slot", ["tool"],
+    buckets=(0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0),
+)
+TOOL_TIMEOUTS = metrics.counter(
+    "mcp_tool_timeouts_total", "Tool calls that missed their deadline", ["tool"]
+)
+
+
+@dataclass(frozen=True)
+class ToolPolicy:
+    """Execution limits of one tool."""
+
+    timeout_seconds: float
+    max_concurrency: int
+    dependency: str = DATABASE
+
+
+def policy_for(tool_name: str) -> ToolPolicy:
+    """
+    Policy of a tool from settings.
+
+    Args:
+        tool_name: Name of the tool
+
+    Returns:
+        ToolPolicy: Deadline and concurrency cap, per-tool overrides applied
+    """
+    return ToolPolicy(
+        timeout_seconds=settings.MCP_TOOL_TIMEOUTS.get(tool_name, settings.MCP_TOOL_TIMEOUT_SECONDS),
+        max_concurrency=settings.MCP_TOOL_CONCURRENCY_LIMITS.get(tool_name, settings.MCP_TOOL_MAX_CONCURRENCY),
+    )
+
+
+def tool_error(tool_name: str, error_code: str, retry_after: Optional[float] = None) -> Dict[str, Any]:
+    """
+    Structured failure result of a call stopped by the policy.
+
+    Args:
+        tool_name: Name of the tool
+        error_code: ERROR_TIMEOUT, ERROR_UNAVAILABLE or ERROR_TOOL
+        retry_after: Seconds after which a retry may succeed
+
+    Returns:
+        Dictionary in the tools' result format
+    """
+    if error_code == ERROR_TIMEOUT:
+        error = f"{tool_name} took too long and was cancelled. No changes were made."
+    elif error_code == ERROR_UNAVAILABLE:
+        error = "Task storage is temporarily unavailable. No changes were made; please try again shortly."
+    else:
+        error = f"{tool_name} failed unexpectedly. No changes were made."
+    result = {"success": False, "error": error, "error_code": error_code}
+    if retry_after is not None:
+        result["retry_after"] = round(retry_after, 1)
+    return result
+
+
+_worker = threading.local()
+
+
+def _run_handler(
+    handler: ToolHandler,
+    tool_name: str,
+    arguments: Dict[str, Any],
+    context: ToolContext,
+    commit: bool,
+    abandoned: threading.Event,
+) -> Dict[str, Any]:
+    """Run a handler on a worker thread; commit its own context unless abandoned."""
+    loop = getattr(_worker, "loop", None)
+    if loop is None:
+        # The handlers never await I/O, so one loop per worker is enough
+        loop = _worker.loop = asyncio.new_event_loop()
+
+    # Run in the caller's context (copied by ToolExecutor), so the request's
+    # trace span is current for the handler's SQL
+    task = loop.create_task(handler(arguments, context), context=contextvars.copy_context())
+    result = loop.run_until_complete(task)
+    if commit and not abandoned.is_set():
+        if not context.commit() and tool_name not in READ_ONLY_TOOLS:
+            result = {"success": False, "error": TURN_ROLLED_BACK}
+    return result
+
+
+class ToolExecutor:
+    """
+    Runs tool handlers under their ToolPolicy.
+    """
+
+    def __init__(
+        self,
+        max_workers: int = 4,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+        policy: Callable[[str], ToolPolicy] = policy_for,
+    ):
+        """
+        Initialize the executor.
+
+        Args:
+            max_workers: Threads running handlers (one DB connection each)
+            breakers: Circuit breakers by dependency (default: from settings)
+            policy: Returns the ToolPolicy of a tool name
+        """
+        self.max_workers = max_workers
+        self.breakers = breakers or CircuitBreakerRegistry(
+            failure_threshold=settings.MCP_BREAKER_FAILURE_THRESHOLD,
+            reset_seconds=settings.MCP_BREAKER_RESET_SECONDS,
+        )
+        self.policy = policy
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="mcp-tool")
+        # asyncio semaphores belong to one event loop
+        self._semaphores: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Dict[str, asyncio.Semaphore]]" = (
+            weakref.WeakKeyDictionary()
+        )
+
+    def _semaphore(self, tool_name: str, limit: int) -> asyncio.Semaphore:
+        per_loop = self._semaphores.setdefault(asyncio.get_running_loop(), {})
+        semaphore = per_loop.get(tool_name)
+        if semaphore is None:
+            semaphore = per_loop[tool_name] = asyncio.Semaphore(limit)
+        return semaphore
+
+    async def run(
+        self,
+        tool_name: str,
+        handler: ToolHandler,
+        arguments: Dict[str, Any],
+        context: Optional[ToolContext] = None
+    ) -> Dict[str, Any]:
+        """
+        Run a tool call under its policy.
+
+        Args:
+            tool_name: Name of the tool
+            handler: The tool's handler
+            arguments: Tool arguments
+            context: Shared session of the agent turn; without one the call
+                gets its own context and is committed here
+
+        Returns:
+            Dictionary with the tool result, or a structured policy error
+        """
+        policy = self.policy(tool_name)
+        breaker = self.breakers.get(policy.dependency)
+        if not breaker.allow():
+            TOOL_CALLS.inc(tool=tool_name, result="rejected")
+            return tool_error(tool_name, ERROR_UNAVAILABLE, retry_after=breaker.retry_after())
+
+        owned = context is None
+        if owned:
+            context = ToolContext()
+        # Opened here, on the loop, so an abandoned call keeps its own session
+        context.session
+        failed_before = context.failed
+        abandoned = threading.Event()
+        loop = asyncio.get_running_loop()
+        semaphore = self._semaphore(tool_name, policy.max_concurrency)
+        future = None
+
+        async def dispatch() -> Dict[str, Any]:
+            nonlocal future
+            await semaphore.acquire()
+            # Thread pools don't propagate contextvars (the current trace span)
+            future = self._executor.submit(
+                contextvars.copy_context().run,
+                _run_handler, handler, tool_name, arguments, context, owned, abandoned
+            )
+            # The slot is held until the thread is done, not just until we stop waiting
+            future.add_done_callback(lambda _: loop.call_soon_threadsafe(semaphore.release))
+            if owned:
+                future.add_done_callback(lambda _: context.close())
+            return await asyncio.wrap_future(future)
+
+        start = time.perf_counter()
+        outcome = "ok"
+        try:
+            result = await asyncio.wait_for(dispatch(), policy.timeout_seconds)
+        except asyncio.TimeoutError:
+            outcome = "timeout"
+            TOOL_TIMEOUTS.inc(tool=tool_name)
+            logger.warning(f"Tool {tool_name} missed its {policy.timeout_seconds:g}s deadline")
+            result = tool_error(tool_name, ERROR_TIMEOUT)
+        except asyncio.CancelledError:
+            outcome = "cancelled"
+            breaker.release()
+            TOOL_CALLS.inc(tool=tool_name, result=outcome)
+            raise
+        except Exception as e:
+            outcome = "failed"
+            logger.error(f"Tool {tool_name} raised: {e}")
+            result = tool_error(tool_name, ERROR_TOOL)
+        finally:
+            if outcome in ("timeout", "cancelled"):
+                abandoned.set()
+                if future is None and owned:
+                    context.close()
+                elif not owned:
+                    # The turn can't commit a session a thread may still use
+                    detached = context.abandon()
+                    if future is not None and detached is not None:
+                        future.add_done_callback(lambda _: detached.close())
+                    elif detached is not None:
+                        detached.close()
+            TOOL_SECONDS.observe(time.perf_counter() - start, tool=tool_name)
+
+        if outcome == "ok" and context.failed and not failed_before:
+            outcome = "failed"
+
+        if outcome == "ok":
+            breaker.record_success()
+        else:
+            breaker.record_failure()
+        TOOL_CALLS.inc(tool=tool_name, result=outcome)
+        return result
+
+    def shutdown(self) -> None:
+        """Stop the workers after the running calls finish."""
+        self._executor.shutdown(wait=True, cancel_futures=True)
+
+
+# Process-wide executor used by MCPServer
+tool_executor = ToolExecutor(max_workers=settings.MCP_TOOL_WORKERS)
@@ -0,0 +1,91 @@
+"""
+MCP Tool Registry
+Phase III: tool schemas and argument validation from the input models
+
+Each tool module declares a ToolSpec from its pydantic input model. The
+OpenAI function definition is generated from the model's JSON schema
+once, at import, and arguments are validated with the model's compiled
+pydantic-core validator, so the field descriptions live in one place and
+a call does no schema work.
+"""
+
+from typing import Any, Dict, Type
+
+from pydantic import BaseModel
+
+
+def _property_schema(schema: Dict[str, Any]) -> Dict[str, Any]:
+    """One property in OpenAI form: Optional[X] as X, no titles or defaults."""
+    options = schema.get("anyOf")
+    if options is not None:
+        non_null = [option for option in options if option.get("type") != "null"]
+        if len(non_null) == 1:
+            schema = {**non_null[0], **{k: v for k, v in schema.items() if k != "anyOf"}}
+    prop = {k: v for k, v in schema.items() if k not in ("title", "default")}
+    # "type" first, then the description, as in the hand-written definitions
+    return dict(sorted(prop.items(), key=lambda item: item[0] != "type"))
+
+
+def openai_parameters(model: Type[BaseModel]) -> Dict[str, Any]:
+    """
+    OpenAI function parameters from a pydantic input model.
+
+    Args:
+        model: Input model of the tool
+
+    Returns:
+        JSON schema object with properties and required fields
+    """
+    schema = model.model_json_schema()
+    return {
+        "type": "object",
+        "properties": {
+            name: _property_schema(prop) for name, prop in schema.get("properties", {}).items()
+        },
+        "required": schema.get("required", []),
+    }
+
+
+class ToolSpec:
+    """
+    Name, description and input model of one tool.
+    """
+
+    def __init__(self, name: str, description: str, input_model: Type[BaseModel]):
+        """
+        Initialize the spec and generate the tool definition.
+
+        Args:
+            name: Tool name the model calls
+            description: When the model should use the tool
+            input_model: Pydantic model of the arguments
+        """
+        self.name = name
+        self.description = description
+        self.input_model = input_model
+        self.definition: Dict[str, Any] = {
+            "type": "function",
+            "function": {
+                "name": name,
+                "description": description,
+                "parameters": openai_parameters(input_model),
+            },
+        }
+        # Compiled when the model class was created; calling it directly
+        # skips BaseModel.__init__'s keyword packing
+        self._validate = input_model.__pydantic_validator__.validate_python
+
+    def validate(self, arguments: Dict[str, Any]) -> BaseModel:
+        """
+        Validate tool arguments.
+
+        Args:
+            arguments: Raw arguments from the model or client
+
+        Returns:
+            Instance of the input model
+
+        Raises:
+            pydantic.ValidationError: If the arguments don't match the model
+        """
+        return self._validate(arguments)
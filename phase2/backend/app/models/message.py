@@ -8,7 +8,7 @@ Represents an individual message in a conversation.
 """
 
 from sqlmodel import SQLModel, Field, Column
-from sqlalchemy import JSON
+from sqlalchemy import JSON, Index
 from datetime import datetime
 from typing import Optional, Any
 
@@ -25,14 +25,23 @@ class Message(SQLModel, table=True):
         conversation_id: ID of the conversation this message belongs to
         role: Message role ('user' or 'assistant')
         content: Message text content
-        tool_calls: JSON array of tool invocations (if assistant used tools)
+        tool_calls: JSON array of tool invocations (if assistant used tools);
+            large results are replaced by a digest referencing tool_results
         created_at: When the message was created
     """
     __tablename__ = "messages"
+    # Same composite index as the Alembic migration (history and pagination)
+    __table_args__ = (Index("idx_conversation_messages", "conversation_id", "created_at"),)
 
     id: Optional[int] = Field(default=None, primary_key=True)
-    conversation_id: int = Field(foreign_key="conversations.id", index=True)
+    conversation_id: int = Field(foreign_key="conversations.id", index=True, ondelete="CASCADE")
     role: str = Field(max_length=20)  # 'user' or 'assistant'
     content: str
     tool_calls: Optional[Any] = Field(default=None, sa_column=Column(JSON))
     created_at: datetime = Field(default_factory=datetime.utcnow)
+
+
+# Archived messages and spilled tool results live in their own tables;
+# register them alongside messages
+from app.models.message_archive import MessageArchive  # noqa: E402,F401
+from app.models.tool_result import ToolResult, ToolResultRef  # noqa: E402,F401
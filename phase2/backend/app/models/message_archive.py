@@ -0,0 +1,40 @@
+# [From]: Message retention - archive tier for idle conversations
+
+"""
+Message archive model.
+
+Holds the messages of an idle conversation as one compressed JSON blob,
+so the hot messages table and its index only contain active conversations.
+"""
+
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import LargeBinary
+from datetime import datetime
+from typing import Optional
+
+
+class MessageArchive(SQLModel, table=True):
+    """
+    Archived messages of one conversation.
+
+    Every archived message is older than the conversation's remaining hot
+    messages; MessageService merges both tiers on read.
+
+    Attributes:
+        id: Unique archive identifier (auto-incremented)
+        conversation_id: Conversation the messages belong to (one archive each)
+        codec: Compression of data ('zstd' or 'gzip')
+        data: Compressed JSON array of message rows, oldest first
+        message_count: Number of messages in data
+        last_message_at: created_at of the newest archived message
+        archived_at: When the archive was last written
+    """
+    __tablename__ = "message_archives"
+
+    id: Optional[int] = Field(default=None, primary_key=True)
+    conversation_id: int = Field(foreign_key="conversations.id", unique=True, ondelete="CASCADE")
+    codec: str = Field(max_length=10)
+    data: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    message_count: int = Field(default=0)
+    last_message_at: datetime
+    archived_at: datetime = Field(default_factory=datetime.utcnow)
@@ -0,0 +1,56 @@
+# [From]: Compact tool_calls storage - spilled tool results
+
+"""
+Tool result models.
+
+Holds large MCP tool results outside messages.tool_calls, addressed by the
+SHA-256 of their JSON so identical results (e.g. the same list_tasks
+output on consecutive turns) are stored once, plus one reference row per
+message that points at a stored result.
+"""
+
+from sqlmodel import SQLModel, Field, Column
+from sqlalchemy import LargeBinary
+from datetime import datetime
+
+
+class ToolResult(SQLModel, table=True):
+    """
+    Content-addressed tool result referenced from messages.tool_calls.
+
+    Attributes:
+        hash: SHA-256 hex digest of the uncompressed JSON (primary key)
+        codec: Compression of data ('zstd' or 'gzip')
+        data: Compressed JSON of the tool result
+        size: Size of the uncompressed JSON in bytes
+        created_at: When the result was first stored
+        last_referenced_at: When a message last referenced the result
+            (orphans are only deleted a grace period after this)
+    """
+    __tablename__ = "tool_results"
+
+    hash: str = Field(primary_key=True, max_length=64)
+    codec: str = Field(max_length=10)
+    data: bytes = Field(sa_column=Column(LargeBinary, nullable=False))
+    size: int
+    created_at: datetime = Field(default_factory=datetime.utcnow)
+    last_referenced_at: datetime = Field(default_factory=datetime.utcnow, index=True)
+
+
+class ToolResultRef(SQLModel, table=True):
+    """
+    A message's reference to a stored tool result.
+
+    message_id has no foreign key: archived messages leave the messages
+    table but keep their IDs, and their references stay valid.
+
+    Attributes:
+        hash: Referenced tool result
+        message_id: Referencing message (hot or archived)
+        conversation_id: Conversation of the message, for conversation deletes
+    """
+    __tablename__ = "tool_result_refs"
+
+    hash: str = Field(primary_key=True, max_length=64, foreign_key="tool_results.hash")
+    message_id: int = Field(primary_key=True)
+    conversation_id: int = Field(foreign_key="conversations.id", index=True, ondelete="CASCADE")
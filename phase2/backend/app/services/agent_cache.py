@@ -0,0 +1,171 @@
+"""
+Agent response cache
+Phase III: skip the model for repeated read-only questions
+
+Caches the agent's final answer for turns whose tool calls were all
+read-only (list_tasks, get_task, search_tasks), keyed by user, normalized
+prompt and the version of the user's task set. Any task write changes the
+version, so stale answers are never served; they simply stop matching and
+age out of the LRU.
+
+Turns without tool calls are not cached: their answers depend on the
+conversation rather than on task data.
+"""
+
+import hashlib
+import re
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlmodel import Session
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import metrics
+from app.mcp_tools import READ_ONLY_TOOLS
+from app.services.task_service import TaskService
+
+AGENT_CACHE_REQUESTS = metrics.counter(
+    "agent_cache_requests_total",
+    "Agent response cache lookups (bypass: task version unavailable)",
+    ["result"],
+)
+AGENT_CACHE_STORES = metrics.counter(
+    "agent_cache_stores_total", "Agent answers added to the response cache"
+)
+
+_PUNCTUATION = re.compile(r"[\s?!.,;:]+")
+
+
+def normalize_prompt(message: str) -> str:
+    """Lowercase and collapse whitespace and punctuation: "What's on my list?" == "what's on my list"."""
+    return _PUNCTUATION.sub(" ", message.lower()).strip()
+
+
+def is_cacheable(tool_calls: Optional[List[Dict[str, Any]]]) -> bool:
+    """
+    Whether a turn's answer may be cached.
+
+    Args:
+        tool_calls: Tool calls made during the turn
+
+    Returns:
+        bool: True if at least one tool was called and every call was a
+        successful read-only call
+    """
+    if not tool_calls:
+        return False
+    return all(
+        call["name"] in READ_ONLY_TOOLS and (call.get("result") or {}).get("success")
+        for call in tool_calls
+    )
+
+
+def task_set_version(user_id: str) -> str:
+    """
+    Version of a user's task set, read from the primary.
+
+    Args:
+        user_id: User whose tasks are versioned
+
+    Returns:
+        str: Opaque version string
+    """
+    with Session(engine) as session:
+        return TaskService(session, user_id).get_task_set_version()
+
+
+class AgentResponseCache:
+    """
+    Bounded LRU cache of agent answers with a time-to-live.
+    """
+
+    def __init__(self, max_size: int = 10000, ttl_seconds: float = 600):
+        """
+        Initialize the cache.
+
+        Args:
+            max_size: Maximum number of cached answers (0 disables caching)
+            ttl_seconds: How long an answer may be served
+        """
+        self.max_size = max_size
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Tuple[Dict[str, Any], float]]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    @staticmethod
+    def _key(user_id: str, message: str, version: str) -> bytes:
+        return hashlib.sha256(
+            "\x00".join((user_id, normalize_prompt(message), version)).encode()
+        ).digest()
+
+    def get(self, user_id: str, message: str, version: str) -> Optional[Dict[str, Any]]:
+        """
+        Look up a cached answer.
+
+        Args:
+            user_id: The authenticated user's ID
+            message: The user's message content
+            version: Current task_set_version of the user
+
+        Returns:
+            dict | None: The cached agent response if present and fresh
+        """
+        if not self.max_size:
+            return None
+
+        key = self._key(user_id, message, version)
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is not None:
+                response, expires_at = entry
+                if time.monotonic() < expires_at:
+                    self._entries.move_to_end(key)
+                    AGENT_CACHE_REQUESTS.inc(result="hit")
+                    return dict(response)
+                del self._entries[key]
+
+        AGENT_CACHE_REQUESTS.inc(result="miss")
+        return None
+
+    def put(self, user_id: str, message: str, version: str, response: Dict[str, Any]) -> None:
+        """
+        Cache an agent response under the task version it was computed at.
+
+        Args:
+            user_id: The authenticated user's ID
+            message: The user's message content
+            version: task_set_version read before the turn
+            response: Agent response (content and tool_calls)
+        """
+        if not self.max_size:
+            return
+
+        key = self._key(user_id, message, version)
+        with self._lock:
+            self._entries[key] = (dict(response), time.monotonic() + self.ttl_seconds)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_size:
+                self._entries.popitem(last=False)
+        AGENT_CACHE_STORES.inc()
+
+    def clear(self) -> None:
+        with self._lock:
+            self._entries.clear()
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+
+# Global cache shared by all agent turns in this process
+agent_response_cache = AgentResponseCache(
+    max_size=settings.AGENT_CACHE_MAX_ENTRIES if settings.AGENT_CACHE_ENABLED else 0,
+    ttl_seconds=settings.AGENT_CACHE_TTL_SECONDS,
+)
+
+metrics.gauge(
+    "agent_cache_entries", "Answers held by the agent response cache",
+    callback=lambda: len(agent_response_cache),
+)
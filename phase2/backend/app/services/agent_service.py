@@ -5,31 +5,61 @@ Task: T-017, T-018 - Integrate MCP tools with agent and create service layer
 This service handles communication between the chat API and the AI agent,
 processing messages and executing tool calls.
 
-Uses OpenAI API with gpt-4o-mini for fast responses.
+Completions come from the LLM providers (OpenAI gpt-4o-mini, Gemini) with
+failover and optional hedging; see llm_providers.
 """
 
 import json
+import logging
 from typing import List, Dict, Any, Optional
-from openai import AsyncOpenAI
-from app.core.config import settings
+from app.core.responses import dumps_str
 from app.mcp_server import mcp_server
+from app.mcp_tools import READ_ONLY_TOOLS
+from app.core.tracing import tracer
+from app.mcp_tools.context import TURN_ROLLED_BACK, ToolContext
+from app.services.agent_cache import (
+    AGENT_CACHE_REQUESTS,
+    agent_response_cache,
+    is_cacheable,
+    task_set_version,
+)
+from app.services.intent_router import intent_router
+from app.services.llm_providers import LLMRouter, build_llm_router
 from app.services.agent_config import (
     AGENT_INSTRUCTIONS,
     AGENT_TEMPERATURE,
 )
 
+logger = logging.getLogger(__name__)
+
 
 class AgentService:
     """
-    Service for processing chat messages through the OpenAI agent.
+    Service for processing chat messages through the LLM agent.
     Handles tool execution and response generation.
     """
 
-    def __init__(self):
-        """Initialize the agent service with OpenAI client."""
-        self.client = AsyncOpenAI(api_key=settings.OPENAI_API_KEY)
-        self.model_name = "gpt-4o-mini"
+    def __init__(self, llm: Optional[LLMRouter] = None):
+        """
+        Initialize the agent service.
+
+        Args:
+            llm: Providers to send completions to (default: from settings)
+        """
+        self.llm = llm or build_llm_router()
         self.tools = mcp_server.get_tools()
+        self.response_cache = agent_response_cache
+
+    def _task_set_version(self, user_id: str) -> Optional[str]:
+        """Task set version for the response cache, or None to bypass it."""
+        if not self.response_cache.max_size:
+            return None
+        try:
+            return task_set_version(user_id)
+        except Exception as e:
+            logger.warning(f"Agent cache bypassed, task version unavailable: {e}")
+            AGENT_CACHE_REQUESTS.inc(result="bypass")
+            return None
 
     async def process_message(
         self,
@@ -38,7 +68,10 @@ class AgentService:
         conversation_history: Optional[List[Dict[str, Any]]] = None
     ) -> Dict[str, Any]:
         """
-        Process a user message through the OpenAI agent.
+        Process a user message through the LLM agent.
+
+        Answers to read-only questions are served from the response cache
+        while the user's tasks are unchanged (see agent_cache).
 
         Args:
             user_id: The authenticated user's ID
@@ -50,6 +83,12 @@ class AgentService:
                 - content: The agent's response text
                 - tool_calls: List of tools that were called (if any)
         """
+        version = self._task_set_version(user_id)
+        if version is not None:
+            cached = self.response_cache.get(user_id, message_content, version)
+            if cached is not None:
+                return cached
+
         # Build messages
         messages = [{"role": "system", "content": AGENT_INSTRUCTIONS}]
 
@@ -62,19 +101,19 @@ class AgentService:
 
         messages.append({"role": "user", "content": message_content})
 
-        # Call OpenAI
-        response = await self.client.chat.completions.create(
-            model=self.model_name,
-            messages=messages,
-            tools=self.tools if self.tools else None,
-            temperature=AGENT_TEMPERATURE,
-        )
+        # Call the model
+        with tracer.span("agent.round", {"agent.round": 1}):
+            response = await self.llm.create(
+                messages=messages,
+                tools=self.tools if self.tools else None,
+                temperature=AGENT_TEMPERATURE,
+            )
 
         tool_calls_made = []
         choice = response.choices[0]
 
-        # Handle tool calls
-        if choice.finish_reason == "tool_calls" and choice.message.tool_calls:
+        # Handle tool calls (Gemini reports finish_reason "stop" for them)
+        if choice.message.tool_calls:
             # Add assistant message with tool calls as dict
             assistant_msg = {
                 "role": "assistant",
@@ -93,48 +132,80 @@ class AgentService:
             }
             messages.append(assistant_msg)
 
-            for tc in choice.message.tool_calls:
-                tool_name = tc.function.name
-                tool_args = json.loads(tc.function.arguments)
+            # All calls of the turn share one session and are committed
+            # together before the second model call, so no transaction is
+            # held open while waiting on the model
+            with tracer.span("agent.tools"), ToolContext() as context:
+                for tc in choice.message.tool_calls:
+                    tool_name = tc.function.name
+                    tool_args = json.loads(tc.function.arguments)
 
-                # Inject user_id
-                tool_args["user_id"] = user_id
+                    # Inject user_id
+                    tool_args["user_id"] = user_id
 
-                # Execute the tool
-                result = await mcp_server.execute_tool(tool_name, tool_args)
+                    # Execute the tool
+                    result = await mcp_server.execute_tool(tool_name, tool_args, context)
 
-                tool_calls_made.append({
-                    "id": tc.id,
-                    "name": tool_name,
-                    "arguments": tool_args,
-                    "result": result
-                })
-
-                # Add tool result
+                    tool_calls_made.append({
+                        "id": tc.id,
+                        "name": tool_name,
+                        "arguments": tool_args,
+                        "result": result
+                    })
+
+                if not context.commit():
+                    # Nothing was saved; don't let the model claim otherwise
+                    for call in tool_calls_made:
+                        if call["name"] not in READ_ONLY_TOOLS:
+                            call["result"] = {"success": False, "error": TURN_ROLLED_BACK}
+
+            # Add tool results
+            for call in tool_calls_made:
                 messages.append({
                     "role": "tool",
-                    "tool_call_id": tc.id,
-                    "content": json.dumps(result)
+                    "tool_call_id": call["id"],
+                    "content": dumps_str(call["result"])
                 })
 
             # Get final response after tool execution
-            response = await self.client.chat.completions.create(
-                model=self.model_name,
-                messages=messages,
-                temperature=AGENT_TEMPERATURE,
-            )
+            with tracer.span("agent.round", {"agent.round": 2}):
+                response = await self.llm.create(
+                    messages=messages,
+                    temperature=AGENT_TEMPERATURE,
+                )
             choice = response.choices[0]
 
         response_text = choice.message.content or ""
 
-        return {
+        result = {
             "content": response_text or "I apologize, I couldn't generate a response.",
             "tool_calls": tool_calls_made if tool_calls_made else None
         }
 
+        # The version was read before any tool ran, so a concurrent write
+        # can only make this entry unreachable, never stale
+        if version is not None and response_text and is_cacheable(tool_calls_made):
+            self.response_cache.put(user_id, message_content, version, result)
+
+        return result
 
-# Global agent service instance
-agent_service = AgentService()
+
+# Global agent service instance, created on first use so that importing
+# this module (and app startup) doesn't construct the provider clients
+agent_service: Optional[AgentService] = None
+
+
+def get_agent_service() -> AgentService:
+    """
+    Get the global agent service instance, creating it on first use.
+
+    Returns:
+        AgentService instance
+    """
+    global agent_service
+    if agent_service is None:
+        agent_service = AgentService()
+    return agent_service
 
 
 async def process_chat_message(
@@ -145,6 +216,9 @@ async def process_chat_message(
     """
     Convenience function to process a chat message.
 
+    Simple commands are answered by the intent router without calling the
+    model; everything else goes to the agent.
+
     Args:
         user_id: The authenticated user's ID
         message_content: The user's message content
@@ -153,6 +227,10 @@ async def process_chat_message(
     Returns:
         Dictionary with content and tool_calls
     """
-    return await agent_service.process_message(
+    routed = await intent_router.route(user_id, message_content)
+    if routed is not None:
+        return routed
+
+    return await get_agent_service().process_message(
         user_id, message_content, conversation_history
     )
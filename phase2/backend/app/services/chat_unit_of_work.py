@@ -0,0 +1,178 @@
+"""
+Chat Unit of Work
+Phase III: Chat persistence in at most two transactions
+
+Persists a chat turn around the LLM call: one transaction before it
+(conversation, title, user message) and one after it (assistant message,
+conversation timestamp). Replaces the per-step commit/refresh cycle of
+ConversationService and MessageService on the chat hot path.
+"""
+
+from sqlmodel import Session, select, update
+from app.core.database import bind_user, engine
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.services.message_service import MessageService
+from app.services.tool_result_store import add_tool_result_refs, compact_tool_calls
+from typing import Optional, List, Any, Dict
+from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Maximum length of a title auto-generated from the first message
+TITLE_MAX_CHARS = 50
+
+
+class ChatUnitOfWork:
+    """
+    Unit of work for a single chat turn.
+    Ensures data isolation by only resolving conversations owned by user_id.
+    """
+
+    def __init__(self, session: Session, user_id: str):
+        """
+        Initialize the unit of work.
+
+        Args:
+            session: Database session
+            user_id: Current user's ID (from JWT token)
+        """
+        self.session = session
+        self.user_id = user_id
+        bind_user(session, user_id)
+        self.conversation_id: Optional[int] = None
+        self.user_message_id: Optional[int] = None
+
+    @staticmethod
+    def make_title(message: str) -> str:
+        """
+        Build a conversation title from the first message.
+
+        Args:
+            message: First user message
+
+        Returns:
+            str: Title truncated to TITLE_MAX_CHARS with an ellipsis
+        """
+        title = message[:TITLE_MAX_CHARS].strip()
+        if len(message) > TITLE_MAX_CHARS:
+            title += "..."
+        return title
+
+    def begin(
+        self,
+        message: str,
+        conversation_id: Optional[int] = None
+    ) -> List[Dict[str, Any]]:
+        """
+        First transaction: resolve (or create) the conversation, load its
+        history and save the user message.
+
+        History is loaded before the user message is added, so it holds only
+        the previous turns. A new conversation skips the history query.
+
+        Args:
+            message: User's message content
+            conversation_id: Existing conversation ID (optional)
+
+        Returns:
+            List of previous messages in OpenAI format
+        """
+        conversation = None
+        if conversation_id:
+            statement = select(Conversation).where(
+                Conversation.id == conversation_id,
+                Conversation.user_id == self.user_id
+            )
+            conversation = self.session.exec(statement).first()
+
+        history: List[Dict[str, Any]] = []
+        if conversation is None:
+            conversation = Conversation(
+                user_id=self.user_id,
+                title=self.make_title(message)
+            )
+            self.session.add(conversation)
+            self.session.flush()
+        else:
+            history = MessageService(self.session).get_conversation_history(conversation.id)
+
+        user_message = Message(
+            conversation_id=conversation.id,
+            role="user",
+            content=message
+        )
+        self.session.add(user_message)
+        self.session.flush()
+
+        # Capture IDs before commit expires the instances
+        self.conversation_id = conversation.id
+        self.user_message_id = user_message.id
+        self.session.commit()
+
+        return history
+
+    def complete(
+        self,
+        content: str,
+        tool_calls: Optional[List[Dict[str, Any]]] = None
+    ) -> int:
+        """
+        Second transaction: save the assistant message and bump the
+        conversation's updated_at timestamp.
+
+        Args:
+            content: Assistant's response content
+            tool_calls: Optional list of tool call details
+
+        Returns:
+            int: ID of the saved assistant message
+        """
+        if self.conversation_id is None:
+            raise ValueError("begin() must be called before complete()")
+
+        assistant_message = Message(
+            conversation_id=self.conversation_id,
+            role="assistant",
+            content=content,
+            tool_calls=compact_tool_calls(self.session, tool_calls)
+        )
+        self.session.add(assistant_message)
+        self.session.flush()
+        add_tool_result_refs(self.session, assistant_message)
+        self.session.exec(
+            update(Conversation)
+            .where(Conversation.id == self.conversation_id)
+            .values(updated_at=datetime.utcnow())
+        )
+
+        message_id = assistant_message.id
+        self.session.commit()
+
+        return message_id
+
+
+def complete_in_background(
+    user_id: str,
+    conversation_id: int,
+    content: str,
+    tool_calls: Optional[List[Dict[str, Any]]] = None
+) -> None:
+    """
+    Run the second transaction with its own session, after the response
+    has been sent. Intended for FastAPI BackgroundTasks.
+
+    Args:
+        user_id: Current user's ID
+        conversation_id: Conversation resolved by begin()
+        content: Assistant's response content
+        tool_calls: Optional list of tool call details
+    """
+    try:
+        with Session(engine) as session:
+            uow = ChatUnitOfWork(session, user_id)
+            uow.conversation_id = conversation_id
+            uow.complete(content, tool_calls)
+    except Exception as e:
+        logger.exception(f"Failed to persist assistant message for conversation {conversation_id}: {e}")
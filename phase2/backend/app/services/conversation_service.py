@@ -5,11 +5,27 @@ Task: T-020 - Create conversation service
 Handles conversation CRUD operations and history loading.
 """
 
-from sqlmodel import Session, select
+from sqlmodel import Session, delete, select, update
+from app.core.config import settings
+from app.core.database import bind_user, engine
+from app.core.metrics import metrics
 from app.models.conversation import Conversation
 from app.models.message import Message
+from app.models.message_archive import MessageArchive
+from app.services.tool_result_store import delete_tool_result_refs
 from typing import Optional, List
 from datetime import datetime
+import logging
+
+logger = logging.getLogger(__name__)
+
+# Owner prefix of conversations hidden from their user and awaiting purge
+DELETED_OWNER_PREFIX = "__deleted__:"
+
+PURGED_MESSAGES = metrics.counter(
+    "conversation_purge_messages_total",
+    "Messages deleted by background conversation purges",
+)
 
 
 class ConversationService:
@@ -28,6 +44,7 @@ class ConversationService:
         """
         self.session = session
         self.user_id = user_id
+        bind_user(session, user_id)
 
     def create_conversation(self, title: str = "New Conversation") -> Conversation:
         """
@@ -131,7 +148,12 @@ class ConversationService:
 
     def delete_conversation(self, conversation_id: int) -> bool:
         """
-        Delete a conversation by ID (cascade deletes messages).
+        Delete a conversation by ID and all its messages.
+
+        Runs set-based DELETE statements (messages, archived messages, tool
+        result references, then the conversation) without loading any rows. Messages are deleted
+        explicitly so this also works where ON DELETE CASCADE is not
+        enforced (e.g. SQLite).
 
         Args:
             conversation_id: Conversation ID to delete
@@ -139,20 +161,69 @@ class ConversationService:
         Returns:
             bool: True if deleted, False if not found
         """
-        conversation = self.get_conversation_by_id(conversation_id)
-        if not conversation:
-            return False
+        owned = select(Conversation.id).where(
+            Conversation.id == conversation_id,
+            Conversation.user_id == self.user_id
+        )
+        self.session.exec(delete(Message).where(Message.conversation_id.in_(owned)))
+        self.session.exec(delete(MessageArchive).where(MessageArchive.conversation_id.in_(owned)))
+        delete_tool_result_refs(self.session, conversation_ids=owned)
+        result = self.session.exec(
+            delete(Conversation).where(
+                Conversation.id == conversation_id,
+                Conversation.user_id == self.user_id
+            )
+        )
+        self.session.commit()
 
-        # Delete associated messages first (if not using cascade)
-        statement = select(Message).where(Message.conversation_id == conversation_id)
-        messages = self.session.exec(statement).all()
-        for message in messages:
-            self.session.delete(message)
+        return result.rowcount > 0
+
+    def delete_all_conversations(self) -> int:
+        """
+        Delete all of the current user's conversations and their messages.
 
-        self.session.delete(conversation)
+        Returns:
+            int: Number of conversations deleted
+        """
+        owned = select(Conversation.id).where(Conversation.user_id == self.user_id)
+        self.session.exec(delete(Message).where(Message.conversation_id.in_(owned)))
+        self.session.exec(delete(MessageArchive).where(MessageArchive.conversation_id.in_(owned)))
+        delete_tool_result_refs(self.session, conversation_ids=owned)
+        result = self.session.exec(
+            delete(Conversation).where(Conversation.user_id == self.user_id)
+        )
         self.session.commit()
 
-        return True
+        return result.rowcount
+
+    def hide_for_purge(self, conversation_id: Optional[int] = None) -> List[int]:
+        """
+        Detach conversations from the user so they disappear immediately,
+        leaving the row deletion to purge_conversations().
+
+        The conversations are reassigned to a tombstone owner
+        (DELETED_OWNER_PREFIX + user_id), which no user query matches.
+
+        Args:
+            conversation_id: Conversation to hide, or None for all of the user's conversations
+
+        Returns:
+            List[int]: IDs of the hidden conversations (empty if not found)
+        """
+        statement = select(Conversation.id).where(Conversation.user_id == self.user_id)
+        if conversation_id is not None:
+            statement = statement.where(Conversation.id == conversation_id)
+        conversation_ids = list(self.session.exec(statement).all())
+
+        if conversation_ids:
+            self.session.exec(
+                update(Conversation)
+                .where(Conversation.id.in_(conversation_ids))
+                .values(user_id=f"{DELETED_OWNER_PREFIX}{self.user_id}"[:255])
+            )
+            self.session.commit()
+
+        return conversation_ids
 
     def get_or_create_conversation(self, conversation_id: Optional[int] = None) -> Conversation:
         """
@@ -171,3 +242,70 @@ class ConversationService:
 
         # Create new conversation if not found or not provided
         return self.create_conversation()
+
+
+def purge_conversations(
+    conversation_ids: List[int],
+    chunk_size: Optional[int] = None,
+    raise_errors: bool = False
+) -> int:
+    """
+    Delete conversations and their messages in chunks, committing after
+    each chunk so no single transaction holds locks on a huge conversation.
+    Intended for FastAPI BackgroundTasks after hide_for_purge().
+
+    Args:
+        conversation_ids: Conversations to delete
+        chunk_size: Messages per DELETE (default CONVERSATION_PURGE_CHUNK_SIZE)
+        raise_errors: Re-raise a failure after logging it instead of
+            returning (callers that loop over batches must not retry it)
+
+    Returns:
+        int: Number of messages deleted
+    """
+    chunk_size = chunk_size or settings.CONVERSATION_PURGE_CHUNK_SIZE
+    deleted = 0
+    try:
+        with Session(engine) as session:
+            while True:
+                chunk = (
+                    select(Message.id)
+                    .where(Message.conversation_id.in_(conversation_ids))
+                    .limit(chunk_size)
+                )
+                result = session.exec(delete(Message).where(Message.id.in_(chunk)))
+                session.commit()
+                deleted += result.rowcount
+                PURGED_MESSAGES.inc(result.rowcount)
+                if result.rowcount < chunk_size:
+                    break
+
+            session.exec(delete(MessageArchive).where(MessageArchive.conversation_id.in_(conversation_ids)))
+            delete_tool_result_refs(session, conversation_ids=conversation_ids)
+            session.exec(delete(Conversation).where(Conversation.id.in_(conversation_ids)))
+            session.commit()
+    except Exception as e:
+        logger.exception(f"Failed to purge conversations {conversation_ids}: {e}")
+        if raise_errors:
+            raise
+    return deleted
+
+
+def purge_hidden_conversations(chunk_size: Optional[int] = None) -> int:
+    """
+    Finish purges that were interrupted (e.g. by a restart) by deleting
+    every conversation still owned by a tombstone owner.
+
+    Args:
+        chunk_size: Messages per DELETE (default CONVERSATION_PURGE_CHUNK_SIZE)
+
+    Returns:
+        int: Number of messages deleted
+    """
+    with Session(engine) as session:
+        conversation_ids = list(session.exec(
+            select(Conversation.id).where(Conversation.user_id.startswith(DELETED_OWNER_PREFIX))
+        ).all())
+    if not conversation_ids:
+        return 0
+    return purge_conversations(conversation_ids, chunk_size)
@@ -0,0 +1,275 @@
+"""
+Fake LLM Provider
+Phase III: scripted in-process model for load tests and local development
+
+Selected with LLM_PROVIDERS=["fake"]. Answers come from a script instead
+of a model, so the chat endpoint, database and MCP tools can be load
+tested without an API key and with repeatable results.
+
+A script is a list of rules, tried in order against the last user
+message:
+
+    [{"match": "remember to (.+)",
+      "tool_calls": [{"name": "create_task", "arguments": {"title": "{1}"}}],
+      "reply": "Added '{1}' to your tasks"}]
+
+"{1}", "{2}", ... are replaced by the regex groups. A rule with
+tool_calls answers the first request of a turn with those calls and the
+follow-up request (after the tool results) with its reply; a rule without
+tool_calls answers with the reply directly.
+
+For multi-step turns a rule lists "steps" instead. The step is picked by
+the number of tool rounds since the user message, and the last step's
+reply ends the turn:
+
+    [{"match": "clear task (\\d+)",
+      "steps": [{"tool_calls": [{"name": "list_tasks", "arguments": {}}]},
+                {"tool_calls": [{"name": "complete_task", "arguments": {"task_id": "{1}"}}]},
+                {"reply": "Task {1} is done"}]}]
+
+Responses are streamed like a real model: the first chunk after
+LLM_FAKE_FIRST_CHUNK_MS, then one word per chunk at
+LLM_FAKE_TOKENS_PER_SECOND.
+"""
+
+import asyncio
+import json
+import re
+from dataclasses import dataclass, field
+from typing import Any, Dict, List, Optional, Tuple
+
+from openai.types.chat import ChatCompletionChunk
+
+from app.core.config import settings
+from app.services.llm_providers import LLMProvider
+
+FALLBACK_REPLY = "I can help you add, list, complete and search your tasks."
+
+# Used when LLM_FAKE_SCRIPT is not set
+DEFAULT_SCRIPT: List[Dict[str, Any]] = [
+    {
+        "match": r"(?:remember|remind me) to (.+)",
+        "tool_calls": [{"name": "create_task", "arguments": {"title": "{1}"}}],
+        "reply": "Added '{1}' to your tasks ✓",
+    },
+    {
+        "match": r"(?:finished|done with) task (\d+)",
+        "tool_calls": [{"name": "complete_task", "arguments": {"task_id": "{1}"}}],
+        "reply": "🎉 Nice work! Task {1} is done.",
+    },
+    {
+        "match": r"(?:find|look for) (.+)",
+        "tool_calls": [{"name": "search_tasks", "arguments": {"keyword": "{1}"}}],
+        "reply": "Here is what I found for '{1}'.",
+    },
+    {
+        "match": r"\b(?:list|tasks|todo|to-do)\b",
+        "tool_calls": [{"name": "list_tasks", "arguments": {}}],
+        "reply": "Here are your tasks.",
+    },
+]
+
+
+@dataclass
+class ScriptStep:
+    """One model response of a scripted turn."""
+
+    reply: str = ""
+    tool_calls: List[Dict[str, Any]] = field(default_factory=list)
+
+
+@dataclass
+class ScriptRule:
+    """One scripted answer, as a step per tool round."""
+
+    pattern: "re.Pattern[str]"
+    steps: List[ScriptStep]
+
+    @property
+    def reply(self) -> str:
+        """The reply that ends the turn."""
+        return self.steps[-1].reply
+
+
+def _steps(rule: Dict[str, Any]) -> List[ScriptStep]:
+    """Steps of a rule; "tool_calls" and "reply" are a tool round and then the reply."""
+    if "steps" in rule:
+        return [
+            ScriptStep(reply=step.get("reply", ""), tool_calls=step.get("tool_calls", []))
+            for step in rule["steps"]
+        ] or [ScriptStep()]
+    reply = ScriptStep(reply=rule.get("reply", ""))
+    if rule.get("tool_calls"):
+        return [ScriptStep(tool_calls=rule["tool_calls"]), reply]
+    return [reply]
+
+
+def load_script(rules: List[Dict[str, Any]]) -> List[ScriptRule]:
+    """
+    Compile script rules.
+
+    Args:
+        rules: Rules with "match" and either optional "tool_calls" and
+            "reply" or a list of "steps"
+
+    Returns:
+        Compiled rules, in order
+    """
+    return [
+        ScriptRule(
+            pattern=re.compile(rule["match"], re.IGNORECASE),
+            steps=_steps(rule),
+        )
+        for rule in rules
+    ]
+
+
+def _fill(value: Any, groups: Tuple[str, ...]) -> Any:
+    """Replace {1}, {2}, ... in a string (or in the values of a dict) by regex groups."""
+    if isinstance(value, dict):
+        return {key: _fill(item, groups) for key, item in value.items()}
+    if isinstance(value, str):
+        return re.sub(r"\{(\d+)\}", lambda m: (groups[int(m.group(1)) - 1] or "").strip(), value)
+    return value
+
+
+def _tool_rounds(messages: List[Dict[str, Any]]) -> int:
+    """Number of tool rounds (runs of tool results) since the last user message."""
+    rounds = 0
+    previous = None
+    for message in reversed(messages):
+        role = message["role"]
+        if role == "user":
+            break
+        if role == "tool" and previous != "tool":
+            rounds += 1
+        previous = role
+    return rounds
+
+
+class FakeStream:
+    """Async iterator over prepared chunks, paced like a model."""
+
+    def __init__(self, chunks: List[ChatCompletionChunk], first_delay: float, interval: float):
+        self._chunks = chunks
+        self._first_delay = first_delay
+        self._interval = interval
+        self._index = 0
+
+    def __aiter__(self) -> "FakeStream":
+        return self
+
+    async def __anext__(self) -> ChatCompletionChunk:
+        if self._index >= len(self._chunks):
+            raise StopAsyncIteration
+        delay = self._first_delay if self._index == 0 else self._interval
+        if delay:
+            await asyncio.sleep(delay)
+        chunk = self._chunks[self._index]
+        self._index += 1
+        return chunk
+
+    async def close(self) -> None:
+        self._index = len(self._chunks)
+
+
+class FakeLLMProvider(LLMProvider):
+    """
+    Scripted provider that streams deterministic responses.
+    """
+
+    def __init__(
+        self,
+        script: Optional[List[Dict[str, Any]]] = None,
+        first_chunk_seconds: float = 0.3,
+        tokens_per_second: float = 50.0,
+        name: str = "fake",
+    ):
+        """
+        Initialize the provider.
+
+        Args:
+            script: Script rules (default: DEFAULT_SCRIPT)
+            first_chunk_seconds: Delay before the first chunk
+            tokens_per_second: Words streamed per second after it (0: no delay)
+            name: Provider name, used in metrics
+        """
+        super().__init__(name, model="fake-model")
+        self.rules = load_script(script if script is not None else DEFAULT_SCRIPT)
+        self.first_chunk_seconds = first_chunk_seconds
+        self.interval = 1.0 / tokens_per_second if tokens_per_second > 0 else 0.0
+        self._completions = 0
+
+    def respond(self, messages: List[Dict[str, Any]], tools: Optional[List[Dict[str, Any]]]) -> Tuple[str, List[Dict[str, Any]]]:
+        """
+        Scripted answer to a conversation.
+
+        Args:
+            messages: Messages of the request
+            tools: Tools offered to the model; without them no calls are made
+
+        Returns:
+            Tuple of reply text and tool calls ({"name", "arguments"})
+        """
+        prompt = next((m["content"] for m in reversed(messages) if m["role"] == "user"), "")
+        rounds = _tool_rounds(messages)
+        for rule in self.rules:
+            match = rule.pattern.search(prompt)
+            if match is None:
+                continue
+            groups = match.groups()
+            if rounds < len(rule.steps):
+                step = rule.steps[rounds]
+                if not step.tool_calls:
+                    return _fill(step.reply, groups), []
+                if tools:
+                    return "", [_fill(call, groups) for call in step.tool_calls]
+            # Out of steps, or no tools to call: end the turn
+            return _fill(rule.reply, groups), []
+        return FALLBACK_REPLY, []
+
+    def _chunk(self, completion_id: str, delta: Dict[str, Any], finish_reason: Optional[str] = None) -> ChatCompletionChunk:
+        return ChatCompletionChunk.model_validate({
+            "id": completion_id,
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": self.model,
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        })
+
+    async def _create_stream(self, **kwargs) -> FakeStream:
+        self._completions += 1
+        completion_id = f"chatcmpl-fake-{self._completions}"
+        text, tool_calls = self.respond(kwargs.get("messages", []), kwargs.get("tools"))
+
+        chunks = [self._chunk(completion_id, {"role": "assistant", "content": ""})]
+        for index, call in enumerate(tool_calls):
+            chunks.append(self._chunk(completion_id, {"tool_calls": [{
+                "index": index,
+                "id": f"call_{self._completions}_{index}",
+                "type": "function",
+                "function": {"name": call["name"], "arguments": json.dumps(call.get("arguments", {}))},
+            }]}))
+        for word in re.findall(r"\S+\s*", text):
+            chunks.append(self._chunk(completion_id, {"content": word}))
+        chunks.append(self._chunk(completion_id, {}, "tool_calls" if tool_calls else "stop"))
+        return FakeStream(chunks, self.first_chunk_seconds, self.interval)
+
+
+def build_fake_provider() -> FakeLLMProvider:
+    """
+    Fake provider from settings.
+
+    Returns:
+        FakeLLMProvider: With the LLM_FAKE_SCRIPT rules (a JSON file) or
+        the default script
+    """
+    script = None
+    if settings.LLM_FAKE_SCRIPT:
+        with open(settings.LLM_FAKE_SCRIPT, encoding="utf-8") as f:
+            script = json.load(f)
+    return FakeLLMProvider(
+        script=script,
+        first_chunk_seconds=settings.LLM_FAKE_FIRST_CHUNK_MS / 1000,
+        tokens_per_second=settings.LLM_FAKE_TOKENS_PER_SECOND,
+    )
@@ -0,0 +1,336 @@
+"""
+Intent Router
+Phase III: deterministic fast path in front of the agent
+
+Recognizes simple, self-contained commands ("add buy milk", "complete task
+3", "delete task 7", "show my tasks") with anchored patterns, runs the
+matching tool through MCPServer.execute_tool and answers from a
+template in the style of AGENT_INSTRUCTIONS. Anything the patterns do not
+fully cover, or match below the confidence threshold, goes to the LLM.
+
+Commands that refer to conversation context ("delete it", "complete the
+first one") or to tasks by title never match: they need the model.
+"""
+
+import re
+import secrets
+import time
+from dataclasses import dataclass, field
+from typing import Any, Callable, Dict, List, Optional, Pattern, Tuple
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.mcp_server import mcp_server
+from app.mcp_tools import READ_ONLY_TOOLS
+from app.mcp_tools.context import TURN_ROLLED_BACK, ToolContext
+
+INTENT_REQUESTS = metrics.counter(
+    "intent_router_requests_total",
+    "Chat messages seen by the intent router (result: routed, low_confidence, no_match)",
+    ["intent", "result"],
+)
+INTENT_SECONDS = metrics.histogram(
+    "intent_router_seconds", "Time to answer a routed message, tools included", ["intent"]
+)
+
+# Longest title / keyword the fast path accepts; longer ones go to the model
+MAX_TITLE_CHARS = 200
+MAX_KEYWORD_WORDS = 4
+
+_POLITE_PREFIX = re.compile(
+    r"^(?:please|pls|plz|kindly|hey|hi|ok|okay|can you|could you|would you|will you)[,\s]+", re.I
+)
+_POLITE_SUFFIX = re.compile(r"[\s,]*(?:please|pls|plz|thanks|thank you|thx)?[\s.!]*$", re.I)
+_QUOTES = "'\"‘’“”`"
+
+# Titles that point at context ("add it", "add what I said") need the model
+_CONTEXT_WORDS = re.compile(
+    r"^(?:it|that|this|them|those|these|one|another|the same|same|what|which|something)\b"
+    r"|\b(?:again|too|as well|earlier|mentioned|above)$|\bmentioned\b", re.I
+)
+# Titles made only of these ("add task", "add a new task", "add more") name
+# no task at all: the model asks what to add
+_FILLER_WORDS = frozenset({
+    "a", "an", "the", "my", "some", "new", "another", "more", "one", "few", "other",
+    "task", "tasks", "todo", "todos", "to-do", "to-dos", "item", "items", "entry", "entries",
+    "thing", "things", "reminder", "reminders", "something", "stuff", "list",
+})
+# "add 5 minutes to task 3" is an update, not a new task
+_TASK_REFERENCE = re.compile(r"\btask\s*#?\d+\b", re.I)
+_TASK_ID = r"(?:task\s*)?#?\s*(?P<task_id>\d+)"
+# The list a task is added to: "my list", "the todo list", "my shopping list"
+_LIST_NAME = r"(?:my |the )?(?:[\w-]+\s+){0,2}?(?:list|tasks)"
+# "add 3", "add task #3": a task ID, not a title
+_BARE_TASK_ID = re.compile(r"^#?\s*\d+$")
+
+
+@dataclass
+class Intent:
+    """A recognized command: which action, its arguments and how sure the parser is."""
+    name: str
+    arguments: Dict[str, Any] = field(default_factory=dict)
+    confidence: float = 1.0
+
+
+def _title_confidence(title: str) -> float:
+    if not title or len(title) > MAX_TITLE_CHARS or "?" in title:
+        return 0.0
+    if _CONTEXT_WORDS.match(title) or _TASK_REFERENCE.search(title):
+        return 0.0
+    # A task ID, or a list phrase the rules failed to strip
+    if _BARE_TASK_ID.match(title) or re.match(r"to (?:my|the)\b", title, re.I):
+        return 0.0
+    if all(word.strip(".!:") in _FILLER_WORDS for word in title.lower().split()):
+        return 0.0
+    # "add milk and eggs" may mean one task or two: let the model decide
+    if re.search(r"\band\b|[,;]", title, re.I):
+        return 0.6
+    return 0.95
+
+
+def _keyword_confidence(keyword: str) -> float:
+    if not keyword or len(keyword.split()) > MAX_KEYWORD_WORDS or "?" in keyword:
+        return 0.0
+    return 0.9
+
+
+def _clean(text: str) -> str:
+    return text.strip().strip(_QUOTES).strip()
+
+
+# (intent, pattern, base confidence); the first full match wins
+_RULES: List[Tuple[str, Pattern, float]] = [
+    ("list", re.compile(
+        r"(?:show|list|display|view|see|get|give)(?: me)?(?: all)?(?: of)? (?:my |the )?"
+        r"(?:tasks|todos|to-?dos|to-?do list|task list|list)", re.I), 0.95),
+    ("list", re.compile(
+        r"what(?:'?s| is| are)(?: on)? (?:my )?(?:tasks|todos|to-?dos|to-?do list|task list|list)", re.I), 0.95),
+    ("list", re.compile(r"(?:my )?(?:tasks|todos|to-?dos|to-?do list)", re.I), 0.9),
+    ("get", re.compile(r"(?:show|get|view|open|display)(?: me)? task\s*#?\s*(?P<task_id>\d+)", re.I), 0.95),
+    ("get", re.compile(r"what(?:'?s| is) (?:in )?task\s*#?\s*(?P<task_id>\d+)", re.I), 0.95),
+    ("reopen", re.compile(rf"(?:uncomplete|reopen|undo|unmark|uncheck) {_TASK_ID}", re.I), 0.95),
+    ("reopen", re.compile(
+        rf"mark {_TASK_ID}(?: as)? (?:not done|not complete|incomplete|pending|undone|open|unfinished)", re.I), 0.95),
+    ("complete", re.compile(rf"(?:complete|finish|check off|tick off|close) {_TASK_ID}", re.I), 0.95),
+    ("complete", re.compile(rf"mark {_TASK_ID}(?: as)? (?:done|complete|completed|finished)", re.I), 0.95),
+    ("complete", re.compile(r"(?:task\s*)?#?\s*(?P<task_id>\d+) (?:is )?(?:done|complete|completed|finished)", re.I), 0.9),
+    ("delete", re.compile(r"(?:delete|remove|drop|erase|trash) (?:task\s*#?\s*|#\s*)(?P<task_id>\d+)", re.I), 0.95),
+    # Bare numbers ("remove 7") are likely but destructive: below the default threshold
+    ("delete", re.compile(r"(?:delete|remove|drop|erase|trash) (?P<task_id>\d+)", re.I), 0.85),
+    ("search", re.compile(
+        r"search(?: my)?(?: tasks?)?(?: for| about| with| containing| matching)? (?P<keyword>.+)", re.I), 0.9),
+    ("search", re.compile(
+        r"(?:find|look for|look up)(?: my)? tasks?(?: for| about| with| containing| matching)? (?P<keyword>.+)", re.I), 0.9),
+    ("create", re.compile(
+        r"(?:add|create|new)(?: a)?(?: new)? (?:task|todo|to-?do|item)(?:\s*:|\s+to|\s+called|\s+named|\s+for)?\s+"
+        rf"(?P<title>.+?)(?:\s+to {_LIST_NAME})?", re.I), 1.0),
+    ("create", re.compile(
+        rf"(?:add|remind me to|remember to)\s+(?:to {_LIST_NAME}\s*:?\s+)?(?P<title>.+?)(?:\s+to {_LIST_NAME})?",
+        re.I), 1.0),
+]
+
+
+def parse_intent(message: str) -> Optional[Intent]:
+    """
+    Parse a chat message into an intent.
+
+    Args:
+        message: The user's message
+
+    Returns:
+        Optional[Intent]: The recognized intent, or None if no rule matches
+        the whole message
+    """
+    text = " ".join(message.split())
+    previous = None
+    while previous != text:
+        previous = text
+        text = _POLITE_PREFIX.sub("", text)
+    text = _POLITE_SUFFIX.sub("", text).rstrip("?").strip()
+
+    for name, pattern, confidence in _RULES:
+        match = pattern.fullmatch(text)
+        if match is None:
+            continue
+        groups = match.groupdict()
+        if "task_id" in groups:
+            return Intent(name, {"task_id": int(groups["task_id"])}, confidence)
+        if "title" in groups:
+            title = _clean(groups["title"])
+            return Intent(name, {"title": title}, min(confidence, _title_confidence(title)))
+        if "keyword" in groups:
+            keyword = _clean(groups["keyword"])
+            return Intent(name, {"keyword": keyword}, min(confidence, _keyword_confidence(keyword)))
+        return Intent(name, {}, confidence)
+    return None
+
+
+def _status(task: Dict[str, Any]) -> Tuple[str, str]:
+    return ("✓", "completed") if task.get("completed") else ("○", "pending")
+
+
+def _task_line(index: int, task: Dict[str, Any]) -> str:
+    icon, status = _status(task)
+    return f"{index}. {icon} {task['title']} (ID: {task['id']}) - {status}"
+
+
+def _not_found(task_id: int) -> str:
+    return f"I couldn't find task {task_id}. Say \"show my tasks\" to see your task IDs."
+
+
+class IntentRouter:
+    """
+    Answers simple commands without the LLM.
+    Every tool call carries the user_id, so data isolation is enforced by
+    the MCP handlers exactly as for agent tool calls.
+    """
+
+    def __init__(self, min_confidence: float = 0.9, enabled: bool = True):
+        """
+        Initialize the router.
+
+        Args:
+            min_confidence: Lowest parser confidence that is acted on
+            enabled: False sends every message to the LLM
+        """
+        self.min_confidence = min_confidence
+        self.enabled = enabled
+        self._actions: Dict[str, Callable] = {
+            "list": self._list,
+            "get": self._get,
+            "create": self._create,
+            "complete": self._complete,
+            "reopen": self._reopen,
+            "delete": self._delete,
+            "search": self._search,
+        }
+
+    async def route(self, user_id: str, message: str) -> Optional[Dict[str, Any]]:
+        """
+        Answer a message on the fast path if it is a simple command.
+
+        Args:
+            user_id: The authenticated user's ID
+            message: The user's message
+
+        Returns:
+            Optional[dict]: An agent-shaped response (content, tool_calls),
+            or None to hand the message to the LLM
+        """
+        if not self.enabled:
+            return None
+
+        intent = parse_intent(message)
+        if intent is None:
+            INTENT_REQUESTS.inc(intent="none", result="no_match")
+            return None
+        if intent.confidence < self.min_confidence:
+            INTENT_REQUESTS.inc(intent=intent.name, result="low_confidence")
+            return None
+
+        start = time.perf_counter()
+        tool_calls: List[Dict[str, Any]] = []
+        with ToolContext() as context:
+            content = await self._actions[intent.name](user_id, intent.arguments, tool_calls, context)
+            if not context.commit():
+                content = "Sorry, that change couldn't be saved. Please try again."
+                for call in tool_calls:
+                    if call["name"] not in READ_ONLY_TOOLS:
+                        call["result"] = {"success": False, "error": TURN_ROLLED_BACK}
+        INTENT_SECONDS.observe(time.perf_counter() - start, intent=intent.name)
+        INTENT_REQUESTS.inc(intent=intent.name, result="routed")
+        return {"content": content, "tool_calls": tool_calls}
+
+    async def _call(
+        self,
+        context: ToolContext,
+        tool_calls: List[Dict[str, Any]],
+        name: str,
+        arguments: Dict[str, Any]
+    ) -> Dict[str, Any]:
+        """Run a tool in the turn's context and record the call like the agent does."""
+        result = await mcp_server.execute_tool(name, arguments, context)
+        tool_calls.append({
+            "id": f"local_{secrets.token_hex(8)}",
+            "name": name,
+            "arguments": arguments,
+            "result": result,
+        })
+        return result
+
+    async def _list(self, user_id, arguments, tool_calls, context) -> str:
+        result = await self._call(context, tool_calls, "list_tasks", {"user_id": user_id})
+        if not result.get("success"):
+            return f"Sorry, I couldn't load your tasks: {result.get('error')}"
+        tasks = result.get("tasks") or []
+        if not tasks:
+            return "Your list is empty. Tell me what you need to do and I'll add it!"
+        pending = sum(1 for task in tasks if not task["completed"])
+        lines = [_task_line(i, task) for i, task in enumerate(tasks, 1)]
+        return f"Here are your tasks ({pending} pending):\n" + "\n".join(lines)
+
+    async def _get(self, user_id, arguments, tool_calls, context) -> str:
+        result = await self._call(context, tool_calls, "get_task", {"user_id": user_id, **arguments})
+        if not result.get("success"):
+            return _not_found(arguments["task_id"])
+        icon, status = _status(result)
+        content = f"{icon} {result['title']} (ID: {result['id']}) - {status}"
+        if result.get("description"):
+            content += f"\n{result['description']}"
+        return content
+
+    async def _create(self, user_id, arguments, tool_calls, context) -> str:
+        result = await self._call(context, tool_calls, "create_task", {"user_id": user_id, **arguments})
+        if not result.get("success"):
+            return f"Sorry, I couldn't add that task: {result.get('error')}"
+        return f"Added '{result['title']}' to your tasks (ID: {result['id']}) ✓"
+
+    async def _set_completed(self, user_id, task_id, completed, tool_calls, context) -> str:
+        # complete_task toggles, so check the current state first
+        task = await self._call(context, tool_calls, "get_task", {"user_id": user_id, "task_id": task_id})
+        if not task.get("success"):
+            return _not_found(task_id)
+        if task["completed"] == completed:
+            icon, status = _status(task)
+            return f"'{task['title']}' (ID: {task_id}) is already {status} {icon}"
+
+        result = await self._call(context, tool_calls, "complete_task", {"user_id": user_id, "task_id": task_id})
+        if not result.get("success"):
+            return f"Sorry, I couldn't update task {task_id}: {result.get('error')}"
+        if completed:
+            return f"🎉 Nice work! Marked '{result['title']}' (ID: {task_id}) as complete ✓"
+        return f"Marked '{result['title']}' (ID: {task_id}) as pending ○"
+
+    async def _complete(self, user_id, arguments, tool_calls, context) -> str:
+        return await self._set_completed(user_id, arguments["task_id"], True, tool_calls, context)
+
+    async def _reopen(self, user_id, arguments, tool_calls, context) -> str:
+        return await self._set_completed(user_id, arguments["task_id"], False, tool_calls, context)
+
+    async def _delete(self, user_id, arguments, tool_calls, context) -> str:
+        task_id = arguments["task_id"]
+        task = await self._call(context, tool_calls, "get_task", {"user_id": user_id, "task_id": task_id})
+        if not task.get("success"):
+            return _not_found(task_id)
+        result = await self._call(context, tool_calls, "delete_task", {"user_id": user_id, "task_id": task_id})
+        if not result.get("success"):
+            return f"Sorry, I couldn't delete task {task_id}: {result.get('error')}"
+        return f"Deleted '{task['title']}' (ID: {task_id}) from your tasks."
+
+    async def _search(self, user_id, arguments, tool_calls, context) -> str:
+        result = await self._call(context, tool_calls, "search_tasks", {"user_id": user_id, **arguments})
+        if not result.get("success"):
+            return f"Sorry, I couldn't search your tasks: {result.get('error')}"
+        tasks = result.get("tasks") or []
+        if not tasks:
+            return f"No tasks match '{arguments['keyword']}'."
+        lines = [_task_line(i, task) for i, task in enumerate(tasks, 1)]
+        noun = "task matches" if len(tasks) == 1 else "tasks match"
+        return f"{len(tasks)} {noun} '{arguments['keyword']}':\n" + "\n".join(lines)
+
+
+# Global intent router instance
+intent_router = IntentRouter(
+    min_confidence=settings.INTENT_ROUTER_MIN_CONFIDENCE,
+    enabled=settings.INTENT_ROUTER_ENABLED,
+)
@@ -0,0 +1,420 @@
+"""
+LLM Providers
+Phase III: ordered failover and hedged requests across OpenAI and Gemini
+
+OpenAI and Gemini are reached through the OpenAI SDK (Gemini through its
+OpenAI-compatible endpoint), each with one long-lived HTTP client, so
+connections are kept alive between requests. The "fake" provider
+(fake_llm) answers from a script, for load tests without an API key.
+
+LLMRouter.create() streams the completion from the first provider in
+LLM_PROVIDERS whose circuit breaker is closed and assembles the chunks
+into a ChatCompletion, so callers get the same object as from
+chat.completions.create. A provider that fails or times out is skipped
+and the request goes to the next one.
+
+With LLM_HEDGING_ENABLED, if a provider hasn't sent its first chunk
+within its hedge delay (the LLM_HEDGE_PERCENTILE of its recent
+first-chunk latencies), the same request is also sent to the next
+provider. The first to answer is used and the other stream is closed.
+A loser cancelled before its first chunk is kept in the latencies at the
+time it was cancelled (a lower bound of its latency): otherwise the slow
+requests that get hedged would never be sampled, and the percentile,
+computed from the fast ones only, would hedge ever more requests.
+"""
+
+import asyncio
+import logging
+import time
+from collections import deque
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+import httpx
+from openai import AsyncOpenAI
+from openai.lib.streaming.chat import ChatCompletionStreamState
+from openai.types.chat import ChatCompletion, ChatCompletionChunk
+
+from app.core.circuit_breaker import CircuitBreakerRegistry
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.tracing import current_span, traced, tracer
+
+logger = logging.getLogger(__name__)
+
+LLM_REQUESTS = metrics.counter(
+    "llm_requests_total", "LLM requests by provider and outcome (ok, error, cancelled)",
+    ["provider", "result"],
+)
+LLM_FIRST_CHUNK_SECONDS = metrics.histogram(
+    "llm_first_chunk_seconds", "Time until the provider sent its first chunk", ["provider"],
+    buckets=(0.1, 0.25, 0.5, 1.0, 2.0, 3.0, 5.0, 10.0, 30.0),
+)
+LLM_HEDGES = metrics.counter(
+    "llm_hedged_requests_total", "Requests also sent to a second provider (winner: primary, hedge)",
+    ["winner"],
+)
+LLM_FAILOVERS = metrics.counter(
+    "llm_failovers_total", "Requests moved to the next provider after a failure", ["provider"]
+)
+
+class LLMUnavailable(Exception):
+    """Raised when no provider could answer."""
+    pass
+
+
+def _percentile(values: Sequence[float], q: float) -> float:
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+class LLMProvider:
+    """
+    Base class of chat completion providers: request, error and
+    first-chunk latency bookkeeping around _create_stream().
+    """
+
+    def __init__(self, name: str, model: str, window: int = 200):
+        """
+        Initialize the provider.
+
+        Args:
+            name: Provider name, used in metrics and logs
+            model: Model requested from this provider
+            window: Recent first-chunk latencies kept for the hedge delay
+        """
+        self.name = name
+        self.model = model
+        self.latencies: deque = deque(maxlen=window)
+        self.requests = 0
+        self.errors = 0
+
+    def record_lower_bound(self, elapsed: float) -> None:
+        """
+        Keep a request cancelled before its first chunk in the latencies.
+
+        Args:
+            elapsed: Seconds it had waited, a lower bound of its latency
+        """
+        self.latencies.append(elapsed)
+
+    def first_chunk_percentile(self, q: float) -> Optional[float]:
+        """Recent first-chunk latency percentile in seconds, None without samples."""
+        if not self.latencies:
+            return None
+        return _percentile(self.latencies, q)
+
+    async def _create_stream(self, **kwargs) -> Any:
+        """Start a streamed completion; returns an async iterator of chunks with close()."""
+        raise NotImplementedError
+
+    async def open_stream(self, **kwargs) -> Tuple[Any, ChatCompletionChunk]:
+        """
+        Start a streamed completion and wait for its first chunk.
+
+        Args:
+            **kwargs: chat.completions.create arguments other than model
+
+        Returns:
+            Tuple of the stream and its first chunk
+        """
+        self.requests += 1
+        start = time.perf_counter()
+        stream = await self._create_stream(**kwargs)
+        try:
+            first = await stream.__anext__()
+        except BaseException:
+            await stream.close()
+            raise
+        elapsed = time.perf_counter() - start
+        self.latencies.append(elapsed)
+        LLM_FIRST_CHUNK_SECONDS.observe(elapsed, provider=self.name)
+        return stream, first
+
+    def stats(self) -> Dict[str, Any]:
+        """Request, error and first-chunk latency counts for diagnostics."""
+        p50 = self.first_chunk_percentile(0.5)
+        p95 = self.first_chunk_percentile(0.95)
+        return {
+            "model": self.model,
+            "requests": self.requests,
+            "errors": self.errors,
+            "first_chunk_p50_ms": round(p50 * 1000, 1) if p50 is not None else None,
+            "first_chunk_p95_ms": round(p95 * 1000, 1) if p95 is not None else None,
+        }
+
+    async def aclose(self) -> None:
+        """Release the provider's resources."""
+        pass
+
+
+class OpenAICompatibleProvider(LLMProvider):
+    """
+    One OpenAI-compatible chat completion endpoint.
+    """
+
+    def __init__(
+        self,
+        name: str,
+        model: str,
+        api_key: str,
+        base_url: Optional[str] = None,
+        timeout_seconds: float = 60.0,
+        max_connections: int = 20,
+        window: int = 200,
+    ):
+        """
+        Initialize the provider and its HTTP client.
+
+        Args:
+            name: Provider name, used in metrics and logs
+            model: Model requested from this provider
+            api_key: API key of the provider
+            base_url: API base URL (default: the SDK's, i.e. OpenAI)
+            timeout_seconds: Request timeout
+            max_connections: Connections kept to the provider
+            window: Recent first-chunk latencies kept for the hedge delay
+        """
+        super().__init__(name, model, window)
+        self.http_client = httpx.AsyncClient(
+            timeout=timeout_seconds,
+            limits=httpx.Limits(max_connections=max_connections, max_keepalive_connections=max_connections),
+        )
+        # No SDK retries: a failed request goes to the next provider instead
+        self.client = AsyncOpenAI(
+            api_key=api_key, base_url=base_url, http_client=self.http_client, max_retries=0
+        )
+
+    async def _create_stream(self, **kwargs) -> Any:
+        return await self.client.chat.completions.create(model=self.model, stream=True, **kwargs)
+
+    async def aclose(self) -> None:
+        """Close the provider's connections."""
+        await self.http_client.aclose()
+
+
+class LLMRouter:
+    """
+    Sends chat completions to the providers with failover and hedging.
+    """
+
+    def __init__(
+        self,
+        providers: List[LLMProvider],
+        hedging: bool = False,
+        hedge_percentile: float = 0.95,
+        hedge_delay_seconds: float = 2.0,
+        hedge_min_samples: int = 20,
+        breakers: Optional[CircuitBreakerRegistry] = None,
+    ):
+        """
+        Initialize the router.
+
+        Args:
+            providers: Providers in order of preference
+            hedging: Also ask the next provider when the first is slow
+            hedge_percentile: First-chunk latency percentile used as hedge delay
+            hedge_delay_seconds: Hedge delay until hedge_min_samples are known
+            hedge_min_samples: Latencies needed before the percentile is used
+            breakers: Circuit breakers by provider name (default: from settings)
+        """
+        if not providers:
+            raise ValueError("At least one LLM provider is required")
+        self.providers = providers
+        self.hedging = hedging
+        self.hedge_percentile = hedge_percentile
+        self.hedge_delay_seconds = hedge_delay_seconds
+        self.hedge_min_samples = hedge_min_samples
+        self.breakers = breakers or CircuitBreakerRegistry(
+            failure_threshold=settings.LLM_BREAKER_FAILURE_THRESHOLD,
+            reset_seconds=settings.LLM_BREAKER_RESET_SECONDS,
+        )
+
+    def hedge_delay(self, provider: LLMProvider) -> float:
+        """Seconds to wait for the provider's first chunk before hedging."""
+        if len(provider.latencies) < self.hedge_min_samples:
+            return self.hedge_delay_seconds
+        return provider.first_chunk_percentile(self.hedge_percentile)
+
+    def _next_provider(self, remaining: List[LLMProvider]) -> Optional[LLMProvider]:
+        """Take the next provider whose breaker lets a request through."""
+        while remaining:
+            provider = remaining.pop(0)
+            if self.breakers.get(provider.name).allow():
+                return provider
+        return None
+
+    async def _open(self, provider: LLMProvider, kwargs: Dict[str, Any]) -> Tuple[Any, ChatCompletionChunk]:
+        """Open a stream on one provider, recording the outcome."""
+        breaker = self.breakers.get(provider.name)
+        try:
+            with tracer.span("llm.first_chunk", {"llm.provider": provider.name}):
+                stream, first = await provider.open_stream(**kwargs)
+        except asyncio.CancelledError:
+            breaker.release()
+            LLM_REQUESTS.inc(provider=provider.name, result="cancelled")
+            raise
+        except Exception:
+            self._record_error(provider)
+            raise
+        breaker.record_success()
+        return stream, first
+
+    def _record_error(self, provider: LLMProvider) -> None:
+        provider.errors += 1
+        self.breakers.get(provider.name).record_failure()
+        LLM_REQUESTS.inc(provider=provider.name, result="error")
+
+    async def _open_hedged(
+        self,
+        primary: LLMProvider,
+        remaining: List[LLMProvider],
+        kwargs: Dict[str, Any]
+    ) -> Tuple[LLMProvider, Any, ChatCompletionChunk]:
+        """Open a stream on primary, hedged by the next provider if primary is slow."""
+        started = time.perf_counter()
+        first_task = asyncio.create_task(self._open(primary, kwargs))
+        tasks = {first_task: primary}
+        started_at = {first_task: started}
+        winner_task = None
+        try:
+            done, _ = await asyncio.wait({first_task}, timeout=self.hedge_delay(primary))
+            hedge = None if done else self._next_provider(remaining)
+            if hedge is None:
+                winner_task = first_task
+                return (primary, *await first_task)
+
+            hedge_task = asyncio.create_task(self._open(hedge, kwargs))
+            tasks[hedge_task] = hedge
+            started_at[hedge_task] = time.perf_counter()
+            pending = set(tasks)
+            while pending and winner_task is None:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                winner_task = next((task for task in done if task.exception() is None), None)
+            if winner_task is None:
+                # Both failed: report the primary's error
+                raise first_task.exception()
+            winner = tasks[winner_task]
+            LLM_HEDGES.inc(winner="primary" if winner is primary else "hedge")
+            return (winner, *winner_task.result())
+        finally:
+            for task in tasks:
+                if not task.done():
+                    task.cancel()
+                    if winner_task is not None:
+                        tasks[task].record_lower_bound(time.perf_counter() - started_at[task])
+                elif task is not winner_task and not task.cancelled() and task.exception() is None:
+                    # Both answered at once: the loser still holds a connection
+                    await task.result()[0].close()
+
+    @traced("llm.create")
+    async def create(self, **kwargs) -> ChatCompletion:
+        """
+        Create a chat completion.
+
+        Args:
+            **kwargs: chat.completions.create arguments other than model
+                and stream (messages, tools, temperature, ...)
+
+        Returns:
+            ChatCompletion assembled from the winning provider's stream
+
+        Raises:
+            LLMUnavailable: If every provider failed or is circuit-broken
+        """
+        if kwargs.get("tools") is None:
+            kwargs.pop("tools", None)
+        remaining = list(self.providers)
+        last_error: Optional[BaseException] = None
+        while True:
+            provider = self._next_provider(remaining)
+            if provider is None:
+                raise LLMUnavailable(f"No LLM provider available: {last_error}")
+            try:
+                if self.hedging and remaining:
+                    provider, stream, first = await self._open_hedged(provider, remaining, kwargs)
+                else:
+                    stream, first = await self._open(provider, kwargs)
+                completion = await self._collect(provider, stream, first, kwargs.get("tools"))
+                LLM_REQUESTS.inc(provider=provider.name, result="ok")
+                span = current_span()
+                if span is not None:
+                    span.set_attribute("llm.provider", provider.name)
+                return completion
+            except Exception as e:
+                last_error = e
+                logger.warning(f"LLM provider {provider.name} failed: {e}")
+                if remaining:
+                    LLM_FAILOVERS.inc(provider=provider.name)
+
+    async def _collect(
+        self,
+        provider: LLMProvider,
+        stream: Any,
+        first: ChatCompletionChunk,
+        tools: Optional[List[Dict[str, Any]]]
+    ) -> ChatCompletion:
+        """Read the rest of a stream into a ChatCompletion."""
+        state = ChatCompletionStreamState(input_tools=tools) if tools else ChatCompletionStreamState()
+        try:
+            state.handle_chunk(first)
+            async for chunk in stream:
+                state.handle_chunk(chunk)
+        except Exception:
+            self._record_error(provider)
+            raise
+        finally:
+            await stream.close()
+        return state.get_final_completion()
+
+    def stats(self) -> Dict[str, Dict[str, Any]]:
+        """Per-provider stats and breaker state."""
+        return {
+            provider.name: {**provider.stats(), "breaker": self.breakers.get(provider.name).state}
+            for provider in self.providers
+        }
+
+    async def aclose(self) -> None:
+        """Close every provider's connections."""
+        for provider in self.providers:
+            await provider.aclose()
+
+
+def build_llm_router() -> LLMRouter:
+    """
+    Router over the providers in LLM_PROVIDERS that are configured.
+
+    "fake" is the scripted in-process provider (see fake_llm) used for
+    load tests; the others are skipped when they have no API key.
+
+    Returns:
+        LLMRouter: Falls back to OpenAI alone when no key is set, so the
+        error surfaces on the first request as before
+    """
+    available = {
+        "openai": (settings.OPENAI_API_KEY, settings.OPENAI_CHAT_MODEL, None),
+        "gemini": (settings.GEMINI_API_KEY, settings.GEMINI_MODEL, settings.GEMINI_BASE_URL),
+    }
+    providers: List[LLMProvider] = []
+    for name in settings.LLM_PROVIDERS:
+        if name == "fake":
+            from app.services.fake_llm import build_fake_provider
+            providers.append(build_fake_provider())
+            continue
+        if name not in available:
+            raise ValueError(f"Unknown LLM provider: {name}. Available providers: {sorted(available) + ['fake']}")
+        api_key, model, base_url = available[name]
+        if api_key:
+            providers.append(OpenAICompatibleProvider(
+                name, model, api_key, base_url,
+                timeout_seconds=settings.LLM_TIMEOUT_SECONDS,
+                max_connections=settings.LLM_MAX_CONNECTIONS,
+            ))
+    if not providers:
+        providers.append(OpenAICompatibleProvider("openai", settings.OPENAI_CHAT_MODEL, settings.OPENAI_API_KEY))
+    return LLMRouter(
+        providers,
+        hedging=settings.LLM_HEDGING_ENABLED,
+        hedge_percentile=settings.LLM_HEDGE_PERCENTILE,
+        hedge_delay_seconds=settings.LLM_HEDGE_DELAY_SECONDS,
+        hedge_min_samples=settings.LLM_HEDGE_MIN_SAMPLES,
+    )
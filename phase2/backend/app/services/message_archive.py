@@ -0,0 +1,122 @@
+"""
+Message archive codec
+Message retention: compressed cold tier for idle conversations
+
+Encodes a conversation's message rows as a compressed JSON blob for the
+message_archives table, and decodes them back into the row dicts that
+MessageService returns for hot messages.
+"""
+
+import gzip
+from datetime import datetime
+from typing import Any, Dict, List, Optional, Tuple
+
+from sqlmodel import Session, select
+
+from app.core.responses import dumps, loads
+from app.models.message_archive import MessageArchive
+
+try:
+    import zstandard
+except ImportError:  # pragma: no cover - optional dependency
+    zstandard = None
+
+# Preferred codec; gzip is used when zstandard is not installed
+DEFAULT_CODEC = "zstd" if zstandard is not None else "gzip"
+ZSTD_LEVEL = 9
+
+
+def compress_payload(payload: bytes, codec: str = DEFAULT_CODEC) -> Tuple[str, bytes]:
+    """
+    Compress a JSON payload.
+
+    Args:
+        payload: Serialized JSON
+        codec: 'zstd' or 'gzip'
+
+    Returns:
+        (codec, data): Codec actually used and the compressed bytes
+    """
+    if codec == "zstd" and zstandard is not None:
+        return "zstd", zstandard.ZstdCompressor(level=ZSTD_LEVEL).compress(payload)
+    return "gzip", gzip.compress(payload)
+
+
+def decompress_payload(codec: str, data: bytes) -> bytes:
+    """
+    Decompress bytes written by compress_payload.
+
+    Args:
+        codec: Codec stored with the data
+        data: Compressed bytes
+
+    Returns:
+        bytes: Serialized JSON
+
+    Raises:
+        ValueError: If the codec is unknown or its library is missing
+    """
+    if codec == "zstd":
+        if zstandard is None:
+            raise ValueError("zstandard is required to read zstd-compressed data")
+        return zstandard.ZstdDecompressor().decompress(data)
+    if codec == "gzip":
+        return gzip.decompress(data)
+    raise ValueError(f"Unknown codec: {codec}")
+
+
+def encode_messages(rows: List[Dict[str, Any]], codec: str = DEFAULT_CODEC) -> Tuple[str, bytes]:
+    """
+    Compress message rows into an archive blob.
+
+    Args:
+        rows: Message dicts (id, role, content, tool_calls, created_at), oldest first
+        codec: 'zstd' or 'gzip'
+
+    Returns:
+        (codec, data): Codec actually used and the compressed JSON
+    """
+    return compress_payload(dumps(rows), codec)
+
+
+def decode_messages(codec: str, data: bytes) -> List[Dict[str, Any]]:
+    """
+    Decompress an archive blob back into message rows.
+
+    Args:
+        codec: Codec stored with the archive
+        data: Compressed JSON
+
+    Returns:
+        List of message dicts, oldest first, with created_at as datetime
+
+    Raises:
+        ValueError: If the codec is unknown or its library is missing
+    """
+    rows = loads(decompress_payload(codec, data))
+    for row in rows:
+        row["created_at"] = datetime.fromisoformat(row["created_at"])
+    return rows
+
+
+def get_archive(session: Session, conversation_id: int) -> Optional[MessageArchive]:
+    """Get the archive of a conversation, if it has one."""
+    statement = select(MessageArchive).where(MessageArchive.conversation_id == conversation_id)
+    return session.exec(statement).first()
+
+
+def load_archived_rows(session: Session, conversation_id: int) -> List[Dict[str, Any]]:
+    """
+    Load and decode a conversation's archived messages.
+
+    Args:
+        session: Database session
+        conversation_id: ID of the conversation
+
+    Returns:
+        List of message dicts, oldest first (empty if nothing is archived)
+    """
+    archive = get_archive(session, conversation_id)
+    if archive is None:
+        return []
+    return decode_messages(archive.codec, archive.data)
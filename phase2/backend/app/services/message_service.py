@@ -5,11 +5,35 @@ Task: T-021 - Create message service
 Handles message CRUD operations and conversation history retrieval.
 """
 
-from sqlmodel import Session, select
+from sqlmodel import Session, func, or_, select
+from app.core.tracing import traced
 from app.models.message import Message
-from typing import Optional, List, Any, Dict
+from app.models.message_archive import MessageArchive
+from app.services.message_archive import load_archived_rows
+from app.services.tool_result_store import (
+    add_tool_result_refs,
+    compact_tool_calls,
+    delete_tool_result_refs,
+    expand_tool_calls,
+)
+from typing import Optional, List, Any, Dict, Tuple
 from datetime import datetime
 
+# Columns returned by the row-level read path (matches MessageResponse)
+MESSAGE_ROW_COLUMNS = (Message.id, Message.role, Message.content, Message.tool_calls, Message.created_at)
+MESSAGE_ROW_KEYS = ("id", "role", "content", "tool_calls", "created_at")
+MESSAGE_ROW_COLUMNS_NO_TOOLS = (Message.id, Message.role, Message.content, Message.created_at)
+MESSAGE_ROW_KEYS_NO_TOOLS = ("id", "role", "content", "created_at")
+
+
+def _older_than(rows: List[Dict[str, Any]], before: int) -> List[Dict[str, Any]]:
+    """Archived rows (oldest first) that precede the message with ID before."""
+    for index, row in enumerate(rows):
+        if row["id"] == before:
+            return rows[:index]
+    # Cursor is a hot message: every archived row is older
+    return rows
+
 
 class MessageService:
     """
@@ -26,6 +50,7 @@ class MessageService:
         """
         self.session = session
 
+    @traced()
     def create_message(
         self,
         conversation_id: int,
@@ -35,6 +60,7 @@ class MessageService:
     ) -> Message:
         """
         Create a new message in a conversation.
+        Large tool results are stored separately (see tool_result_store).
 
         Args:
             conversation_id: ID of the conversation
@@ -49,15 +75,18 @@ class MessageService:
             conversation_id=conversation_id,
             role=role,
             content=content,
-            tool_calls=tool_calls
+            tool_calls=compact_tool_calls(self.session, tool_calls)
         )
 
         self.session.add(message)
+        self.session.flush()
+        add_tool_result_refs(self.session, message)
         self.session.commit()
         self.session.refresh(message)
 
         return message
 
+    @traced()
     def create_user_message(self, conversation_id: int, content: str) -> Message:
         """
         Create a user message in a conversation.
@@ -75,6 +104,7 @@ class MessageService:
             content=content
         )
 
+    @traced()
     def create_assistant_message(
         self,
         conversation_id: int,
@@ -99,6 +129,7 @@ class MessageService:
             tool_calls=tool_calls
         )
 
+    @traced()
     def get_conversation_messages(
         self,
         conversation_id: int,
@@ -106,6 +137,8 @@ class MessageService:
     ) -> List[Message]:
         """
         Get all messages for a conversation, ordered by creation time.
+        Archived messages are rehydrated as detached Message instances.
+        Spilled tool results are left as digests.
 
         Args:
             conversation_id: ID of the conversation
@@ -114,15 +147,123 @@ class MessageService:
         Returns:
             List[Message]: List of messages in the conversation
         """
+        archived = [
+            Message(conversation_id=conversation_id, **row)
+            for row in load_archived_rows(self.session, conversation_id)
+        ]
+        if limit and len(archived) >= limit:
+            return archived[:limit]
+
         statement = select(Message).where(
             Message.conversation_id == conversation_id
         ).order_by(Message.created_at.asc())
 
         if limit:
-            statement = statement.limit(limit)
+            statement = statement.limit(limit - len(archived))
 
-        return list(self.session.exec(statement).all())
+        return archived + list(self.session.exec(statement).all())
 
+    @traced()
+    def get_conversation_message_rows(
+        self,
+        conversation_id: int,
+        expand_tool_results: bool = True
+    ) -> List[Dict[str, Any]]:
+        """
+        Get all messages for a conversation as plain dicts, oldest first.
+
+        Reads only the response columns instead of building Message
+        instances, for endpoints that only serialize the result. Archived
+        messages come first.
+
+        Args:
+            conversation_id: ID of the conversation
+            expand_tool_results: Replace tool result digests with the stored results
+
+        Returns:
+            List of dicts with id, role, content, tool_calls and created_at
+        """
+        statement = select(*MESSAGE_ROW_COLUMNS).where(
+            Message.conversation_id == conversation_id
+        ).order_by(Message.created_at.asc())
+
+        rows = load_archived_rows(self.session, conversation_id)
+        rows.extend(dict(zip(MESSAGE_ROW_KEYS, row)) for row in self.session.exec(statement))
+        if expand_tool_results:
+            expand_tool_calls(self.session, rows)
+        return rows
+
+    @traced()
+    def get_message_page(
+        self,
+        conversation_id: int,
+        limit: int = 50,
+        before: Optional[int] = None,
+        include_tool_calls: bool = True,
+        expand_tool_results: bool = True
+    ) -> Tuple[List[Dict[str, Any]], bool]:
+        """
+        Get one page of messages, newest first, using keyset pagination.
+
+        Pages are ordered by (created_at, id) descending, which walks the
+        idx_conversation_messages (conversation_id, created_at) index. The
+        cursor is the id of the oldest message of the previous page; its
+        position is resolved in the same query.
+
+        Args:
+            conversation_id: ID of the conversation
+            limit: Maximum number of messages to return
+            before: Only return messages older than this message ID
+            include_tool_calls: Whether to read the tool_calls column
+            expand_tool_results: Replace tool result digests with the stored results
+
+        Returns:
+            (rows, has_more): Message dicts newest first, and whether older
+            messages exist
+        """
+        if include_tool_calls:
+            columns, keys = MESSAGE_ROW_COLUMNS, MESSAGE_ROW_KEYS
+        else:
+            columns, keys = MESSAGE_ROW_COLUMNS_NO_TOOLS, MESSAGE_ROW_KEYS_NO_TOOLS
+
+        statement = select(*columns).where(Message.conversation_id == conversation_id)
+        if before is not None:
+            cursor_created_at = (
+                select(Message.created_at)
+                .where(Message.id == before, Message.conversation_id == conversation_id)
+                .scalar_subquery()
+            )
+            # created_at <= cursor bounds the index range scan; id breaks ties
+            statement = statement.where(
+                Message.created_at <= cursor_created_at,
+                or_(Message.created_at < cursor_created_at, Message.id < before)
+            )
+        statement = statement.order_by(
+            Message.created_at.desc(), Message.id.desc()
+        ).limit(limit + 1)
+
+        rows = [dict(zip(keys, row)) for row in self.session.exec(statement)]
+
+        # Archived messages are all older than the hot ones: continue into
+        # the archive only once the hot rows run out
+        if len(rows) <= limit:
+            archived = load_archived_rows(self.session, conversation_id)
+            if archived:
+                if before is not None and not rows:
+                    archived = _older_than(archived, before)
+                for row in reversed(archived):
+                    if not include_tool_calls:
+                        row.pop("tool_calls", None)
+                    rows.append(row)
+                    if len(rows) > limit:
+                        break
+
+        page = rows[:limit]
+        if include_tool_calls and expand_tool_results:
+            expand_tool_calls(self.session, page)
+        return page, len(rows) > limit
+
+    @traced()
     def get_conversation_history(
         self,
         conversation_id: int,
@@ -133,21 +274,22 @@ class MessageService:
 
         Args:
             conversation_id: ID of the conversation
-            max_messages: Maximum number of messages to return (default 50)
+            max_messages: Maximum number of most recent messages to return (default 50)
 
         Returns:
-            List of message dictionaries in OpenAI format
+            List of message dictionaries in OpenAI format, oldest first
         """
-        messages = self.get_conversation_messages(conversation_id, limit=max_messages)
+        rows, _ = self.get_message_page(conversation_id, limit=max_messages, include_tool_calls=False)
 
         return [
             {
-                "role": msg.role,
-                "content": msg.content
+                "role": row["role"],
+                "content": row["content"]
             }
-            for msg in messages
+            for row in reversed(rows)
         ]
 
+    @traced()
     def get_message_by_id(self, message_id: int) -> Optional[Message]:
         """
         Get a specific message by ID.
@@ -161,6 +303,7 @@ class MessageService:
         statement = select(Message).where(Message.id == message_id)
         return self.session.exec(statement).first()
 
+    @traced()
     def delete_message(self, message_id: int) -> bool:
         """
         Delete a message by ID.
@@ -175,11 +318,13 @@ class MessageService:
         if not message:
             return False
 
+        delete_tool_result_refs(self.session, message_ids=[message.id])
         self.session.delete(message)
         self.session.commit()
 
         return True
 
+    @traced()
     def get_message_count(self, conversation_id: int) -> int:
         """
         Get the number of messages in a conversation.
@@ -190,7 +335,10 @@ class MessageService:
         Returns:
             int: Number of messages
         """
-        statement = select(Message).where(
+        hot = select(func.count()).select_from(Message).where(
             Message.conversation_id == conversation_id
         )
-        return len(list(self.session.exec(statement).all()))
+        archived = select(MessageArchive.message_count).where(
+            MessageArchive.conversation_id == conversation_id
+        )
+        return self.session.exec(hot).one() + (self.session.exec(archived).first() or 0)
@@ -0,0 +1,233 @@
+"""
+Message Retention Service
+Message retention: archive tier and hard-delete retention
+
+Keeps the hot messages table small:
+- Conversations idle for MESSAGE_ARCHIVE_AFTER_DAYS have their messages
+  moved into one compressed message_archives row each. MessageService
+  reads both tiers, so archived history stays available.
+- Conversations idle for MESSAGE_RETENTION_DAYS are deleted with all
+  their messages and archives.
+- Conversations left hidden by an interrupted background delete are purged.
+- Spilled tool results no message references any more are deleted.
+
+Run periodically, e.g. as a Kubernetes CronJob:
+    python -m app.services.retention_service
+"""
+
+from datetime import datetime, timedelta
+from typing import Dict, List, Optional, Tuple
+import logging
+
+from sqlmodel import Session, delete, exists, select
+
+from app.core.config import settings
+from app.core.database import engine
+from app.core.metrics import metrics
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.models.message_archive import MessageArchive
+from app.services.conversation_service import purge_conversations, purge_hidden_conversations
+from app.services.message_archive import decode_messages, encode_messages, get_archive
+from app.services.message_service import MESSAGE_ROW_COLUMNS, MESSAGE_ROW_KEYS
+from app.services.tool_result_store import purge_orphaned_tool_results
+
+logger = logging.getLogger(__name__)
+
+ARCHIVED_MESSAGES = metrics.counter(
+    "retention_archived_messages_total",
+    "Messages moved from the messages table into message_archives",
+)
+EXPIRED_CONVERSATIONS = metrics.counter(
+    "retention_expired_conversations_total",
+    "Conversations deleted by the retention policy",
+)
+
+
+def archive_conversation(session: Session, conversation_id: int) -> int:
+    """
+    Move a conversation's hot messages into its archive and commit.
+
+    Messages already archived are decoded and re-encoded together with the
+    new ones, so each conversation keeps a single archive row. Only the
+    rows read here are deleted, so a message written concurrently stays hot
+    (and is newer than everything archived).
+
+    Args:
+        session: Database session
+        conversation_id: ID of the conversation
+
+    Returns:
+        int: Number of messages archived
+    """
+    statement = select(*MESSAGE_ROW_COLUMNS).where(
+        Message.conversation_id == conversation_id
+    ).order_by(Message.created_at.asc(), Message.id.asc())
+    hot_rows = [dict(zip(MESSAGE_ROW_KEYS, row)) for row in session.exec(statement)]
+    if not hot_rows:
+        return 0
+
+    archive = get_archive(session, conversation_id)
+    rows = decode_messages(archive.codec, archive.data) if archive else []
+    rows.extend(hot_rows)
+    codec, data = encode_messages(rows)
+
+    if archive is None:
+        archive = MessageArchive(conversation_id=conversation_id, codec=codec, data=data,
+                                 message_count=0, last_message_at=rows[-1]["created_at"])
+    archive.codec = codec
+    archive.data = data
+    archive.message_count = len(rows)
+    archive.last_message_at = rows[-1]["created_at"]
+    archive.archived_at = datetime.utcnow()
+    session.add(archive)
+
+    session.exec(
+        delete(Message).where(
+            Message.conversation_id == conversation_id,
+            Message.id.in_([row["id"] for row in hot_rows])
+        )
+    )
+    session.commit()
+
+    ARCHIVED_MESSAGES.inc(len(hot_rows))
+    return len(hot_rows)
+
+
+def idle_conversation_ids(session: Session, idle_days: int, limit: int) -> List[int]:
+    """
+    Find conversations idle for idle_days that still have hot messages.
+
+    Args:
+        session: Database session
+        idle_days: Days since the conversation's last update
+        limit: Maximum number of IDs to return
+
+    Returns:
+        List[int]: Conversation IDs
+    """
+    cutoff = datetime.utcnow() - timedelta(days=idle_days)
+    statement = select(Conversation.id).where(
+        Conversation.updated_at < cutoff,
+        exists().where(Message.conversation_id == Conversation.id)
+    ).limit(limit)
+    return list(session.exec(statement).all())
+
+
+def expired_conversation_ids(session: Session, retention_days: int, limit: int) -> List[int]:
+    """
+    Find conversations idle for longer than the retention period.
+
+    Args:
+        session: Database session
+        retention_days: Days since the conversation's last update
+        limit: Maximum number of IDs to return
+
+    Returns:
+        List[int]: Conversation IDs
+    """
+    cutoff = datetime.utcnow() - timedelta(days=retention_days)
+    statement = select(Conversation.id).where(Conversation.updated_at < cutoff).limit(limit)
+    return list(session.exec(statement).all())
+
+
+def archive_idle_conversations(
+    idle_days: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> Tuple[int, int]:
+    """
+    Archive every conversation idle for idle_days, one transaction each.
+
+    Args:
+        idle_days: Idle threshold (default MESSAGE_ARCHIVE_AFTER_DAYS; 0 disables)
+        batch_size: Conversations looked up per query (default RETENTION_BATCH_SIZE)
+
+    Returns:
+        (conversations, messages): Number of conversations and messages archived
+    """
+    idle_days = settings.MESSAGE_ARCHIVE_AFTER_DAYS if idle_days is None else idle_days
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    if idle_days <= 0:
+        return 0, 0
+
+    conversations = messages = 0
+    with Session(engine) as session:
+        while True:
+            conversation_ids = idle_conversation_ids(session, idle_days, batch_size)
+            for conversation_id in conversation_ids:
+                try:
+                    messages += archive_conversation(session, conversation_id)
+                    conversations += 1
+                except Exception as e:
+                    session.rollback()
+                    logger.exception(f"Failed to archive conversation {conversation_id}: {e}")
+                    return conversations, messages
+            if len(conversation_ids) < batch_size:
+                break
+    return conversations, messages
+
+
+def delete_expired_conversations(
+    retention_days: Optional[int] = None,
+    batch_size: Optional[int] = None
+) -> int:
+    """
+    Hard-delete conversations idle for longer than retention_days.
+
+    Args:
+        retention_days: Retention period (default MESSAGE_RETENTION_DAYS; 0 keeps everything)
+        batch_size: Conversations deleted per batch (default RETENTION_BATCH_SIZE)
+
+    Returns:
+        int: Number of conversations deleted (stops at the first failed batch)
+    """
+    retention_days = settings.MESSAGE_RETENTION_DAYS if retention_days is None else retention_days
+    batch_size = batch_size or settings.RETENTION_BATCH_SIZE
+    if retention_days <= 0:
+        return 0
+
+    deleted = 0
+    while True:
+        with Session(engine) as session:
+            conversation_ids = expired_conversation_ids(session, retention_days, batch_size)
+        if not conversation_ids:
+            break
+        try:
+            purge_conversations(conversation_ids, raise_errors=True)
+        except Exception:
+            # Already logged; the same batch would be selected again forever
+            break
+        deleted += len(conversation_ids)
+        EXPIRED_CONVERSATIONS.inc(len(conversation_ids))
+        if len(conversation_ids) < batch_size:
+            break
+    return deleted
+
+
+def run_retention() -> Dict[str, int]:
+    """
+    Run one retention pass: expire, then archive, then finish hidden
+    purges, then drop unreferenced tool results.
+
+    Returns:
+        dict: Counts of what was done
+    """
+    expired = delete_expired_conversations()
+    archived_conversations, archived_messages = archive_idle_conversations()
+    purged_messages = purge_hidden_conversations()
+    with Session(engine) as session:
+        orphaned_results = purge_orphaned_tool_results(session)
+    summary = {
+        "expired_conversations": expired,
+        "archived_conversations": archived_conversations,
+        "archived_messages": archived_messages,
+        "purged_hidden_messages": purged_messages,
+        "orphaned_tool_results": orphaned_results,
+    }
+    logger.info(f"Retention pass finished: {summary}")
+    return summary
+
+
+if __name__ == "__main__":
+    logging.basicConfig(level=logging.INFO)
+    print(run_retention())
@@ -3,9 +3,15 @@ Task service layer for business logic
 Task: T-012 - Create Task Service Layer
 """
 
-from sqlmodel import Session, select
+from sqlmodel import Session, func, select
+from app.core.database import bind_user
 from app.models.task import Task
-from typing import Optional
+from typing import Any, Dict, List, Optional
+from datetime import datetime
+
+# Columns returned by the row-level read path, in table order
+TASK_COLUMNS = tuple(Task.__table__.columns)
+TASK_KEYS = tuple(column.key for column in TASK_COLUMNS)
 
 
 class TaskService:
@@ -14,16 +20,29 @@ class TaskService:
     Ensures data isolation by filtering all queries by user_id.
     """
 
-    def __init__(self, session: Session, user_id: str):
+    def __init__(self, session: Session, user_id: str, autocommit: bool = True):
         """
         Initialize task service.
 
         Args:
             session: Database session
             user_id: Current user's ID (from JWT token)
+            autocommit: Commit each write; False only flushes, leaving the
+                commit to the caller's unit of work
         """
         self.session = session
         self.user_id = user_id
+        self.autocommit = autocommit
+        bind_user(session, user_id)
+
+    def _save(self, task: Optional[Task] = None) -> None:
+        """Commit (and reload task), or just flush when not autocommitting."""
+        if not self.autocommit:
+            self.session.flush()
+            return
+        self.session.commit()
+        if task is not None:
+            self.session.refresh(task)
 
     def create_task(self, title: str, description: str = "") -> Task:
         """
@@ -54,8 +73,7 @@ class TaskService:
         )
 
         self.session.add(task)
-        self.session.commit()
-        self.session.refresh(task)
+        self._save(task)
 
         return task
 
@@ -69,6 +87,34 @@ class TaskService:
         statement = select(Task).where(Task.user_id == self.user_id)
         return list(self.session.exec(statement).all())
 
+    def get_all_task_rows(self) -> List[Dict[str, Any]]:
+        """
+        Get all tasks for the current user as plain dicts.
+
+        Reads columns directly instead of building Task instances, for
+        endpoints that only serialize the result.
+
+        Returns:
+            List of task dicts with the same keys as Task
+        """
+        statement = select(*TASK_COLUMNS).where(Task.user_id == self.user_id)
+        return [dict(zip(TASK_KEYS, row)) for row in self.session.exec(statement)]
+
+    def get_task_set_version(self) -> str:
+        """
+        Get a version string that changes whenever the user's tasks change.
+
+        Creates and updates raise max(updated_at); deletes lower the count.
+
+        Returns:
+            str: Task count and latest updated_at
+        """
+        statement = select(func.count(Task.id), func.max(Task.updated_at)).where(
+            Task.user_id == self.user_id
+        )
+        count, last_updated = self.session.exec(statement).one()
+        return f"{count}:{last_updated.isoformat() if last_updated else ''}"
+
     def get_task_by_id(self, task_id: int) -> Optional[Task]:
         """
         Get a specific task by ID (only if owned by current user).
@@ -79,11 +125,11 @@ class TaskService:
         Returns:
             Optional[Task]: Task if found and owned by user, None otherwise
         """
-        statement = select(Task).where(
-            Task.id == task_id,
-            Task.user_id == self.user_id
-        )
-        return self.session.exec(statement).first()
+        # session.get answers from the identity map when the task is loaded
+        task = self.session.get(Task, task_id)
+        if task is None or task.user_id != self.user_id:
+            return None
+        return task
 
     def update_task(
         self,
@@ -119,9 +165,9 @@ class TaskService:
         if description is not None:
             task.description = description.strip()
 
+        task.updated_at = datetime.utcnow()
         self.session.add(task)
-        self.session.commit()
-        self.session.refresh(task)
+        self._save(task)
 
         return task
 
@@ -140,7 +186,7 @@ class TaskService:
             return False
 
         self.session.delete(task)
-        self.session.commit()
+        self._save()
 
         return True
 
@@ -159,9 +205,9 @@ class TaskService:
             return None
 
         task.completed = not task.completed
+        task.updated_at = datetime.utcnow()
 
         self.session.add(task)
-        self.session.commit()
-        self.session.refresh(task)
+        self._save(task)
 
         return task
@@ -0,0 +1,271 @@
+"""
+Tool result store
+Compact tool_calls storage: large results are stored once, by reference
+
+Assistant messages record every tool call with its full result, and a
+list_tasks result carries the user's whole task list on every turn. Before
+a message is saved, results larger than TOOL_RESULT_INLINE_MAX_BYTES are
+spilled to the tool_results table, keyed by the SHA-256 of their JSON (so
+repeated identical results are stored once), and replaced in
+messages.tool_calls by a digest:
+
+    {"success": true, "count": 42, "error": null,
+     "_ref": "<sha256>", "_bytes": 5120}
+
+The digest keeps the result's top-level scalars (strings truncated), so
+clients that only show success/error need no rehydration. The history
+endpoints swap digests back for the full results in one query.
+
+Each saved message records its references in tool_result_refs, and
+reusing a stored result bumps its last_referenced_at. Orphans (results
+without references) are deleted a grace period after their last use,
+without reading any message or archive.
+"""
+
+import hashlib
+from datetime import datetime, timedelta
+from typing import Any, Dict, Iterable, List, Optional
+
+from sqlalchemy import insert, update
+from sqlmodel import Session, delete, exists, select
+
+from app.core.config import settings
+from app.core.metrics import metrics
+from app.core.responses import dumps, loads
+from app.models.message import Message
+from app.models.tool_result import ToolResult, ToolResultRef
+from app.services.message_archive import compress_payload, decompress_payload
+
+REF_KEY = "_ref"
+SIZE_KEY = "_bytes"
+
+SPILLED_RESULTS = metrics.counter(
+    "tool_results_spilled_total",
+    "Tool results moved out of messages.tool_calls, by whether they were new",
+    ("stored",),
+)
+
+
+def _digest(result: Any, ref: str, size: int, preview_chars: int) -> Dict[str, Any]:
+    """Top-level scalars of result plus the reference to the full value."""
+    digest: Dict[str, Any] = {}
+    if isinstance(result, dict):
+        for key, value in result.items():
+            if isinstance(value, str):
+                digest[key] = value[:preview_chars]
+            elif value is None or isinstance(value, (bool, int, float)):
+                digest[key] = value
+    digest[REF_KEY] = ref
+    digest[SIZE_KEY] = size
+    return digest
+
+
+def is_reference(result: Any) -> bool:
+    """Whether a stored tool call result is a digest pointing at tool_results."""
+    return isinstance(result, dict) and REF_KEY in result
+
+
+def _insert_ignoring_duplicates(session: Session, model: Any, values: List[Dict[str, Any]], keys: List[str]) -> None:
+    """Insert rows, skipping keys a concurrent writer stored first."""
+    dialect = session.get_bind().dialect.name
+    if dialect == "postgresql":
+        from sqlalchemy.dialects.postgresql import insert as dialect_insert
+    elif dialect == "sqlite":
+        from sqlalchemy.dialects.sqlite import insert as dialect_insert
+    else:
+        session.exec(insert(model).values(values))
+        return
+    session.exec(dialect_insert(model).values(values).on_conflict_do_nothing(index_elements=keys))
+
+
+def compact_tool_calls(
+    session: Session,
+    tool_calls: Optional[List[Dict[str, Any]]],
+    inline_max_bytes: Optional[int] = None
+) -> Optional[List[Dict[str, Any]]]:
+    """
+    Replace large tool call results with digests, storing the results.
+
+    The results are written in the caller's transaction, so they commit
+    (or roll back) together with the message that references them. Once
+    the message has an ID, the caller records its references with
+    add_tool_result_refs().
+
+    Args:
+        session: Database session
+        tool_calls: Tool calls as returned by the agent
+        inline_max_bytes: Largest result kept inline (default
+            TOOL_RESULT_INLINE_MAX_BYTES; 0 keeps everything inline)
+
+    Returns:
+        The tool calls to store (a new list; the input is not modified)
+    """
+    inline_max_bytes = settings.TOOL_RESULT_INLINE_MAX_BYTES if inline_max_bytes is None else inline_max_bytes
+    if not tool_calls or inline_max_bytes <= 0:
+        return tool_calls
+
+    compacted = []
+    pending: Dict[str, bytes] = {}
+    for call in tool_calls:
+        result = call.get("result") if isinstance(call, dict) else None
+        if result is None or is_reference(result):
+            compacted.append(call)
+            continue
+        payload = dumps(result)
+        if len(payload) <= inline_max_bytes:
+            compacted.append(call)
+            continue
+        ref = hashlib.sha256(payload).hexdigest()
+        pending[ref] = payload
+        compacted.append({**call, "result": _digest(result, ref, len(payload), settings.TOOL_RESULT_PREVIEW_CHARS)})
+
+    if pending:
+        now = datetime.utcnow()
+        # Touching reused results both finds them and restarts their grace
+        # period; a result purged just before is simply stored again
+        existing = set(session.exec(
+            update(ToolResult)
+            .where(ToolResult.hash.in_(list(pending)))
+            .values(last_referenced_at=now)
+            .returning(ToolResult.hash)
+        ).scalars().all())
+        new = []
+        for ref, payload in pending.items():
+            if ref in existing:
+                continue
+            codec, data = compress_payload(payload)
+            new.append({"hash": ref, "codec": codec, "data": data, "size": len(payload),
+                        "created_at": now, "last_referenced_at": now})
+        if new:
+            _insert_ignoring_duplicates(session, ToolResult, new, ["hash"])
+        SPILLED_RESULTS.inc(len(new), stored="new")
+        SPILLED_RESULTS.inc(len(pending) - len(new), stored="deduplicated")
+
+    return compacted
+
+
+def load_tool_results(session: Session, refs: Iterable[str]) -> Dict[str, Any]:
+    """
+    Load stored tool results by reference.
+
+    Args:
+        session: Database session
+        refs: SHA-256 references
+
+    Returns:
+        dict: Reference -> decoded result (missing references are omitted)
+    """
+    refs = list(set(refs))
+    if not refs:
+        return {}
+    statement = select(ToolResult.hash, ToolResult.codec, ToolResult.data).where(ToolResult.hash.in_(refs))
+    return {ref: loads(decompress_payload(codec, data)) for ref, codec, data in session.exec(statement)}
+
+
+def _references(tool_calls: Any) -> Iterable[str]:
+    if isinstance(tool_calls, list):
+        for call in tool_calls:
+            if isinstance(call, dict) and is_reference(call.get("result")):
+                yield call["result"][REF_KEY]
+
+
+def expand_tool_calls(session: Session, rows: List[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """
+    Swap digests in message rows' tool_calls for the stored results.
+
+    All references in rows are loaded with a single query. A digest whose
+    result is no longer stored is left as is.
+
+    Args:
+        session: Database session
+        rows: Message dicts with a tool_calls key (modified in place)
+
+    Returns:
+        The same rows
+    """
+    refs = [ref for row in rows for ref in _references(row.get("tool_calls"))]
+    if not refs:
+        return rows
+
+    results = load_tool_results(session, refs)
+    for row in rows:
+        tool_calls = row.get("tool_calls")
+        if not any(True for _ in _references(tool_calls)):
+            continue
+        row["tool_calls"] = [
+            {**call, "result": results[call["result"][REF_KEY]]}
+            if isinstance(call, dict) and is_reference(call.get("result")) and call["result"][REF_KEY] in results
+            else call
+            for call in tool_calls
+        ]
+    return rows
+
+
+def add_tool_result_refs(session: Session, message: Message) -> None:
+    """
+    Record the stored results a message references.
+
+    Args:
+        session: Database session (the message's transaction)
+        message: Flushed message with compacted tool_calls
+    """
+    refs = set(_references(message.tool_calls))
+    if refs:
+        _insert_ignoring_duplicates(session, ToolResultRef, [
+            {"hash": ref, "message_id": message.id, "conversation_id": message.conversation_id}
+            for ref in refs
+        ], ["hash", "message_id"])
+
+
+def delete_tool_result_refs(
+    session: Session,
+    message_ids: Optional[List[int]] = None,
+    conversation_ids: Optional[Any] = None
+) -> None:
+    """
+    Drop the references of deleted messages or conversations.
+
+    The results themselves are deleted later by purge_orphaned_tool_results().
+
+    Args:
+        session: Database session
+        message_ids: Deleted messages
+        conversation_ids: Deleted conversations (a list or a subquery of IDs)
+    """
+    if message_ids is not None:
+        session.exec(delete(ToolResultRef).where(ToolResultRef.message_id.in_(message_ids)))
+    if conversation_ids is not None:
+        session.exec(delete(ToolResultRef).where(ToolResultRef.conversation_id.in_(conversation_ids)))
+
+
+def purge_orphaned_tool_results(session: Session, grace: timedelta = timedelta(hours=1)) -> int:
+    """
+    Delete stored results that no message references any more.
+
+    Results referenced within grace are kept, so a result stored or reused
+    by a turn that has not committed its message yet is never deleted.
+
+    Args:
+        session: Database session
+        grace: Minimum time since a result was last referenced before it can be deleted
+
+    Returns:
+        int: Number of results deleted
+    """
+    cutoff = datetime.utcnow() - grace
+    orphaned = list(session.exec(
+        select(ToolResult.hash).where(
+            ToolResult.last_referenced_at < cutoff,
+            ~exists().where(ToolResultRef.hash == ToolResult.hash)
+        )
+    ).all())
+    deleted = 0
+    for start in range(0, len(orphaned), 500):
+        # Re-check the conditions: a turn may have reused a result since the select
+        deleted += session.exec(delete(ToolResult).where(
+            ToolResult.hash.in_(orphaned[start:start + 500]),
+            ToolResult.last_referenced_at < cutoff,
+            ~exists().where(ToolResultRef.hash == ToolResult.hash)
+        )).rowcount
+    session.commit()
+    return deleted
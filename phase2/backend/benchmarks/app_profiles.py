@@ -0,0 +1,89 @@
+"""
+Benchmark: startup time and resident memory per app profile
+
+Builds the app with create_app(profile) in a fresh interpreter for each
+profile and reports the time to import and assemble it, the peak resident
+set size, the number of routes and whether the agent stack was loaded.
+With --warm the chat profile also loads the agent stack, as its first
+chat request would.
+
+Usage:
+    python -m benchmarks.app_profiles [--runs 3] [--warm]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+PROFILES = ("full", "tasks", "chat", "analytics")
+
+ENV = {
+    "DATABASE_URL": "sqlite:///./test.db",
+    "JWT_SECRET": "benchmark-secret",
+    "OPENAI_API_KEY": "sk-benchmark",
+    "KAFKA_ENABLED": "false",
+}
+
+PROBE = """
+import json, resource, sys, time
+start = time.perf_counter()
+from app.main import create_app
+app = create_app({profile!r})
+if {warm!r} and {profile!r} in ("full", "chat"):
+    from app.services.agent_service import get_agent_service
+    get_agent_service()
+elapsed = time.perf_counter() - start
+print(json.dumps({{
+    "startup_ms": elapsed * 1000,
+    "maxrss_mb": resource.getrusage(resource.RUSAGE_SELF).ru_maxrss / 1024,
+    "routes": len(app.routes),
+    "modules": len(sys.modules),
+    "openai": "openai" in sys.modules,
+}}))
+"""
+
+
+def measure_once(profile: str, warm: bool = False) -> dict:
+    """
+    Build one profile in a fresh interpreter.
+
+    Args:
+        profile: App profile name
+        warm: Also load the agent stack for chat-serving profiles
+
+    Returns:
+        dict: startup_ms, maxrss_mb, routes, modules, openai
+    """
+    env = {**os.environ, **ENV, "APP_PROFILE": profile}
+    result = subprocess.run(
+        [sys.executable, "-c", PROBE.format(profile=profile, warm=warm)],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=3)
+    parser.add_argument("--warm", action="store_true")
+    args = parser.parse_args()
+
+    print(f"{'profile':<10} {'startup ms':>11} {'max RSS MB':>11} {'routes':>7} {'modules':>8}  openai")
+    for profile in PROFILES:
+        runs = [measure_once(profile, args.warm) for _ in range(args.runs)]
+        last = runs[-1]
+        print(
+            f"{profile:<10} "
+            f"{statistics.median(r['startup_ms'] for r in runs):11.0f} "
+            f"{statistics.median(r['maxrss_mb'] for r in runs):11.1f} "
+            f"{last['routes']:7d} {last['modules']:8d}  {'yes' if last['openai'] else 'no'}"
+        )
+
+
+if __name__ == "__main__":
+    main()
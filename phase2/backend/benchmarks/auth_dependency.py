@@ -0,0 +1,56 @@
+"""
+Benchmark: per-call cost of the get_current_user_id dependency
+
+Compares full JWT verification on every call (cache disabled) with the
+verified-token cache, for the same token presented repeatedly.
+
+Usage:
+    python -m benchmarks.auth_dependency
+"""
+
+import asyncio
+import os
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+from unittest.mock import patch
+
+from fastapi.security import HTTPAuthorizationCredentials
+
+ITERATIONS = 20000
+
+
+async def time_dependency(credentials, iterations: int) -> float:
+    from app.core.auth import get_current_user_id
+
+    start = time.perf_counter()
+    for _ in range(iterations):
+        await get_current_user_id(credentials)
+    return (time.perf_counter() - start) / iterations
+
+
+def main():
+    from app.core.security import create_access_token
+    from app.core.token_cache import TokenCache
+
+    token = create_access_token({"sub": "bench-user"})
+    credentials = HTTPAuthorizationCredentials(scheme="Bearer", credentials=token)
+
+    with patch("app.core.security.token_cache", TokenCache(max_size=0)):
+        uncached = asyncio.run(time_dependency(credentials, ITERATIONS))
+
+    cache = TokenCache()
+    with patch("app.core.security.token_cache", cache):
+        cached = asyncio.run(time_dependency(credentials, ITERATIONS))
+
+    print(f"full verification: {uncached * 1e6:8.2f} us/call")
+    print(f"cached:            {cached * 1e6:8.2f} us/call  ({uncached / cached:.1f}x faster)")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,97 @@
+"""
+Benchmark: database round trips per chat request
+
+Drives POST /api/chat through the real FastAPI app against a file-backed
+SQLite database (the agent is stubbed out) and counts the SQL statements
+and COMMITs issued per request, for both a new and an existing conversation.
+
+Usage:
+    python -m benchmarks.chat_db_round_trips
+"""
+
+import os
+import sys
+import tempfile
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+os.environ.setdefault("OPENAI_API_KEY", "sk-benchmark")
+
+from unittest.mock import AsyncMock, patch
+
+from fastapi.testclient import TestClient
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine
+
+
+AGENT_REPLY = {"content": "Here are your tasks.", "tool_calls": None}
+
+
+class RoundTripCounter:
+    """Counts statements and commits issued by an engine."""
+
+    def __init__(self, engine):
+        self.statements = 0
+        self.commits = 0
+        event.listen(engine, "before_cursor_execute", self._on_execute)
+        event.listen(engine, "commit", self._on_commit)
+
+    def _on_execute(self, *args):
+        self.statements += 1
+
+    def _on_commit(self, *args):
+        self.commits += 1
+
+    def reset(self):
+        self.statements = 0
+        self.commits = 0
+
+    @property
+    def round_trips(self) -> int:
+        return self.statements + self.commits
+
+
+def main():
+    from app.main import app
+    from app.core.auth import get_current_user_id
+    from app.core.database import get_session
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    SQLModel.metadata.create_all(engine)
+    counter = RoundTripCounter(engine)
+
+    def override_session():
+        with Session(engine) as session:
+            yield session
+
+    app.dependency_overrides[get_session] = override_session
+    app.dependency_overrides[get_current_user_id] = lambda: "bench-user"
+
+    with patch("app.api.chat.process_chat_message", AsyncMock(return_value=AGENT_REPLY)), \
+         patch("app.services.chat_unit_of_work.engine", engine):
+        client = TestClient(app)
+
+        counter.reset()
+        response = client.post("/api/chat", json={"message": "What's on my list?"})
+        response.raise_for_status()
+        conversation_id = response.json()["conversation_id"]
+        print(f"new conversation:      {counter.statements:3d} statements, "
+              f"{counter.commits} commits, {counter.round_trips:3d} round trips")
+
+        counter.reset()
+        response = client.post(
+            "/api/chat",
+            json={"message": "And what's done?", "conversation_id": conversation_id},
+        )
+        response.raise_for_status()
+        print(f"existing conversation: {counter.statements:3d} statements, "
+              f"{counter.commits} commits, {counter.round_trips:3d} round trips")
+
+    app.dependency_overrides.clear()
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,183 @@
+"""
+Benchmark: end-to-end chat load with the fake LLM provider
+
+Drives concurrent chat sessions through POST /api/chat on the real
+FastAPI app (JWT auth, chat persistence, agent, MCP tools) against a
+temporary SQLite database (or --database-url), with the scripted "fake"
+provider in place of a model. Each session adds a task, lists its tasks, completes the
+task, searches, and chats without tools, all in one conversation.
+
+Reports requests/sec, p50/p95/p99 latency, SQL statements per turn and
+event loop lag (how late a 10 ms timer fires while the load runs).
+--blocking-report also lists the call sites that blocked the loop for
+longer than --blocking-threshold-ms (see app.core.loop_monitor).
+
+SQLite allows one writer at a time, and the chat endpoint persists
+messages with a blocking session on the event loop (ChatUnitOfWork). A
+turn waiting on the write lock therefore stalls every other turn. Expect
+loop lag spikes, and "database is locked" errors once model delays
+approach zero. Use --database-url with Postgres for numbers that reflect
+production.
+
+Usage:
+    python -m benchmarks.chat_load [--sessions 20] [--turns 5]
+        [--first-chunk-ms 300] [--tokens-per-second 50]
+        [--database-url postgresql://...]
+        [--blocking-report] [--blocking-threshold-ms 20]
+"""
+
+import argparse
+import asyncio
+import logging
+import os
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+
+def conversation(session: int):
+    """Messages of one session; the default fake script maps them to tools."""
+    return [
+        f"Please remember to buy milk {session}",
+        "What's on my todo list?",
+        "I'm done with task {task_id}",
+        f"Can you find milk {session}",
+        "Thanks, that's all for now",
+    ]
+
+
+def percentile(values, q):
+    ordered = sorted(values)
+    return ordered[min(len(ordered) - 1, int(len(ordered) * q))]
+
+
+async def run_session(client, headers, session: int, turns: int, latencies, failures):
+    conversation_id = None
+    task_id = None
+    for message in conversation(session)[:turns]:
+        body = {"message": message.format(task_id=task_id or 1)}
+        if conversation_id is not None:
+            body["conversation_id"] = conversation_id
+        start = time.perf_counter()
+        response = await client.post("/api/chat", json=body, headers=headers)
+        latencies.append(time.perf_counter() - start)
+        if response.status_code != 200:
+            failures.append(response.status_code)
+            continue
+        data = response.json()
+        conversation_id = data["conversation_id"]
+        for call in data.get("tool_calls") or []:
+            if call["name"] == "create_task" and call["result"].get("success"):
+                task_id = call["result"]["id"]
+
+
+async def run(args) -> dict:
+    import httpx
+    from sqlalchemy import event
+    from sqlmodel import SQLModel
+
+    from app.core.database import engine
+    from app.core.loop_monitor import LoopMonitor
+    from app.core.security import create_access_token
+    from app.main import create_app
+
+    SQLModel.metadata.create_all(engine)
+    statements = 0
+
+    def count(*_):
+        nonlocal statements
+        statements += 1
+
+    event.listen(engine, "before_cursor_execute", count)
+
+    app = create_app("chat")
+    latencies, failures = [], []
+    monitor = LoopMonitor(
+        interval_seconds=0.01,
+        threshold_seconds=args.blocking_threshold_ms / 1000,
+        capture_stacks=args.blocking_report,
+        window=1_000_000,
+    )
+    # Offenders are printed at the end instead of logged as they appear
+    logging.getLogger("app.core.loop_monitor").setLevel(logging.ERROR)
+    await monitor.start()
+
+    transport = httpx.ASGITransport(app=app)
+    async with httpx.AsyncClient(transport=transport, base_url="http://bench", timeout=120) as client:
+        start = time.perf_counter()
+        await asyncio.gather(*(
+            run_session(
+                client,
+                {"Authorization": f"Bearer {create_access_token({'sub': f'bench-user-{i}'})}"},
+                i, args.turns, latencies, failures,
+            )
+            for i in range(args.sessions)
+        ))
+        elapsed = time.perf_counter() - start
+
+    lag = monitor.snapshot()
+    await monitor.stop()
+    event.remove(engine, "before_cursor_execute", count)
+
+    return {
+        "requests": len(latencies),
+        "failed": len(failures),
+        "rps": len(latencies) / elapsed,
+        "p50": percentile(latencies, 0.50) * 1000,
+        "p95": percentile(latencies, 0.95) * 1000,
+        "p99": percentile(latencies, 0.99) * 1000,
+        "statements": statements / max(len(latencies), 1),
+        "lag_p50": lag["lag_p50_ms"] or 0.0,
+        "lag_p99": lag["lag_p99_ms"] or 0.0,
+        "lag_max": lag["lag_max_ms"] or 0.0,
+        "offenders": lag["offenders"],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--sessions", type=int, default=20, help="Concurrent chat sessions")
+    parser.add_argument("--turns", type=int, default=5, help="Messages per session (max 5)")
+    parser.add_argument("--first-chunk-ms", type=float, default=300.0)
+    parser.add_argument("--tokens-per-second", type=float, default=50.0)
+    parser.add_argument("--database-url", default="",
+                        help="Database to use (default: a temporary SQLite file)")
+    parser.add_argument("--blocking-report", action="store_true",
+                        help="Capture and list the call sites that blocked the event loop")
+    parser.add_argument("--blocking-threshold-ms", type=float, default=20.0)
+    parser.add_argument("--intent-router", action="store_true",
+                        help="Let the intent router answer simple commands (off: every turn reaches the model)")
+    args = parser.parse_args()
+
+    # Settings are read at import, so configure the app before importing it
+    if args.database_url:
+        os.environ["DATABASE_URL"] = args.database_url
+    else:
+        db_path = os.path.join(tempfile.mkdtemp(), "chat_load.db")
+        os.environ["DATABASE_URL"] = f"sqlite:///{db_path}"
+    os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+    os.environ["LLM_PROVIDERS"] = '["fake"]'
+    os.environ["LLM_FAKE_FIRST_CHUNK_MS"] = str(args.first_chunk_ms)
+    os.environ["LLM_FAKE_TOKENS_PER_SECOND"] = str(args.tokens_per_second)
+    os.environ["INTENT_ROUTER_ENABLED"] = "true" if args.intent_router else "false"
+    os.environ.setdefault("KAFKA_ENABLED", "false")
+
+    r = asyncio.run(run(args))
+    print(f"{args.sessions} sessions x {args.turns} turns, first chunk {args.first_chunk_ms:g} ms, "
+          f"{args.tokens_per_second:g} tokens/s")
+    print(f"requests      {r['requests']} ({r['failed']} failed)")
+    print(f"throughput    {r['rps']:.1f} req/s")
+    print(f"latency       p50 {r['p50']:.0f} ms  p95 {r['p95']:.0f} ms  p99 {r['p99']:.0f} ms")
+    print(f"SQL per turn  {r['statements']:.1f}")
+    print(f"loop lag      p50 {r['lag_p50']:.1f} ms  p99 {r['lag_p99']:.1f} ms  max {r['lag_max']:.1f} ms")
+    if args.blocking_report:
+        print(f"blocking call sites (> {args.blocking_threshold_ms:g} ms)")
+        for o in r["offenders"]:
+            print(f"  {o['count']:4d}x  total {o['total_seconds'] * 1000:6.0f} ms  max {o['max_seconds'] * 1000:5.0f} ms  "
+                  f"{o['call_site']}  (in {o['blocked_in']})")
+
+
+if __name__ == "__main__":
+    main()
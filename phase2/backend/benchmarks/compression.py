@@ -0,0 +1,90 @@
+"""
+Benchmark: response compression, bytes on the wire vs CPU cost
+
+Compresses task-list JSON bodies of increasing size (as served by
+GET /tasks/) with each available encoder at the configured levels and
+reports the compressed size and the CPU time per response. Bodies below
+COMPRESSION_MIN_SIZE are marked: the middleware sends them as is.
+
+Usage:
+    python -m benchmarks.compression [--runs 20]
+"""
+
+import argparse
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+from datetime import datetime, timedelta
+
+# Number of tasks per body; ~245 bytes each
+TASK_COUNTS = (2, 16, 256, 4096, 10000)
+
+
+def task_list_body(count: int) -> bytes:
+    """JSON body of GET /tasks/ for count tasks."""
+    from app.core.responses import dumps
+
+    now = datetime(2025, 1, 1)
+    return dumps([
+        {
+            "id": i,
+            "user_id": "7f3c9a2e-5d1b-4c8e-9a6f-2b4d8e1c3a5f",
+            "title": f"Task {i}",
+            "description": f"Description for task {i} " * 3,
+            "completed": i % 3 == 0,
+            "created_at": now - timedelta(minutes=i),
+            "updated_at": now,
+        }
+        for i in range(count)
+    ])
+
+
+def cpu_us(func, runs: int) -> float:
+    """Median CPU time of func() in microseconds."""
+    timings = []
+    for _ in range(runs):
+        start = time.process_time_ns()
+        func()
+        timings.append((time.process_time_ns() - start) / 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=20)
+    args = parser.parse_args()
+
+    from app.core.compression import available_encoders
+    from app.core.config import settings
+
+    encoders = available_encoders({
+        "gzip": settings.COMPRESSION_GZIP_LEVEL,
+        "br": settings.COMPRESSION_BROTLI_QUALITY,
+        "zstd": settings.COMPRESSION_ZSTD_LEVEL,
+    })
+    names = [name for name in settings.COMPRESSION_ENCODINGS if name in encoders]
+    print("levels: " + ", ".join(f"{name}={encoders[name].level}" for name in names))
+    print(f"{'body':>10}  " + "  ".join(f"{name + ' bytes':>11} {name + ' CPU us':>11}" for name in names))
+
+    for count in TASK_COUNTS:
+        body = task_list_body(count)
+        cells = []
+        for name in names:
+            encoder = encoders[name]
+            size = len(encoder.compress(body))
+            cells.append(f"{size:11d} {cpu_us(lambda: encoder.compress(body), args.runs):11.0f}")
+        marker = "*" if len(body) < settings.COMPRESSION_MIN_SIZE else " "
+        print(f"{len(body):9d}{marker}  " + "  ".join(cells))
+
+    print(f"* below COMPRESSION_MIN_SIZE={settings.COMPRESSION_MIN_SIZE}: sent uncompressed")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,80 @@
+"""
+Benchmark: import time of the serverless entry point
+
+Imports api/index.py in a fresh interpreter under `python -X importtime`
+and reports the cumulative import time, the slowest top-level packages and
+whether heavy optional stacks (openai, mcp, aiokafka) were loaded eagerly.
+
+Usage:
+    python -m benchmarks.import_time [--runs 5]
+"""
+
+import argparse
+import os
+import statistics
+import subprocess
+import sys
+from collections import defaultdict
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Packages that should only load on first chat request / Kafka use
+LAZY_PACKAGES = ("openai", "mcp", "aiokafka", "google")
+
+ENV = {
+    "DATABASE_URL": "sqlite:///./test.db",
+    "JWT_SECRET": "benchmark-secret",
+    "OPENAI_API_KEY": "sk-benchmark",
+}
+
+
+def measure_once(module: str = "api.index"):
+    """
+    Import a module in a fresh interpreter.
+
+    Returns:
+        (total_us, per_package_us): cumulative time for the module and
+        self time summed per top-level package
+    """
+    env = {**os.environ, **ENV}
+    result = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", f"import {module}"],
+        cwd=BACKEND_DIR, env=env, capture_output=True, text=True, check=True,
+    )
+
+    total_us = 0
+    per_package = defaultdict(int)
+    for line in result.stderr.splitlines():
+        if not line.startswith("import time:") or "cumulative" in line:
+            continue
+        self_us, cumulative_us, name = line[len("import time:"):].split("|")
+        name = name.strip()
+        per_package[name.split(".")[0]] += int(self_us)
+        if name == module:
+            total_us = int(cumulative_us)
+    return total_us, dict(per_package)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=5)
+    args = parser.parse_args()
+
+    totals = []
+    packages = {}
+    for _ in range(args.runs):
+        total_us, packages = measure_once()
+        totals.append(total_us)
+
+    print(f"import api.index: median {statistics.median(totals) / 1000:.0f} ms "
+          f"over {args.runs} runs (min {min(totals) / 1000:.0f} ms)")
+    print("slowest packages (self time, last run):")
+    for name, us in sorted(packages.items(), key=lambda kv: -kv[1])[:10]:
+        print(f"  {name:<24} {us / 1000:8.1f} ms")
+
+    eager = [name for name in LAZY_PACKAGES if name in packages]
+    print(f"eagerly imported lazy packages: {', '.join(eager) if eager else 'none'}")
+
+
+if __name__ == "__main__":
+    main()
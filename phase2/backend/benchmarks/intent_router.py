@@ -0,0 +1,212 @@
+"""
+Benchmark: intent router accuracy and latency
+
+Runs a labeled corpus of chat messages through the intent router.
+Messages labeled with an intent should take the fast path with exactly
+those arguments; messages labeled None need the LLM (context, titles,
+multi-step or ambiguous requests) and must fall back.
+
+Reports coverage (share of fast-path messages routed), precision (routed
+messages with the right action and arguments), false routes (LLM
+messages wrongly routed), parse time, and end-to-end time for routed
+messages with the real MCP handlers on a file-backed SQLite database.
+
+Usage:
+    python -m benchmarks.intent_router [--runs 200]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+from unittest.mock import patch
+
+from sqlmodel import Session, SQLModel, create_engine
+
+# (message, expected intent or None for the LLM, expected arguments)
+CORPUS = [
+    ("show my tasks", "list", {}),
+    ("Show me all my tasks", "list", {}),
+    ("list my todos", "list", {}),
+    ("What's on my list?", "list", {}),
+    ("whats on my todo list", "list", {}),
+    ("what are my tasks?", "list", {}),
+    ("my tasks", "list", {}),
+    ("Can you show my task list please", "list", {}),
+    ("view tasks", "list", {}),
+    ("todos?", "list", {}),
+    ("show task 4", "get", {"task_id": 4}),
+    ("what's task #2?", "get", {"task_id": 2}),
+    ("open task 12", "get", {"task_id": 12}),
+    ("add buy milk", "create", {"title": "buy milk"}),
+    ("Add buy milk to my list", "create", {"title": "buy milk"}),
+    ("add 'Call mom' to my tasks", "create", {"title": "Call mom"}),
+    ("add a task to renew passport", "create", {"title": "renew passport"}),
+    ("create a task called Pay rent", "create", {"title": "Pay rent"}),
+    ("new task: water the plants", "create", {"title": "water the plants"}),
+    ("Please add book dentist appointment", "create", {"title": "book dentist appointment"}),
+    ("remind me to email Sarah", "create", {"title": "email Sarah"}),
+    ("add task Finish quarterly report", "create", {"title": "Finish quarterly report"}),
+    ("add pick up dry cleaning to the list", "create", {"title": "pick up dry cleaning"}),
+    ("complete task 3", "complete", {"task_id": 3}),
+    ("Complete task #3", "complete", {"task_id": 3}),
+    ("finish task 8", "complete", {"task_id": 8}),
+    ("mark task 5 as done", "complete", {"task_id": 5}),
+    ("mark 5 done", "complete", {"task_id": 5}),
+    ("mark task 9 complete please", "complete", {"task_id": 9}),
+    ("task 2 is done", "complete", {"task_id": 2}),
+    ("check off task 6", "complete", {"task_id": 6}),
+    ("task 11 done!", "complete", {"task_id": 11}),
+    ("reopen task 3", "reopen", {"task_id": 3}),
+    ("mark task 4 as not done", "reopen", {"task_id": 4}),
+    ("undo task 7", "reopen", {"task_id": 7}),
+    ("mark task 2 incomplete", "reopen", {"task_id": 2}),
+    ("delete task 7", "delete", {"task_id": 7}),
+    ("Delete task #7", "delete", {"task_id": 7}),
+    ("remove task 10", "delete", {"task_id": 10}),
+    ("please delete task 1, thanks", "delete", {"task_id": 1}),
+    ("search for groceries", "search", {"keyword": "groceries"}),
+    ("search tasks for report", "search", {"keyword": "report"}),
+    ("find tasks about dentist", "search", {"keyword": "dentist"}),
+    ("search 'tax return'", "search", {"keyword": "tax return"}),
+    # Need the model: context, titles, several actions, ambiguity, chit-chat
+    ("delete it", None, None),
+    ("complete the first one", None, None),
+    ("mark that as done", None, None),
+    ("delete the milk task", None, None),
+    ("remove buy milk", None, None),
+    ("remove 7", None, None),
+    ("add milk and eggs", None, None),
+    ("add milk, eggs, bread", None, None),
+    ("add it again", None, None),
+    ("add 10 minutes to task 3", None, None),
+    ("rename task 3 to Call dad", None, None),
+    ("change the description of task 2", None, None),
+    ("what should I do first?", None, None),
+    ("how many tasks do I have left?", None, None),
+    ("show my completed tasks", None, None),
+    ("which tasks are pending?", None, None),
+    ("hello", None, None),
+    ("thanks!", None, None),
+    ("I finished everything today", None, None),
+    ("complete all my tasks", None, None),
+    ("delete all completed tasks", None, None),
+    ("can you help me plan my week?", None, None),
+    ("add what I mentioned earlier", None, None),
+    ("find time for the gym next week and add it", None, None),
+    ("search for tasks I created yesterday about the quarterly planning meeting", None, None),
+    ("What's the weather like?", None, None),
+]
+
+
+def evaluate(min_confidence: float):
+    """Parse the corpus; returns counts and the misclassified messages."""
+    from app.services.intent_router import parse_intent
+
+    routed_right = routed_wrong = missed = false_routes = 0
+    errors = []
+    for message, expected, arguments in CORPUS:
+        intent = parse_intent(message)
+        routed = intent is not None and intent.confidence >= min_confidence
+        if expected is None:
+            if routed:
+                false_routes += 1
+                errors.append((message, "LLM", f"{intent.name} {intent.arguments}"))
+        elif not routed:
+            missed += 1
+            errors.append((message, expected, "LLM"))
+        elif intent.name == expected and intent.arguments == arguments:
+            routed_right += 1
+        else:
+            routed_wrong += 1
+            errors.append((message, f"{expected} {arguments}", f"{intent.name} {intent.arguments}"))
+    return routed_right, routed_wrong, missed, false_routes, errors
+
+
+def parse_us(runs: int) -> float:
+    """Mean time to parse one corpus message, in microseconds."""
+    from app.services.intent_router import parse_intent
+
+    start = time.perf_counter()
+    for _ in range(runs):
+        for message, _, _ in CORPUS:
+            parse_intent(message)
+    return (time.perf_counter() - start) / (runs * len(CORPUS)) * 1e6
+
+
+async def end_to_end_ms(engine, runs: int) -> dict:
+    """Median fast-path latency per intent, MCP handlers and SQLite included."""
+    from app.services.intent_router import IntentRouter
+    from app.services.task_service import TaskService
+
+    router = IntentRouter(min_confidence=0.9)
+    with Session(engine) as session:
+        service = TaskService(session, "bench-user")
+        task_ids = [service.create_task(f"Task {i}").id for i in range(20)]
+
+    messages = {
+        "list": lambda i: "show my tasks",
+        "get": lambda i: f"show task {task_ids[i % 20]}",
+        "create": lambda i: f"add benchmark item {i}",
+        "complete": lambda i: f"complete task {task_ids[i % 20]}",
+        "search": lambda i: "search for task 1",
+    }
+    timings = {}
+    for name, message in messages.items():
+        samples = []
+        for i in range(runs):
+            start = time.perf_counter()
+            response = await router.route("bench-user", message(i))
+            samples.append((time.perf_counter() - start) * 1000)
+            assert response is not None, name
+        timings[name] = statistics.median(samples)
+    return timings
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--runs", type=int, default=200)
+    args = parser.parse_args()
+
+    from app.core.config import settings
+
+    threshold = settings.INTENT_ROUTER_MIN_CONFIDENCE
+    right, wrong, missed, false_routes, errors = evaluate(threshold)
+    fast = sum(1 for _, expected, _ in CORPUS if expected is not None)
+    llm = len(CORPUS) - fast
+
+    print(f"corpus: {len(CORPUS)} messages ({fast} fast-path, {llm} LLM), threshold {threshold}")
+    print(f"coverage:     {right + wrong}/{fast} fast-path messages routed")
+    print(f"precision:    {right}/{right + wrong} routed with the right action and arguments")
+    print(f"false routes: {false_routes}/{llm} LLM messages routed")
+    for message, expected, got in errors:
+        print(f"  {message!r}: expected {expected}, got {got}")
+    print(f"parse:        {parse_us(args.runs):.1f} us per message")
+
+    db_path = os.path.join(tempfile.mkdtemp(), "intent.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    SQLModel.metadata.create_all(engine)
+    modules = ["context", "create_task", "list_tasks", "get_task", "complete_task", "delete_task", "search_tasks"]
+    patches = [patch(f"app.mcp_tools.{module}.engine", engine) for module in modules]
+    for p in patches:
+        p.start()
+    try:
+        timings = asyncio.run(end_to_end_ms(engine, args.runs))
+    finally:
+        for p in patches:
+            p.stop()
+    print("fast path, median ms (MCP handlers + SQLite): "
+          + ", ".join(f"{name} {ms:.2f}" for name, ms in timings.items()))
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,216 @@
+"""
+Benchmark: JSON serialization of large list responses
+
+Seeds a file-backed SQLite database with a 10k-task list and a 500-message
+conversation (every other message carrying tool_calls), then times:
+
+- GET /tasks/ and GET /api/conversations/{id} on the real app (row dicts
+  rendered by FastJSONResponse) against the previous handlers (ORM
+  instances validated by response_model, rendered by stdlib json)
+- the list_tasks tool result for the LLM: pydantic models + model_dump +
+  json.dumps against plain dicts + dumps_str
+
+Usage:
+    python -m benchmarks.json_serialization [--tasks 10000] [--messages 500] [--runs 10]
+"""
+
+import argparse
+import json
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+from datetime import datetime, timedelta
+from typing import List
+
+from fastapi import Depends, FastAPI
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+USER_ID = "bench-user"
+
+
+def seed(engine, n_tasks: int, n_messages: int) -> int:
+    """Insert the task list and conversation; returns the conversation id."""
+    from app.models.conversation import Conversation
+    from app.models.message import Message
+    from app.models.task import Task
+
+    now = datetime.utcnow()
+    with Session(engine) as session:
+        session.add_all(
+            Task(
+                user_id=USER_ID,
+                title=f"Task {i}",
+                description=f"Description for task {i} " * 3,
+                completed=i % 3 == 0,
+                created_at=now - timedelta(minutes=i),
+                updated_at=now,
+            )
+            for i in range(n_tasks)
+        )
+        conversation = Conversation(user_id=USER_ID, title="Benchmark conversation")
+        session.add(conversation)
+        session.flush()
+        for i in range(n_messages):
+            assistant = i % 2 == 1
+            session.add(Message(
+                conversation_id=conversation.id,
+                role="assistant" if assistant else "user",
+                content=f"Message {i}: " + "lorem ipsum " * 10,
+                tool_calls=[{
+                    "id": f"call_{i}",
+                    "name": "list_tasks",
+                    "arguments": {"user_id": USER_ID},
+                    "result": {"success": True, "count": 3, "tasks": [
+                        {"id": j, "title": f"Task {j}", "completed": False} for j in range(3)
+                    ]},
+                }] if assistant else None,
+                created_at=now + timedelta(seconds=i),
+            ))
+        session.commit()
+        return conversation.id
+
+
+def legacy_app(get_session, get_current_user_id) -> FastAPI:
+    """The previous handlers: ORM instances serialized through response_model."""
+    from app.api.conversations import ConversationMessagesResponse, MessageResponse
+    from app.models.task import Task
+    from app.services.conversation_service import ConversationService
+    from app.services.message_service import MessageService
+    from app.services.task_service import TaskService
+
+    app = FastAPI()
+
+    @app.get("/tasks/", response_model=List[Task])
+    async def get_all_tasks(session: Session = Depends(get_session), user_id: str = Depends(get_current_user_id)):
+        return TaskService(session, user_id).get_all_tasks()
+
+    @app.get("/api/conversations/{conversation_id}", response_model=ConversationMessagesResponse)
+    async def get_conversation_messages(
+        conversation_id: int,
+        session: Session = Depends(get_session),
+        user_id: str = Depends(get_current_user_id),
+    ):
+        conversation = ConversationService(session, user_id).get_conversation_by_id(conversation_id)
+        messages = MessageService(session).get_conversation_messages(conversation_id)
+        return ConversationMessagesResponse(
+            conversation_id=conversation.id,
+            title=conversation.title,
+            messages=[
+                MessageResponse(
+                    id=m.id, role=m.role, content=m.content,
+                    tool_calls=m.tool_calls, created_at=m.created_at,
+                )
+                for m in messages
+            ],
+            total=len(messages),
+        )
+
+    return app
+
+
+def time_get(client: TestClient, path: str, runs: int):
+    """Median latency in ms and body size of GET path."""
+    client.get(path).raise_for_status()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        response = client.get(path)
+        timings.append((time.perf_counter() - start) * 1000)
+        response.raise_for_status()
+    return statistics.median(timings), len(response.content)
+
+
+def time_call(func, runs: int) -> float:
+    """Median duration of func() in ms."""
+    func()
+    timings = []
+    for _ in range(runs):
+        start = time.perf_counter()
+        func()
+        timings.append((time.perf_counter() - start) * 1000)
+    return statistics.median(timings)
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--tasks", type=int, default=10000)
+    parser.add_argument("--messages", type=int, default=500)
+    parser.add_argument("--runs", type=int, default=10)
+    args = parser.parse_args()
+
+    from app.core.auth import get_current_user_id
+    from app.core.database import get_read_session
+    from app.core.responses import dumps_str, orjson
+    from app.main import create_app
+    from app.mcp_tools.list_tasks import ListTasksOutput, TaskItem
+    from app.models.task import Task
+
+    db_path = os.path.join(tempfile.mkdtemp(), "bench.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    SQLModel.metadata.create_all(engine)
+    conversation_id = seed(engine, args.tasks, args.messages)
+
+    def override_session():
+        with Session(engine) as session:
+            yield session
+
+    def override_user():
+        return USER_ID
+
+    current = create_app("full")
+    current.dependency_overrides[get_read_session] = override_session
+    current.dependency_overrides[get_current_user_id] = override_user
+    legacy = legacy_app(override_session, override_user)
+
+    print(f"JSON encoder: {'orjson ' + orjson.__version__ if orjson else 'stdlib json'}")
+    print(f"{'endpoint':<34} {'before ms':>10} {'after ms':>10} {'KB':>8}")
+    for label, path in (
+        (f"GET /tasks/ ({args.tasks} tasks)", "/tasks/"),
+        (f"GET conversation ({args.messages} msgs)", f"/api/conversations/{conversation_id}"),
+    ):
+        before_ms, _ = time_get(TestClient(legacy), path, args.runs)
+        after_ms, size = time_get(TestClient(current), path, args.runs)
+        print(f"{label:<34} {before_ms:10.1f} {after_ms:10.1f} {size / 1024:8.0f}")
+
+    # list_tasks tool result serialization (the DB read is the same on both paths)
+    with Session(engine) as session:
+        from sqlmodel import select
+        tasks = session.exec(select(Task).where(Task.user_id == USER_ID)).all()
+
+    def tool_result_before():
+        items = [
+            TaskItem(
+                id=t.id, title=t.title, description=t.description, completed=t.completed,
+                created_at=t.created_at.isoformat(), updated_at=t.updated_at.isoformat(),
+            )
+            for t in tasks
+        ]
+        return json.dumps(ListTasksOutput(success=True, tasks=items, count=len(items)).model_dump())
+
+    def tool_result_after():
+        items = [
+            {
+                "id": t.id, "title": t.title, "description": t.description, "completed": t.completed,
+                "created_at": t.created_at.isoformat(), "updated_at": t.updated_at.isoformat(),
+            }
+            for t in tasks
+        ]
+        return dumps_str({"success": True, "tasks": items, "count": len(items), "error": None})
+
+    before_ms = time_call(tool_result_before, args.runs)
+    after_ms = time_call(tool_result_after, args.runs)
+    label = f"list_tasks tool result ({args.tasks})"
+    print(f"{label:<34} {before_ms:10.1f} {after_ms:10.1f}")
+
+
+if __name__ == "__main__":
+    main()
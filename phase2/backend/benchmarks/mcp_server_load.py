@@ -0,0 +1,173 @@
+"""
+Benchmark: MCP protocol server under concurrent tool calls
+
+Starts the MCP server on a file-backed SQLite database and drives many
+concurrent tool calls through a real MCP client session: 80% reads
+(list_tasks, search_tasks, get_task) and 20% writes (create_task,
+complete_task). Every SQL statement is delayed by --db-latency-ms to
+stand in for the round trip to a networked database. Runs once per
+worker-pool size and reports throughput, call latency percentiles and
+failed calls.
+
+Transports:
+    memory  in-process MCP streams (measures the server, not the network)
+    http    streamable HTTP through uvicorn on localhost, with a bearer JWT
+
+Usage:
+    python -m benchmarks.mcp_server_load [--transport memory] [--calls 2000]
+        [--concurrency 64] [--workers 1 4 8] [--db-latency-ms 2]
+"""
+
+import argparse
+import asyncio
+import json
+import os
+import random
+import socket
+import statistics
+import sys
+import tempfile
+import threading
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+from contextlib import asynccontextmanager
+from unittest.mock import patch
+
+from sqlalchemy import event
+from sqlmodel import Session, SQLModel, create_engine
+
+USER = "load-user"
+
+
+def pick_call(rng: random.Random, task_ids: list) -> tuple:
+    roll = rng.random()
+    if roll < 0.4:
+        return "list_tasks", {}
+    if roll < 0.6:
+        return "search_tasks", {"keyword": "Task 1"}
+    if roll < 0.8:
+        return "get_task", {"task_id": rng.choice(task_ids)}
+    if roll < 0.9:
+        return "create_task", {"title": f"Load task {rng.randrange(10**6)}"}
+    return "complete_task", {"task_id": rng.choice(task_ids)}
+
+
+@asynccontextmanager
+async def memory_client(limiter):
+    from mcp.shared.memory import create_connected_server_and_client_session
+    from app.mcp_protocol import build_server
+
+    async with create_connected_server_and_client_session(build_server(limiter, user_id=USER)) as client:
+        yield client
+
+
+@asynccontextmanager
+async def http_client(limiter):
+    import uvicorn
+    from mcp import ClientSession
+    from mcp.client.streamable_http import streamablehttp_client
+    from app.core.security import create_access_token
+    from app.mcp_protocol import create_http_app
+
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        port = s.getsockname()[1]
+    server = uvicorn.Server(uvicorn.Config(create_http_app(limiter), host="127.0.0.1", port=port,
+                                           log_level="warning"))
+    thread = threading.Thread(target=server.run, daemon=True)
+    thread.start()
+    while not server.started:
+        await asyncio.sleep(0.01)
+
+    headers = {"Authorization": f"Bearer {create_access_token({'sub': USER})}"}
+    try:
+        async with streamablehttp_client(f"http://127.0.0.1:{port}/mcp", headers=headers) as (read, write, _):
+            async with ClientSession(read, write) as client:
+                await client.initialize()
+                yield client
+    finally:
+        server.should_exit = True
+        thread.join()
+
+
+async def run(workers: int, args) -> dict:
+    from app.mcp_protocol import ToolCallLimiter
+    from app.mcp_server import mcp_server
+    from app.mcp_tools.policy import ToolExecutor, ToolPolicy
+    from app.services.task_service import TaskService
+
+    db_path = os.path.join(tempfile.mkdtemp(), "mcp_load.db")
+    engine = create_engine(f"sqlite:///{db_path}", pool_size=workers, max_overflow=0)
+    SQLModel.metadata.create_all(engine)
+    if args.db_latency_ms:
+        # Stand-in for the network round trip to Postgres (sleep releases the GIL)
+        event.listen(engine, "before_cursor_execute",
+                     lambda *a: time.sleep(args.db_latency_ms / 1000))
+    with Session(engine) as session:
+        service = TaskService(session, USER)
+        task_ids = [service.create_task(f"Task {i}").id for i in range(50)]
+
+    rng = random.Random(7)
+    calls = [pick_call(rng, task_ids) for _ in range(args.calls)]
+    limiter = ToolCallLimiter(max_pending=args.concurrency)
+    executor = ToolExecutor(max_workers=workers,
+                            policy=lambda name: ToolPolicy(timeout_seconds=30, max_concurrency=workers))
+    client_factory = memory_client if args.transport == "memory" else http_client
+    latencies, failures = [], 0
+
+    with patch("app.mcp_tools.context.engine", engine), patch.object(mcp_server, "executor", executor):
+        async with client_factory(limiter) as client:
+            queue = list(reversed(calls))
+
+            async def client_loop():
+                nonlocal failures
+                while queue:
+                    name, arguments = queue.pop()
+                    start = time.perf_counter()
+                    result = await client.call_tool(name, arguments)
+                    latencies.append((time.perf_counter() - start) * 1000)
+                    if result.isError or not json.loads(result.content[0].text).get("success"):
+                        failures += 1
+
+            start = time.perf_counter()
+            await asyncio.gather(*(client_loop() for _ in range(args.concurrency)))
+            elapsed = time.perf_counter() - start
+    executor.shutdown()
+    engine.dispose()
+
+    latencies.sort()
+    return {
+        "throughput": len(latencies) / elapsed,
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95)],
+        "p99": latencies[int(len(latencies) * 0.99)],
+        "failures": failures,
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--transport", choices=["memory", "http"], default="memory")
+    parser.add_argument("--calls", type=int, default=2000)
+    parser.add_argument("--concurrency", type=int, default=64)
+    parser.add_argument("--workers", type=int, nargs="+", default=[1, 4, 8])
+    parser.add_argument("--db-latency-ms", type=float, default=2.0,
+                        help="Delay added to every SQL statement (0 = local SQLite speed)")
+    args = parser.parse_args()
+
+    print(f"{args.calls} calls, {args.concurrency} in flight, {args.transport} transport, "
+          f"{args.db_latency_ms:g} ms per statement")
+    print(f"{'workers':>7}  {'calls/s':>8}  {'p50':>8}  {'p95':>8}  {'p99':>8}  {'failed':>6}")
+    for workers in args.workers:
+        r = asyncio.run(run(workers, args))
+        print(f"{workers:7d}  {r['throughput']:8.0f}  {r['p50']:6.1f}ms  {r['p95']:6.1f}ms"
+              f"  {r['p99']:6.1f}ms  {r['failures']:6d}")
+
+
+if __name__ == "__main__":
+    main()
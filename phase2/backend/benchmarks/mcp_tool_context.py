@@ -0,0 +1,105 @@
+"""
+Benchmark: agent-turn tool calls, one session per call vs one per turn
+
+Replays multi-tool agent turns (create, list, complete, search, delete)
+against a file-backed SQLite database, once with every handler opening
+and committing its own session and once with the turn's calls sharing a
+ToolContext that commits them together. Reports pool checkouts, SQL
+statements and commits per turn, and the median and p95 turn latency.
+
+Usage:
+    python -m benchmarks.mcp_tool_context [--turns 300]
+"""
+
+import argparse
+import asyncio
+import os
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+from unittest.mock import patch
+
+from sqlalchemy import event
+from sqlmodel import SQLModel, create_engine
+
+TOOL_MODULES = ["context", "create_task", "list_tasks", "get_task", "update_task",
+                "complete_task", "delete_task", "search_tasks"]
+
+
+async def turn(handlers, context, user_id: str, i: int) -> None:
+    """One agent turn: add a task, list, complete it, search, delete an older one."""
+    created = await handlers["create_task"]({"user_id": user_id, "title": f"Task {i}"}, context)
+    await handlers["list_tasks"]({"user_id": user_id}, context)
+    await handlers["complete_task"]({"user_id": user_id, "task_id": created["id"]}, context)
+    await handlers["search_tasks"]({"user_id": user_id, "keyword": "Task"}, context)
+    if i >= 10:
+        await handlers["delete_task"]({"user_id": user_id, "task_id": created["id"] - 10}, context)
+
+
+async def run(shared: bool, turns: int) -> dict:
+    from app.mcp_tools import TOOL_HANDLERS
+    from app.mcp_tools.context import ToolContext
+
+    db_path = os.path.join(tempfile.mkdtemp(), "tools.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    SQLModel.metadata.create_all(engine)
+    counts = {"checkouts": 0, "statements": 0, "commits": 0}
+
+    def count(name):
+        def listener(*args, **kwargs):
+            counts[name] += 1
+        return listener
+
+    event.listen(engine, "checkout", count("checkouts"))
+    event.listen(engine, "before_cursor_execute", count("statements"))
+    event.listen(engine, "commit", count("commits"))
+
+    patches = [patch(f"app.mcp_tools.{module}.engine", engine) for module in TOOL_MODULES]
+    for p in patches:
+        p.start()
+    latencies = []
+    try:
+        for i in range(turns):
+            start = time.perf_counter()
+            if shared:
+                with ToolContext() as context:
+                    await turn(TOOL_HANDLERS, context, "bench-user", i)
+                    assert context.commit()
+            else:
+                await turn(TOOL_HANDLERS, None, "bench-user", i)
+            latencies.append((time.perf_counter() - start) * 1000)
+    finally:
+        for p in patches:
+            p.stop()
+        engine.dispose()
+
+    latencies.sort()
+    return {
+        **{name: value / turns for name, value in counts.items()},
+        "p50": statistics.median(latencies),
+        "p95": latencies[int(len(latencies) * 0.95)],
+    }
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--turns", type=int, default=300)
+    args = parser.parse_args()
+
+    print(f"{args.turns} turns of 4-5 tool calls")
+    print(f"{'mode':>16}  {'checkouts':>9}  {'statements':>10}  {'commits':>7}  {'p50':>8}  {'p95':>8}")
+    for label, shared in (("session per call", False), ("shared context", True)):
+        r = asyncio.run(run(shared, args.turns))
+        print(f"{label:>16}  {r['checkouts']:9.1f}  {r['statements']:10.1f}  {r['commits']:7.1f}"
+              f"  {r['p50']:6.2f}ms  {r['p95']:6.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -0,0 +1,77 @@
+"""
+Benchmark: concurrent logins vs. latency of other requests
+
+Runs a burst of bcrypt verifications on one event loop, either inline
+(the old blocking path) or through the bounded PasswordHasher, while a
+stream of lightweight "requests" measures how long they wait for the loop.
+
+Usage:
+    python -m benchmarks.password_hashing
+"""
+
+import asyncio
+import os
+import statistics
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+LOGINS = 16
+REQUEST_INTERVAL = 0.005
+
+
+async def light_requests(stop: asyncio.Event, latencies: list):
+    """Simulated cheap requests: each should take ~0 ms of loop time."""
+    while not stop.is_set():
+        start = time.perf_counter()
+        await asyncio.sleep(REQUEST_INTERVAL)
+        latencies.append(time.perf_counter() - start - REQUEST_INTERVAL)
+
+
+async def run(mode: str, hashed: str) -> dict:
+    from app.core.password_hasher import PasswordHasher
+    from app.core.security import pwd_context
+
+    hasher = PasswordHasher(pwd_context, max_workers=2, queue_limit=LOGINS)
+    stop = asyncio.Event()
+    latencies: list = []
+    ticker = asyncio.create_task(light_requests(stop, latencies))
+
+    async def login():
+        if mode == "inline":
+            return pwd_context.verify("secret", hashed)
+        return await hasher.verify("secret", hashed)
+
+    start = time.perf_counter()
+    await asyncio.gather(*(login() for _ in range(LOGINS)))
+    elapsed = time.perf_counter() - start
+
+    stop.set()
+    await ticker
+    latencies.sort()
+    return {
+        "elapsed": elapsed,
+        "p50": statistics.median(latencies) if latencies else 0.0,
+        "max": latencies[-1] if latencies else 0.0,
+        "samples": len(latencies),
+    }
+
+
+def main():
+    from app.core.security import pwd_context
+
+    hashed = pwd_context.hash("secret")
+    print(f"{LOGINS} concurrent logins (bcrypt, {pwd_context.to_dict().get('bcrypt__rounds')} rounds)")
+    for mode in ("inline", "pool"):
+        r = asyncio.run(run(mode, hashed))
+        print(f"{mode:>6}: logins done in {r['elapsed']:.2f}s, other requests "
+              f"delayed p50 {r['p50'] * 1000:7.1f} ms, max {r['max'] * 1000:7.1f} ms "
+              f"({r['samples']} samples)")
+
+
+if __name__ == "__main__":
+    main()
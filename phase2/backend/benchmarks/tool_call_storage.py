@@ -0,0 +1,110 @@
+"""
+Benchmark: messages.tool_calls storage, inline vs compact
+
+Replays a chat workload against a file-backed SQLite database: each turn
+saves an assistant message whose tool calls are mostly list_tasks (full
+task list in the result) and some create_task calls that grow the list.
+Runs it once with every result inline and once with results above
+TOOL_RESULT_INLINE_MAX_BYTES spilled to tool_results, then reports the
+database size and the per-message write latency.
+
+Usage:
+    python -m benchmarks.tool_call_storage [--conversations 40] [--turns 25] [--tasks 30]
+"""
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import tempfile
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+os.environ.setdefault("DATABASE_URL", "sqlite:///./test.db")
+os.environ.setdefault("JWT_SECRET", "benchmark-secret")
+
+from unittest.mock import patch
+
+from sqlalchemy import text
+from sqlmodel import Session, SQLModel, create_engine
+
+
+def task(i: int) -> dict:
+    return {
+        "id": i,
+        "title": f"Task {i}",
+        "description": f"Details for task number {i}",
+        "completed": i % 4 == 0,
+        "created_at": "2025-01-01T12:00:00",
+    }
+
+
+def turn_tool_calls(rng: random.Random, tasks: list, turn: int) -> list:
+    """Tool calls of one assistant turn; create_task appends to tasks."""
+    roll = rng.random()
+    if roll < 0.6:
+        return [{"id": f"call_{turn}", "name": "list_tasks", "arguments": {"status": "all"},
+                 "result": {"success": True, "tasks": list(tasks), "count": len(tasks), "error": None}}]
+    if roll < 0.9:
+        tasks.append(task(len(tasks)))
+        return [{"id": f"call_{turn}", "name": "add_task", "arguments": {"title": tasks[-1]["title"]},
+                 "result": {"success": True, "task": tasks[-1], "error": None}}]
+    return None
+
+
+def run(inline_max_bytes: int, args) -> tuple:
+    """Replay the workload; returns (database bytes, write latencies in ms)."""
+    from app.core.config import settings
+    from app.models.conversation import Conversation
+    from app.services.message_service import MessageService
+
+    db_path = os.path.join(tempfile.mkdtemp(), "tool_calls.db")
+    engine = create_engine(f"sqlite:///{db_path}")
+    SQLModel.metadata.create_all(engine)
+    rng = random.Random(42)
+    latencies = []
+
+    with patch.object(settings, "TOOL_RESULT_INLINE_MAX_BYTES", inline_max_bytes), Session(engine) as session:
+        service = MessageService(session)
+        for c in range(args.conversations):
+            conversation = Conversation(user_id=f"user-{c}", title="Chat")
+            session.add(conversation)
+            session.commit()
+            conversation_id = conversation.id
+            tasks = [task(i) for i in range(args.tasks)]
+            for turn in range(args.turns):
+                service.create_user_message(conversation_id, "What's on my list?")
+                tool_calls = turn_tool_calls(rng, tasks, turn)
+                start = time.perf_counter()
+                service.create_assistant_message(conversation_id, "Here are your tasks.", tool_calls)
+                latencies.append((time.perf_counter() - start) * 1000)
+
+    with engine.connect() as connection:
+        connection.execute(text("VACUUM"))
+    engine.dispose()
+    return os.path.getsize(db_path), latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[1])
+    parser.add_argument("--conversations", type=int, default=40)
+    parser.add_argument("--turns", type=int, default=25)
+    parser.add_argument("--tasks", type=int, default=30)
+    args = parser.parse_args()
+
+    from app.core.config import settings
+
+    print(f"{args.conversations} conversations x {args.turns} turns, {args.tasks} initial tasks")
+    print(f"{'mode':>22}  {'db size':>10}  {'write p50':>10}  {'write p95':>10}")
+    for label, cap in (("inline", 0), (f"compact (>{settings.TOOL_RESULT_INLINE_MAX_BYTES} B)",
+                                       settings.TOOL_RESULT_INLINE_MAX_BYTES)):
+        size, latencies = run(cap, args)
+        latencies.sort()
+        p95 = latencies[int(len(latencies) * 0.95)]
+        print(f"{label:>22}  {size / 1024:8.0f} KB  {statistics.median(latencies):8.2f}ms  {p95:8.2f}ms")
+
+
+if __name__ == "__main__":
+    main()
@@ -68,44 +68,30 @@ class TestAgentServiceUnit:
     @pytest.mark.asyncio
     async def test_process_message_simple_response(self, mock_openai_response):
         """Test processing a message with simple response (no tools)."""
-        with patch('app.services.agent_service.settings') as mock_settings, \
-             patch('app.services.agent_service.AsyncOpenAI') as mock_client_class:
+        mock_llm = MagicMock()
+        mock_llm.create = AsyncMock(return_value=mock_openai_response)
 
-            mock_settings.OPENAI_API_KEY = "test-key"
-            mock_settings.OPENAI_AGENT_MODEL = "gpt-4o"
+        from app.services.agent_service import AgentService
+        service = AgentService(llm=mock_llm)
 
-            mock_client = AsyncMock()
-            mock_client.chat.completions.create = AsyncMock(return_value=mock_openai_response)
-            mock_client_class.return_value = mock_client
-
-            from app.services.agent_service import AgentService
-            service = AgentService()
-            service.client = mock_client
-
-            result = await service.process_message(
-                user_id="user-123",
-                message_content="Hello!",
-                conversation_history=[]
-            )
+        result = await service.process_message(
+            user_id="user-123",
+            message_content="Hello!",
+            conversation_history=[]
+        )
 
-            assert "content" in result
-            assert result["tool_calls"] is None
+        assert "content" in result
+        assert result["tool_calls"] is None
 
     @pytest.mark.asyncio
     async def test_process_message_with_tool_call(self, mock_openai_response_with_tools):
         """Test processing a message that triggers tool usage."""
         response1, response2 = mock_openai_response_with_tools
 
-        with patch('app.services.agent_service.settings') as mock_settings, \
-             patch('app.services.agent_service.AsyncOpenAI') as mock_client_class, \
-             patch('app.services.agent_service.mcp_server') as mock_mcp:
-
-            mock_settings.OPENAI_API_KEY = "test-key"
-            mock_settings.OPENAI_AGENT_MODEL = "gpt-4o"
+        mock_llm = MagicMock()
+        mock_llm.create = AsyncMock(side_effect=[response1, response2])
 
-            mock_client = AsyncMock()
-            mock_client.chat.completions.create = AsyncMock(side_effect=[response1, response2])
-            mock_client_class.return_value = mock_client
+        with patch('app.services.agent_service.mcp_server') as mock_mcp:
 
             # Mock MCP server
             mock_mcp.get_tools.return_value = []
@@ -117,8 +103,7 @@ class TestAgentServiceUnit:
             })
 
             from app.services.agent_service import AgentService
-            service = AgentService()
-            service.client = mock_client
+            service = AgentService(llm=mock_llm)
 
             result = await service.process_message(
                 user_id="user-123",
@@ -0,0 +1,150 @@
+"""
+Agent Response Cache Tests
+
+Tests which turns are cached, the task-set version used to invalidate
+answers, and that cache hits skip the model.
+"""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.services.agent_cache import AgentResponseCache, is_cacheable, normalize_prompt
+from app.services.task_service import TaskService
+
+
+def completion(content=None, tool_calls=None):
+    """Mock chat completion with a single choice."""
+    message = MagicMock()
+    message.content = content
+    message.tool_calls = tool_calls
+    choice = MagicMock()
+    choice.message = message
+    choice.finish_reason = "tool_calls" if tool_calls else "stop"
+    response = MagicMock()
+    response.choices = [choice]
+    return response
+
+
+def tool_call(name):
+    call = MagicMock()
+    call.id = f"call_{name}"
+    call.function.name = name
+    call.function.arguments = json.dumps({})
+    return call
+
+
+class TestCachePolicy:
+    """Tests for prompt normalization, cacheability and the LRU."""
+
+    def test_normalize_prompt(self):
+        """Test case, whitespace and punctuation differences map to one key."""
+        assert normalize_prompt("What's on my  list?") == normalize_prompt("what's on my list")
+
+    def test_only_successful_read_only_turns_are_cacheable(self):
+        """Test write tools, failed calls and tool-less turns are not cached."""
+        ok = {"name": "list_tasks", "result": {"success": True}}
+
+        assert is_cacheable([ok, {"name": "search_tasks", "result": {"success": True}}])
+        assert not is_cacheable([ok, {"name": "create_task", "result": {"success": True}}])
+        assert not is_cacheable([{"name": "get_task", "result": {"success": False}}])
+        assert not is_cacheable(None)
+
+    def test_entries_are_keyed_by_version_and_expire(self):
+        """Test a new version misses and entries expire after the TTL."""
+        cache = AgentResponseCache(max_size=10, ttl_seconds=60)
+        cache.put("u", "List my tasks", "v1", {"content": "3 tasks"})
+
+        assert cache.get("u", "list my tasks!", "v1") == {"content": "3 tasks"}
+        assert cache.get("u", "list my tasks", "v2") is None
+        assert cache.get("other", "list my tasks", "v1") is None
+
+        with patch("app.services.agent_cache.time.monotonic", return_value=1e12):
+            assert cache.get("u", "list my tasks", "v1") is None
+
+    def test_lru_bound(self):
+        """Test the oldest entry is evicted beyond max_size."""
+        cache = AgentResponseCache(max_size=2)
+        for i in range(3):
+            cache.put("u", f"q{i}", "v", {"content": str(i)})
+
+        assert len(cache) == 2
+        assert cache.get("u", "q0", "v") is None
+
+
+class TestTaskSetVersion:
+    """Tests for TaskService.get_task_set_version."""
+
+    def test_version_changes_on_every_write(self, tmp_path):
+        """Test every write changes the version, and equal task sets share one."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'tasks.db'}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            service = TaskService(session, "user-123")
+            versions = [service.get_task_set_version()]
+            task_id = service.create_task("Buy milk").id
+            versions.append(service.get_task_set_version())
+            service.update_task(task_id, title="Buy oat milk")
+            versions.append(service.get_task_set_version())
+            service.toggle_completion(task_id)
+            versions.append(service.get_task_set_version())
+            service.delete_task(task_id)
+            versions.append(service.get_task_set_version())
+
+            assert len(set(versions[:4])) == 4
+            # Back to no tasks: the same set, so answers for it are valid again
+            assert versions[4] == versions[0]
+            assert TaskService(session, "other-user").get_task_set_version() == versions[0]
+
+
+class TestAgentServiceCache:
+    """Tests for the cache in AgentService.process_message."""
+
+    @pytest.fixture
+    def service(self):
+        from app.services.agent_service import AgentService
+
+        service = AgentService(llm=MagicMock())
+        service.response_cache = AgentResponseCache(max_size=100)
+        return service
+
+    async def _ask(self, service, tool_name, version="v1"):
+        service.llm.create = AsyncMock(side_effect=[
+            completion(tool_calls=[tool_call(tool_name)]),
+            completion(content="You have 2 tasks."),
+        ])
+        with patch("app.services.agent_service.task_set_version", return_value=version), \
+             patch("app.services.agent_service.mcp_server") as mcp:
+            mcp.execute_tool = AsyncMock(return_value={"success": True, "count": 2})
+            result = await service.process_message("user-123", "What's on my list?", [])
+        return result, service.llm.create.await_count
+
+    @pytest.mark.asyncio
+    async def test_read_only_answer_is_reused_until_tasks_change(self, service):
+        """Test a repeated read-only question skips the model until the version changes."""
+        first, first_calls = await self._ask(service, "list_tasks")
+        second, second_calls = await self._ask(service, "list_tasks")
+        third, third_calls = await self._ask(service, "list_tasks", version="v2")
+
+        assert (first_calls, second_calls, third_calls) == (2, 0, 2)
+        assert second == first
+        assert second["tool_calls"][0]["name"] == "list_tasks"
+
+    @pytest.mark.asyncio
+    async def test_write_turns_are_not_cached(self, service):
+        """Test turns that call a write tool always reach the model."""
+        await self._ask(service, "complete_task")
+        _, calls = await self._ask(service, "complete_task")
+
+        assert calls == 2
+        assert len(service.response_cache) == 0
+
+    @pytest.mark.asyncio
+    async def test_version_failure_bypasses_cache(self, service):
+        """Test the agent still answers when the task version cannot be read."""
+        service.llm.create = AsyncMock(return_value=completion(content="Hi!"))
+        with patch("app.services.agent_service.task_set_version", side_effect=RuntimeError("db down")):
+            result = await service.process_message("user-123", "Hello", [])
+
+        assert result["content"] == "Hi!"
@@ -0,0 +1,194 @@
+"""
+Authentication Tests
+
+Tests the async password hasher and the login/register endpoints.
+"""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from passlib.context import CryptContext
+from sqlmodel import Session, SQLModel, create_engine, select
+
+
+# Low bcrypt cost keeps tests fast
+FAST_CONTEXT = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=4, bcrypt__min_rounds=4)
+
+
+class TestPasswordHasher:
+    """Tests for the bounded async password hasher."""
+
+    @pytest.mark.asyncio
+    async def test_hash_and_verify(self):
+        """Test hashing and verification run through the pool."""
+        from app.core.password_hasher import PasswordHasher
+
+        hasher = PasswordHasher(FAST_CONTEXT, max_workers=1, queue_limit=1)
+        hashed = await hasher.hash("secret")
+
+        assert await hasher.verify("secret", hashed) is True
+        assert await hasher.verify("wrong", hashed) is False
+        assert hasher.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_rejects_when_queue_full(self):
+        """Test calls beyond workers + queue_limit are rejected."""
+        from app.core.password_hasher import PasswordHasher, PasswordHasherBusy, HASH_REJECTED
+
+        slow = CryptContext(schemes=["bcrypt"], bcrypt__rounds=10)
+        hasher = PasswordHasher(slow, max_workers=1, queue_limit=1)
+        rejected_before = HASH_REJECTED.value(op="hash")
+
+        results = await asyncio.gather(
+            *(hasher.hash("secret") for _ in range(3)), return_exceptions=True
+        )
+
+        assert sum(isinstance(r, PasswordHasherBusy) for r in results) == 1
+        assert HASH_REJECTED.value(op="hash") == rejected_before + 1
+
+    @pytest.mark.asyncio
+    async def test_cancelled_call_counts_until_it_finishes(self):
+        """Test a cancelled caller's hash still holds its slot while it runs."""
+        from app.core.password_hasher import PasswordHasher, PasswordHasherBusy
+
+        release = threading.Event()
+        started = threading.Event()
+
+        class Blocking:
+            def hash(self, password):
+                started.set()
+                release.wait(5)
+                return "hashed"
+
+        hasher = PasswordHasher(Blocking(), max_workers=1, queue_limit=0)
+        caller = asyncio.create_task(hasher.hash("secret"))
+        await asyncio.to_thread(started.wait, 5)
+        caller.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await caller
+
+        assert hasher.pending == 1
+        with pytest.raises(PasswordHasherBusy):
+            await hasher.hash("secret")
+
+        release.set()
+        for _ in range(100):
+            if hasher.pending == 0:
+                break
+            await asyncio.sleep(0.01)
+        assert hasher.pending == 0
+
+    @pytest.mark.asyncio
+    async def test_upgrades_weak_hash(self):
+        """Test a hash with fewer rounds than configured is replaced."""
+        from app.core.password_hasher import PasswordHasher
+
+        old_hash = FAST_CONTEXT.hash("secret")
+        stronger = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5, bcrypt__min_rounds=5)
+        hasher = PasswordHasher(stronger, max_workers=1)
+
+        valid, new_hash = await hasher.verify_and_update("secret", old_hash)
+
+        assert valid is True
+        assert new_hash is not None and new_hash.startswith("$2b$05$")
+
+
+class TestAuthAPI:
+    """Tests for register and login with stored credentials."""
+
+    @pytest.fixture(autouse=True)
+    def setup_app(self, tmp_path):
+        """Use a file database and a fast hasher."""
+        from app.main import app
+        from app.core.database import get_session
+        from app.core.password_hasher import PasswordHasher
+        from app.models.better_auth_user import BetterAuthUser
+
+        self.engine = create_engine(f"sqlite:///{tmp_path / 'auth.db'}")
+        SQLModel.metadata.create_all(self.engine)
+
+        def override_session():
+            with Session(self.engine) as session:
+                yield session
+
+        app.dependency_overrides[get_session] = override_session
+        with patch('app.api.auth.password_hasher', PasswordHasher(FAST_CONTEXT)):
+            self.client = TestClient(app)
+            yield
+        app.dependency_overrides.clear()
+
+    def test_register_then_login(self):
+        """Test a registered user must use the right password."""
+        credentials = {"email": "alice@example.com", "password": "secret"}
+
+        assert self.client.post("/auth/register", json=credentials).status_code == 200
+        assert self.client.post("/auth/login", json=credentials).status_code == 200
+
+        wrong = {"email": "alice@example.com", "password": "nope"}
+        assert self.client.post("/auth/login", json=wrong).status_code == 401
+
+    def test_duplicate_register_rejected(self):
+        """Test an email can only be registered once."""
+        credentials = {"email": "bob@example.com", "password": "secret"}
+
+        assert self.client.post("/auth/register", json=credentials).status_code == 200
+        assert self.client.post("/auth/register", json=credentials).status_code == 400
+
+    def test_login_upgrades_stored_hash(self):
+        """Test login replaces a hash made with outdated parameters."""
+        from app.core.password_hasher import PasswordHasher
+        from app.models.better_auth_user import BetterAuthUser
+
+        with Session(self.engine) as session:
+            session.add(BetterAuthUser(
+                id="carol", email="carol@example.com", name="carol",
+                hashed_password=FAST_CONTEXT.hash("secret"),
+            ))
+            session.commit()
+
+        stronger = CryptContext(schemes=["bcrypt"], deprecated="auto", bcrypt__rounds=5, bcrypt__min_rounds=5)
+        with patch('app.api.auth.password_hasher', PasswordHasher(stronger)):
+            response = self.client.post("/auth/login", json={"email": "carol@example.com", "password": "secret"})
+
+        assert response.status_code == 200
+        with Session(self.engine) as session:
+            account = session.exec(select(BetterAuthUser).where(BetterAuthUser.id == "carol")).first()
+            assert account.hashed_password.startswith("$2b$05$")
+
+    def test_unregistered_demo_login(self):
+        """Test unregistered emails still get a demo token."""
+        response = self.client.post("/auth/login", json={"email": "demo@example.com", "password": "x"})
+
+        assert response.status_code == 200
+        assert response.json()["user_id"] == "demo"
+
+    def test_registered_user_id_cannot_be_claimed_from_another_domain(self):
+        """Test an unregistered email cannot log in as a registered user with the same name."""
+        credentials = {"email": "erin@example.com", "password": "secret"}
+        assert self.client.post("/auth/register", json=credentials).status_code == 200
+
+        response = self.client.post("/auth/login", json={"email": "erin@elsewhere.com", "password": "anything"})
+
+        assert response.status_code == 401
+        assert "access_token" not in response.json()
+
+    def test_register_rejects_taken_user_name(self):
+        """Test registering the same user name under another domain is refused."""
+        assert self.client.post("/auth/register", json={"email": "frank@example.com", "password": "a"}).status_code == 200
+
+        response = self.client.post("/auth/register", json={"email": "frank@elsewhere.com", "password": "b"})
+
+        assert response.status_code == 400
+        assert response.json()["detail"] == "User name already taken"
+
+    def test_busy_hasher_returns_503(self):
+        """Test a full hashing queue surfaces as 503 with Retry-After."""
+        from app.core.password_hasher import PasswordHasherBusy
+
+        with patch('app.api.auth.password_hasher.hash', side_effect=PasswordHasherBusy("full")):
+            response = self.client.post("/auth/register", json={"email": "dan@example.com", "password": "x"})
+
+        assert response.status_code == 503
+        assert response.headers["Retry-After"] == "1"
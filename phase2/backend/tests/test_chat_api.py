@@ -8,7 +8,7 @@ Tests the chat API endpoint and conversation services.
 import pytest
 from unittest.mock import patch, AsyncMock, MagicMock
 from fastapi.testclient import TestClient
-from sqlmodel import Session, create_engine, SQLModel
+from sqlmodel import Session, create_engine, SQLModel, text
 
 # Test database
 TEST_DATABASE_URL = "sqlite:///:memory:"
@@ -133,6 +133,92 @@ class TestChatAPIUnit:
         assert len(messages) == 0
 
 
+class TestChatUnitOfWork:
+    """Tests for the two-transaction chat persistence unit of work."""
+
+    @pytest.fixture(autouse=True)
+    def setup_test_db(self):
+        """Set up test database."""
+        from app.models.conversation import Conversation
+        from app.models.message import Message
+
+        self.test_engine = create_engine(TEST_DATABASE_URL, echo=False)
+        SQLModel.metadata.create_all(self.test_engine)
+
+        yield
+
+        SQLModel.metadata.drop_all(self.test_engine)
+
+    @pytest.fixture
+    def test_session(self):
+        """Create a test session."""
+        with Session(self.test_engine) as session:
+            yield session
+
+    def test_new_conversation_gets_title_from_message(self, test_session):
+        """Test begin() creates a titled conversation and saves the user message."""
+        from app.services.chat_unit_of_work import ChatUnitOfWork
+        from app.services.conversation_service import ConversationService
+        from app.services.message_service import MessageService
+
+        uow = ChatUnitOfWork(test_session, "user-123")
+        history = uow.begin("x" * 60)
+
+        assert history == []
+        conversation = ConversationService(test_session, "user-123").get_conversation_by_id(uow.conversation_id)
+        assert conversation.title == "x" * 50 + "..."
+        messages = MessageService(test_session).get_conversation_messages(uow.conversation_id)
+        assert [m.role for m in messages] == ["user"]
+
+    def test_turn_uses_two_commits(self, test_session):
+        """Test a full turn on an existing conversation commits exactly twice."""
+        from sqlalchemy import event
+        from app.services.chat_unit_of_work import ChatUnitOfWork
+
+        first = ChatUnitOfWork(test_session, "user-123")
+        first.begin("Hello")
+        first.complete("Hi there!")
+
+        commits = []
+        event.listen(self.test_engine, "commit", lambda conn: commits.append(1))
+
+        uow = ChatUnitOfWork(test_session, "user-123")
+        history = uow.begin("Show my tasks", first.conversation_id)
+        message_id = uow.complete("You have no tasks.", tool_calls=[{"name": "list_tasks"}])
+
+        assert len(commits) == 2
+        assert uow.conversation_id == first.conversation_id
+        assert [m["content"] for m in history] == ["Hello", "Hi there!"]
+        assert message_id is not None
+
+    def test_other_users_conversation_not_reused(self, test_session):
+        """Test begin() never appends to another user's conversation."""
+        from app.services.chat_unit_of_work import ChatUnitOfWork
+
+        owner = ChatUnitOfWork(test_session, "user-1")
+        owner.begin("Private")
+
+        intruder = ChatUnitOfWork(test_session, "user-2")
+        history = intruder.begin("Hello", owner.conversation_id)
+
+        assert history == []
+        assert intruder.conversation_id != owner.conversation_id
+
+    def test_complete_in_background(self, test_session):
+        """Test deferred persistence writes the assistant message with its own session."""
+        from app.services.chat_unit_of_work import ChatUnitOfWork, complete_in_background
+        from app.services.message_service import MessageService
+
+        uow = ChatUnitOfWork(test_session, "user-123")
+        uow.begin("Hello")
+
+        with patch('app.services.chat_unit_of_work.engine', self.test_engine):
+            complete_in_background("user-123", uow.conversation_id, "Hi!", None)
+
+        messages = MessageService(test_session).get_conversation_messages(uow.conversation_id)
+        assert [m.role for m in messages] == ["user", "assistant"]
+
+
 class TestChatAPIIntegration:
     """Integration tests for chat API (requires mocking OpenAI)."""
 
@@ -224,6 +310,208 @@ class TestConversationAPI:
         assert len(convs) == 2
         assert convs[0].id == conv1.id  # Updated more recently
 
+    def _add_messages(self, session, conversation_id, count, same_timestamp=False):
+        from datetime import datetime, timedelta
+        from app.models.message import Message
+
+        base = datetime(2025, 1, 1)
+        for i in range(count):
+            session.add(Message(
+                conversation_id=conversation_id,
+                role="user" if i % 2 == 0 else "assistant",
+                content=f"Message {i}",
+                tool_calls=None if i % 2 == 0 else [{"name": "list_tasks"}],
+                created_at=base if same_timestamp else base + timedelta(seconds=i)
+            ))
+        session.commit()
+
+    @pytest.mark.parametrize("same_timestamp", [False, True])
+    def test_message_pages_walk_history_newest_first(self, test_session, same_timestamp):
+        """Test before-cursors visit every message once, newest first, even on timestamp ties."""
+        from app.services.conversation_service import ConversationService
+        from app.services.message_service import MessageService
+
+        conversation = ConversationService(test_session, "user-123").create_conversation("Long")
+        self._add_messages(test_session, conversation.id, 7, same_timestamp)
+        service = MessageService(test_session)
+
+        seen = []
+        before = None
+        while True:
+            rows, has_more = service.get_message_page(conversation.id, limit=3, before=before)
+            seen.extend(row["content"] for row in rows)
+            if not has_more:
+                break
+            before = rows[-1]["id"]
+
+        assert seen == [f"Message {i}" for i in reversed(range(7))]
+
+    def test_message_page_can_omit_tool_calls(self, test_session):
+        """Test include_tool_calls=False leaves the tool_calls key out."""
+        from app.services.conversation_service import ConversationService
+        from app.services.message_service import MessageService
+
+        conversation = ConversationService(test_session, "user-123").create_conversation("Tools")
+        self._add_messages(test_session, conversation.id, 2)
+
+        rows, has_more = MessageService(test_session).get_message_page(conversation.id, include_tool_calls=False)
+
+        assert has_more is False
+        assert all("tool_calls" not in row for row in rows)
+
+    def test_history_returns_most_recent_messages(self, test_session):
+        """Test chat history holds the latest messages, oldest first."""
+        from app.services.conversation_service import ConversationService
+        from app.services.message_service import MessageService
+
+        conversation = ConversationService(test_session, "user-123").create_conversation("Long")
+        self._add_messages(test_session, conversation.id, 10)
+
+        history = MessageService(test_session).get_conversation_history(conversation.id, max_messages=4)
+
+        assert [m["content"] for m in history] == ["Message 6", "Message 7", "Message 8", "Message 9"]
+
+    def test_message_page_endpoint(self, tmp_path):
+        """Test GET /{id}/messages returns pages with a cursor and hides other users' conversations."""
+        from app.main import create_app
+        from app.core.auth import get_current_user_id
+        from app.core.database import get_read_session
+        from app.models.conversation import Conversation
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'pages.db'}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            conversation = Conversation(user_id="user-123", title="Paged")
+            session.add(conversation)
+            session.flush()
+            self._add_messages(session, conversation.id, 5)
+            conversation_id = conversation.id
+
+        def override_session():
+            with Session(engine) as session:
+                yield session
+
+        app = create_app("chat")
+        app.dependency_overrides[get_read_session] = override_session
+        app.dependency_overrides[get_current_user_id] = lambda: "user-123"
+        client = TestClient(app)
+
+        first = client.get(f"/api/conversations/{conversation_id}/messages?limit=3").json()
+        second = client.get(
+            f"/api/conversations/{conversation_id}/messages",
+            params={"limit": 3, "before": first["next_before"], "include_tool_calls": "false"}
+        ).json()
+
+        assert [m["content"] for m in first["messages"]] == ["Message 4", "Message 3", "Message 2"]
+        assert first["has_more"] is True
+        assert [m["content"] for m in second["messages"]] == ["Message 1", "Message 0"]
+        assert second["has_more"] is False
+        assert second["next_before"] is None
+        assert "tool_calls" not in second["messages"][0]
+
+        app.dependency_overrides[get_current_user_id] = lambda: "someone-else"
+        assert client.get(f"/api/conversations/{conversation_id}/messages").status_code == 404
+
+    def test_delete_conversation_is_set_based(self, test_session):
+        """Test deletion issues set-based DELETEs without loading messages."""
+        from sqlalchemy import event
+        from app.services.conversation_service import ConversationService
+        from app.services.message_service import MessageService
+
+        conv_service = ConversationService(test_session, "user-123")
+        conversation_id = conv_service.create_conversation("Big").id
+        self._add_messages(test_session, conversation_id, 20)
+
+        statements = []
+        listener = lambda conn, cursor, statement, *args: statements.append(statement.split()[0].upper())
+        event.listen(self.test_engine, "before_cursor_execute", listener)
+        try:
+            assert conv_service.delete_conversation(conversation_id) is True
+        finally:
+            event.remove(self.test_engine, "before_cursor_execute", listener)
+
+        # Messages, archive, tool result references, conversation
+        assert statements == ["DELETE", "DELETE", "DELETE", "DELETE"]
+        assert MessageService(test_session).get_message_count(conversation_id) == 0
+        assert conv_service.delete_conversation(conversation_id) is False
+
+    def test_delete_all_conversations_only_touches_owner(self, test_session):
+        """Test bulk deletion removes the user's conversations and nobody else's."""
+        from app.services.conversation_service import ConversationService
+        from app.services.message_service import MessageService
+
+        mine = ConversationService(test_session, "user-123")
+        theirs = ConversationService(test_session, "user-456")
+        for title in ("a", "b"):
+            self._add_messages(test_session, mine.create_conversation(title).id, 3)
+        other = theirs.create_conversation("keep")
+        self._add_messages(test_session, other.id, 3)
+
+        assert mine.delete_all_conversations() == 2
+
+        assert mine.get_all_conversations() == []
+        assert len(theirs.get_all_conversations()) == 1
+        assert MessageService(test_session).get_message_count(other.id) == 3
+
+    def test_background_purge_hides_then_deletes_in_chunks(self, test_session):
+        """Test hidden conversations vanish at once and purge in chunked transactions."""
+        from app.models.conversation import Conversation
+        from app.services.conversation_service import ConversationService, purge_conversations
+        from app.services.message_service import MessageService
+
+        conv_service = ConversationService(test_session, "user-123")
+        conversation_id = conv_service.create_conversation("Huge").id
+        self._add_messages(test_session, conversation_id, 25)
+
+        hidden = conv_service.hide_for_purge(conversation_id)
+
+        assert hidden == [conversation_id]
+        assert conv_service.get_conversation_by_id(conversation_id) is None
+
+        with patch('app.services.conversation_service.engine', self.test_engine):
+            deleted = purge_conversations(hidden, chunk_size=10)
+
+        test_session.expire_all()
+        assert deleted == 25
+        assert MessageService(test_session).get_message_count(conversation_id) == 0
+        assert test_session.get(Conversation, conversation_id) is None
+
+    def test_delete_endpoints(self, tmp_path):
+        """Test DELETE endpoints, including background mode returning 202."""
+        from app.main import create_app
+        from app.core.auth import get_current_user_id
+        from app.core.database import get_session
+        from app.services.conversation_service import ConversationService
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'delete.db'}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            service = ConversationService(session, "user-123")
+            first = service.create_conversation("one").id
+            for title in ("two", "three"):
+                self._add_messages(session, service.create_conversation(title).id, 5)
+
+        def override_session():
+            with Session(engine) as session:
+                yield session
+
+        app = create_app("chat")
+        app.dependency_overrides[get_session] = override_session
+        app.dependency_overrides[get_current_user_id] = lambda: "user-123"
+        client = TestClient(app)
+
+        with patch('app.services.conversation_service.engine', engine):
+            assert client.delete(f"/api/conversations/{first}").status_code == 200
+            assert client.delete(f"/api/conversations/{first}").status_code == 404
+            response = client.delete("/api/conversations", params={"background": "true"})
+
+        assert response.status_code == 202
+        assert response.json() == {"scheduled": 2}
+        with Session(engine) as session:
+            assert ConversationService(session, "user-123").get_all_conversations() == []
+            assert session.exec(text("SELECT COUNT(*) FROM messages")).one()[0] == 0
+            assert session.exec(text("SELECT COUNT(*) FROM conversations")).one()[0] == 0
+
 
 if __name__ == "__main__":
     pytest.main([__file__, "-v"])
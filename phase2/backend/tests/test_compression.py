@@ -0,0 +1,194 @@
+"""
+Compression Middleware Tests
+
+Tests content-coding negotiation, the size threshold, streamed bodies and
+precompressed responses.
+"""
+
+import gzip
+import pytest
+from unittest.mock import patch
+from fastapi import FastAPI
+from fastapi.responses import PlainTextResponse, StreamingResponse
+from fastapi.testclient import TestClient
+
+from app.core.compression import CompressionMiddleware, PrecompressedResponse, negotiate
+
+LARGE_BODY = "x" * 5000
+
+
+class TestNegotiate:
+    """Tests for Accept-Encoding negotiation."""
+
+    def test_server_preference_breaks_ties(self):
+        """Test equal q-values pick the first supported server encoding."""
+        assert negotiate("gzip, br", ["zstd", "br", "gzip"]) == "br"
+
+    def test_highest_q_wins(self):
+        """Test the client's q-values take priority over server preference."""
+        assert negotiate("br;q=0.5, gzip", ["br", "gzip"]) == "gzip"
+
+    def test_refused_and_unsupported(self):
+        """Test q=0, unknown codings and a missing header yield no encoding."""
+        assert negotiate("gzip;q=0", ["gzip"]) is None
+        assert negotiate("compress", ["gzip"]) is None
+        assert negotiate("", ["gzip"]) is None
+
+    def test_wildcard(self):
+        """Test * matches codings the client did not list."""
+        assert negotiate("*", ["br", "gzip"]) == "br"
+        assert negotiate("br;q=0, *", ["br", "gzip"]) == "gzip"
+
+
+class TestCompressionMiddleware:
+    """Tests for CompressionMiddleware on a minimal app."""
+
+    @pytest.fixture
+    def client(self):
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware, minimum_size=1024, encodings=["gzip"])
+
+        @app.get("/small")
+        async def small():
+            return PlainTextResponse("small body")
+
+        @app.get("/large")
+        async def large():
+            return PlainTextResponse(LARGE_BODY)
+
+        @app.get("/stream")
+        async def stream():
+            async def chunks():
+                for i in range(3):
+                    yield f"chunk {i} ".encode() * 50
+            return StreamingResponse(chunks(), media_type="text/plain")
+
+        @app.get("/small-stream")
+        async def small_stream():
+            async def chunks():
+                for i in range(3):
+                    yield f"chunk {i} ".encode()
+            return StreamingResponse(chunks(), media_type="text/plain")
+
+        @app.get("/events")
+        async def events():
+            async def chunks():
+                yield b"data: hello\n\n"
+            return StreamingResponse(chunks(), media_type="text/event-stream")
+
+        return TestClient(app)
+
+    def test_large_body_is_compressed(self, client):
+        """Test bodies above the threshold are gzip-encoded with a matching length."""
+        response = client.get("/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.headers["vary"] == "Accept-Encoding"
+        assert int(response.headers["content-length"]) < len(LARGE_BODY)
+        assert response.text == LARGE_BODY
+
+    def test_small_body_is_not_compressed(self, client):
+        """Test bodies below the threshold are sent as is."""
+        response = client.get("/small", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == "small body"
+
+    def test_identity_client_gets_plain_body(self, client):
+        """Test clients that do not accept gzip get the raw body."""
+        response = client.get("/large", headers={"Accept-Encoding": "identity"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == LARGE_BODY
+
+    def test_streamed_body_is_compressed_incrementally(self, client):
+        """Test streamed bodies past the threshold are gzip-encoded without a Content-Length."""
+        response = client.get("/stream", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert "content-length" not in response.headers
+        assert response.text == "".join(f"chunk {i} " * 50 for i in range(3))
+
+    def test_small_streamed_body_is_not_compressed(self, client):
+        """Test a streamed body that ends below the threshold is sent as is."""
+        response = client.get("/small-stream", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == "chunk 0 chunk 1 chunk 2 "
+
+    def test_event_stream_passes_through(self, client):
+        """Test server-sent events are never compressed."""
+        response = client.get("/events", headers={"Accept-Encoding": "gzip"})
+
+        assert "content-encoding" not in response.headers
+        assert response.text == "data: hello\n\n"
+
+
+class TestCompressionInApp:
+    """Tests for compression behind the app's own middleware stack."""
+
+    @pytest.fixture
+    def client(self):
+        """Full-profile app, whose rate limiter re-sends bodies in pieces."""
+        from app.main import create_app
+
+        app = create_app("full")
+
+        @app.get("/test/large")
+        async def large():
+            return PlainTextResponse(LARGE_BODY)
+
+        return TestClient(app)
+
+    def test_small_response_keeps_content_length(self, client):
+        """Test small responses are sent uncompressed with their Content-Length."""
+        response = client.get("/health/live", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert "content-encoding" not in response.headers
+        assert int(response.headers["content-length"]) == len(response.content)
+
+    def test_large_response_is_compressed(self, client):
+        """Test large responses are still compressed."""
+        response = client.get("/test/large", headers={"Accept-Encoding": "gzip"})
+
+        assert response.headers["content-encoding"] == "gzip"
+        assert response.text == LARGE_BODY
+
+
+class TestPrecompressedResponse:
+    """Tests for PrecompressedResponse."""
+
+    def test_variants_are_built_once(self):
+        """Test a shared response compresses each encoding only once."""
+        shared = PrecompressedResponse(LARGE_BODY.encode(), media_type="text/plain", encodings=["gzip"])
+        app = FastAPI()
+        app.add_middleware(CompressionMiddleware, encodings=["gzip"])
+
+        @app.get("/cached")
+        async def cached():
+            return shared
+
+        client = TestClient(app)
+        encoder = shared._encoders["gzip"]
+        with patch.object(encoder, "compress", wraps=encoder.compress) as compress:
+            first = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+            second = client.get("/cached", headers={"Accept-Encoding": "gzip"})
+            plain = client.get("/cached", headers={"Accept-Encoding": "identity"})
+
+        assert compress.call_count == 1
+        assert first.headers["content-encoding"] == "gzip"
+        assert first.text == second.text == plain.text == LARGE_BODY
+        assert gzip.decompress(shared.variant("gzip")) == LARGE_BODY.encode()
+        assert "content-encoding" not in plain.headers
+
+    def test_openapi_served_precompressed(self):
+        """Test the app serves its OpenAPI schema compressed."""
+        from app.main import create_app
+
+        client = TestClient(create_app("tasks"))
+        response = client.get("/openapi.json", headers={"Accept-Encoding": "gzip"})
+
+        assert response.status_code == 200
+        assert response.headers["content-encoding"] == "gzip"
+        assert "/tasks/" in response.json()["paths"]
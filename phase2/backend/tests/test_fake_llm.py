@@ -0,0 +1,152 @@
+"""
+Fake LLM Provider Tests
+
+Tests script matching, streamed tool calls and pacing of the scripted
+provider used by load tests.
+"""
+
+import time
+import pytest
+
+from app.mcp_tools import ALL_TOOLS
+from app.services.fake_llm import FALLBACK_REPLY, FakeLLMProvider
+from app.services.llm_providers import LLMRouter
+
+
+def user(content):
+    return {"role": "user", "content": content}
+
+
+class TestScript:
+    """Tests for FakeLLMProvider.respond."""
+
+    def test_matching_rule_calls_tools(self):
+        """Test the first request of a turn gets the rule's tool calls with groups filled in."""
+        provider = FakeLLMProvider()
+
+        text, calls = provider.respond([user("Please remember to buy milk")], ALL_TOOLS)
+
+        assert text == ""
+        assert calls == [{"name": "create_task", "arguments": {"title": "buy milk"}}]
+
+    def test_reply_after_tool_results(self):
+        """Test the request carrying tool results gets the rule's reply."""
+        provider = FakeLLMProvider()
+        messages = [
+            user("I'm done with task 7"),
+            {"role": "assistant", "content": None, "tool_calls": []},
+            {"role": "tool", "tool_call_id": "call_1", "content": "{}"},
+        ]
+
+        text, calls = provider.respond(messages, ALL_TOOLS)
+
+        assert text == "🎉 Nice work! Task 7 is done."
+        assert calls == []
+
+    def test_no_tools_offered(self):
+        """Test a rule replies directly when the request offers no tools."""
+        provider = FakeLLMProvider()
+
+        assert provider.respond([user("find groceries")], None) == ("Here is what I found for 'groceries'.", [])
+
+    def test_steps_follow_tool_rounds(self):
+        """Test a rule with steps answers each tool round with the next step."""
+        provider = FakeLLMProvider(script=[{
+            "match": r"clear task (\d+)",
+            "steps": [
+                {"tool_calls": [{"name": "list_tasks", "arguments": {}}]},
+                {"tool_calls": [{"name": "complete_task", "arguments": {"task_id": "{1}"}}]},
+                {"reply": "Task {1} is done"},
+            ],
+        }])
+        messages = [user("clear task 3")]
+
+        assert provider.respond(messages, ALL_TOOLS) == ("", [{"name": "list_tasks", "arguments": {}}])
+
+        messages += [
+            {"role": "assistant", "content": None, "tool_calls": []},
+            {"role": "tool", "tool_call_id": "call_1", "content": "{}"},
+        ]
+        assert provider.respond(messages, ALL_TOOLS) == (
+            "", [{"name": "complete_task", "arguments": {"task_id": "3"}}]
+        )
+
+        messages += [
+            {"role": "assistant", "content": None, "tool_calls": []},
+            {"role": "tool", "tool_call_id": "call_2", "content": "{}"},
+            {"role": "tool", "tool_call_id": "call_3", "content": "{}"},
+        ]
+        assert provider.respond(messages, ALL_TOOLS) == ("Task 3 is done", [])
+
+    def test_steps_end_without_tools(self):
+        """Test a step with tool calls ends the turn when no tools are offered."""
+        provider = FakeLLMProvider(script=[{
+            "match": "tidy up",
+            "steps": [
+                {"tool_calls": [{"name": "list_tasks", "arguments": {}}]},
+                {"tool_calls": [{"name": "delete_task", "arguments": {"task_id": "1"}}]},
+                {"reply": "All tidy"},
+            ],
+        }])
+        messages = [
+            user("tidy up"),
+            {"role": "assistant", "content": None, "tool_calls": []},
+            {"role": "tool", "tool_call_id": "call_1", "content": "{}"},
+        ]
+
+        assert provider.respond(messages, None) == ("All tidy", [])
+
+    def test_rounds_count_from_last_user_message(self):
+        """Test tool rounds of earlier turns don't advance the steps."""
+        provider = FakeLLMProvider()
+        messages = [
+            user("remember to buy milk"),
+            {"role": "assistant", "content": None, "tool_calls": []},
+            {"role": "tool", "tool_call_id": "call_1", "content": "{}"},
+            {"role": "assistant", "content": "Added"},
+            user("remember to call mum"),
+        ]
+
+        assert provider.respond(messages, ALL_TOOLS) == (
+            "", [{"name": "create_task", "arguments": {"title": "call mum"}}]
+        )
+
+    def test_unmatched_message(self):
+        """Test messages no rule matches get the fallback reply."""
+        provider = FakeLLMProvider(script=[])
+
+        assert provider.respond([user("hello")], ALL_TOOLS) == (FALLBACK_REPLY, [])
+
+
+class TestStreaming:
+    """Tests for completions through the router."""
+
+    @pytest.mark.asyncio
+    async def test_tool_calls_are_assembled(self):
+        """Test streamed tool calls arrive as a ChatCompletion."""
+        router = LLMRouter([FakeLLMProvider(first_chunk_seconds=0, tokens_per_second=0)])
+
+        completion = await router.create(messages=[user("what's on my todo list")], tools=ALL_TOOLS)
+
+        message = completion.choices[0].message
+        assert message.tool_calls[0].function.name == "list_tasks"
+        assert message.tool_calls[0].function.arguments == "{}"
+        assert completion.choices[0].finish_reason == "tool_calls"
+
+    @pytest.mark.asyncio
+    async def test_reply_is_paced(self):
+        """Test the first chunk delay and streaming rate are applied."""
+        provider = FakeLLMProvider(
+            script=[{"match": "hi", "reply": "one two three four five"}],
+            first_chunk_seconds=0.05,
+            tokens_per_second=100,
+        )
+        router = LLMRouter([provider])
+
+        start = time.perf_counter()
+        completion = await router.create(messages=[user("hi")])
+        elapsed = time.perf_counter() - start
+
+        assert completion.choices[0].message.content == "one two three four five"
+        assert elapsed >= 0.05 + 5 * 0.01
+        assert router.stats()["fake"]["requests"] == 1
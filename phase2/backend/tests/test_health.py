@@ -0,0 +1,185 @@
+"""
+Health Probe Tests
+
+Tests the cached dependency monitor and the liveness/readiness endpoints.
+"""
+
+import asyncio
+import threading
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.core.health import HealthMonitor, SkipCheck
+
+
+class TestHealthMonitor:
+    """Tests for HealthMonitor caching and status aggregation."""
+
+    @pytest.mark.asyncio
+    async def test_snapshot_is_cached_between_probes(self):
+        """Test repeated status reads run each check once while fresh."""
+        calls = []
+        monitor = HealthMonitor(max_age_seconds=60)
+        monitor.register("database", lambda: calls.append(1))
+
+        for _ in range(5):
+            status = await monitor.get_status()
+
+        assert len(calls) == 1
+        assert status["ready"] is True
+        assert status["checks"]["database"]["status"] == "ok"
+        assert "latency_ms" in status["checks"]["database"]
+
+    @pytest.mark.asyncio
+    async def test_concurrent_probes_share_one_refresh(self):
+        """Test concurrent reads of a stale snapshot trigger a single check."""
+        calls = []
+
+        async def slow_check():
+            calls.append(1)
+            await asyncio.sleep(0.01)
+
+        monitor = HealthMonitor()
+        monitor.register("database", slow_check)
+
+        await asyncio.gather(*(monitor.get_status() for _ in range(10)))
+
+        assert len(calls) == 1
+
+    @pytest.mark.asyncio
+    async def test_critical_failure_is_not_ready(self):
+        """Test a failing critical dependency makes the service not ready."""
+        def broken():
+            raise RuntimeError("connection refused")
+
+        monitor = HealthMonitor()
+        monitor.register("database", broken)
+
+        status = await monitor.get_status()
+
+        assert status["ready"] is False
+        assert status["checks"]["database"]["status"] == "failed"
+        assert status["checks"]["database"]["error"] == "connection refused"
+
+    @pytest.mark.asyncio
+    async def test_non_critical_failure_and_skip_stay_ready(self):
+        """Test optional dependencies are reported without failing readiness."""
+        async def unreachable():
+            raise RuntimeError("HTTP 503")
+
+        async def not_configured():
+            raise SkipCheck("not configured")
+
+        monitor = HealthMonitor()
+        monitor.register("database", lambda: None)
+        monitor.register("openai", unreachable, critical=False)
+        monitor.register("kafka", not_configured, critical=False)
+
+        status = await monitor.get_status()
+
+        assert status["ready"] is True
+        assert status["checks"]["openai"]["status"] == "failed"
+        assert status["checks"]["kafka"]["status"] == "disabled"
+
+    @pytest.mark.asyncio
+    async def test_slow_check_times_out(self):
+        """Test a hanging dependency is reported as failed after the timeout."""
+        async def hang():
+            await asyncio.sleep(10)
+
+        monitor = HealthMonitor(timeout_seconds=0.05)
+        monitor.register("database", hang)
+
+        status = await monitor.get_status()
+
+        assert status["ready"] is False
+        assert "timed out" in status["checks"]["database"]["error"]
+
+    @pytest.mark.asyncio
+    async def test_hung_sync_check_is_not_restarted(self):
+        """Test a sync check stuck in its thread is reported failing, not run again."""
+        release = threading.Event()
+        calls = []
+
+        def hung_database():
+            calls.append(1)
+            release.wait(5)
+
+        monitor = HealthMonitor(timeout_seconds=0.05)
+        monitor.register("database", hung_database)
+        try:
+            await monitor.refresh()
+            await monitor.refresh()
+            status = monitor.snapshot()
+        finally:
+            release.set()
+        await asyncio.sleep(0.05)
+        await monitor.refresh()
+
+        assert len(calls) == 2
+        assert status["ready"] is False
+        assert "still running" in status["checks"]["database"]["error"]
+        assert monitor.snapshot()["checks"]["database"]["status"] == "ok"
+
+    @pytest.mark.asyncio
+    async def test_check_interval_limits_polling(self):
+        """Test a check with an interval is skipped on refreshes within it."""
+        calls = []
+        monitor = HealthMonitor()
+        monitor.register("openai", lambda: calls.append(1), critical=False, interval=60)
+
+        await monitor.refresh()
+        await monitor.refresh()
+
+        assert len(calls) == 1
+        assert monitor.snapshot()["checks"]["openai"]["status"] == "ok"
+
+
+class TestHealthEndpoints:
+    """Tests for /health/live, /health/ready and /health."""
+
+    @pytest.fixture
+    def app(self):
+        from app.main import create_app
+        return create_app("tasks")
+
+    def test_liveness_does_no_io(self, app):
+        """Test the liveness probe never runs dependency checks."""
+        client = TestClient(app)
+
+        with patch.object(app.state.health, 'refresh') as refresh:
+            response = client.get("/health/live")
+
+        assert response.status_code == 200
+        assert response.json() == {"status": "alive"}
+        refresh.assert_not_called()
+
+    def test_readiness_reports_dependencies(self, app):
+        """Test the readiness probe reports per-dependency status and latency."""
+        client = TestClient(app)
+
+        response = client.get("/health/ready")
+
+        assert response.status_code == 200
+        data = response.json()
+        assert data["status"] == "ready"
+        assert data["checks"]["database"]["status"] == "ok"
+        assert data["checks"]["database"]["latency_ms"] >= 0
+        assert "openai" not in data["checks"]
+
+    def test_readiness_fails_when_database_down(self, app):
+        """Test readiness and the legacy /health return 503 without a database."""
+        def database_down():
+            raise RuntimeError("could not connect")
+
+        app.state.health.register("database", database_down)
+        client = TestClient(app)
+
+        ready = client.get("/health/ready")
+        legacy = client.get("/health")
+
+        assert ready.status_code == 503
+        assert ready.json()["status"] == "not_ready"
+        assert legacy.status_code == 503
+        assert legacy.json()["status"] == "unhealthy"
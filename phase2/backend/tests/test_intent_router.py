@@ -0,0 +1,136 @@
+"""
+Intent Router Tests
+
+Tests the command parser and the fast path against the real MCP handlers.
+"""
+
+import pytest
+from unittest.mock import patch
+from sqlmodel import SQLModel, create_engine
+
+from app.services.intent_router import IntentRouter, parse_intent
+
+TOOL_MODULES = ["context", "create_task", "list_tasks", "get_task", "update_task", "complete_task", "delete_task", "search_tasks"]
+
+
+class TestParseIntent:
+    """Tests for parse_intent."""
+
+    @pytest.mark.parametrize("message,name,arguments", [
+        ("show my tasks", "list", {}),
+        ("What's on my list?", "list", {}),
+        ("Add buy milk to my list", "create", {"title": "buy milk"}),
+        ("add to my list: milk", "create", {"title": "milk"}),
+        ("add milk to my shopping list", "create", {"title": "milk"}),
+        ("create a task called 'Pay rent'", "create", {"title": "Pay rent"}),
+        ("please complete task #3, thanks", "complete", {"task_id": 3}),
+        ("mark task 4 as not done", "reopen", {"task_id": 4}),
+        ("delete task 7", "delete", {"task_id": 7}),
+        ("show task 2", "get", {"task_id": 2}),
+        ("search for groceries", "search", {"keyword": "groceries"}),
+    ])
+    def test_simple_commands(self, message, name, arguments):
+        """Test simple commands parse with confidence above the default threshold."""
+        intent = parse_intent(message)
+
+        assert (intent.name, intent.arguments) == (name, arguments)
+        assert intent.confidence >= 0.9
+
+    @pytest.mark.parametrize("message", [
+        "delete it",
+        "complete the first one",
+        "remove buy milk",
+        "what should I do first?",
+        "show my completed tasks",
+    ])
+    def test_context_and_open_questions_do_not_match(self, message):
+        """Test messages that need the model produce no intent."""
+        assert parse_intent(message) is None
+
+    @pytest.mark.parametrize("message", [
+        "add milk and eggs",
+        "add it again",
+        "add 10 minutes to task 3",
+        "remove 7",
+        "add task",
+        "add a task",
+        "add new task",
+        "add a new task",
+        "add my tasks",
+        "add more",
+        "add a reminder",
+        "add some items",
+        "add task 3",
+        "add #3",
+        "add to my list",
+    ])
+    def test_ambiguous_commands_are_below_threshold(self, message):
+        """Test ambiguous or risky matches stay below the default threshold."""
+        assert parse_intent(message).confidence < 0.9
+
+
+class TestIntentRouter:
+    """Tests for IntentRouter.route with the MCP handlers on a test database."""
+
+    @pytest.fixture(autouse=True)
+    def setup_test_db(self, tmp_path):
+        """Point every MCP tool module at a test database."""
+        engine = create_engine(f"sqlite:///{tmp_path / 'intent.db'}")
+        SQLModel.metadata.create_all(engine)
+        patches = [patch(f"app.mcp_tools.{module}.engine", engine) for module in TOOL_MODULES]
+        for p in patches:
+            p.start()
+        yield
+        for p in patches:
+            p.stop()
+
+    @pytest.fixture
+    def router(self):
+        return IntentRouter(min_confidence=0.9)
+
+    @pytest.mark.asyncio
+    async def test_create_complete_and_list(self, router, test_user_id):
+        """Test commands run the handlers and answer from templates."""
+        created = await router.route(test_user_id, "add buy milk")
+        task_id = created["tool_calls"][0]["result"]["id"]
+        completed = await router.route(test_user_id, f"complete task {task_id}")
+        again = await router.route(test_user_id, f"complete task {task_id}")
+        listed = await router.route(test_user_id, "show my tasks")
+
+        assert created["content"] == f"Added 'buy milk' to your tasks (ID: {task_id}) ✓"
+        assert created["tool_calls"][0]["arguments"] == {"user_id": test_user_id, "title": "buy milk"}
+        assert [call["name"] for call in completed["tool_calls"]] == ["get_task", "complete_task"]
+        assert "as complete ✓" in completed["content"]
+        # complete_task toggles: a second "complete" must not reopen the task
+        assert [call["name"] for call in again["tool_calls"]] == ["get_task"]
+        assert "already completed" in again["content"]
+        assert f"1. ✓ buy milk (ID: {task_id}) - completed" in listed["content"]
+
+    @pytest.mark.asyncio
+    async def test_other_users_tasks_are_not_found(self, router, test_user_id):
+        """Test the fast path cannot touch another user's task."""
+        created = await router.route("other-user", "add secret task")
+        task_id = created["tool_calls"][0]["result"]["id"]
+
+        response = await router.route(test_user_id, f"delete task {task_id}")
+
+        assert response["content"].startswith(f"I couldn't find task {task_id}")
+        assert [call["name"] for call in response["tool_calls"]] == ["get_task"]
+
+    @pytest.mark.asyncio
+    async def test_unmatched_and_disabled_fall_back(self, router, test_user_id):
+        """Test unknown messages and a disabled router return None."""
+        assert await router.route(test_user_id, "what should I do first?") is None
+        assert await IntentRouter(enabled=False).route(test_user_id, "show my tasks") is None
+
+    @pytest.mark.asyncio
+    async def test_process_chat_message_skips_agent(self, router, test_user_id):
+        """Test routed messages never construct or call the agent."""
+        from app.services import agent_service
+
+        with patch.object(agent_service, "intent_router", router), \
+             patch.object(agent_service, "get_agent_service") as get_agent:
+            response = await agent_service.process_chat_message(test_user_id, "show my tasks", [])
+
+        get_agent.assert_not_called()
+        assert response["content"].startswith("Your list is empty")
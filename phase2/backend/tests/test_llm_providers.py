@@ -0,0 +1,284 @@
+"""
+LLM Provider Tests
+
+Tests failover, hedging, circuit breaking and connection reuse of the
+LLM router against two local OpenAI-compatible stub servers with
+injected latency.
+"""
+
+import asyncio
+import json
+import socket
+import threading
+import time
+import pytest
+import uvicorn
+from starlette.applications import Starlette
+from starlette.requests import Request
+from starlette.responses import JSONResponse, StreamingResponse
+from starlette.routing import Route
+
+from app.core.circuit_breaker import CircuitBreakerRegistry
+from app.services.llm_providers import (
+    LLMProvider,
+    LLMRouter,
+    LLMUnavailable,
+    OpenAICompatibleProvider,
+)
+
+MESSAGES = [{"role": "user", "content": "What's on my list?"}]
+
+
+class StubLLM:
+    """OpenAI-compatible streaming chat endpoint with injected latency."""
+
+    def __init__(self, name, first_chunk_delay=0.0, status=200, tool_call=None):
+        self.name = name
+        self.first_chunk_delay = first_chunk_delay
+        self.status = status
+        self.tool_call = tool_call
+        self.requests = 0
+        self.client_ports = set()
+        self.app = Starlette(routes=[Route("/v1/chat/completions", self.completions, methods=["POST"])])
+
+    def _chunk(self, delta, finish_reason=None):
+        return "data: " + json.dumps({
+            "id": f"chatcmpl-{self.name}",
+            "object": "chat.completion.chunk",
+            "created": 0,
+            "model": (self.body or {}).get("model", "stub"),
+            "choices": [{"index": 0, "delta": delta, "finish_reason": finish_reason}],
+        }) + "\n\n"
+
+    async def completions(self, request: Request):
+        self.requests += 1
+        self.client_ports.add(request.client.port)
+        self.body = await request.json()
+        if self.status != 200:
+            return JSONResponse({"error": {"message": "stub failure"}}, status_code=self.status)
+
+        delay = self.first_chunk_delay
+
+        async def stream():
+            await asyncio.sleep(delay)
+            yield self._chunk({"role": "assistant", "content": ""})
+            if self.tool_call:
+                yield self._chunk({"tool_calls": [{
+                    "index": 0, "id": "call_1", "type": "function",
+                    "function": {"name": self.tool_call, "arguments": "{}"},
+                }]})
+                yield self._chunk({}, "tool_calls")
+            else:
+                yield self._chunk({"content": f"Hello from {self.name}"})
+                yield self._chunk({}, "stop")
+            yield "data: [DONE]\n\n"
+
+        return StreamingResponse(stream(), media_type="text/event-stream")
+
+
+class StubServer:
+    """Runs a stub on an ephemeral port in a background thread."""
+
+    def __init__(self, stub):
+        self.stub = stub
+        self.socket = socket.socket()
+        self.socket.bind(("127.0.0.1", 0))
+        self.url = f"http://127.0.0.1:{self.socket.getsockname()[1]}/v1"
+        self.server = uvicorn.Server(uvicorn.Config(stub.app, log_level="warning", lifespan="off"))
+        self.thread = threading.Thread(target=self.server.run, kwargs={"sockets": [self.socket]}, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        while not self.server.started:
+            time.sleep(0.01)
+        return self
+
+    def __exit__(self, *exc):
+        self.server.should_exit = True
+        self.thread.join(timeout=5)
+        self.socket.close()
+
+
+@pytest.fixture
+def servers():
+    primary, secondary = StubLLM("primary"), StubLLM("secondary")
+    with StubServer(primary) as first, StubServer(secondary) as second:
+        yield primary, secondary, first.url, second.url
+
+
+def make_router(primary_url, secondary_url, **kwargs):
+    kwargs.setdefault("breakers", CircuitBreakerRegistry(failure_threshold=3, reset_seconds=60))
+    return LLMRouter([
+        OpenAICompatibleProvider("primary", "stub-a", "key-a", primary_url),
+        OpenAICompatibleProvider("secondary", "stub-b", "key-b", secondary_url),
+    ], **kwargs)
+
+
+class TestFailover:
+    """Tests for ordered failover."""
+
+    @pytest.mark.asyncio
+    async def test_first_provider_answers(self, servers):
+        """Test the first provider is used while it is healthy."""
+        primary, secondary, primary_url, secondary_url = servers
+        router = make_router(primary_url, secondary_url)
+
+        completion = await router.create(messages=MESSAGES)
+        await router.aclose()
+
+        assert completion.choices[0].message.content == "Hello from primary"
+        assert primary.body["model"] == "stub-a"
+        assert secondary.requests == 0
+
+    @pytest.mark.asyncio
+    async def test_failed_provider_hands_over(self, servers):
+        """Test a provider error sends the request to the next provider."""
+        primary, secondary, primary_url, secondary_url = servers
+        primary.status = 500
+        router = make_router(primary_url, secondary_url)
+
+        completion = await router.create(messages=MESSAGES)
+        await router.aclose()
+
+        assert completion.choices[0].message.content == "Hello from secondary"
+        assert router.stats()["primary"]["errors"] == 1
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_skips_provider(self, servers):
+        """Test a provider that keeps failing is skipped until its breaker resets."""
+        primary, secondary, primary_url, secondary_url = servers
+        primary.status = 503
+        router = make_router(primary_url, secondary_url)
+
+        for _ in range(5):
+            await router.create(messages=MESSAGES)
+        await router.aclose()
+
+        assert primary.requests == 3
+        assert secondary.requests == 5
+        assert router.stats()["primary"]["breaker"] == "open"
+
+    @pytest.mark.asyncio
+    async def test_all_providers_failing(self, servers):
+        """Test LLMUnavailable is raised when no provider answers."""
+        primary, secondary, primary_url, secondary_url = servers
+        primary.status = secondary.status = 500
+        router = make_router(primary_url, secondary_url)
+
+        with pytest.raises(LLMUnavailable):
+            await router.create(messages=MESSAGES)
+        await router.aclose()
+
+    @pytest.mark.asyncio
+    async def test_streamed_tool_calls_are_assembled(self, servers):
+        """Test tool calls arrive as in a non-streamed ChatCompletion."""
+        primary, secondary, primary_url, secondary_url = servers
+        primary.tool_call = "list_tasks"
+        router = make_router(primary_url, secondary_url)
+        tools = [{"type": "function", "function": {"name": "list_tasks", "parameters": {"type": "object", "properties": {}}}}]
+
+        completion = await router.create(messages=MESSAGES, tools=tools)
+        await router.aclose()
+
+        call = completion.choices[0].message.tool_calls[0]
+        assert (call.id, call.function.name, call.function.arguments) == ("call_1", "list_tasks", "{}")
+
+    @pytest.mark.asyncio
+    async def test_connections_are_reused(self, servers):
+        """Test sequential requests share one keep-alive connection."""
+        primary, secondary, primary_url, secondary_url = servers
+        router = make_router(primary_url, secondary_url)
+
+        for _ in range(5):
+            await router.create(messages=MESSAGES)
+        await router.aclose()
+
+        assert primary.requests == 5
+        assert len(primary.client_ports) == 1
+
+
+class TestHedging:
+    """Tests for hedged requests."""
+
+    @pytest.mark.asyncio
+    async def test_slow_provider_is_hedged(self, servers):
+        """Test a provider slower than its hedge delay loses to the next provider."""
+        primary, secondary, primary_url, secondary_url = servers
+        primary.first_chunk_delay = 2.0
+        router = make_router(primary_url, secondary_url, hedging=True, hedge_delay_seconds=0.1)
+
+        start = time.perf_counter()
+        completion = await router.create(messages=MESSAGES)
+        elapsed = time.perf_counter() - start
+        await router.aclose()
+
+        assert completion.choices[0].message.content == "Hello from secondary"
+        assert elapsed < 1.0
+        assert primary.requests == 1
+        assert router.stats()["primary"]["breaker"] == "closed"
+
+    @pytest.mark.asyncio
+    async def test_fast_provider_is_not_hedged(self, servers):
+        """Test no second request is sent when the first chunk arrives in time."""
+        primary, secondary, primary_url, secondary_url = servers
+        primary.first_chunk_delay = 0.01
+        router = make_router(primary_url, secondary_url, hedging=True, hedge_delay_seconds=1.0)
+
+        completion = await router.create(messages=MESSAGES)
+        await router.aclose()
+
+        assert completion.choices[0].message.content == "Hello from primary"
+        assert secondary.requests == 0
+
+    @pytest.mark.asyncio
+    async def test_hedged_losers_keep_the_delay_honest(self):
+        """Test slow requests that lose to a hedge still count towards the hedge delay."""
+        from collections import deque
+        from itertools import cycle
+        from app.services.fake_llm import FakeLLMProvider
+
+        class Scheduled(FakeLLMProvider):
+            def __init__(self, name, delays):
+                super().__init__(first_chunk_seconds=0, tokens_per_second=0)
+                self.name = name
+                self.delays = cycle(delays)
+
+            async def _create_stream(self, **kwargs):
+                self.first_chunk_seconds = next(self.delays)
+                return await super()._create_stream(**kwargs)
+
+        # One request in ten takes 30-100 ms: the p95 is about 70 ms
+        delays = []
+        for slow in (0.03, 0.04, 0.05, 0.06, 0.07, 0.08, 0.09, 0.10):
+            delays += [0.005] * 9 + [slow]
+        primary = Scheduled("primary", delays)
+        primary.latencies = deque(maxlen=40)
+        hedge = Scheduled("hedge", [0.01])
+        router = LLMRouter([primary, hedge], hedging=True, hedge_delay_seconds=1.0, hedge_min_samples=20)
+        slots = asyncio.Semaphore(10)
+
+        async def request():
+            async with slots:
+                await router.create(messages=MESSAGES)
+
+        await asyncio.gather(*(request() for _ in range(160)))
+        hedged_before = hedge.requests
+        await asyncio.gather(*(request() for _ in range(160)))
+
+        # Without the cancelled losers the delay drifts down to the fast
+        # requests' latency and hedges well over 5% of requests
+        assert router.hedge_delay(primary) >= 0.06
+        assert hedge.requests - hedged_before <= 10
+
+    def test_hedge_delay_follows_recent_latency(self):
+        """Test the hedge delay is the configured percentile once enough samples exist."""
+        provider = LLMProvider("primary", "stub-a")
+        router = LLMRouter([provider], hedge_delay_seconds=2.0, hedge_min_samples=20)
+
+        provider.latencies.extend([0.2] * 10)
+        assert router.hedge_delay(provider) == 2.0
+
+        provider.latencies.extend([0.2] * 9 + [0.9])
+        assert router.hedge_delay(provider) == 0.9
+        provider.latencies.extend([0.2] * 20)
+        assert router.hedge_delay(provider) == 0.2
@@ -0,0 +1,143 @@
+"""
+Event Loop Monitor Tests
+
+Tests lag measurement, capture of blocking call stacks and their
+deduplication into the blocking report.
+"""
+
+import asyncio
+import time
+import traceback
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+
+from app.core.auth import get_current_user_id
+from app.core.config import settings
+from app.core.loop_monitor import LOOP_LAG_SECONDS, BlockingReport, LoopMonitor, offender_key
+
+
+def block_the_loop(seconds):
+    time.sleep(seconds)
+
+
+def block_elsewhere(seconds):
+    time.sleep(seconds)
+
+
+async def run_with_monitor(monitor, *blockers):
+    await monitor.start()
+    await asyncio.sleep(0.05)
+    for blocker in blockers:
+        blocker(0.15)
+        await asyncio.sleep(0.05)
+    await monitor.stop()
+
+
+class TestLoopMonitor:
+    """Tests for LoopMonitor."""
+
+    @pytest.mark.asyncio
+    async def test_lag_is_measured(self):
+        """Test a blocking call shows up as lag and in the metric."""
+        monitor = LoopMonitor(interval_seconds=0.01, threshold_seconds=0.05)
+        observed = LOOP_LAG_SECONDS.count()
+
+        await run_with_monitor(monitor, block_the_loop)
+
+        snapshot = monitor.snapshot()
+        assert snapshot["lag_max_ms"] >= 100
+        assert snapshot["offenders"] == []
+        assert LOOP_LAG_SECONDS.count() > observed
+
+    @pytest.mark.asyncio
+    async def test_blocking_stack_is_captured(self):
+        """Test debug mode reports the call site that blocked the loop."""
+        monitor = LoopMonitor(interval_seconds=0.01, threshold_seconds=0.05, capture_stacks=True)
+
+        await run_with_monitor(monitor, block_the_loop)
+
+        [offender] = monitor.snapshot()["offenders"]
+        assert "in block_the_loop" in offender["call_site"]
+        assert offender["count"] == 1
+        assert offender["max_seconds"] >= 0.1
+        assert any("run_with_monitor" in line for line in offender["stack"])
+
+    @pytest.mark.asyncio
+    async def test_offenders_are_deduplicated(self):
+        """Test repeated blocks at one call site are counted, not listed twice."""
+        monitor = LoopMonitor(interval_seconds=0.01, threshold_seconds=0.05, capture_stacks=True)
+
+        await run_with_monitor(monitor, block_the_loop, block_elsewhere, block_the_loop)
+
+        offenders = {o["call_site"].rsplit(" in ", 1)[1]: o for o in monitor.snapshot()["offenders"]}
+        assert offenders["block_the_loop"]["count"] == 2
+        assert offenders["block_elsewhere"]["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_short_calls_are_not_reported(self):
+        """Test calls below the threshold are neither counted nor captured."""
+        monitor = LoopMonitor(interval_seconds=0.01, threshold_seconds=0.5, capture_stacks=True)
+
+        await run_with_monitor(monitor, block_the_loop)
+
+        assert monitor.snapshot()["offenders"] == []
+
+
+class TestBlockingReport:
+    """Tests for offender keys and the report."""
+
+    def test_call_site_skips_library_frames(self):
+        """Test the call site is the innermost frame outside the stdlib."""
+        stack = traceback.extract_stack()
+        library = traceback.FrameSummary(asyncio.__file__, 1, "library_call")
+        call_site, blocked_in = offender_key(stack + [library])
+
+        assert call_site.endswith(f"in {stack[-1].name}")
+        assert blocked_in.endswith("in library_call")
+
+    def test_report_is_bounded(self):
+        """Test call sites beyond max_offenders are counted as dropped."""
+        report = BlockingReport(max_offenders=1)
+        first = [traceback.FrameSummary(__file__, 1, "first")]
+        second = [traceback.FrameSummary(__file__, 2, "second")]
+
+        assert report.record(first, 0.2)
+        assert not report.record(first, 0.3)
+        assert not report.record(second, 0.2)
+
+        [offender] = report.offenders()
+        assert (offender["count"], offender["total_seconds"], offender["max_seconds"]) == (2, 0.5, 0.3)
+        assert report.dropped == 1
+
+
+class TestEventLoopEndpoint:
+    """Tests for GET /diagnostics/event-loop."""
+
+    @pytest.fixture
+    def app(self):
+        from app.main import create_app
+
+        app = create_app("tasks")
+        app.dependency_overrides[get_current_user_id] = lambda: "admin-1"
+        with patch.object(settings, "ADMIN_USER_IDS", ["admin-1"]):
+            yield app
+
+    def test_snapshot_endpoint(self, app):
+        """Test the endpoint reports the running monitor of the app."""
+        with TestClient(app) as client:
+            time.sleep(0.3)
+            data = client.get("/diagnostics/event-loop").json()
+
+        assert data["running"] is True
+        assert data["samples"] > 0
+        assert "offenders" in data
+
+    def test_snapshot_requires_admin(self, app):
+        """Test the stacks are not served to other users or anonymously."""
+        app.dependency_overrides[get_current_user_id] = lambda: "user-2"
+        assert TestClient(app).get("/diagnostics/event-loop").status_code == 403
+
+        app.dependency_overrides.clear()
+        # HTTPBearer answers a missing Authorization header with 403
+        assert TestClient(app).get("/diagnostics/event-loop").status_code == 403
@@ -0,0 +1,123 @@
+"""
+MCP Protocol Server Tests
+
+Tests the task tools served over MCP: tool listing, user injection,
+input validation, concurrent calls and admission control.
+"""
+
+import asyncio
+import json
+import pytest
+from unittest.mock import patch
+from mcp.shared.memory import create_connected_server_and_client_session
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.mcp_protocol import ToolCallLimiter, ToolServerBusy, build_server, create_http_app
+from app.models.task import Task
+
+USER = "user-123"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'mcp.db'}")
+    SQLModel.metadata.create_all(engine)
+    with patch("app.mcp_tools.context.engine", engine):
+        yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def limiter():
+    return ToolCallLimiter(max_pending=64)
+
+
+def tasks_of(engine, user_id=USER):
+    with Session(engine) as session:
+        return session.exec(select(Task).where(Task.user_id == user_id)).all()
+
+
+def payload(result):
+    return json.loads(result.content[0].text)
+
+
+class TestMCPProtocolServer:
+    """Tests for the MCP server over in-memory streams."""
+
+    @pytest.mark.asyncio
+    async def test_tools_are_listed_without_user_id(self, limiter):
+        """Test every tool is listed and user_id is not a client argument."""
+        async with create_connected_server_and_client_session(build_server(limiter, user_id=USER)) as client:
+            tools = (await client.list_tools()).tools
+
+        assert len(tools) == 7
+        for tool in tools:
+            assert "user_id" not in tool.inputSchema["properties"]
+            assert "user_id" not in tool.inputSchema["required"]
+
+    @pytest.mark.asyncio
+    async def test_calls_run_as_the_server_user(self, engine, limiter):
+        """Test a client-supplied user_id is replaced by the served user."""
+        async with create_connected_server_and_client_session(build_server(limiter, user_id=USER)) as client:
+            result = await client.call_tool("create_task", {"title": "Buy milk", "user_id": "someone-else"})
+
+        assert not result.isError
+        assert payload(result)["success"]
+        assert [task.title for task in tasks_of(engine)] == ["Buy milk"]
+        assert tasks_of(engine, "someone-else") == []
+
+    @pytest.mark.asyncio
+    async def test_invalid_arguments_are_rejected(self, engine, limiter):
+        """Test arguments are validated against the tool's input schema."""
+        async with create_connected_server_and_client_session(build_server(limiter, user_id=USER)) as client:
+            result = await client.call_tool("get_task", {})
+
+        assert result.isError
+        assert "task_id" in result.content[0].text
+
+    @pytest.mark.asyncio
+    async def test_concurrent_calls(self, engine, limiter):
+        """Test many concurrent calls through one session all succeed."""
+        async with create_connected_server_and_client_session(build_server(limiter, user_id=USER)) as client:
+            created = await asyncio.gather(*(
+                client.call_tool("create_task", {"title": f"Task {i}"}) for i in range(20)
+            ))
+            listed = await asyncio.gather(*(client.call_tool("list_tasks", {}) for _ in range(20)))
+
+        assert all(payload(result)["success"] for result in created)
+        assert {payload(result)["count"] for result in listed} == {20}
+
+
+class TestToolCallLimiter:
+    """Tests for admission control."""
+
+    @pytest.mark.asyncio
+    async def test_calls_beyond_max_pending_are_rejected(self):
+        """Test calls beyond max_pending are rejected, not queued."""
+        async def slow_tool(tool_name, arguments, context=None):
+            await asyncio.sleep(0.05)
+            return {"success": True}
+
+        limiter = ToolCallLimiter(max_pending=2)
+        with patch("app.mcp_protocol.mcp_server.execute_tool", side_effect=slow_tool):
+            results = await asyncio.gather(*(
+                limiter.call("list_tasks", {"user_id": USER}) for _ in range(3)
+            ), return_exceptions=True)
+
+        assert sum(isinstance(result, ToolServerBusy) for result in results) == 1
+        assert limiter.pending == 0
+
+
+class TestMCPHTTPTransport:
+    """Tests for authentication on the streamable-HTTP transport."""
+
+    def test_requests_without_token_are_rejected(self, limiter):
+        """Test /mcp requires the API's bearer token."""
+        from fastapi.testclient import TestClient
+
+        with TestClient(create_http_app(limiter)) as client:
+            response = client.post("/mcp", json={"jsonrpc": "2.0", "id": 1, "method": "tools/list"})
+            invalid = client.post("/mcp", json={}, headers={"Authorization": "Bearer not-a-token"})
+
+        assert response.status_code == 401
+        assert invalid.status_code == 401
@@ -0,0 +1,195 @@
+"""
+Sampling Profiler Tests
+
+Tests stack sampling and collapsing, the admin-only worker profile
+endpoint and per-request profiles requested with the X-Profile header.
+"""
+
+import sys
+import threading
+import time
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core import profiler
+from app.core.auth import get_current_user_id
+from app.core.config import settings
+from app.core.database import get_read_session
+from app.core.profiler import StackSampler, collapse, frame_label
+
+ADMIN = "admin-1"
+
+
+def spin(seconds):
+    deadline = time.monotonic() + seconds
+    while time.monotonic() < deadline:
+        pass
+
+
+def spin_in_thread(seconds):
+    thread = threading.Thread(target=spin, args=(seconds,), name="spinner")
+    thread.start()
+    return thread
+
+
+class TestCollapse:
+    """Tests for collapsed stack formatting."""
+
+    def test_frame_label(self):
+        """Test labels carry the qualified name and a sys.path-relative location."""
+        label = frame_label(TestCollapse.test_frame_label.__code__)
+
+        assert label.startswith("TestCollapse.test_frame_label (tests/test_profiler.py:")
+
+    def test_stack_within_a_frame(self):
+        """Test within keeps only that frame and the frames it called."""
+        def outer():
+            return inner(sys._getframe())
+
+        def inner(within):
+            return collapse(sys._getframe(), "root", within)
+
+        stack = outer()
+
+        assert [part.split(" ")[0] for part in stack.split(";")] == [
+            "root",
+            "TestCollapse.test_stack_within_a_frame.<locals>.outer",
+            "TestCollapse.test_stack_within_a_frame.<locals>.inner",
+        ]
+
+    def test_frame_not_on_stack(self):
+        """Test stacks without the within frame are dropped."""
+        def elsewhere():
+            return sys._getframe()
+
+        assert collapse(sys._getframe(), "root", elsewhere()) is None
+
+
+class TestStackSampler:
+    """Tests for StackSampler."""
+
+    def test_busy_thread_is_sampled(self):
+        """Test a spinning thread shows up under its thread name."""
+        thread = spin_in_thread(0.3)
+        sampler = StackSampler(hz=200).run(0.2)
+        thread.join()
+
+        spinning = sum(count for stack, count in sampler.stacks.items() if stack.startswith("spinner;") and "spin (" in stack)
+        assert spinning >= 10
+        assert sampler.samples >= 20
+        for line in sampler.collapsed().splitlines():
+            stack, count = line.rsplit(" ", 1)
+            assert int(count) > 0 and ";" in stack
+
+    def test_idle_threads_are_skipped(self):
+        """Test threads waiting for work are left out unless requested."""
+        stop = threading.Event()
+        thread = threading.Thread(target=stop.wait, name="waiter")
+        thread.start()
+        try:
+            busy = StackSampler(hz=200).run(0.05)
+            everything = StackSampler(hz=200, include_idle=True).run(0.05)
+        finally:
+            stop.set()
+            thread.join()
+
+        assert not any(stack.startswith("waiter;") for stack in busy.stacks)
+        assert any(stack.startswith("waiter;") for stack in everything.stacks)
+
+
+@pytest.fixture
+def client(tmp_path):
+    from app.main import create_app
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'profile.db'}")
+    SQLModel.metadata.create_all(engine)
+    users = {"current": ADMIN}
+
+    def override_session():
+        with Session(engine) as session:
+            yield session
+
+    app = create_app("tasks")
+    app.dependency_overrides[get_read_session] = override_session
+    app.dependency_overrides[get_current_user_id] = lambda: users["current"]
+    with patch.object(settings, "ADMIN_USER_IDS", [ADMIN]):
+        yield TestClient(app), users
+    engine.dispose()
+
+
+class TestWorkerProfile:
+    """Tests for GET /diagnostics/profile."""
+
+    def test_admin_gets_collapsed_stacks(self, client):
+        """Test the profile covers the worker's busy threads."""
+        client, users = client
+        thread = spin_in_thread(0.4)
+
+        response = client.get("/diagnostics/profile", params={"seconds": 0.2, "hz": 200})
+        thread.join()
+
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("text/plain")
+        assert any(line.startswith("spinner;") for line in response.text.splitlines())
+        assert int(response.headers["x-profile-samples"]) > 0
+
+    def test_non_admin_is_forbidden(self, client):
+        client, users = client
+        users["current"] = "user-2"
+
+        assert client.get("/diagnostics/profile", params={"seconds": 0.1}).status_code == 403
+
+    def test_duration_is_capped(self, client):
+        client, users = client
+
+        response = client.get("/diagnostics/profile", params={"seconds": settings.PROFILER_MAX_SECONDS + 1})
+
+        assert response.status_code == 422
+
+    def test_one_profile_at_a_time(self, client):
+        """Test a second profile on the same worker is refused."""
+        client, users = client
+
+        with profiler._worker_profile_lock:
+            response = client.get("/diagnostics/profile", params={"seconds": 0.1})
+
+        assert response.status_code == 409
+
+
+class TestRequestProfile:
+    """Tests for the X-Profile request header."""
+
+    def slow_rows(self, *args):
+        spin(0.1)
+        return []
+
+    def test_profiled_request(self, client):
+        """Test an admin's request is profiled on its own and can be fetched."""
+        client, users = client
+
+        with patch("app.services.task_service.TaskService.get_all_task_rows", self.slow_rows):
+            response = client.get("/tasks/", headers={"X-Profile": "1"})
+        profile = client.get(f"/diagnostics/profile/requests/{response.headers['x-profile-id']}")
+
+        assert response.status_code == 200
+        assert profile.status_code == 200
+        lines = profile.text.splitlines()
+        assert lines and all(line.startswith("GET /tasks/;get_all_tasks (app/api/tasks.py:") for line in lines)
+        assert any("spin (" in line for line in lines)
+
+    def test_header_ignored_for_other_users(self, client):
+        """Test non-admins cannot trigger profiling."""
+        client, users = client
+        users["current"] = "user-2"
+
+        response = client.get("/tasks/", headers={"X-Profile": "1"})
+
+        assert response.status_code == 200
+        assert "x-profile-id" not in response.headers
+
+    def test_unknown_profile(self, client):
+        client, users = client
+
+        assert client.get("/diagnostics/profile/requests/unknown").status_code == 404
@@ -0,0 +1,114 @@
+"""
+Read Replica Routing Tests
+
+Uses two SQLite databases as primary and replica to verify that read-only
+paths go to the replica, and that a user's reads stay on the primary for
+a short window after they write.
+"""
+
+import time
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+
+class TestReadRouting:
+    """Tests for read_bind and read-your-writes tracking."""
+
+    @pytest.fixture(autouse=True)
+    def setup_databases(self, tmp_path):
+        """Create primary and replica databases and patch them in."""
+        from app.core.database import ReadYourWritesTracker
+        from app.models.task import Task
+
+        self.primary = create_engine(f"sqlite:///{tmp_path / 'primary.db'}")
+        self.replica = create_engine(f"sqlite:///{tmp_path / 'replica.db'}")
+        SQLModel.metadata.create_all(self.primary)
+        SQLModel.metadata.create_all(self.replica)
+
+        # The replica holds a marker row so tests can tell where reads went
+        with Session(self.replica) as session:
+            session.add(Task(user_id="user-1", title="from replica"))
+            session.commit()
+
+        self.tracker = ReadYourWritesTracker(window_seconds=60)
+        with patch('app.core.database.engine', self.primary), \
+             patch('app.core.database.read_engine', self.replica), \
+             patch('app.core.database.read_your_writes', self.tracker):
+            yield
+
+    def test_no_replica_uses_primary(self):
+        """Test reads go to the primary when DATABASE_READ_URL is not set."""
+        from app.core.database import read_bind
+
+        with patch('app.core.database.read_engine', None):
+            assert read_bind("user-1") is self.primary
+
+    def test_reads_go_to_replica(self):
+        """Test a user without recent writes reads from the replica."""
+        from app.core.database import read_bind
+
+        assert read_bind("user-1") is self.replica
+
+    def test_write_pins_user_to_primary(self):
+        """Test committing through a service pins only that user to the primary."""
+        from app.core.database import read_bind
+        from app.services.task_service import TaskService
+
+        with Session(self.primary) as session:
+            TaskService(session, "user-1").create_task("Buy milk")
+
+        assert read_bind("user-1") is self.primary
+        assert read_bind("user-2") is self.replica
+
+    def test_read_only_session_does_not_pin(self):
+        """Test commits without changes do not count as writes."""
+        from app.core.database import read_bind
+        from app.services.task_service import TaskService
+
+        with Session(self.primary) as session:
+            TaskService(session, "user-1").get_all_tasks()
+            session.commit()
+
+        assert read_bind("user-1") is self.replica
+
+    def test_window_expires(self):
+        """Test the user returns to the replica after the window."""
+        from app.core.database import ReadYourWritesTracker
+
+        tracker = ReadYourWritesTracker(window_seconds=0.05)
+        tracker.record_write("user-1")
+        assert tracker.recently_wrote("user-1") is True
+
+        time.sleep(0.06)
+        assert tracker.recently_wrote("user-1") is False
+
+    def test_task_endpoints_read_your_writes(self):
+        """Test GET /tasks/ reads the replica until the user creates a task."""
+        from app.main import app
+        from app.core.auth import get_current_user_id
+
+        app.dependency_overrides[get_current_user_id] = lambda: "user-1"
+        try:
+            client = TestClient(app)
+
+            titles = [t["title"] for t in client.get("/tasks/").json()]
+            assert titles == ["from replica"]
+
+            assert client.post("/tasks/", json={"title": "Buy milk"}).status_code == 201
+
+            titles = [t["title"] for t in client.get("/tasks/").json()]
+            assert titles == ["Buy milk"]
+        finally:
+            app.dependency_overrides.clear()
+
+    @pytest.mark.asyncio
+    async def test_mcp_list_tasks_uses_replica(self):
+        """Test the list_tasks tool reads through read_bind."""
+        from app.mcp_tools.list_tasks import handle_list_tasks
+
+        with patch('app.mcp_tools.list_tasks.engine', self.primary):
+            result = await handle_list_tasks({"user_id": "user-1"})
+
+        assert [t["title"] for t in result["tasks"]] == ["from replica"]
@@ -0,0 +1,124 @@
+"""
+JSON Serialization Tests
+
+Tests the fast JSON encoder and the row-level read paths used by the
+large list endpoints.
+"""
+
+import json
+import pytest
+from datetime import datetime
+from fastapi.encoders import jsonable_encoder
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.responses import FastJSONResponse, dumps, dumps_str, loads
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.models.task import Task
+from app.services.message_service import MessageService
+from app.services.task_service import TaskService
+
+
+class TestEncoder:
+    """Tests for dumps/loads and FastJSONResponse."""
+
+    def test_matches_default_encoding(self):
+        """Test output decodes to what jsonable_encoder + json would produce."""
+        value = {
+            "id": 1,
+            "title": "Café ✓",
+            "created_at": datetime(2025, 1, 2, 3, 4, 5, 678901),
+            "tool_calls": [{"name": "list_tasks", "arguments": {"user_id": "u"}}],
+            "missing": None,
+        }
+
+        assert loads(dumps(value)) == json.loads(json.dumps(jsonable_encoder(value)))
+
+    def test_encodes_pydantic_models(self):
+        """Test models nested in plain data are serialized via model_dump."""
+        task = Task(id=1, user_id="u", title="Buy milk", created_at=datetime(2025, 1, 1), updated_at=datetime(2025, 1, 1))
+
+        assert loads(dumps_str({"task": task}))["task"]["title"] == "Buy milk"
+
+    def test_response_renders_bytes(self):
+        """Test FastJSONResponse renders compact JSON with the JSON media type."""
+        response = FastJSONResponse(content={"a": [1, 2]})
+
+        assert response.body == b'{"a":[1,2]}'
+        assert response.media_type == "application/json"
+
+
+class TestRowReadPath:
+    """Tests that row dicts match the model-based responses."""
+
+    @pytest.fixture
+    def engine(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'rows.db'}")
+        SQLModel.metadata.create_all(engine)
+        return engine
+
+    def test_task_rows_match_models(self, engine, test_user_id):
+        """Test get_all_task_rows returns the same data as get_all_tasks."""
+        with Session(engine) as session:
+            session.add(Task(user_id=test_user_id, title="Buy milk", description="2 liters"))
+            session.add(Task(user_id="other-user", title="Not mine"))
+            session.commit()
+
+            service = TaskService(session, test_user_id)
+            rows = service.get_all_task_rows()
+            models = service.get_all_tasks()
+
+        assert rows == [task.model_dump() for task in models]
+
+    def test_message_rows_are_ordered(self, engine):
+        """Test message rows come back oldest first with tool_calls decoded."""
+        with Session(engine) as session:
+            conversation = Conversation(user_id="u", title="t")
+            session.add(conversation)
+            session.flush()
+            session.add(Message(conversation_id=conversation.id, role="assistant", content="b",
+                                tool_calls=[{"name": "list_tasks"}], created_at=datetime(2025, 1, 2)))
+            session.add(Message(conversation_id=conversation.id, role="user", content="a",
+                                created_at=datetime(2025, 1, 1)))
+            session.commit()
+
+            rows = MessageService(session).get_conversation_message_rows(conversation.id)
+
+        assert [row["content"] for row in rows] == ["a", "b"]
+        assert rows[1]["tool_calls"] == [{"name": "list_tasks"}]
+        assert set(rows[0]) == {"id", "role", "content", "tool_calls", "created_at"}
+
+    def test_list_endpoints_serialize_rows(self, engine, test_user_id):
+        """Test GET /tasks/ and GET /api/conversations/{id} keep their JSON shape."""
+        from app.main import create_app
+        from app.core.auth import get_current_user_id
+        from app.core.database import get_read_session
+
+        with Session(engine) as session:
+            session.add(Task(user_id=test_user_id, title="Buy milk", created_at=datetime(2025, 1, 1, 12, 30)))
+            conversation = Conversation(user_id=test_user_id, title="Chat")
+            session.add(conversation)
+            session.flush()
+            session.add(Message(conversation_id=conversation.id, role="user", content="hi"))
+            session.commit()
+            conversation_id = conversation.id
+
+        def override_session():
+            with Session(engine) as session:
+                yield session
+
+        app = create_app("full")
+        app.dependency_overrides[get_read_session] = override_session
+        app.dependency_overrides[get_current_user_id] = lambda: test_user_id
+        client = TestClient(app)
+
+        tasks = client.get("/tasks/").json()
+        conversation = client.get(f"/api/conversations/{conversation_id}").json()
+
+        assert tasks[0]["title"] == "Buy milk"
+        assert tasks[0]["created_at"] == "2025-01-01T12:30:00"
+        assert set(tasks[0]) == set(Task.model_fields)
+        assert conversation["total"] == 1
+        assert conversation["messages"][0]["content"] == "hi"
+        assert conversation["messages"][0]["tool_calls"] is None
@@ -0,0 +1,157 @@
+"""
+Message Retention Tests
+
+Tests archiving idle conversations, reading history across the hot and
+archive tiers, and hard-delete retention.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from unittest.mock import patch
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.models.conversation import Conversation
+from app.models.message import Message
+from app.models.message_archive import MessageArchive
+from app.services.message_archive import decode_messages, encode_messages
+from app.services.message_service import MessageService
+from app.services.retention_service import (
+    archive_conversation,
+    archive_idle_conversations,
+    delete_expired_conversations,
+)
+
+
+class TestMessageArchiveCodec:
+    """Tests for encode_messages/decode_messages."""
+
+    @pytest.mark.parametrize("codec", ["zstd", "gzip"])
+    def test_round_trip(self, codec):
+        """Test rows decode to the same values, datetimes included."""
+        rows = [
+            {"id": 1, "role": "user", "content": "hi", "tool_calls": None,
+             "created_at": datetime(2025, 1, 1, 12, 0, 0, 123456)},
+            {"id": 2, "role": "assistant", "content": "done", "tool_calls": [{"name": "add_task"}],
+             "created_at": datetime(2025, 1, 1, 12, 0, 1)},
+        ]
+
+        used, data = encode_messages(rows, codec)
+
+        assert used == codec
+        assert decode_messages(used, data) == rows
+
+
+class TestRetention:
+    """Tests for the retention job."""
+
+    @pytest.fixture(autouse=True)
+    def setup_test_db(self, tmp_path):
+        """Set up a file database shared by the job's own sessions."""
+        self.test_engine = create_engine(f"sqlite:///{tmp_path / 'retention.db'}")
+        SQLModel.metadata.create_all(self.test_engine)
+        with patch('app.services.retention_service.engine', self.test_engine), \
+                patch('app.services.conversation_service.engine', self.test_engine):
+            yield
+
+    @pytest.fixture
+    def test_session(self):
+        """Create a test session."""
+        with Session(self.test_engine) as session:
+            yield session
+
+    def _conversation(self, session, idle_days, count):
+        """Add a conversation last updated idle_days ago with count messages."""
+        updated = datetime.utcnow() - timedelta(days=idle_days)
+        conversation = Conversation(user_id="user-123", title="Chat", created_at=updated, updated_at=updated)
+        session.add(conversation)
+        session.flush()
+        conversation_id = conversation.id
+        for i in range(count):
+            session.add(Message(
+                conversation_id=conversation_id,
+                role="user" if i % 2 == 0 else "assistant",
+                content=f"Message {i}",
+                tool_calls=None if i % 2 == 0 else [{"name": "list_tasks"}],
+                created_at=updated - timedelta(minutes=count - i)
+            ))
+        session.commit()
+        return conversation_id
+
+    def test_idle_conversations_move_to_archive(self, test_session):
+        """Test only idle conversations are archived and reads are unchanged."""
+        idle_id = self._conversation(test_session, 40, 6)
+        active_id = self._conversation(test_session, 1, 3)
+        service = MessageService(test_session)
+        before = service.get_conversation_message_rows(idle_id)
+
+        conversations, messages = archive_idle_conversations(idle_days=30)
+
+        test_session.expire_all()
+        hot = test_session.exec(select(Message.conversation_id)).all()
+        assert (conversations, messages) == (1, 6)
+        assert set(hot) == {active_id}
+        assert service.get_conversation_message_rows(idle_id) == before
+        assert [m.content for m in service.get_conversation_messages(idle_id)] == [r["content"] for r in before]
+        assert service.get_message_count(idle_id) == 6
+
+    def test_history_spans_both_tiers(self, test_session):
+        """Test new messages after archiving stay hot and pages cross into the archive."""
+        conversation_id = self._conversation(test_session, 40, 5)
+        archive_conversation(test_session, conversation_id)
+        test_session.add(Message(conversation_id=conversation_id, role="user", content="Later",
+                                 created_at=datetime.utcnow()))
+        test_session.commit()
+        service = MessageService(test_session)
+
+        seen = []
+        before = None
+        while True:
+            rows, has_more = service.get_message_page(conversation_id, limit=2, before=before)
+            seen.extend(row["content"] for row in rows)
+            if not has_more:
+                break
+            before = rows[-1]["id"]
+
+        assert seen == ["Later"] + [f"Message {i}" for i in reversed(range(5))]
+        assert service.get_message_count(conversation_id) == 6
+        assert [row["content"] for row in service.get_conversation_history(conversation_id, max_messages=2)] == \
+            ["Message 4", "Later"]
+
+    def test_rearchiving_merges_into_one_row(self, test_session):
+        """Test archiving again appends to the existing archive row."""
+        conversation_id = self._conversation(test_session, 40, 4)
+        archive_conversation(test_session, conversation_id)
+        test_session.add(Message(conversation_id=conversation_id, role="user", content="Later"))
+        test_session.commit()
+
+        assert archive_conversation(test_session, conversation_id) == 1
+        archives = test_session.exec(select(MessageArchive)).all()
+        assert len(archives) == 1
+        assert archives[0].message_count == 5
+        assert archive_conversation(test_session, conversation_id) == 0
+
+    def test_expired_conversations_are_deleted(self, test_session):
+        """Test retention deletes old conversations with their archives."""
+        expired_id = self._conversation(test_session, 400, 3)
+        archive_conversation(test_session, expired_id)
+        kept_id = self._conversation(test_session, 10, 2)
+
+        assert delete_expired_conversations(retention_days=0) == 0
+        assert delete_expired_conversations(retention_days=365, batch_size=1) == 1
+
+        test_session.expire_all()
+        assert test_session.get(Conversation, expired_id) is None
+        assert test_session.get(Conversation, kept_id) is not None
+        assert test_session.exec(select(MessageArchive)).all() == []
+
+    def test_failed_purge_stops_the_pass(self, test_session):
+        """Test a batch that cannot be deleted is not retried in a loop."""
+        expired_id = self._conversation(test_session, 400, 3)
+
+        with patch('app.services.conversation_service.delete_tool_result_refs', side_effect=RuntimeError("locked")) as failing:
+            assert delete_expired_conversations(retention_days=365, batch_size=1) == 0
+
+        assert failing.call_count == 1
+        test_session.expire_all()
+        assert test_session.get(Conversation, expired_id) is not None
+        assert delete_expired_conversations(retention_days=365) == 1
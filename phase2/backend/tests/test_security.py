@@ -0,0 +1,249 @@
+"""
+Security Tests
+
+Tests the verified-token cache and asymmetric (RS256) verification with a
+public key or a cached JWKS.
+"""
+
+import asyncio
+import time
+import httpx
+import pytest
+from unittest.mock import patch
+from cryptography.hazmat.primitives import serialization
+from cryptography.hazmat.primitives.asymmetric import rsa
+from jose import jwk, jwt
+
+
+def _rsa_keypair():
+    """Generate an RSA key pair as PEM strings."""
+    key = rsa.generate_private_key(public_exponent=65537, key_size=2048)
+    private_pem = key.private_bytes(
+        serialization.Encoding.PEM,
+        serialization.PrivateFormat.PKCS8,
+        serialization.NoEncryption(),
+    ).decode()
+    public_pem = key.public_key().public_bytes(
+        serialization.Encoding.PEM,
+        serialization.PublicFormat.SubjectPublicKeyInfo,
+    ).decode()
+    return private_pem, public_pem
+
+
+def _jwks(public_pem, kid):
+    """JWKS document holding one public key."""
+    key = jwk.construct(public_pem, "RS256").to_dict()
+    key["kid"] = kid
+    return {"keys": [key]}
+
+
+class TestTokenCache:
+    """Tests for the verified-token cache."""
+
+    @pytest.fixture(autouse=True)
+    def fresh_cache(self):
+        """Use an empty cache for each test."""
+        from app.core.token_cache import TokenCache
+
+        self.cache = TokenCache(max_size=2)
+        with patch('app.core.security.token_cache', self.cache):
+            yield
+
+    @pytest.mark.asyncio
+    async def test_repeated_token_skips_verification(self):
+        """Test a second verify_token call is served from the cache."""
+        from app.core import security
+
+        token = security.create_access_token({"sub": "user-1"})
+
+        with patch.object(security.jwt, 'decode', wraps=security.jwt.decode) as decode:
+            assert (await security.verify_token(token))["sub"] == "user-1"
+            assert (await security.verify_token(token))["sub"] == "user-1"
+
+        assert decode.call_count == 1
+
+    @pytest.mark.asyncio
+    async def test_invalid_token_not_cached(self):
+        """Test tokens that fail verification are never cached."""
+        from app.core.security import verify_token
+
+        assert await verify_token("not-a-jwt") is None
+        assert len(self.cache) == 0
+
+    def test_entry_expires_with_token(self):
+        """Test cached claims are dropped at the token's exp."""
+        self.cache.put("token", {"sub": "user-1", "exp": time.time() - 1})
+
+        assert self.cache.get("token") is None
+        assert len(self.cache) == 0
+
+    def test_cache_is_bounded(self):
+        """Test least recently used tokens are evicted beyond max_size."""
+        exp = time.time() + 60
+        for i in range(3):
+            self.cache.put(f"token-{i}", {"sub": f"user-{i}", "exp": exp})
+
+        assert len(self.cache) == 2
+        assert self.cache.get("token-0") is None
+        assert self.cache.get("token-2")["sub"] == "user-2"
+
+    def test_tokens_without_exp_not_cached(self):
+        """Test tokens without exp are verified on every request."""
+        self.cache.put("token", {"sub": "user-1"})
+
+        assert len(self.cache) == 0
+
+
+class TestAsymmetricVerification:
+    """Tests for RS256 verification with a PEM key or a JWKS."""
+
+    @pytest.fixture(autouse=True)
+    def rs256_settings(self):
+        """Configure RS256 with a fresh key pair and an empty cache."""
+        from app.core.token_cache import TokenCache
+
+        self.private_pem, self.public_pem = _rsa_keypair()
+        with patch('app.core.security.settings') as mock_settings, \
+             patch('app.core.security.token_cache', TokenCache()):
+            mock_settings.JWT_ALGORITHM = "RS256"
+            mock_settings.JWT_PRIVATE_KEY = self.private_pem
+            mock_settings.JWT_PUBLIC_KEY = self.public_pem
+            mock_settings.ACCESS_TOKEN_EXPIRE_MINUTES = 30
+            self.settings = mock_settings
+            yield
+
+    @pytest.mark.asyncio
+    async def test_public_key_round_trip(self):
+        """Test tokens signed with the private key verify with the public key."""
+        from app.core.security import create_access_token, verify_token
+
+        token = create_access_token({"sub": "user-1"})
+
+        assert (await verify_token(token))["sub"] == "user-1"
+
+    @pytest.mark.asyncio
+    async def test_jwks_verification_and_rotation(self):
+        """Test JWKS keys are cached and re-fetched when a new key appears."""
+        from app.core.jwks import JWKSCache
+        from app.core.security import verify_token
+
+        old_private, old_public = _rsa_keypair()
+
+        responses = [_jwks(old_public, "old"), _jwks(self.public_pem, "new")]
+        requests = []
+
+        def handler(request):
+            requests.append(request)
+            return httpx.Response(200, json=responses.pop(0))
+
+        self.settings.JWT_PUBLIC_KEY = ""
+        cache = JWKSCache(
+            "https://auth.example.com/jwks", min_refresh_seconds=0, transport=httpx.MockTransport(handler)
+        )
+        exp = int(time.time()) + 60
+
+        with patch('app.core.security.jwks_cache', cache):
+            old_token = jwt.encode({"sub": "user-1", "exp": exp}, old_private, algorithm="RS256")
+            assert (await verify_token(old_token))["sub"] == "user-1"
+
+            # Signed with a rotated key: first attempt fails, JWKS is re-fetched
+            new_token = jwt.encode({"sub": "user-2", "exp": exp}, self.private_pem, algorithm="RS256")
+            assert (await verify_token(new_token))["sub"] == "user-2"
+
+        assert len(requests) == 2
+
+    @pytest.mark.asyncio
+    async def test_bad_jwks_response_rejects_token(self):
+        """Test a JWKS response that is not JSON or not a key set rejects the token."""
+        from app.core.jwks import JWKSCache
+        from app.core.security import verify_token
+
+        self.settings.JWT_PUBLIC_KEY = ""
+        token = jwt.encode({"sub": "user-1", "exp": int(time.time()) + 60}, self.private_pem, algorithm="RS256")
+        bodies = [
+            httpx.Response(200, text="<html>Bad gateway</html>"),
+            httpx.Response(200, json={"error": "unavailable"}),
+        ]
+
+        for body in bodies:
+            cache = JWKSCache("https://auth.example.com/jwks", transport=httpx.MockTransport(lambda request: body))
+            with patch('app.core.security.jwks_cache', cache):
+                assert await verify_token(token) is None
+
+    @pytest.mark.asyncio
+    async def test_bad_jwks_refresh_keeps_keys(self):
+        """Test a refresh answered with an error page keeps the cached keys."""
+        from app.core.jwks import JWKSCache
+
+        responses = [
+            httpx.Response(200, json=_jwks(self.public_pem, "key")),
+            httpx.Response(200, text="<html>Bad gateway</html>"),
+        ]
+        cache = JWKSCache(
+            "https://auth.example.com/jwks",
+            min_refresh_seconds=0,
+            transport=httpx.MockTransport(lambda request: responses.pop(0)),
+        )
+
+        keys = await cache.get()
+
+        assert await cache.refresh() is False
+        assert await cache.get() is keys
+
+    @pytest.mark.asyncio
+    async def test_jwks_fetch_is_shared(self):
+        """Test concurrent requests share one JWKS fetch without blocking the loop."""
+        from app.core.jwks import JWKSCache
+        from app.core.security import verify_token
+
+        fetches = 0
+        ticks = 0
+
+        async def handler(request):
+            nonlocal fetches
+            fetches += 1
+            await asyncio.sleep(0.1)
+            return httpx.Response(200, json=_jwks(self.public_pem, "key"))
+
+        async def ticker():
+            nonlocal ticks
+            while True:
+                await asyncio.sleep(0.01)
+                ticks += 1
+
+        self.settings.JWT_PUBLIC_KEY = ""
+        cache = JWKSCache("https://auth.example.com/jwks", transport=httpx.MockTransport(handler))
+        exp = int(time.time()) + 60
+        tokens = [
+            jwt.encode({"sub": f"user-{i}", "exp": exp}, self.private_pem, algorithm="RS256")
+            for i in range(10)
+        ]
+
+        ticking = asyncio.create_task(ticker())
+        with patch('app.core.security.jwks_cache', cache):
+            payloads = await asyncio.gather(*(verify_token(token) for token in tokens))
+        ticking.cancel()
+
+        assert [payload["sub"] for payload in payloads] == [f"user-{i}" for i in range(10)]
+        assert fetches == 1
+        assert ticks >= 5
+
+    @pytest.mark.asyncio
+    async def test_jwks_refreshes_are_shared(self):
+        """Test refreshes arriving during a fetch join it instead of fetching again."""
+        from app.core.jwks import JWKSCache
+
+        fetches = 0
+
+        async def handler(request):
+            nonlocal fetches
+            fetches += 1
+            await asyncio.sleep(0.05)
+            return httpx.Response(200, json=_jwks(self.public_pem, "key"))
+
+        cache = JWKSCache(
+            "https://auth.example.com/jwks", min_refresh_seconds=0, transport=httpx.MockTransport(handler)
+        )
+
+        assert await asyncio.gather(*(cache.refresh() for _ in range(5))) == [True] * 5
+        assert fetches == 1
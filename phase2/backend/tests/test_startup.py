@@ -0,0 +1,129 @@
+"""
+Startup Tests
+
+Guards cold-start cost: importing the app must not load the agent stack,
+and startup must not touch the database unless asked to.
+"""
+
+import os
+import subprocess
+import sys
+from unittest.mock import patch
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+
+class TestLazyImports:
+    """Tests for lazy loading of optional heavy dependencies."""
+
+    def test_app_import_skips_agent_stack(self):
+        """Test importing the serverless entry point leaves openai/mcp/aiokafka unloaded."""
+        code = (
+            "import sys, api.index; "
+            "print(','.join(m for m in ('openai', 'mcp', 'aiokafka', 'app.services.agent_service') "
+            "if m in sys.modules))"
+        )
+        env = {**os.environ, "DATABASE_URL": "sqlite:///./test.db", "JWT_SECRET": "test-secret-key"}
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+            capture_output=True, text=True, check=True,
+        )
+
+        assert result.stdout.strip() == ""
+
+    def test_agent_service_created_on_first_use(self):
+        """Test the global AgentService is only built when first requested."""
+        import app.services.agent_service as agent_module
+
+        with patch.object(agent_module, 'agent_service', None), \
+             patch.object(agent_module, 'AgentService') as service_class:
+            assert agent_module.agent_service is None
+            first = agent_module.get_agent_service()
+            second = agent_module.get_agent_service()
+
+        assert service_class.call_count == 1
+        assert first is second
+
+
+class TestStartupSchema:
+    """Tests for opt-in table creation at startup."""
+
+    def test_startup_skips_create_all_by_default(self):
+        """Test on_startup does not run create_all unless enabled."""
+        from app import main
+
+        with patch('app.main.create_db_and_tables') as create_tables:
+            main.on_startup()
+            assert create_tables.call_count == 0
+
+            with patch.object(main.settings, 'DB_CREATE_TABLES_ON_STARTUP', True):
+                main.on_startup()
+            assert create_tables.call_count == 1
+
+
+class TestAppProfiles:
+    """Tests for the per-deployment app factory."""
+
+    @staticmethod
+    def _paths(app):
+        return {route.path for route in app.routes}
+
+    def test_full_profile_serves_everything(self):
+        """Test the full profile keeps every router and the debug endpoints."""
+        from app.main import create_app
+
+        paths = self._paths(create_app("full"))
+
+        assert {"/health", "/auth/login", "/tasks/", "/api/chat", "/analytics", "/debug/auth", "/metrics"} <= paths
+
+    def test_tasks_profile_omits_chat_and_debug(self):
+        """Test the tasks profile has no chat, analytics or debug routes."""
+        from app.main import create_app
+
+        paths = self._paths(create_app("tasks"))
+
+        assert {"/health", "/auth/login", "/tasks/"} <= paths
+        assert "/api/chat" not in paths
+        assert "/analytics" not in paths
+        assert "/debug/auth" not in paths
+
+    def test_analytics_profile_has_no_api_routers(self):
+        """Test the analytics profile starts the consumer and serves no API routers."""
+        from app.main import create_app, start_event_consumer
+
+        app = create_app("analytics")
+        paths = self._paths(app)
+
+        assert "/analytics" in paths
+        assert not any(path.startswith(("/api/", "/auth", "/tasks")) for path in paths)
+        assert start_event_consumer in app.router.on_startup
+
+    def test_unknown_profile_raises(self):
+        """Test an unknown profile is rejected."""
+        import pytest
+        from app.main import create_app
+
+        with pytest.raises(ValueError):
+            create_app("everything")
+
+    def test_tasks_profile_skips_chat_modules(self):
+        """Test a tasks-profile process never imports the chat, agent or MCP stack."""
+        code = (
+            "import sys, app.main; "
+            "print(','.join(m for m in ("
+            "'app.api.chat', 'app.api.conversations', 'app.mcp_tools', "
+            "'app.services.agent_service', 'openai') "
+            "if m in sys.modules))"
+        )
+        env = {
+            **os.environ,
+            "DATABASE_URL": "sqlite:///./test.db",
+            "JWT_SECRET": "test-secret-key",
+            "APP_PROFILE": "tasks",
+        }
+        result = subprocess.run(
+            [sys.executable, "-c", code], cwd=BACKEND_DIR, env=env,
+            capture_output=True, text=True, check=True,
+        )
+
+        assert result.stdout.strip() == ""
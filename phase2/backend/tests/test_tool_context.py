@@ -0,0 +1,169 @@
+"""
+Tool Context Tests
+
+Tests that the tool calls of one agent turn share a session, that their
+writes are committed together, and that a database error rolls back the
+whole turn.
+"""
+
+import json
+import pytest
+from unittest.mock import AsyncMock, MagicMock, patch
+from sqlalchemy import event
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.mcp_tools import (
+    handle_complete_task,
+    handle_create_task,
+    handle_delete_task,
+    handle_list_tasks,
+)
+from app.mcp_tools.context import TURN_ROLLED_BACK, ToolContext
+from app.models.task import Task
+
+TOOL_MODULES = ["context", "create_task", "list_tasks", "get_task", "update_task", "complete_task", "delete_task", "search_tasks"]
+USER = "user-123"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'tools.db'}")
+    SQLModel.metadata.create_all(engine)
+    patches = [patch(f"app.mcp_tools.{module}.engine", engine) for module in TOOL_MODULES]
+    for p in patches:
+        p.start()
+    yield engine
+    for p in patches:
+        p.stop()
+    engine.dispose()
+
+
+def titles(engine):
+    with Session(engine) as session:
+        return sorted(task.title for task in session.exec(select(Task).where(Task.user_id == USER)))
+
+
+def checkouts(engine):
+    counter = {"count": 0}
+
+    def on_checkout(*args):
+        counter["count"] += 1
+
+    event.listen(engine, "checkout", on_checkout)
+    return counter
+
+
+async def create_list_complete(context=None):
+    created = await handle_create_task({"user_id": USER, "title": "Buy milk"}, context)
+    listed = await handle_list_tasks({"user_id": USER}, context)
+    completed = await handle_complete_task({"user_id": USER, "task_id": created["id"]}, context)
+    return created, listed, completed
+
+
+class TestToolContext:
+    """Tests for handlers running in a shared ToolContext."""
+
+    @pytest.mark.asyncio
+    async def test_turn_uses_one_connection(self, engine):
+        """Test a shared context checks out one connection for all calls."""
+        counter = checkouts(engine)
+        with ToolContext() as context:
+            created, listed, completed = await create_list_complete(context)
+            assert context.commit()
+
+        assert counter["count"] == 1
+        assert created["success"] and completed["completed"]
+        assert listed["count"] == 1
+
+    @pytest.mark.asyncio
+    async def test_standalone_calls_commit_individually(self, engine):
+        """Test handlers without a context keep their own session per call."""
+        counter = checkouts(engine)
+        created, _, completed = await create_list_complete()
+
+        # Writes check out twice: commit releases the connection, refresh takes another
+        assert counter["count"] == 5
+        assert completed["completed"]
+        assert titles(engine) == ["Buy milk"]
+
+    @pytest.mark.asyncio
+    async def test_writes_are_visible_after_commit_only(self, engine):
+        """Test the turn's writes are committed together by ToolContext.commit."""
+        with ToolContext() as context:
+            await handle_create_task({"user_id": USER, "title": "Buy milk"}, context)
+            await handle_create_task({"user_id": USER, "title": "Call mom"}, context)
+            assert titles(engine) == []
+            assert context.commit()
+
+        assert titles(engine) == ["Buy milk", "Call mom"]
+
+    @pytest.mark.asyncio
+    async def test_database_error_rolls_back_turn(self, engine):
+        """Test an error in one call discards the earlier writes of the turn."""
+        with ToolContext() as context:
+            await handle_create_task({"user_id": USER, "title": "Buy milk"}, context)
+            with patch("app.services.task_service.TaskService.delete_task",
+                       side_effect=OperationalError("DELETE", {}, Exception("database is locked"))):
+                result = await handle_delete_task({"user_id": USER, "task_id": 1}, context)
+
+            assert not result["success"]
+            assert context.failed
+            assert not context.commit()
+
+        assert titles(engine) == []
+
+    def test_unused_context_opens_no_session(self, engine):
+        """Test a turn without tool calls never checks out a connection."""
+        counter = checkouts(engine)
+        with ToolContext() as context:
+            assert context.commit()
+        assert counter["count"] == 0
+
+
+class TestAgentToolBatch:
+    """Tests for the tool batch in AgentService.process_message."""
+
+    @pytest.mark.asyncio
+    async def test_rolled_back_writes_are_reported_as_failed(self, engine):
+        """Test the model is told a write failed when its turn was rolled back."""
+        from app.services.agent_cache import AgentResponseCache
+        from app.services.agent_service import AgentService
+
+        calls = []
+        for i, (name, arguments) in enumerate([
+            ("create_task", {"title": "Buy milk"}),
+            ("list_tasks", {}),
+            ("delete_task", {"task_id": 1}),
+        ]):
+            call = MagicMock()
+            call.id = f"call_{i}"
+            call.function.name = name
+            call.function.arguments = json.dumps(arguments)
+            calls.append(call)
+
+        def completion(content=None, tool_calls=None):
+            choice = MagicMock()
+            choice.message.content = content
+            choice.message.tool_calls = tool_calls
+            choice.finish_reason = "tool_calls" if tool_calls else "stop"
+            return MagicMock(choices=[choice])
+
+        service = AgentService(llm=MagicMock())
+        service.response_cache = AgentResponseCache(max_size=0)
+        service.llm.create = AsyncMock(side_effect=[
+            completion(tool_calls=calls),
+            completion(content="Sorry, something went wrong."),
+        ])
+
+        with patch("app.services.task_service.TaskService.delete_task",
+                   side_effect=OperationalError("DELETE", {}, Exception("database is locked"))):
+            result = await service.process_message(USER, "Add milk then delete task 1", [])
+
+        results = {call["name"]: call["result"] for call in result["tool_calls"]}
+        assert results["create_task"] == {"success": False, "error": TURN_ROLLED_BACK}
+        assert results["list_tasks"]["success"]
+        assert titles(engine) == []
+
+        tool_messages = service.llm.create.await_args.kwargs["messages"][-3:]
+        assert json.loads(tool_messages[0]["content"])["error"] == TURN_ROLLED_BACK
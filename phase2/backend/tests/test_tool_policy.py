@@ -0,0 +1,179 @@
+"""
+Tool Execution Policy Tests
+
+Tests the circuit breaker and the ToolExecutor behind
+MCPServer.execute_tool: deadlines, per-tool concurrency caps, and failing
+fast while the database breaker is open.
+"""
+
+import asyncio
+import time
+import pytest
+from unittest.mock import patch
+from sqlalchemy.exc import OperationalError
+from sqlmodel import Session, SQLModel, create_engine, select
+
+from app.core.circuit_breaker import (
+    STATE_CLOSED,
+    STATE_HALF_OPEN,
+    STATE_OPEN,
+    CircuitBreaker,
+    CircuitBreakerRegistry,
+)
+from app.mcp_tools import handle_create_task, handle_list_tasks
+from app.mcp_tools.context import ToolContext
+from app.mcp_tools.policy import (
+    ERROR_TIMEOUT,
+    ERROR_UNAVAILABLE,
+    ToolExecutor,
+    ToolPolicy,
+)
+from app.models.task import Task
+
+USER = "user-123"
+
+
+@pytest.fixture
+def engine(tmp_path):
+    engine = create_engine(f"sqlite:///{tmp_path / 'policy.db'}")
+    SQLModel.metadata.create_all(engine)
+    with patch("app.mcp_tools.context.engine", engine):
+        yield engine
+    engine.dispose()
+
+
+@pytest.fixture
+def executor():
+    executor = ToolExecutor(
+        max_workers=4,
+        breakers=CircuitBreakerRegistry(failure_threshold=2, reset_seconds=60),
+        policy=lambda name: ToolPolicy(timeout_seconds=0.1, max_concurrency=1),
+    )
+    yield executor
+    executor.shutdown()
+
+
+def titles(engine):
+    with Session(engine) as session:
+        return [task.title for task in session.exec(select(Task).where(Task.user_id == USER))]
+
+
+async def slow_create(arguments, context=None):
+    """Create a task, then take longer than the deadline."""
+    result = await handle_create_task(arguments, context)
+    time.sleep(0.3)
+    return result
+
+
+class TestCircuitBreaker:
+    """Tests for CircuitBreaker state changes."""
+
+    def test_opens_after_consecutive_failures(self):
+        """Test the breaker opens at the threshold and a success resets the count."""
+        breaker = CircuitBreaker("db", failure_threshold=2, reset_seconds=30)
+        breaker.record_failure()
+        breaker.record_success()
+        breaker.record_failure()
+        assert breaker.state == STATE_CLOSED
+
+        breaker.record_failure()
+        assert breaker.state == STATE_OPEN
+        assert not breaker.allow()
+        assert 0 < breaker.retry_after() <= 30
+
+    def test_half_open_probe(self):
+        """Test one probe is let through after reset_seconds and decides the state."""
+        breaker = CircuitBreaker("db", failure_threshold=1, reset_seconds=30)
+        breaker.record_failure()
+
+        later = time.monotonic() + 31
+        with patch("app.core.circuit_breaker.time.monotonic", return_value=later):
+            assert breaker.state == STATE_HALF_OPEN
+            assert breaker.allow()
+            assert not breaker.allow()
+            breaker.record_failure()
+            assert breaker.state == STATE_OPEN
+
+        with patch("app.core.circuit_breaker.time.monotonic", return_value=later + 31):
+            assert breaker.allow()
+            breaker.record_success()
+            assert breaker.state == STATE_CLOSED
+            assert breaker.allow()
+
+
+class TestToolExecutor:
+    """Tests for ToolExecutor.run."""
+
+    @pytest.mark.asyncio
+    async def test_timeout_returns_structured_error_and_rolls_back(self, engine, executor):
+        """Test a call past its deadline reports a timeout and its write is discarded."""
+        result = await executor.run("create_task", slow_create, {"user_id": USER, "title": "Too late"})
+
+        assert result["success"] is False
+        assert result["error_code"] == ERROR_TIMEOUT
+        executor.shutdown()
+        assert titles(engine) == []
+
+    @pytest.mark.asyncio
+    async def test_open_breaker_fails_fast(self, engine, executor):
+        """Test repeated timeouts open the breaker and later calls skip the handler."""
+        for _ in range(2):
+            await executor.run("create_task", slow_create, {"user_id": USER, "title": "Slow"})
+
+        with patch("app.mcp_tools.list_tasks.TaskService") as service:
+            result = await executor.run("list_tasks", handle_list_tasks, {"user_id": USER})
+
+        assert result["error_code"] == ERROR_UNAVAILABLE
+        assert result["retry_after"] > 0
+        service.assert_not_called()
+
+    @pytest.mark.asyncio
+    async def test_database_errors_trip_the_breaker(self, engine, executor):
+        """Test handler database errors count as breaker failures."""
+        error = OperationalError("SELECT", {}, Exception("connection refused"))
+        with patch("app.services.task_service.TaskService.get_all_tasks", side_effect=error):
+            for _ in range(2):
+                result = await executor.run("list_tasks", handle_list_tasks, {"user_id": USER})
+                assert result["success"] is False
+
+        result = await executor.run("list_tasks", handle_list_tasks, {"user_id": USER})
+        assert result["error_code"] == ERROR_UNAVAILABLE
+
+    @pytest.mark.asyncio
+    async def test_concurrency_cap(self, engine):
+        """Test calls beyond a tool's cap wait for a slot."""
+        running, peak = 0, 0
+
+        async def tracked(arguments, context=None):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            time.sleep(0.02)
+            running -= 1
+            return {"success": True}
+
+        executor = ToolExecutor(
+            max_workers=4,
+            breakers=CircuitBreakerRegistry(),
+            policy=lambda name: ToolPolicy(timeout_seconds=5, max_concurrency=2),
+        )
+        results = await asyncio.gather(*(executor.run("list_tasks", tracked, {}) for _ in range(8)))
+        executor.shutdown()
+
+        assert all(result["success"] for result in results)
+        assert peak == 2
+
+    @pytest.mark.asyncio
+    async def test_timeout_in_shared_context_fails_the_turn(self, engine, executor):
+        """Test a timed-out call makes the whole turn roll back, later calls still run."""
+        with ToolContext() as context:
+            await executor.run("create_task", handle_create_task, {"user_id": USER, "title": "First"}, context)
+            timed_out = await executor.run("create_task", slow_create, {"user_id": USER, "title": "Slow"}, context)
+            listed = await executor.run("list_tasks", handle_list_tasks, {"user_id": USER}, context)
+
+            assert timed_out["error_code"] == ERROR_TIMEOUT
+            assert listed["success"]
+            assert not context.commit()
+
+        executor.shutdown()
+        assert titles(engine) == []
@@ -0,0 +1,76 @@
+"""
+Tool Registry Tests
+
+Tests the OpenAI tool definitions generated from the tools' input models
+and argument validation through ToolSpec.
+"""
+
+import pytest
+from typing import Optional
+from pydantic import BaseModel, Field, ValidationError
+
+from app.mcp_tools import ALL_TOOLS, TOOL_HANDLERS, TOOL_SPECS
+from app.mcp_tools.registry import ToolSpec, openai_parameters
+
+
+class ExampleInput(BaseModel):
+    user_id: str = Field(..., description="The user's ID")
+    limit: int = Field(10, description="Maximum results")
+    done: Optional[bool] = Field(None, description="Completion filter")
+
+
+class TestOpenAIParameters:
+    """Tests for schema generation."""
+
+    def test_optional_fields_become_plain_types(self):
+        """Test titles, defaults and the null branch of Optional are dropped."""
+        assert openai_parameters(ExampleInput) == {
+            "type": "object",
+            "properties": {
+                "user_id": {"type": "string", "description": "The user's ID"},
+                "limit": {"type": "integer", "description": "Maximum results"},
+                "done": {"type": "boolean", "description": "Completion filter"},
+            },
+            "required": ["user_id"],
+        }
+
+    def test_every_tool_has_a_generated_definition(self):
+        """Test ALL_TOOLS and TOOL_HANDLERS come from the same specs."""
+        assert ALL_TOOLS == [spec.definition for spec in TOOL_SPECS]
+        assert [spec.name for spec in TOOL_SPECS] == list(TOOL_HANDLERS)
+        for tool in ALL_TOOLS:
+            parameters = tool["function"]["parameters"]
+            assert "user_id" in parameters["required"]
+            for prop in parameters["properties"].values():
+                assert set(prop) == {"type", "description"}
+
+
+class TestToolSpec:
+    """Tests for ToolSpec.validate."""
+
+    def test_validate_returns_the_input_model(self):
+        """Test arguments are validated into the input model with defaults."""
+        spec = ToolSpec("example", "Example tool", ExampleInput)
+
+        validated = spec.validate({"user_id": "user-1", "limit": "5"})
+
+        assert isinstance(validated, ExampleInput)
+        assert validated.limit == 5
+        assert validated.done is None
+
+    def test_validate_rejects_bad_arguments(self):
+        """Test missing or mistyped arguments raise ValidationError."""
+        spec = ToolSpec("example", "Example tool", ExampleInput)
+
+        with pytest.raises(ValidationError):
+            spec.validate({"limit": 5})
+        with pytest.raises(ValidationError):
+            spec.validate({"user_id": "user-1", "limit": "many"})
+
+    @pytest.mark.asyncio
+    async def test_handler_reports_invalid_arguments(self):
+        """Test a handler turns a validation error into a failed result."""
+        result = await TOOL_HANDLERS["get_task"]({"user_id": "user-1", "task_id": "abc"})
+
+        assert result["success"] is False
+        assert "task_id" in result["error"]
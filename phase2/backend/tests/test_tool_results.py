@@ -0,0 +1,146 @@
+"""
+Tool Result Storage Tests
+
+Tests that large tool results are spilled to tool_results, deduplicated,
+rehydrated by the history reads and garbage-collected.
+"""
+
+import pytest
+from datetime import datetime, timedelta
+from sqlmodel import Session, SQLModel, create_engine, select, update
+
+from app.models.conversation import Conversation
+from app.models.tool_result import ToolResult, ToolResultRef
+from app.services.conversation_service import ConversationService
+from app.services.message_service import MessageService
+from app.services.retention_service import archive_conversation
+from app.services.tool_result_store import (
+    REF_KEY,
+    compact_tool_calls,
+    is_reference,
+    purge_orphaned_tool_results,
+)
+
+
+def list_tasks_call(count: int, call_id: str = "call_1"):
+    """A list_tasks tool call whose result holds count tasks."""
+    tasks = [{"id": i, "title": f"Task {i}", "description": "x" * 40, "completed": False} for i in range(count)]
+    return {
+        "id": call_id,
+        "name": "list_tasks",
+        "arguments": {"user_id": "user-123"},
+        "result": {"success": True, "tasks": tasks, "count": count, "error": None},
+    }
+
+
+class TestToolResultStore:
+    """Tests for compact_tool_calls and the history reads."""
+
+    @pytest.fixture
+    def session(self, tmp_path):
+        engine = create_engine(f"sqlite:///{tmp_path / 'tools.db'}")
+        SQLModel.metadata.create_all(engine)
+        with Session(engine) as session:
+            yield session
+
+    @pytest.fixture
+    def conversation_id(self, session):
+        conversation = Conversation(user_id="user-123", title="Chat")
+        session.add(conversation)
+        session.commit()
+        return conversation.id
+
+    def test_small_results_stay_inline(self, session):
+        """Test results under the cap are stored unchanged."""
+        calls = [list_tasks_call(1)]
+
+        assert compact_tool_calls(session, calls, inline_max_bytes=1024) == calls
+        assert session.exec(select(ToolResult)).all() == []
+
+    def test_large_results_become_digests(self, session):
+        """Test large results are replaced by a digest that keeps top-level scalars."""
+        call = list_tasks_call(50)
+        call["result"]["error"] = "e" * 500
+
+        stored = compact_tool_calls(session, [call], inline_max_bytes=1024)[0]
+
+        assert is_reference(stored["result"])
+        assert stored["result"]["success"] is True
+        assert stored["result"]["count"] == 50
+        assert len(stored["result"]["error"]) == 120
+        assert "tasks" not in stored["result"]
+        assert call["result"]["tasks"]  # Input is not modified
+        assert session.get(ToolResult, stored["result"][REF_KEY]) is not None
+
+    def test_disabled_cap_keeps_everything_inline(self, session):
+        """Test inline_max_bytes=0 stores results as is."""
+        calls = [list_tasks_call(50)]
+
+        assert compact_tool_calls(session, calls, inline_max_bytes=0) is calls
+
+    def test_identical_results_are_stored_once(self, session, conversation_id):
+        """Test repeated results share one tool_results row."""
+        service = MessageService(session)
+        for i in range(3):
+            service.create_assistant_message(conversation_id, "Here you go", [list_tasks_call(50, f"call_{i}")])
+        service.create_assistant_message(conversation_id, "Changed", [list_tasks_call(51)])
+
+        assert len(session.exec(select(ToolResult)).all()) == 2
+
+    def test_history_reads_rehydrate_results(self, session, conversation_id):
+        """Test rows and pages return full results unless asked for digests."""
+        call = list_tasks_call(50)
+        service = MessageService(session)
+        service.create_user_message(conversation_id, "Show my tasks")
+        service.create_assistant_message(conversation_id, "Here you go", [call])
+
+        rows = service.get_conversation_message_rows(conversation_id)
+        page, _ = service.get_message_page(conversation_id)
+        compact = service.get_conversation_message_rows(conversation_id, expand_tool_results=False)
+
+        assert rows[1]["tool_calls"] == [call]
+        assert page[0]["tool_calls"] == [call]
+        assert is_reference(compact[1]["tool_calls"][0]["result"])
+
+    def test_orphaned_results_are_purged(self, session, conversation_id):
+        """Test results are deleted once no message references them, after the grace period."""
+        service = MessageService(session)
+        kept = service.create_assistant_message(conversation_id, "a", [list_tasks_call(50)]).id
+        dropped = service.create_assistant_message(conversation_id, "b", [list_tasks_call(60)]).id
+
+        assert purge_orphaned_tool_results(session, grace=timedelta(0)) == 0
+
+        service.delete_message(dropped)
+
+        assert purge_orphaned_tool_results(session) == 0  # Still within the grace period
+        assert purge_orphaned_tool_results(session, grace=timedelta(0)) == 1
+        assert service.get_conversation_message_rows(conversation_id)[0]["id"] == kept
+        assert service.get_conversation_message_rows(conversation_id)[0]["tool_calls"] == [list_tasks_call(50)]
+
+    def test_reused_results_restart_the_grace_period(self, session, conversation_id):
+        """Test a deduplicated result is protected like a new one until its message commits."""
+        service = MessageService(session)
+        message = service.create_assistant_message(conversation_id, "a", [list_tasks_call(50)])
+        service.delete_message(message.id)
+        session.exec(update(ToolResult).values(last_referenced_at=datetime.utcnow() - timedelta(days=1)))
+        session.commit()
+
+        # A new turn reuses the result but has not committed its message yet
+        compact_tool_calls(session, [list_tasks_call(50)], inline_max_bytes=1024)
+        session.commit()
+
+        assert purge_orphaned_tool_results(session) == 0
+        assert len(session.exec(select(ToolResult)).all()) == 1
+
+    def test_archived_messages_keep_their_results(self, session, conversation_id):
+        """Test references survive archiving and go away with the conversation."""
+        service = MessageService(session)
+        service.create_assistant_message(conversation_id, "a", [list_tasks_call(50)])
+        archive_conversation(session, conversation_id)
+
+        assert purge_orphaned_tool_results(session, grace=timedelta(0)) == 0
+
+        ConversationService(session, "user-123").delete_conversation(conversation_id)
+
+        assert session.exec(select(ToolResultRef)).all() == []
+        assert purge_orphaned_tool_results(session, grace=timedelta(0)) == 1
@@ -0,0 +1,216 @@
+"""
+Tracing Tests
+
+Tests span recording, traceparent handling and the Server-Timing
+breakdown of a chat request traced end to end (API, MessageService,
+agent rounds, model calls, tools and SQL).
+"""
+
+import pytest
+from unittest.mock import patch
+from fastapi.testclient import TestClient
+from sqlmodel import Session, SQLModel, create_engine
+
+from app.core.auth import get_current_user_id
+from app.core.database import get_session
+from app.core.tracing import (
+    InMemorySpanExporter,
+    Tracer,
+    current_span,
+    parse_traceparent,
+    server_timing,
+    traced,
+    tracer,
+)
+
+TOOL_MODULES = ["context", "create_task", "list_tasks", "get_task", "update_task", "complete_task", "delete_task", "search_tasks"]
+USER = "user-123"
+TRACE_ID = "4bf92f3577b34da6a3ce929d0e0e4736"
+PARENT_ID = "00f067aa0ba902b7"
+
+
+@pytest.fixture
+def exporter():
+    exporter = InMemorySpanExporter()
+    with patch.object(tracer, "exporters", [exporter]):
+        yield exporter
+
+
+class TestSpans:
+    """Tests for spans outside and inside a trace."""
+
+    def test_nothing_is_recorded_outside_a_trace(self, exporter):
+        """Test spans and traced functions are no-ops without a sampled request."""
+        @traced()
+        def work():
+            return current_span()
+
+        with tracer.span("outside") as span:
+            assert span is None
+        assert work() is None
+        assert exporter.get_finished_spans() == []
+
+    def test_child_spans_share_the_trace(self, exporter):
+        """Test nested spans get parent links and are exported with the root."""
+        @traced("work")
+        def work():
+            return current_span()
+
+        with tracer.start_trace("root") as root:
+            with tracer.span("child", {"n": 1}) as child:
+                inner = work()
+        tracer.export(root)
+
+        spans = exporter.get_finished_spans()
+        assert [span.name for span in spans] == ["root", "child", "work"]
+        assert child.parent_id == root.span_id
+        assert inner.parent_id == child.span_id
+        assert {span.trace_id for span in spans} == {root.trace_id}
+        assert all(span.end_ns is not None for span in spans)
+        assert child.to_otlp()["attributes"] == [{"key": "n", "value": {"intValue": "1"}}]
+
+    def test_exception_marks_span_failed(self):
+        """Test a span left by an exception records the error."""
+        with tracer.start_trace("root"):
+            with pytest.raises(ValueError):
+                with tracer.span("failing") as span:
+                    raise ValueError("boom")
+
+        assert span.error == "ValueError: boom"
+        assert span.to_otlp()["status"]["code"] == 2
+
+    def test_server_timing_sums_by_name(self):
+        """Test Server-Timing has the total and one entry per span name."""
+        with tracer.start_trace("root") as root:
+            for _ in range(3):
+                with tracer.span("db.query"):
+                    pass
+            with tracer.span("llm.create"):
+                pass
+
+        entries = [entry.split(";")[0] for entry in server_timing(root).split(", ")]
+        assert entries == ["total", "db.query", "llm.create"]
+        assert 'db.query;dur=' in server_timing(root) and 'desc="3 calls"' in server_timing(root)
+
+
+class TestTraceparent:
+    """Tests for W3C trace context parsing."""
+
+    def test_valid_header(self):
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-01") == (TRACE_ID, PARENT_ID, True)
+        assert parse_traceparent(f"00-{TRACE_ID}-{PARENT_ID}-00") == (TRACE_ID, PARENT_ID, False)
+
+    def test_invalid_headers(self):
+        for header in (None, "", "00-abc-def-01", f"00-{'0' * 32}-{PARENT_ID}-01", f"00-{TRACE_ID}-{PARENT_ID}-zz"):
+            assert parse_traceparent(header) is None
+
+    def test_sampling_decision(self):
+        """Test a sampled traceparent is only followed when honored."""
+        parent = (TRACE_ID, PARENT_ID, True)
+        assert not Tracer().should_sample(parent)
+        assert Tracer(honor_traceparent=True).should_sample(parent)
+        assert not Tracer(honor_traceparent=True).should_sample((TRACE_ID, PARENT_ID, False))
+        assert Tracer(sample_rate=1.0).should_sample(None)
+
+
+class TestChatTrace:
+    """Tests for a traced POST /api/chat with the fake model."""
+
+    @pytest.fixture
+    def client(self, tmp_path, exporter):
+        from app.main import create_app
+        from app.services.agent_service import AgentService
+        from app.services.fake_llm import FakeLLMProvider
+        from app.services.intent_router import intent_router
+        from app.services.llm_providers import LLMRouter
+
+        engine = create_engine(f"sqlite:///{tmp_path / 'chat.db'}")
+        SQLModel.metadata.create_all(engine)
+        agent = AgentService(llm=LLMRouter([FakeLLMProvider(first_chunk_seconds=0, tokens_per_second=0)]))
+
+        def override_session():
+            with Session(engine) as session:
+                yield session
+
+        patches = [patch(f"app.mcp_tools.{module}.engine", engine) for module in TOOL_MODULES] + [
+            patch.object(tracer, "sample_rate", 1.0),
+            patch.object(intent_router, "enabled", False),
+            patch.object(agent, "_task_set_version", return_value=None),
+            patch("app.services.agent_service.agent_service", agent),
+        ]
+        for p in patches:
+            p.start()
+        app = create_app("chat")
+        app.dependency_overrides[get_session] = override_session
+        app.dependency_overrides[get_current_user_id] = lambda: USER
+        yield TestClient(app)
+        for p in reversed(patches):
+            p.stop()
+        engine.dispose()
+
+    def test_chat_breakdown(self, client, exporter):
+        """Test the response's Server-Timing covers each stage of the turn."""
+        response = client.post("/api/chat", json={"message": "What's on my todo list?"})
+
+        assert response.status_code == 200
+        timing = response.headers["server-timing"]
+        names = [entry.split(";")[0] for entry in timing.split(", ")]
+        assert names[0] == "total"
+        for name in ("chat.begin", "chat.agent", "agent.round", "llm.create", "llm.first_chunk",
+                     "agent.tools", "tool.list_tasks", "db.query", "chat.complete"):
+            assert name in names, name
+
+    def test_spans_form_one_tree(self, client, exporter):
+        """Test every span of the request hangs off the root span."""
+        client.post("/api/chat", json={"message": "What's on my todo list?"})
+
+        spans = exporter.get_finished_spans()
+        root = spans[0]
+        ids = {span.span_id for span in spans}
+        assert root.name == "http.request"
+        assert root.attributes["http.route"] == "/api/chat"
+        assert root.attributes["http.status_code"] == 200
+        assert all(span.parent_id in ids for span in spans[1:])
+        assert {span.trace_id for span in spans} == {root.trace_id}
+        assert [span.attributes["agent.round"] for span in spans if span.name == "agent.round"] == [1, 2]
+
+    def test_tool_sql_is_traced(self, client, exporter):
+        """Test SQL run by a tool on its worker thread is recorded under the tool's span."""
+        client.post("/api/chat", json={"message": "What's on my todo list?"})
+
+        spans = exporter.get_finished_spans()
+        [tool] = [span for span in spans if span.name == "tool.list_tasks"]
+        queries = [span for span in spans if span.name == "db.query" and span.parent_id == tool.span_id]
+        assert any(span.attributes["db.statement"].lstrip().upper().startswith("SELECT") for span in queries)
+
+    def test_history_is_traced(self, client, exporter):
+        """Test the second turn of a conversation records its history load."""
+        first = client.post("/api/chat", json={"message": "What's on my todo list?"}).json()
+        exporter.clear()
+
+        client.post("/api/chat", json={"message": "Thanks", "conversation_id": first["conversation_id"]})
+
+        names = [span.name for span in exporter.get_finished_spans()]
+        assert "MessageService.get_conversation_history" in names
+
+    def test_incoming_traceparent_is_continued(self, client, exporter):
+        """Test a sampled caller's trace ID and parent span are kept."""
+        with patch.object(tracer, "sample_rate", 0.0), patch.object(tracer, "honor_traceparent", True):
+            response = client.post(
+                "/api/chat",
+                json={"message": "What's on my todo list?"},
+                headers={"traceparent": f"00-{TRACE_ID}-{PARENT_ID}-01"},
+            )
+
+        root = exporter.get_finished_spans()[0]
+        assert (root.trace_id, root.parent_id) == (TRACE_ID, PARENT_ID)
+        assert response.headers["traceresponse"] == f"00-{TRACE_ID}-{root.span_id}-01"
+
+    def test_unsampled_request_has_no_header(self, client, exporter):
+        """Test requests outside the sample are not recorded."""
+        with patch.object(tracer, "sample_rate", 0.0):
+            response = client.post("/api/chat", json={"message": "What's on my todo list?"})
+
+        assert response.status_code == 200
+        assert "server-timing" not in response.headers
+        assert exporter.get_finished_spans() == []